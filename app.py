@@ -4,172 +4,46 @@ A Streamlit application for managing sole trader tax records
 """
 
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func
 import os
-import io
 import hmac
 import hashlib
 import time
 
-# Import local modules
-from models import (
-    init_db, seed_default_data,
-    Transaction, Income, Expense, Mileage, Donation, Rule, Setting,
-    EXPENSE_CATEGORIES, INCOME_TYPES, MATCH_MODES
-)
-from utils import (
-    parse_csv, format_currency, parse_uk_date, export_to_excel,
-    get_tax_year_dates, calculate_mileage_allowance
-)
-from mobile_utils import (
-    get_optimal_columns, responsive_chart_height,
-    format_number_for_mobile, get_table_page_size
+# Import local modules. Only what the app shell itself uses is imported here;
+# each page's module (and its plotting, export and OCR dependencies) is
+# imported by page_registry when the page is first opened.
+from models import Transaction, Income, Setting
+from db_runtime import get_database
+from page_registry import (
+    PAGE_NAMES, PAGES_BY_NAME, render_page, page_load_times,
+    import_profile, startup_modules
 )
+from utils import format_currency
 from ledger_helpers import (
     post_transaction_to_ledger, safe_commit,
-    update_transaction_categorization, bulk_post_to_ledger
-)
-from cache_helpers import (
-    load_rules, clear_rules_cache,
-    get_dashboard_statistics, clear_dashboard_cache, clear_all_caches
-)
-
-# Import restructured page modules
-from expenses_restructured import render_restructured_expense_screen
-
-# Import Phase 1 components
-from components.bulk_operations import (
-    render_bulk_toolbar, render_transaction_checkbox,
-    render_select_similar_button, get_selected_count
-)
-from components.keyboard_shortcuts import (
-    inject_keyboard_shortcuts, render_keyboard_help_button,
-    render_keyboard_help_overlay, render_keyboard_indicator,
-    handle_keyboard_action
-)
-
-# Import Phase 2 components
-from components.search_filter import (
-    render_search_bar, render_advanced_filters,
-    clear_all_filters, has_active_filters
-)
-# TODO: Re-enable when progress widget is implemented
-# from components.progress_widget import (
-#     render_progress_widget, render_sidebar_badge,
-#     get_completion_percentage, get_unreviewed_count
-# )
-from components.smart_learning import (
-    render_enhanced_modal, detect_and_prompt_similar,
-    get_learning_enabled
+    update_transaction_categorization
 )
+from cache_helpers import CACHE_TTL_SECONDS
+from data_versions import table_versions
+from search_index import search_records, load_hits
 
 # Phase 3: Advanced Features
-from components.receipt_upload import (
-    upload_receipt, render_receipt_gallery, render_receipt_indicator,
-    get_receipt_paths, delete_receipt
-)
-from components.audit_trail import (
-    log_action, render_undo_button, render_undo_notification,
-    render_audit_viewer, get_record_current_values, undo_last_action
-)
-from components.merchant_db import (
-    find_merchant_match, get_merchant_suggestions, render_merchant_selector,
-    update_transaction_from_merchant, add_custom_merchant
-)
-from components.confidence_tooltips import (
-    quick_render_full, quick_render_compact, render_help_modal,
-    render_bulk_confidence_stats
-)
-from models import Merchant, AuditLog
+from components.audit_trail import render_undo_button, render_undo_notification
 
 # Phase 4: Polish & Scale
-from components.mobile_responsive import (
-    initialize_mobile_support, MobileDetector, MobileComponents,
-    adaptive_columns, responsive_expander
-)
+from components.mobile_responsive import initialize_mobile_support
 from components.advanced_keyboard import (
-    KeyboardShortcutManager, render_command_palette,
-    render_shortcut_customization, inject_keyboard_handler
-)
-from components.performance import (
-    initialize_performance_optimizations, VirtualScrolling,
-    CacheManager, LazyLoader, BackgroundProcessor
-)
-from components.ocr_receipt import (
-    quick_ocr, ReceiptOCR, render_ocr_review_ui
+    KeyboardShortcutManager, render_command_palette, inject_keyboard_handler
 )
+from components.performance import initialize_performance_optimizations
 from components.merchant_management import (
-    render_merchant_management_page, quick_add_merchant_button,
-    render_quick_add_merchant_modal
-)
-from components.batch_receipt_upload import (
-    render_batch_upload_interface, batch_process_receipts
-)
-from components.compliance_reports import (
-    generate_audit_trail_report, generate_sa103s_export,
-    render_report_generator_ui
-)
-from components.keyboard_integration import FinalReviewKeyboardHandler
-
-# Phase 5: New UI Component Library (UX Transformation)
-from components.ui.cards import (
-    render_action_card, render_stat_card, render_hero_card,
-    render_progress_card, render_info_card
-)
-from components.ui.buttons import (
-    render_action_toolbar, render_quick_category_buttons,
-    render_yes_no_dialog, render_quick_action_buttons,
-    render_nav_buttons
-)
-# Legacy CSS imports kept for backward compatibility but superseded by theme
-from components.ui.styles import inject_custom_css
-from components.ui.modern_styles import inject_modern_styles
-from components.ui.mobile_styles import inject_mobile_responsive_css, check_mobile_viewport
-from components.ui.aurora_design import inject_aurora_design
-from components.ui.aurora_components import (
-    create_aurora_hero,
-    create_aurora_metric_card,
-    create_aurora_data_card,
-    create_aurora_empty_state,
-    create_aurora_section_header,
-    create_aurora_progress_ring,
-    create_aurora_divider
+    quick_add_merchant_button, render_quick_add_merchant_modal
 )
 
-# Unified Obsidian Ledger Design System (replaces all above CSS)
+# Unified Obsidian Ledger Design System
 from components.ui.theme import inject_obsidian_theme
 
-# Phase 6: Data Visualization Components (Phase 2)
-from components.ui.charts import (
-    render_expense_breakdown_chart, render_income_vs_expenses_chart,
-    render_monthly_comparison_bars, render_tax_breakdown_donut,
-    render_category_trend_chart, render_income_sources_chart,
-    render_yearly_comparison_chart
-)
-
-# Phase 7: Enhanced Interaction Components (Phase 3)
-from components.ui.interactions import (
-    render_bulk_action_selector, render_advanced_filter_panel,
-    render_quick_search, render_pagination,
-    render_quick_edit_modal, render_smart_suggestions
-)
-
-# Phase 8: Advanced Analytics Visualizations (Phase 5)
-from components.ui.advanced_charts import (
-    render_spending_heatmap, render_cash_flow_waterfall,
-    render_expense_treemap, render_tax_projection_gauge,
-    render_spending_radar, render_income_tax_timeline,
-    render_expense_velocity, render_income_to_expense_sankey,
-    render_tax_efficiency_sunburst, render_quarterly_dashboard
-)
-
-# Phase 9: Professional Data Export & Reporting
-from components.export_manager import (
-    render_export_panel, render_advanced_export_dialog, ExportManager
-)
-
 # Page configuration
 st.set_page_config(
     page_title="UK Self Assessment Tax Helper",
@@ -278,9 +152,10 @@ DEBUG = os.environ.get('TAX_HELPER_DEBUG', '0') == '1'
 if DEBUG:
     st.warning("Debug mode is enabled. This should only be used in development environments.")
 
-# Initialize database
+# Initialize database (engine, pool and session factory are shared by the whole process)
 DB_PATH = os.path.join(os.path.dirname(__file__), 'tax_helper.db')
-engine, Session = init_db(DB_PATH)
+db = get_database(DB_PATH)
+engine, Session = db.engine, db.Session
 
 # Security: Check database file permissions
 def check_database_permissions(db_path):
@@ -309,16 +184,9 @@ def check_database_permissions(db_path):
 # Perform permission check on startup
 check_database_permissions(DB_PATH)
 
-# Session state initialization
-if 'db_session' not in st.session_state:
-    st.session_state.db_session = Session()
-    seed_default_data(st.session_state.db_session)
-
-session = st.session_state.db_session
-
-# CRITICAL: Expire all cached objects at the start of EVERY page load
-# This ensures we always see fresh data from the database
-session.expire_all()
+# This browser session's database session (st.session_state.db_session), with
+# objects from tables written since the last page load expired
+session = db.begin_rerun(st.session_state)
 
 # Phase 4 Initialization
 initialize_mobile_support()  # Detect device and inject CSS
@@ -341,7 +209,6 @@ if 'review_page' not in st.session_state:
 
 
 # Helper function to load settings
-@st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_settings(_session):
     """
     Load all settings into a dictionary
@@ -352,6 +219,11 @@ def load_settings(_session):
     Returns:
         Dictionary of settings key-value pairs
     """
+    return _load_settings(_session, table_versions('settings'))
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)  # Refreshed whenever the settings table changes
+def _load_settings(_session, data_version):
     settings = {}
     for setting in _session.query(Setting).all():
         settings[setting.key] = setting.value
@@ -360,7 +232,7 @@ def load_settings(_session):
 
 def clear_settings_cache():
     """Clear the settings cache when settings are modified"""
-    load_settings.clear()
+    _load_settings.clear()
 
 
 # Helper function to get confidence badge
@@ -473,29 +345,17 @@ _search_q = st.sidebar.text_input(
     label_visibility="collapsed",
 )
 if _search_q and len(_search_q) >= 2:
-    from sqlalchemy import or_
-    _sq = f"%{_search_q}%"
+    # Ranked full-text search over transactions, income and expenses
     _results = []
-    # Search transactions
-    _txns = session.query(Transaction).filter(
-        Transaction.description.ilike(_sq)
-    ).order_by(Transaction.date.desc()).limit(5).all()
-    for t in _txns:
-        amt = t.paid_in if t.paid_in > 0 else t.paid_out
-        sign = "+" if t.paid_in > 0 else "-"
-        _results.append(("Transaction", t.description[:40], f"{sign}{format_currency(amt)}", "Final Review"))
-    # Search income
-    _inc = session.query(Income).filter(
-        or_(Income.source.ilike(_sq), Income.description.ilike(_sq))
-    ).order_by(Income.date.desc()).limit(3).all()
-    for i in _inc:
-        _results.append(("Income", i.source[:40], format_currency(i.amount_gross), "Income"))
-    # Search expenses
-    _exp = session.query(Expense).filter(
-        or_(Expense.supplier.ilike(_sq), Expense.description.ilike(_sq))
-    ).order_by(Expense.date.desc()).limit(3).all()
-    for e in _exp:
-        _results.append(("Expense", e.supplier[:40], format_currency(e.amount), "Expenses"))
+    for record in load_hits(session, search_records(session, _search_q, limit=8)):
+        if isinstance(record, Transaction):
+            amt = record.paid_in if record.paid_in > 0 else record.paid_out
+            sign = "+" if record.paid_in > 0 else "-"
+            _results.append(("Transaction", record.description[:40], f"{sign}{format_currency(amt)}", "Final Review"))
+        elif isinstance(record, Income):
+            _results.append(("Income", record.source[:40], format_currency(record.amount_gross), "Income"))
+        else:
+            _results.append(("Expense", record.supplier[:40], format_currency(record.amount), "Expenses"))
 
     if _results:
         for rtype, rdesc, ramt, rpage in _results[:8]:
@@ -524,23 +384,7 @@ if 'navigate_to' in st.session_state:
 
 page = st.sidebar.radio(
     "Navigation",
-    [
-        "Dashboard",
-        "Import Statements",
-        "Final Review",
-        "Income",
-        "Expenses",
-        "Mileage",
-        "Donations",
-        "Rules",
-        "Summary (HMRC)",
-        "HMRC Guidance",
-        "Settings",
-        "Export",
-        "Audit Trail",
-        "Batch Upload",
-        "Reports"
-    ],
+    PAGE_NAMES,
     key="main_nav",
     label_visibility="collapsed"
 )
@@ -557,6 +401,25 @@ if DEBUG:
             del st.session_state[key]
         st.rerun()
 
+    # Import-time profile: what cold start and each page's first load cost
+    with st.sidebar.expander("Import profile"):
+        for page_name, seconds in page_load_times.items():
+            st.caption(f"{page_name}: first load {seconds * 1000:.0f} ms")
+        profile_target = st.selectbox("Profile", ["App startup"] + PAGE_NAMES, key="import_profile_target")
+        if st.button("Run import profile", use_container_width=True, key="import_profile_btn"):
+            modules = startup_modules() if profile_target == "App startup" \
+                else [PAGES_BY_NAME[profile_target].module]
+            with st.spinner("Profiling imports..."):
+                profile = import_profile(modules)
+            st.caption(f"{profile['total_ms']:,.0f} ms, {profile['module_count']:,} modules")
+            for error in profile['errors']:
+                st.warning(error)
+            st.dataframe(
+                [{'Module': t.module, 'Self (ms)': t.self_us / 1000, 'Total (ms)': t.cumulative_us / 1000}
+                 for t in profile['slowest']],
+                hide_index=True, use_container_width=True
+            )
+
 st.sidebar.markdown("---")
 settings = load_settings(session)
 
@@ -634,6 +497,9 @@ if st.session_state.get('show_quick_report'):
         )
         if st.button("Generate", key="quick_gen_btn"):
             with st.spinner("Generating report..."):
+                from components.compliance_reports import (
+                    generate_audit_trail_report, generate_sa103s_export
+                )
                 if quick_report_type == "Audit Trail":
                     report_path = generate_audit_trail_report(session)
                     st.success(f"Report generated: {report_path}")
@@ -654,7 +520,7 @@ if st.session_state.get('show_quick_report'):
 # ============================================================================
 # FINAL REVIEW PAGE - HELPER FUNCTIONS
 # ============================================================================
-# Note: streamlit, datetime, and models are already imported at the top of this file
+# Note: streamlit and models are already imported at the top of this file
 # These duplicate imports have been removed for code cleanup
 
 def render_transaction_card(txn: Transaction, index: int, total: int):
@@ -886,111 +752,7 @@ def render_receipt_upload_inline(txn: Transaction, session):
 # Main content landmark for skip-link and screen readers
 st.markdown('<div id="main-content" tabindex="-1"></div>', unsafe_allow_html=True)
 
-# ============================================================================
-if page == "Dashboard":
-    # Use the restructured dashboard with proper CSS and visible text
-    from dashboard_restructured import render_restructured_dashboard
-    render_restructured_dashboard(session, settings)
-
-# ============================================================================
-# PAGE: IMPORT STATEMENTS
-# ============================================================================
-elif page == "Import Statements":
-    from import_restructured import render_restructured_import_screen
-    render_restructured_import_screen(session, settings)
-# ============================================================================
-# PAGE: FINAL REVIEW
-# ============================================================================
-elif page == "Final Review":
-    from review_restructured import render_restructured_review_screen
-    render_restructured_review_screen(session, settings)
-
-elif page == "Income":
-    # Use the restructured income screen with modern interface
-    from income_restructured import render_restructured_income_screen
-    render_restructured_income_screen(session, settings)
-
-# ============================================================================
-# PAGE: EXPENSES
-# ============================================================================
-elif page == "Expenses":
-    # Use the modern restructured expenses screen
-    render_restructured_expense_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: MILEAGE
-# ============================================================================
-elif page == "Mileage":
-    # Use the restructured mileage screen with modern interface
-    from mileage_restructured import render_restructured_mileage_screen
-    render_restructured_mileage_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: DONATIONS
-# ============================================================================
-elif page == "Donations":
-    # Use the restructured donations screen with modern interface
-    from donations_restructured import render_restructured_donations_screen
-    render_restructured_donations_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: RULES
-# ============================================================================
-elif page == "Rules":
-    # Use the restructured rules screen with modern interface
-    from rules_restructured import render_restructured_rules_screen
-    render_restructured_rules_screen(session, settings)
-elif page == "Summary (HMRC)":
-    from summary_restructured import render_restructured_summary_screen
-    render_restructured_summary_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: SETTINGS
-# ============================================================================
-elif page == "Settings":
-    from settings_restructured import render_restructured_settings_screen
-    render_restructured_settings_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: HMRC GUIDANCE
-# ============================================================================
-elif page == "HMRC Guidance":
-    from guidance_restructured import render_restructured_guidance_screen
-    render_restructured_guidance_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: EXPORT
-# ============================================================================
-elif page == "Export":
-    from export_restructured import render_restructured_export_screen
-    render_restructured_export_screen(session, settings)
-
+render_page(page, session, settings)
 
-# ============================================================================
-# PAGE: AUDIT TRAIL
-# ============================================================================
-elif page == "Audit Trail":
-    from audit_trail_restructured import render_restructured_audit_trail_screen
-    render_restructured_audit_trail_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: BATCH UPLOAD (Phase 4)
-# ============================================================================
-elif page == "Batch Upload":
-    from batch_upload_restructured import render_restructured_batch_upload_screen
-    render_restructured_batch_upload_screen(session, settings)
-
-
-# ============================================================================
-# PAGE: REPORTS (Phase 4)
-# ============================================================================
-elif page == "Reports":
-    from reports_restructured import render_restructured_reports_screen
-    render_restructured_reports_screen(session, settings)
+# Return this rerun's connection to the pool
+db.end_rerun(st.session_state)
@@ -1,15 +1,24 @@
 """
 Cached helper functions for Tax Helper
 Improves performance by caching frequently accessed data
+
+Cached results are keyed on the generations of the tables they read (see
+data_versions.py), so they refresh as soon as those tables are written and
+the TTL only bounds how long unused entries are kept.
 """
 
 import streamlit as st
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import and_, case, func, or_
 from models import Rule, Setting, Transaction, Expense
+from data_versions import table_versions
+from rule_evaluation import rule_statistics
+
+
+# Entries are replaced when their tables change, so they can live for hours
+CACHE_TTL_SECONDS = 6 * 3600
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_rules(_session):
     """
     Load all rules from database with caching
@@ -20,15 +29,20 @@ def load_rules(_session):
     Returns:
         List of Rule objects (as dictionaries for caching)
     """
+    return _load_rules(_session, table_versions('rules'))
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def _load_rules(_session, data_version):
     rules = _session.query(Rule).order_by(Rule.priority).all()
     # Convert to dictionaries for caching
     return [{
         'id': r.id,
-        'name': r.name,
-        'pattern': r.pattern,
         'match_mode': r.match_mode,
-        'category': r.category,
-        'transaction_type': r.transaction_type,
+        'text_to_match': r.text_to_match,
+        'map_to': r.map_to,
+        'income_type': r.income_type,
+        'expense_category': r.expense_category,
         'is_personal': r.is_personal,
         'priority': r.priority,
         'enabled': r.enabled
@@ -36,11 +50,15 @@ def load_rules(_session):
 
 
 def clear_rules_cache():
-    """Clear the rules cache when rules are modified"""
-    load_rules.clear()
+    """Clear the rules cache (rule changes made through a session refresh it automatically)"""
+    _load_rules.clear()
+
+
+def _count_where(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END), 0 when no rows match"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes (dashboard stats)
 def get_dashboard_statistics(_session, start_date, end_date, account_filter=None):
     """
     Calculate dashboard statistics with caching
@@ -54,8 +72,21 @@ def get_dashboard_statistics(_session, start_date, end_date, account_filter=None
     Returns:
         Dictionary of calculated statistics
     """
-    # Base query
-    query = _session.query(Transaction).filter(
+    return _dashboard_statistics(
+        _session, start_date, end_date, account_filter, table_versions('transactions', 'expenses')
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def _dashboard_statistics(_session, start_date, end_date, account_filter, data_version):
+    # Transaction counts in one pass over the date index
+    query = _session.query(
+        func.count(Transaction.id),
+        _count_where(or_(Transaction.reviewed == False, Transaction.reviewed == None)),
+        _count_where(Transaction.confidence_score >= 70),
+        _count_where(or_(Transaction.requires_review == True,
+                         func.coalesce(Transaction.confidence_score, 0) < 40)),
+    ).filter(
         Transaction.date >= start_date,
         Transaction.date <= end_date
     )
@@ -63,28 +94,17 @@ def get_dashboard_statistics(_session, start_date, end_date, account_filter=None
     if account_filter and account_filter != 'All Accounts':
         query = query.filter(Transaction.account_name == account_filter)
 
-    all_transactions = query.all()
-    total_transactions = len(all_transactions)
-
-    # Calculate metrics
-    unreviewed_count = sum(1 for t in all_transactions if not t.reviewed)
-    high_confidence = sum(1 for t in all_transactions if t.confidence_score >= 70)
-    needs_manual_review = sum(1 for t in all_transactions if t.requires_review or t.confidence_score < 40)
+    total_transactions, unreviewed_count, high_confidence, needs_manual_review = query.one()
 
-    # Generic expenses count
-    generic_expenses = _session.query(Expense).filter(
-        Expense.category == 'Other business expenses',
+    # Generic expenses and large expenses without receipts
+    generic_expenses, large_expenses_count = _session.query(
+        _count_where(Expense.category == 'Other business expenses'),
+        _count_where(and_(Expense.amount >= 100.0,
+                          or_(Expense.receipt_link == '', Expense.receipt_link == None))),
+    ).filter(
         Expense.date >= start_date,
         Expense.date <= end_date
-    ).count()
-
-    # Large expenses without receipts
-    large_expenses_count = _session.query(Expense).filter(
-        Expense.amount >= 100.0,
-        Expense.date >= start_date,
-        Expense.date <= end_date,
-        or_(Expense.receipt_link == '', Expense.receipt_link == None)
-    ).count()
+    ).one()
 
     return {
         'total_transactions': total_transactions,
@@ -98,10 +118,29 @@ def get_dashboard_statistics(_session, start_date, end_date, account_filter=None
 
 def clear_dashboard_cache():
     """Clear the dashboard statistics cache"""
-    get_dashboard_statistics.clear()
+    _dashboard_statistics.clear()
+
+
+def get_rule_statistics(_session):
+    """
+    Hit and win counts of every enabled rule with caching
+
+    Args:
+        _session: Database session (prefixed with _ to exclude from cache key)
+
+    Returns:
+        RuleStatistics (see rule_evaluation.rule_statistics)
+    """
+    return _rule_statistics(_session, table_versions('transactions', 'rules'))
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def _rule_statistics(_session, data_version):
+    return rule_statistics(_session)
 
 
 def clear_all_caches():
     """Clear all caches when data changes significantly"""
-    load_rules.clear()
-    get_dashboard_statistics.clear()
+    _load_rules.clear()
+    _dashboard_statistics.clear()
+    _rule_statistics.clear()
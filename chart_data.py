@@ -0,0 +1,259 @@
+"""
+Chart data provider for Tax Helper
+Daily income and expense aggregates for a date range, fetched in two grouped
+queries and shaped with pandas for every chart that plots them
+
+The Reports page draws up to ten charts over the same tax year; each used to
+query its own monthly or quarterly sums. They now all read one ChartData,
+memoized per database for the last few date ranges and rebuilt when the
+income or expense tables change (see data_versions.py).
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Union
+
+import pandas as pd
+from sqlalchemy import func
+
+from data_versions import table_versions
+
+
+# Tables chart data is built from
+CHART_TABLES = ('income', 'expenses')
+
+EXPENSE_COLUMNS = ['date', 'category', 'supplier', 'amount', 'count']
+INCOME_COLUMNS = ['date', 'income_type', 'amount', 'tax_deducted', 'count']
+
+# Date ranges kept per database; the least recently used goes first
+CHART_CACHE_SIZE = 4
+
+# engine -> OrderedDict {(start_date, end_date): (data_version, chart_data)}, oldest use first
+_chart_data = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _as_date(value: Union[date, datetime]) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def previous_period(start_date: date, end_date: date) -> Tuple[date, date]:
+    """The period of the same length ending the day before start_date"""
+    prev_end = start_date - timedelta(days=1)
+    return prev_end - (end_date - start_date), prev_end
+
+
+@dataclass(frozen=True)
+class ChartData:
+    """
+    Per-day income and expense totals for a date range
+
+    expenses holds one row per day, category and supplier (amount, count)
+    from the start of the previous period (see previous_period) to end_date,
+    so period-on-period comparisons need no second query. income holds one
+    row per day and income type (amount, tax_deducted, count) within the
+    range. Methods return new frames; the stored ones are shared between
+    reruns and must not be modified.
+    """
+    start_date: date
+    end_date: date
+    expenses: pd.DataFrame
+    income: pd.DataFrame
+
+    def _window(self, frame: pd.DataFrame, start: Optional[date] = None,
+                end: Optional[date] = None) -> pd.DataFrame:
+        start = pd.Timestamp(start or self.start_date)
+        end = pd.Timestamp(end or self.end_date)
+        return frame[(frame['date'] >= start) & (frame['date'] <= end)]
+
+    def expense_rows(self, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+        """Expense rows between two dates (default: the chart range)"""
+        return self._window(self.expenses, start, end)
+
+    # --- Totals ---
+
+    @property
+    def total_income(self) -> float:
+        return float(self.income['amount'].sum())
+
+    @property
+    def income_count(self) -> int:
+        return int(self.income['count'].sum())
+
+    @property
+    def total_expenses(self) -> float:
+        return float(self.expense_rows()['amount'].sum())
+
+    @property
+    def expense_count(self) -> int:
+        return int(self.expense_rows()['count'].sum())
+
+    # --- Shapes ---
+
+    def daily_expenses(self) -> pd.DataFrame:
+        """date, amount and count for each day with expenses"""
+        return self.expense_rows().groupby('date', as_index=False)[['amount', 'count']].sum()
+
+    def expenses_by(self, *columns: str, start: Optional[date] = None,
+                    end: Optional[date] = None) -> pd.DataFrame:
+        """Expense amount summed by the given columns (e.g. 'category', 'supplier')"""
+        return self.expense_rows(start, end).groupby(list(columns), as_index=False)['amount'].sum()
+
+    def income_by_type(self) -> pd.DataFrame:
+        """income_type with summed amount and tax_deducted"""
+        return self.income.groupby('income_type', as_index=False)[['amount', 'tax_deducted']].sum()
+
+    def monthly_totals(self) -> pd.DataFrame:
+        """
+        Income, tax deducted and expenses per calendar month of the range
+
+        Returns:
+            DataFrame with month (first day, as a Timestamp), income, tax and
+            expenses columns, one row per month the range touches, zero-filled
+        """
+        months = pd.period_range(self.start_date, self.end_date, freq='M')
+        income = self.income.groupby(self.income['date'].dt.to_period('M'))[['amount', 'tax_deducted']].sum()
+        expense_rows = self.expense_rows()
+        expenses = expense_rows.groupby(expense_rows['date'].dt.to_period('M'))['amount'].sum()
+
+        totals = pd.DataFrame({
+            'income': income['amount'],
+            'tax': income['tax_deducted'],
+            'expenses': expenses,
+        }).reindex(months, fill_value=0.0).fillna(0.0)
+        totals.index = months.to_timestamp()
+        return totals.rename_axis('month').reset_index()
+
+    def period_expenses(self, granularity: str = 'weekly') -> pd.DataFrame:
+        """
+        Expenses per week (starting Monday) or calendar month
+
+        Periods start on the first Monday / first of the month on or after
+        start_date, as pd.date_range lays them out; days before the first
+        period are not counted.
+
+        Returns:
+            DataFrame with period (Timestamp) and expenses columns
+        """
+        rows = self.expense_rows()
+        if granularity == 'weekly':
+            periods = pd.date_range(self.start_date, self.end_date, freq='W-MON')
+            buckets = rows['date'] - pd.to_timedelta(rows['date'].dt.weekday, unit='D')
+        else:
+            periods = pd.date_range(self.start_date, self.end_date, freq='MS')
+            buckets = rows['date'].dt.to_period('M').dt.start_time
+
+        expenses = rows['amount'].groupby(buckets).sum().reindex(periods, fill_value=0.0)
+        return pd.DataFrame({'period': periods, 'expenses': expenses.to_numpy()})
+
+    def quarterly_totals(self, year: int) -> pd.DataFrame:
+        """
+        Income and expenses per quarter of a tax year (Q1 starts 6 April)
+
+        Args:
+            year: Tax year start year (e.g. 2024 for 2024/25)
+
+        Returns:
+            DataFrame with quarter ('Q1'-'Q4'), income and expenses columns
+        """
+        names = ['Q1', 'Q2', 'Q3', 'Q4']
+        edges = pd.to_datetime([
+            date(year, 4, 6), date(year, 7, 6), date(year, 10, 6), date(year + 1, 1, 6), date(year + 1, 4, 6)
+        ])
+
+        def by_quarter(frame):
+            quarters = pd.cut(frame['date'], bins=edges, right=False, labels=names)
+            return frame['amount'].groupby(quarters, observed=False).sum().reindex(names, fill_value=0.0)
+
+        return pd.DataFrame({
+            'quarter': names,
+            'income': by_quarter(self.income).to_numpy(),
+            'expenses': by_quarter(self.expense_rows()).to_numpy(),
+        })
+
+
+def _frame(rows, columns) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=columns)
+    frame['date'] = pd.to_datetime(frame['date'])
+    for column in ('amount', 'tax_deducted', 'count'):
+        if column in frame:
+            frame[column] = pd.to_numeric(frame[column]).fillna(0)
+    return frame
+
+
+def build_chart_data(session, start_date: date, end_date: date) -> ChartData:
+    """Run the two grouped queries behind a ChartData"""
+    from models import Income, Expense
+
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    lookback_start, _ = previous_period(start_date, end_date)
+
+    expense_rows = session.query(
+        Expense.date,
+        Expense.category,
+        Expense.supplier,
+        func.sum(Expense.amount),
+        func.count(Expense.id)
+    ).filter(
+        Expense.date >= lookback_start,
+        Expense.date <= end_date
+    ).group_by(Expense.date, Expense.category, Expense.supplier).all()
+
+    income_rows = session.query(
+        Income.date,
+        Income.income_type,
+        func.sum(Income.amount_gross),
+        func.sum(Income.tax_deducted),
+        func.count(Income.id)
+    ).filter(
+        Income.date >= start_date,
+        Income.date <= end_date
+    ).group_by(Income.date, Income.income_type).all()
+
+    return ChartData(
+        start_date=start_date,
+        end_date=end_date,
+        expenses=_frame(expense_rows, EXPENSE_COLUMNS),
+        income=_frame(income_rows, INCOME_COLUMNS),
+    )
+
+
+def get_chart_data(session, start_date: Union[date, datetime], end_date: Union[date, datetime]) -> ChartData:
+    """
+    Chart data for a date range, reused until the income or expense tables change
+
+    The last CHART_CACHE_SIZE ranges are kept per database; entries built
+    before a change are dropped with the next rebuild.
+
+    Args:
+        session: SQLAlchemy session
+        start_date: First day of the range
+        end_date: Last day of the range (inclusive)
+
+    Returns:
+        ChartData
+    """
+    engine = session.get_bind()
+    key = (_as_date(start_date), _as_date(end_date))
+    data_version = table_versions(*CHART_TABLES)
+
+    with _lock:
+        cache = _chart_data.get(engine)
+        cached = cache.get(key) if cache is not None else None
+        if cached and cached[0] == data_version:
+            cache.move_to_end(key)
+            return cached[1]
+
+    data = build_chart_data(session, *key)
+    with _lock:
+        cache = _chart_data.setdefault(engine, OrderedDict())
+        for stale in [k for k, (version, _) in cache.items() if version != data_version]:
+            del cache[stale]
+        cache[key] = (data_version, data)
+        cache.move_to_end(key)
+        while len(cache) > CHART_CACHE_SIZE:
+            cache.popitem(last=False)
+    return data
@@ -1,74 +1,94 @@
 """
 Components module for Tax Helper
 Exports all reusable UI components
+
+Names are imported from their submodule on first access, so importing
+one component does not load every other component and its dependencies
 """
 
-# Phase 1: Bulk Operations & Keyboard Shortcuts
-from components.bulk_operations import (
-    render_bulk_toolbar,
-    render_transaction_checkbox,
-    render_select_similar_button,
-    get_selected_count
-)
-
-from components.keyboard_shortcuts import (
-    inject_keyboard_shortcuts,
-    render_keyboard_help_button,
-    render_keyboard_help_overlay,
-    render_keyboard_indicator,
-    handle_keyboard_action
-)
-
-# Phase 2: Search, Progress, Smart Learning
-from components.search_filter import (
-    render_search_bar,
-    render_advanced_filters,
-    clear_all_filters,
-    has_active_filters
-)
-
-from components.progress_widget import (
-    render_progress_widget,
-    render_sidebar_badge,
-    get_completion_percentage,
-    get_unreviewed_count
-)
-
-from components.smart_learning import (
-    render_enhanced_modal,
-    detect_and_prompt_similar,
-    get_learning_enabled
-)
-
-# Phase 3: Receipt Upload
-from components.receipt_upload import (
-    upload_receipt,
-    render_receipt_gallery,
-    render_receipt_indicator,
-    extract_receipts_from_notes,
-    get_receipt_paths,
-    save_receipt,
-    generate_receipt_filename,
-    delete_receipt,
-    view_receipt_fullsize,
-    ensure_receipts_directory
-)
-
-# Phase 4: Confidence Tooltips
-from components.confidence_tooltips import (
-    calculate_confidence_breakdown,
-    render_confidence_tooltip,
-    render_confidence_breakdown_card,
-    render_inline_confidence_indicator,
-    render_confidence_with_breakdown,
-    render_help_modal,
-    render_bulk_confidence_stats,
-    get_confidence_level,
-    get_confidence_explanation,
-    quick_render_badge,
-    quick_render_compact,
-    quick_render_full
-)
+import importlib
+
+# Submodule -> names it exports
+_EXPORTS = {
+    # Phase 1: Bulk Operations & Keyboard Shortcuts
+    'bulk_operations': [
+        'render_bulk_toolbar',
+        'render_transaction_checkbox',
+        'render_select_similar_button',
+        'get_selected_count',
+    ],
+    'keyboard_shortcuts': [
+        'inject_keyboard_shortcuts',
+        'render_keyboard_help_button',
+        'render_keyboard_help_overlay',
+        'render_keyboard_indicator',
+        'handle_keyboard_action',
+    ],
+
+    # Phase 2: Search, Progress, Smart Learning
+    'search_filter': [
+        'render_search_bar',
+        'render_advanced_filters',
+        'clear_all_filters',
+        'has_active_filters',
+    ],
+    'progress_widget': [
+        'render_progress_widget',
+        'render_sidebar_badge',
+        'get_completion_percentage',
+        'get_unreviewed_count',
+    ],
+    'smart_learning': [
+        'render_enhanced_modal',
+        'detect_and_prompt_similar',
+        'get_learning_enabled',
+    ],
+
+    # Phase 3: Receipt Upload
+    'receipt_upload': [
+        'upload_receipt',
+        'render_receipt_gallery',
+        'render_receipt_indicator',
+        'extract_receipts_from_notes',
+        'get_receipt_paths',
+        'save_receipt',
+        'generate_receipt_filename',
+        'delete_receipt',
+        'view_receipt_fullsize',
+        'ensure_receipts_directory',
+    ],
+
+    # Phase 4: Confidence Tooltips
+    'confidence_tooltips': [
+        'calculate_confidence_breakdown',
+        'render_confidence_tooltip',
+        'render_confidence_breakdown_card',
+        'render_inline_confidence_indicator',
+        'render_confidence_with_breakdown',
+        'render_help_modal',
+        'render_bulk_confidence_stats',
+        'get_confidence_level',
+        'get_confidence_explanation',
+        'quick_render_badge',
+        'quick_render_compact',
+        'quick_render_full',
+    ],
+}
+_EXPORT_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_MODULES))
+
 
 __all__ = [
     # Bulk Operations
@@ -6,8 +6,9 @@ Provides undo functionality for single and bulk operations
 Usage:
     from components.audit_trail import log_action, undo_last_action, render_audit_viewer
 
-    # Log an action
+    # Log an action (written with the session's next flush or commit)
     log_action(session, 'UPDATE', 'Transaction', record_id, old_vals, new_vals, 'Updated category')
+    session.commit()
 
     # Undo last action
     success, message = undo_last_action(session)
@@ -19,17 +20,27 @@ Usage:
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import Boolean, String, case, cast, desc, and_, or_, event, func, insert, literal, select
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.orm import Session
 import json
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Sequence, Tuple, List
+from itertools import chain
 
 from models import Transaction, Income, Expense
-from components.export_manager import render_export_panel
 
 
 # Maximum number of actions to keep in undo stack
 MAX_UNDO_STACK = 50
 
+# Old entries are trimmed once every this many writes rather than after each
+# one, so the table briefly holds up to MAX_UNDO_STACK + AUDIT_TRIM_INTERVAL rows
+AUDIT_TRIM_INTERVAL = MAX_UNDO_STACK
+
+# session.info keys: entries waiting to be written, writes since the last trim
+_AUDIT_BUFFER_KEY = 'audit_log_buffer'
+_AUDIT_WRITES_KEY = 'audit_log_writes_since_trim'
+
 
 def init_audit_session_state():
     """Initialize session state variables for audit trail"""
@@ -53,6 +64,11 @@ def log_action(
     """
     Log an action to the audit trail
 
+    The entry is buffered on the session and written, together with any
+    others, inside the caller's transaction the next time the session
+    flushes or commits (or when the audit trail is read). It is discarded
+    if the caller rolls back.
+
     Args:
         session: SQLAlchemy session
         action_type: 'CREATE', 'UPDATE', 'DELETE', 'BULK_UPDATE'
@@ -66,62 +82,214 @@ def log_action(
         bool: True if logged successfully, False otherwise
     """
     try:
-        # Import AuditLog here to avoid circular imports
-        from models import AuditLog
-
         # Convert values to JSON strings
         old_json = json.dumps(old_values, default=str) if old_values else None
         new_json = json.dumps(new_values, default=str) if new_values else None
 
-        # Create audit log entry
-        audit_log = AuditLog(
-            timestamp=datetime.now(),
-            action_type=action_type,
-            record_type=record_type,
-            record_id=record_id,
-            old_values=old_json,
-            new_values=new_json,
-            changes_summary=changes_summary
-        )
-
-        session.add(audit_log)
-        session.commit()
-
-        # Trim old audit logs if exceeding limit
-        _trim_audit_logs(session)
-
+        session.info.setdefault(_AUDIT_BUFFER_KEY, []).append({
+            'timestamp': datetime.now(),
+            'action_type': action_type,
+            'record_type': record_type,
+            'record_id': record_id,
+            'old_values': old_json,
+            'new_values': new_json,
+            'changes_summary': changes_summary
+        })
         return True
 
     except Exception as e:
         print(f"Error logging audit action: {e}")
-        session.rollback()
         return False
 
 
+def flush_audit_log(session) -> int:
+    """
+    Write buffered audit entries in one INSERT within the session's transaction
+
+    Also trims old entries once every AUDIT_TRIM_INTERVAL writes.
+    Does not commit.
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        Number of entries written
+    """
+    entries = session.info.pop(_AUDIT_BUFFER_KEY, None)
+    if not entries:
+        return 0
+
+    # Import AuditLog here to avoid circular imports
+    from models import AuditLog
+
+    session.execute(insert(AuditLog), entries)
+    _count_audit_writes(session, len(entries))
+
+    return len(entries)
+
+
+def _count_audit_writes(session, count: int) -> None:
+    """Trim old entries once every AUDIT_TRIM_INTERVAL writes"""
+    # A session's first write trims, as the table may have grown meanwhile
+    writes = session.info.get(_AUDIT_WRITES_KEY, AUDIT_TRIM_INTERVAL) + count
+    if writes >= AUDIT_TRIM_INTERVAL:
+        _trim_audit_logs(session)
+        writes = 0
+    session.info[_AUDIT_WRITES_KEY] = writes
+
+
+def _json_value(value):
+    """SQL for a value as it appears in log_action's JSON (booleans as true/false)"""
+    if hasattr(value, '__clause_element__'):
+        value = value.__clause_element__()  # a model attribute such as Transaction.reviewed
+    if not isinstance(value, ClauseElement):
+        if value is None or isinstance(value, bool):
+            return func.json(json.dumps(value))
+        return literal(value)
+    if isinstance(value.type, Boolean):
+        return func.json(case((value.is_(None), 'null'), (value == True, 'true'), else_='false'))
+    return value
+
+
+def log_bulk_update(
+    session,
+    model,
+    conditions: Sequence,
+    new_values: Dict[str, Any],
+    changes_summary: str
+) -> int:
+    """
+    Log one BULK_UPDATE entry covering every matching record, with one INSERT ... SELECT
+
+    old_values and new_values map each record's id to the old and new values
+    of the changed fields ({"12": {"reviewed": false}, ...}), built by SQLite
+    from the rows instead of Python loading every record. The whole batch is
+    one entry, so it counts once towards MAX_UNDO_STACK and undo restores it
+    in one step. record_id holds the lowest id in the batch. Call it before
+    the UPDATE, while the rows still hold their old values. Does not commit.
+
+    Args:
+        session: SQLAlchemy session
+        model: Model class of the records, e.g. Transaction
+        conditions: Predicates selecting the records
+        new_values: Field -> new value, either a constant or a SQL
+            expression over the record's columns
+        changes_summary: Human-readable description of the change
+
+    Returns:
+        Number of entries written (0 when no record matches)
+    """
+    from models import AuditLog
+
+    # Entries already buffered are older, so they go first
+    flush_audit_log(session)
+
+    def json_object(values):
+        return func.json_object(*chain.from_iterable(
+            (literal(field), _json_value(value)) for field, value in values.items()
+        ))
+
+    batch = select(
+        func.min(model.id).label('record_id'),
+        func.count().label('records'),
+        func.json_group_object(model.id, json_object(
+            {field: getattr(model, field) for field in new_values}
+        )).label('old_values'),
+        func.json_group_object(model.id, json_object(new_values)).label('new_values'),
+    ).where(*conditions).subquery()
+
+    rows = select(
+        literal(datetime.now(), AuditLog.timestamp.type),
+        literal('BULK_UPDATE'),
+        literal(model.__name__),
+        batch.c.record_id,
+        batch.c.old_values,
+        batch.c.new_values,
+        literal(f'{changes_summary} (') + cast(batch.c.records, String) + literal(' records)'),
+    ).where(batch.c.records > 0)
+
+    result = session.execute(insert(AuditLog).from_select(
+        ['timestamp', 'action_type', 'record_type', 'record_id', 'old_values', 'new_values', 'changes_summary'],
+        rows
+    ))
+    if result.rowcount:
+        _count_audit_writes(session, result.rowcount)
+    return result.rowcount
+
+
+def _is_bulk_entry(values: Dict[str, Any]) -> bool:
+    """True for log_bulk_update's values, keyed by record id rather than field name"""
+    return bool(values) and all(key.isdigit() for key in values)
+
+
+def _restore_values(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Logged field values with date strings converted back to dates"""
+    restored = {}
+    for field, value in values.items():
+        column = model.__table__.columns.get(field)
+        if column is None:
+            continue
+        if str(column.type) == 'DATE' and value:
+            value = datetime.fromisoformat(value).date()
+        restored[field] = value
+    return restored
+
+
+def _undo_bulk_update(session, model, old_values: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Restore every record of a log_bulk_update entry
+
+    Records sharing the same old values are restored with one UPDATE.
+
+    Returns:
+        Number of records restored (records deleted since are skipped)
+    """
+    groups = {}
+    for record_id, values in old_values.items():
+        key = json.dumps(values, sort_keys=True)
+        groups.setdefault(key, []).append(int(record_id))
+
+    restored = 0
+    for key, ids in groups.items():
+        restored += session.query(model).filter(model.id.in_(ids)).update(
+            _restore_values(model, json.loads(key)), synchronize_session='fetch'
+        )
+    return restored
+
+
 def _trim_audit_logs(session):
-    """Keep only the most recent MAX_UNDO_STACK audit logs"""
+    """Keep only the most recent MAX_UNDO_STACK audit logs (the caller commits)"""
     try:
         from models import AuditLog
 
-        # Count total logs
-        total_count = session.query(AuditLog).count()
-
-        if total_count > MAX_UNDO_STACK:
-            # Get the ID of the MAX_UNDO_STACK-th most recent log
-            cutoff_log = session.query(AuditLog).order_by(
-                desc(AuditLog.id)
-            ).offset(MAX_UNDO_STACK).first()
+        # ID of the MAX_UNDO_STACK-th most recent log, read backwards off the primary key
+        cutoff_id = session.query(AuditLog.id).order_by(
+            desc(AuditLog.id)
+        ).offset(MAX_UNDO_STACK).limit(1).scalar()
 
-            if cutoff_log:
-                # Delete all logs older than this
-                session.query(AuditLog).filter(
-                    AuditLog.id < cutoff_log.id
-                ).delete()
-                session.commit()
+        if cutoff_id is not None:
+            # Delete all logs older than this
+            session.query(AuditLog).filter(
+                AuditLog.id < cutoff_id
+            ).delete(synchronize_session=False)
 
     except Exception as e:
         print(f"Error trimming audit logs: {e}")
-        session.rollback()
+
+
+@event.listens_for(Session, 'before_flush')
+def _write_audit_before_flush(session, flush_context, instances):
+    flush_audit_log(session)
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_audit_before_commit(session):
+    flush_audit_log(session)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_audit_on_rollback(session, previous_transaction):
+    session.info.pop(_AUDIT_BUFFER_KEY, None)
 
 
 def get_record_current_values(session, record_type: str, record_id: int) -> Optional[Dict[str, Any]]:
@@ -180,6 +348,8 @@ def undo_last_action(session) -> Tuple[bool, str]:
     try:
         from models import AuditLog
 
+        flush_audit_log(session)
+
         # Get the most recent audit log entry
         last_action = session.query(AuditLog).order_by(
             desc(AuditLog.id)
@@ -210,6 +380,8 @@ def undo_action_by_id(session, audit_log_id: int) -> Tuple[bool, str]:
     try:
         from models import AuditLog
 
+        flush_audit_log(session)
+
         # Get the audit log entry
         audit_log = session.query(AuditLog).filter_by(id=audit_log_id).first()
 
@@ -237,6 +409,12 @@ def undo_action_by_id(session, audit_log_id: int) -> Tuple[bool, str]:
             session.delete(record)
             message = f"Deleted {audit_log.record_type} #{audit_log.record_id}"
 
+        elif audit_log.action_type == 'BULK_UPDATE' and _is_bulk_entry(json.loads(audit_log.old_values or '{}')):
+            # Undo a log_bulk_update batch: restore every record in it
+            old_values = json.loads(audit_log.old_values)
+            restored = _undo_bulk_update(session, model, old_values)
+            message = f"Restored {restored} of {len(old_values)} {audit_log.record_type} records to previous state"
+
         elif audit_log.action_type in ['UPDATE', 'BULK_UPDATE']:
             # Undo UPDATE: Restore old values
             record = session.query(model).filter_by(id=audit_log.record_id).first()
@@ -327,6 +505,8 @@ def get_audit_trail(
     try:
         from models import AuditLog
 
+        flush_audit_log(session)
+
         # Build query
         query = session.query(AuditLog)
 
@@ -549,6 +729,9 @@ def render_audit_viewer(session):
 
                 audit_df = pd.DataFrame(data)
 
+                # Imported here so the export stack loads only when exporting
+                from components.export_manager import render_export_panel
+
                 # Show Aurora-themed export panel in a modal/expander
                 with st.expander("Export Audit Trail", expanded=True):
                     render_export_panel(
@@ -712,6 +895,7 @@ def get_undo_stack_size(session) -> int:
     """
     try:
         from models import AuditLog
+        flush_audit_log(session)
         return session.query(AuditLog).count()
     except Exception as e:
         print(f"Error getting undo stack size: {e}")
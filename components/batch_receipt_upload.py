@@ -26,7 +26,7 @@ from components.export_manager import render_export_panel
 # Import existing components
 try:
     from components.receipt_upload import save_receipt, generate_receipt_filename
-    from components.ocr_receipt import quick_ocr
+    from components.ocr_receipt import quick_ocr, ReceiptOCR, OCR_WORKERS
     from components.merchant_db import find_merchant_match
     from components.audit_trail import log_action
 except ImportError:
@@ -51,6 +51,9 @@ except ImportError:
     def log_action(session, action_type, details):
         pass
 
+    ReceiptOCR = None
+    OCR_WORKERS = 1
+
 
 # Constants
 MAX_FILES = 20
@@ -275,12 +278,15 @@ def render_file_preview_list(files, total_size: float):
         st.caption(f"{len(files)}/{MAX_FILES} files")
 
 
-def process_single_receipt(file, filename: str, session=None) -> Dict[str, Any]:
+def ocr_result(filename: str, ocr_data, processing_time: float = 0) -> Dict[str, Any]:
     """
-    Process a single receipt with OCR
+    Result dictionary for one receipt
 
-    Returns:
-        Result dictionary with OCR data and status
+    Args:
+        filename: Uploaded file name
+        ocr_data: ReceiptData from components.ocr_receipt, or an OCR dict
+            with merchant, date, total and confidence
+        processing_time: Seconds spent on the receipt
     """
     result = {
         'filename': filename,
@@ -288,9 +294,41 @@ def process_single_receipt(file, filename: str, session=None) -> Dict[str, Any]:
         'data': None,
         'error': None,
         'confidence': 0,
-        'processing_time': 0
+        'processing_time': processing_time
     }
 
+    if ocr_data is not None and hasattr(ocr_data, 'raw_text'):
+        if ocr_data.raw_text.startswith('ERROR:'):
+            result['status'] = 'failed'
+            result['error'] = ocr_data.raw_text[len('ERROR:'):].strip()
+            return result
+        scores = ocr_data.confidence or {}
+        ocr_data = {
+            'merchant': ocr_data.merchant,
+            'date': ocr_data.date.isoformat() if ocr_data.date else None,
+            'total': ocr_data.amount,
+            'confidence': int(sum(scores.values()) / len(scores)) if scores else 0,
+        }
+
+    # Check if OCR was successful
+    if ocr_data and 'merchant' in ocr_data:
+        result['status'] = 'success'
+        result['data'] = ocr_data
+        result['confidence'] = ocr_data.get('confidence', 0)
+    else:
+        result['status'] = 'failed'
+        result['error'] = 'OCR extraction failed'
+
+    return result
+
+
+def process_single_receipt(file, filename: str, session=None) -> Dict[str, Any]:
+    """
+    Process a single receipt with OCR
+
+    Returns:
+        Result dictionary with OCR data and status
+    """
     start_time = time.time()
 
     try:
@@ -307,17 +345,10 @@ def process_single_receipt(file, filename: str, session=None) -> Dict[str, Any]:
         if os.path.exists(temp_path):
             os.remove(temp_path)
 
-        # Check if OCR was successful
-        if ocr_data and 'merchant' in ocr_data:
-            result['status'] = 'success'
-            result['data'] = ocr_data
-            result['confidence'] = ocr_data.get('confidence', 0)
-        else:
-            result['status'] = 'failed'
-            result['error'] = 'OCR extraction failed'
+        result = ocr_result(filename, ocr_data)
 
     except Exception as e:
-        result['status'] = 'failed'
+        result = ocr_result(filename, None)
         result['error'] = str(e)
 
     result['processing_time'] = time.time() - start_time
@@ -325,14 +356,19 @@ def process_single_receipt(file, filename: str, session=None) -> Dict[str, Any]:
     return result
 
 
-def batch_process_receipts(files, progress_placeholder, session=None):
+def batch_process_receipts(files, progress_placeholder, session=None, workers: Optional[int] = None):
     """
     Process multiple receipts with progress tracking
 
+    Receipts are read into memory and shared among OCR worker processes
+    (one per core by default); progress is rendered here as each finishes.
+    Cancelling stops receipts that have not started yet.
+
     Args:
         files: List of uploaded files
         progress_placeholder: Streamlit placeholder for progress UI
         session: Database session (optional)
+        workers: OCR worker processes (default: one per core)
 
     Returns:
         List of result dictionaries
@@ -340,6 +376,62 @@ def batch_process_receipts(files, progress_placeholder, session=None):
     results = []
     total = len(files)
 
+    if ReceiptOCR is None or total == 0:
+        return _process_receipts_sequentially(files, progress_placeholder, session)
+
+    if st.session_state.batch_processing_cancelled:
+        return results
+
+    try:
+        ocr = ReceiptOCR()
+    except RuntimeError as e:
+        for file in files:
+            result = ocr_result(file.name, None)
+            result['error'] = str(e)
+            results.append(result)
+        return results
+
+    workers = min(workers or OCR_WORKERS, total)
+    waiting = list(range(total))
+    positions = []
+    render_processing_progress(1, total, files[0].name, results, progress_placeholder, processing=workers)
+
+    last_finished = time.time()
+    batch = ocr.iter_batch([file.getvalue() for file in files], workers)
+    try:
+        for index, receipt in batch:
+            # Time between completions, so averages reflect the pool's throughput
+            now = time.time()
+            results.append(ocr_result(files[index].name, receipt, now - last_finished))
+            positions.append(index)
+            last_finished = now
+            waiting.remove(index)
+
+            # Update session state
+            current = len(results)
+            st.session_state.batch_upload_progress = (current / total) * 100
+            st.session_state.batch_upload_results = results
+
+            # Check if cancelled
+            if st.session_state.batch_processing_cancelled or not waiting:
+                break
+
+            render_processing_progress(current + 1, total, files[waiting[0]].name, results, progress_placeholder,
+                                       processing=workers)
+    finally:
+        batch.close()
+
+    # Back in upload order for review
+    results = [result for _, result in sorted(zip(positions, results), key=lambda pair: pair[0])]
+    st.session_state.batch_upload_results = results
+    return results
+
+
+def _process_receipts_sequentially(files, progress_placeholder, session=None):
+    """One receipt after another (used when the OCR module is unavailable)"""
+    results = []
+    total = len(files)
+
     for idx, file in enumerate(files):
         # Check if cancelled
         if st.session_state.batch_processing_cancelled:
@@ -367,8 +459,9 @@ def batch_process_receipts(files, progress_placeholder, session=None):
     return results
 
 
-def render_processing_progress(current: int, total: int, current_file: str, results: List, placeholder):
-    """Render real-time processing progress"""
+def render_processing_progress(current: int, total: int, current_file: str, results: List, placeholder,
+                               processing: int = 1):
+    """Render real-time processing progress (processing: receipts being worked on at once)"""
     with placeholder.container():
         st.markdown("### ⚙️ Processing Receipts...")
 
@@ -381,7 +474,7 @@ def render_processing_progress(current: int, total: int, current_file: str, resu
 
         completed = len([r for r in results if r['status'] == 'success'])
         failed = len([r for r in results if r['status'] == 'failed'])
-        processing = 1 if current <= total else 0
+        processing = min(processing, total - current + 1) if current <= total else 0
         pending = total - current + 1
 
         with col1:
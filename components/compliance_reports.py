@@ -22,14 +22,13 @@ from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
 
 import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case, cast, String
 
 from models import (
-    Transaction, AuditLog, TransactionType
+    Transaction, Expense, AuditLog, TransactionType
 )
 
 
@@ -1120,6 +1119,9 @@ def generate_excel_workbook(
     """
     Generate comprehensive Excel workbook with multiple sheets.
 
+    Rows are streamed from the database into write-only sheets
+    (see excel_export.py), so large tax years use bounded memory.
+
     Sheets:
     1. Summary
     2. Income
@@ -1128,256 +1130,157 @@ def generate_excel_workbook(
     5. Audit Trail
     6. Receipts
     """
+    from excel_export import StreamingWorkbook
+
     tax_year_str = f"{tax_year_start.year}/{str(tax_year_end.year)[2:]}"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = REPORTS_DIR / f"complete_workbook_{tax_year_str.replace('/', '_')}_{timestamp}.xlsx"
 
-    wb = openpyxl.Workbook()
+    # Transaction and expense dates are plain dates: compare against dates,
+    # or entries dated on the first day would fall outside a midnight bound
+    start_date = tax_year_start.date() if isinstance(tax_year_start, datetime) else tax_year_start
+    end_date = tax_year_end.date() if isinstance(tax_year_end, datetime) else tax_year_end
+    in_year = and_(Transaction.date >= start_date, Transaction.date <= end_date)
 
-    # Get all data
-    transactions = session.query(Transaction).filter(
-        and_(
-            Transaction.date >= tax_year_start,
-            Transaction.date <= tax_year_end
-        )
-    ).order_by(Transaction.date.desc()).all()
-
-    audit_logs = session.query(AuditLog).filter(
-        and_(
-            AuditLog.timestamp >= tax_year_start,
-            AuditLog.timestamp <= tax_year_end
-        )
-    ).order_by(AuditLog.timestamp.desc()).all()
+    book = StreamingWorkbook()
 
     # Sheet 1: Summary
-    ws_summary = wb.active
-    ws_summary.title = "Summary"
-    _create_summary_sheet(ws_summary, transactions, tax_year_str)
+    _create_summary_sheet(book, session, in_year, tax_year_str)
 
     # Sheet 2: Income
-    ws_income = wb.create_sheet("Income")
-    income_trans = [t for t in transactions if t.type == TransactionType.INCOME]
-    _create_transactions_sheet(ws_income, income_trans, "Income")
+    _create_transactions_sheet(book, session, and_(in_year, Transaction.guessed_type == 'Income'), "Income")
 
     # Sheet 3: Expenses by Category
-    ws_expenses = wb.create_sheet("Expenses by Category")
-    expense_trans = [t for t in transactions if t.type == TransactionType.EXPENSE]
-    _create_expenses_by_category_sheet(ws_expenses, expense_trans)
+    _create_expenses_by_category_sheet(book, session, and_(in_year, Transaction.guessed_type == 'Expense'))
 
     # Sheet 4: All Transactions
-    ws_all = wb.create_sheet("All Transactions")
-    _create_transactions_sheet(ws_all, transactions, "All Transactions")
+    _create_transactions_sheet(book, session, in_year, "All Transactions")
 
     # Sheet 5: Audit Trail
-    ws_audit = wb.create_sheet("Audit Trail")
-    _format_excel_audit_log_sheet(ws_audit, audit_logs)
+    _create_audit_trail_sheet(book, session, tax_year_start, tax_year_end)
 
     # Sheet 6: Receipts
-    ws_receipts = wb.create_sheet("Receipts")
-    _create_receipts_sheet(ws_receipts, transactions)
+    _create_receipts_sheet(book, session, start_date, end_date)
 
-    wb.save(filename)
+    book.save(filename)
     return str(filename)
 
 
-def _create_summary_sheet(ws, transactions, tax_year_str):
+def _create_summary_sheet(book, session, in_year, tax_year_str):
     """Create summary sheet in Excel workbook."""
-    # Title
-    ws.merge_cells('A1:B1')
-    ws['A1'] = f"Tax Summary - {tax_year_str}"
-    ws['A1'].font = Font(size=16, bold=True)
-    ws['A1'].alignment = Alignment(horizontal='center')
-
-    ws.append([])  # Blank row
-
-    # Calculate totals
-    income = sum(t.amount for t in transactions if t.type == TransactionType.INCOME)
-    expenses = sum(abs(t.amount) for t in transactions if t.type == TransactionType.EXPENSE)
-    net = income - expenses
-
-    income_count = sum(1 for t in transactions if t.type == TransactionType.INCOME)
-    expense_count = sum(1 for t in transactions if t.type == TransactionType.EXPENSE)
-
-    # Summary data
-    ws.append(['Metric', 'Value'])
-    ws.append(['Total Income', income])
-    ws.append(['Total Expenses', expenses])
-    ws.append(['Net Profit/Loss', net])
-    ws.append([])
-    ws.append(['Income Transactions', income_count])
-    ws.append(['Expense Transactions', expense_count])
-    ws.append(['Total Transactions', len(transactions)])
-
-    # Format
-    header_fill = PatternFill(start_color="3498db", end_color="3498db", fill_type="solid")
-    ws['A3'].fill = header_fill
-    ws['B3'].fill = header_fill
-    ws['A3'].font = Font(bold=True, color="FFFFFF")
-    ws['B3'].font = Font(bold=True, color="FFFFFF")
-
-    # Currency formatting
-    for row in [4, 5, 6]:
-        ws[f'B{row}'].number_format = '£#,##0.00'
-
-    # Number formatting
-    for row in [8, 9, 10]:
-        ws[f'B{row}'].number_format = '0'
-
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 20
-
-
-def _create_transactions_sheet(ws, transactions, title):
+    is_income = Transaction.guessed_type == 'Income'
+    is_expense = Transaction.guessed_type == 'Expense'
+
+    income, expenses, income_count, expense_count, total_count = session.query(
+        func.coalesce(func.sum(case((is_income, Transaction.paid_in), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((is_expense, Transaction.paid_out), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((is_income, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((is_expense, 1), else_=0)), 0),
+        func.count(Transaction.id),
+    ).filter(in_year).one()
+
+    worksheet = book.create_sheet("Summary", widths=[25, 20])
+    book.write_top(worksheet, heading=f"Tax Summary - {tax_year_str}", headers=['Metric', 'Value'],
+                   header_color="3498db")
+    book.write_rows(worksheet, [
+        ['Total Income', income],
+        ['Total Expenses', expenses],
+        ['Net Profit/Loss', income - expenses],
+    ], number_formats={2: '£#,##0.00'})
+    book.write_rows(worksheet, [
+        [],
+        ['Income Transactions', income_count],
+        ['Expense Transactions', expense_count],
+        ['Total Transactions', total_count],
+    ])
+
+
+def _create_transactions_sheet(book, session, condition, title):
     """Create transactions sheet in Excel workbook."""
-    ws.append([title])
-    ws.merge_cells(f'A1:{get_column_letter(8)}1')
-    ws['A1'].font = Font(size=14, bold=True)
-    ws['A1'].alignment = Alignment(horizontal='center')
-
-    ws.append([])
-
-    # Headers
-    headers = ['Date', 'Merchant', 'Description', 'Amount', 'Type', 'Category', 'Confidence', 'Method']
-    ws.append(headers)
-
-    # Style headers
-    header_fill = PatternFill(start_color="16a085", end_color="16a085", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
-
-    for col_num in range(1, len(headers) + 1):
-        cell = ws.cell(row=3, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-
-    # Data
-    for trans in transactions:
-        ws.append([
-            trans.date.strftime('%d/%m/%Y'),
-            trans.merchant or '',
-            trans.description or '',
-            trans.amount,
-            trans.type.value if trans.type else '',
-            trans.category or '',
-            trans.confidence_score or 0,
-            trans.categorization_method or ''
-        ])
-
-    # Format amount column
-    for row in range(4, len(transactions) + 4):
-        ws.cell(row=row, column=4).number_format = '£#,##0.00'
-        ws.cell(row=row, column=7).number_format = '0"%"'
-
-    # Column widths
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 35
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 10
-    ws.column_dimensions['F'].width = 20
-    ws.column_dimensions['G'].width = 12
-    ws.column_dimensions['H'].width = 18
+    from excel_export import stream_query
+
+    rows = stream_query(session.query(
+        func.strftime('%d/%m/%Y', Transaction.date),
+        func.coalesce(Transaction.description_normalized, ''),
+        func.coalesce(Transaction.description, ''),
+        func.coalesce(Transaction.paid_in, 0.0) - func.coalesce(Transaction.paid_out, 0.0),
+        func.coalesce(Transaction.guessed_type, ''),
+        func.coalesce(Transaction.guessed_category, ''),
+        func.coalesce(Transaction.confidence_score, 0),
+        case((Transaction.reviewed == True, 'Yes'), else_='No'),
+    ).filter(condition).order_by(Transaction.date.desc(), Transaction.id.desc()))
+
+    book.add_sheet(
+        title, rows,
+        headers=['Date', 'Merchant', 'Description', 'Amount', 'Type', 'Category', 'Confidence', 'Reviewed'],
+        heading=title,
+        widths=[12, 25, 35, 12, 10, 20, 12, 18],
+        number_formats={4: '£#,##0.00', 7: '0"%"'},
+        header_color="16a085"
+    )
 
 
-def _create_expenses_by_category_sheet(ws, expenses):
+def _create_expenses_by_category_sheet(book, session, condition):
     """Create expenses by category sheet."""
-    ws.append(['Expenses by Category'])
-    ws.merge_cells('A1:C1')
-    ws['A1'].font = Font(size=14, bold=True)
-    ws['A1'].alignment = Alignment(horizontal='center')
-
-    ws.append([])
-
-    # Group by category
-    category_totals = {}
-    category_counts = {}
+    category = func.coalesce(func.nullif(Transaction.guessed_category, ''), 'Uncategorized')
+    category_rows = session.query(
+        category, func.count(Transaction.id), func.sum(func.abs(func.coalesce(Transaction.paid_out, 0.0)))
+    ).filter(condition).group_by(category).order_by(category).all()
 
-    for expense in expenses:
-        cat = expense.category or "Uncategorized"
-        category_totals[cat] = category_totals.get(cat, 0) + abs(expense.amount)
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-
-    # Headers
-    ws.append(['Category', 'Count', 'Total'])
-
-    header_fill = PatternFill(start_color="e67e22", end_color="e67e22", fill_type="solid")
-    for col in range(1, 4):
-        cell = ws.cell(row=3, column=col)
-        cell.fill = header_fill
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.alignment = Alignment(horizontal='center')
-
-    # Data
-    for category in sorted(category_totals.keys()):
-        ws.append([
-            category,
-            category_counts[category],
-            category_totals[category]
-        ])
-
-    # Format
+    # Data starts below the heading, blank row and headers
     start_row = 4
-    end_row = start_row + len(category_totals) - 1
-
-    for row in range(start_row, end_row + 1):
-        ws.cell(row=row, column=2).number_format = '0'
-        ws.cell(row=row, column=3).number_format = '£#,##0.00'
-
-    # Total row
-    ws.append([])
-    total_row = end_row + 2
-    ws[f'A{total_row}'] = 'TOTAL'
-    ws[f'A{total_row}'].font = Font(bold=True)
-    ws[f'B{total_row}'] = f'=SUM(B{start_row}:B{end_row})'
-    ws[f'C{total_row}'] = f'=SUM(C{start_row}:C{end_row})'
-    ws[f'C{total_row}'].number_format = '£#,##0.00'
-
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 12
-    ws.column_dimensions['C'].width = 15
-
-
-def _create_receipts_sheet(ws, transactions):
+    end_row = start_row + len(category_rows) - 1
+    rows = [list(row) for row in category_rows]
+    rows.append([])
+    rows.append(['TOTAL', f'=SUM(B{start_row}:B{end_row})', f'=SUM(C{start_row}:C{end_row})'])
+
+    book.add_sheet("Expenses by Category", rows, headers=['Category', 'Count', 'Total'],
+                   heading='Expenses by Category', widths=[25, 12, 15],
+                   number_formats={3: '£#,##0.00'}, header_color="e67e22")
+
+
+def _create_audit_trail_sheet(book, session, tax_year_start, tax_year_end):
+    """Create audit trail sheet."""
+    from excel_export import stream_query
+
+    rows = stream_query(session.query(
+        func.strftime('%Y-%m-%d %H:%M:%S', AuditLog.timestamp),
+        AuditLog.record_type + ' #' + cast(AuditLog.record_id, String),
+        AuditLog.action_type,
+        func.coalesce(AuditLog.old_values, ''),
+        func.coalesce(AuditLog.new_values, ''),
+        func.coalesce(AuditLog.changes_summary, ''),
+    ).filter(
+        AuditLog.timestamp >= tax_year_start,
+        AuditLog.timestamp <= tax_year_end
+    ).order_by(AuditLog.timestamp.desc()))
+
+    book.add_sheet("Audit Trail", rows,
+                   headers=['Timestamp', 'Record', 'Action', 'Before Value', 'After Value', 'Change Summary'],
+                   widths=[20, 15, 12, 30, 30, 40], header_color="16a085")
+
+
+def _create_receipts_sheet(book, session, start_date, end_date):
     """Create receipts sheet."""
-    ws.append(['Receipts'])
-    ws.merge_cells('A1:E1')
-    ws['A1'].font = Font(size=14, bold=True)
-    ws['A1'].alignment = Alignment(horizontal='center')
-
-    ws.append([])
-
-    # Headers
-    headers = ['Date', 'Merchant', 'Amount', 'Category', 'Receipt File']
-    ws.append(headers)
-
-    header_fill = PatternFill(start_color="9b59b6", end_color="9b59b6", fill_type="solid")
-    for col_num in range(1, len(headers) + 1):
-        cell = ws.cell(row=3, column=col_num)
-        cell.fill = header_fill
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.alignment = Alignment(horizontal='center')
-
-    # Data
-    for trans in transactions:
-        if trans.receipts:
-            for receipt in trans.receipts:
-                ws.append([
-                    trans.date.strftime('%d/%m/%Y'),
-                    trans.merchant or '',
-                    abs(trans.amount),
-                    trans.category or '',
-                    Path(receipt.file_path).name if receipt.file_path else ''
-                ])
-
-    # Format
-    for row in range(4, ws.max_row + 1):
-        ws.cell(row=row, column=3).number_format = '£#,##0.00'
-
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 35
+    from excel_export import stream_query
+
+    rows = stream_query(session.query(
+        func.strftime('%d/%m/%Y', Expense.date),
+        Expense.supplier,
+        func.abs(Expense.amount),
+        func.coalesce(Expense.category, ''),
+        Expense.receipt_link,
+    ).filter(
+        Expense.date >= start_date,
+        Expense.date <= end_date,
+        Expense.receipt_link != None,
+        Expense.receipt_link != ''
+    ).order_by(Expense.date.desc(), Expense.id.desc()))
+
+    book.add_sheet("Receipts", (row[:4] + (Path(row[4]).name,) for row in rows),
+                   headers=['Date', 'Merchant', 'Amount', 'Category', 'Receipt File'],
+                   heading='Receipts', widths=[12, 25, 12, 20, 35],
+                   number_formats={3: '£#,##0.00'}, header_color="9b59b6")
 
 
 def _format_excel_summary_sheet(
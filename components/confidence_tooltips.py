@@ -26,6 +26,8 @@ import streamlit as st
 from typing import Dict, Optional
 import re
 
+from text_normalizer import merchant_search_key
+
 
 def calculate_confidence_breakdown(transaction, session) -> Dict:
     """
@@ -198,11 +200,7 @@ def calculate_pattern_learning_score(transaction, session) -> Dict:
     from models import Transaction
 
     # Extract merchant name
-    desc = transaction.description
-    cleaned = re.sub(r'\d{4}\s*\w{3}\d{2}', '', desc)  # Remove dates
-    cleaned = re.sub(r'\d{2}/\d{2}/\d{2,4}', '', cleaned)
-    cleaned = re.sub(r',.*', '', cleaned).strip()
-    merchant_key = cleaned[:30] if len(cleaned) >= 10 else cleaned
+    merchant_key = merchant_search_key(transaction.description)
 
     if not merchant_key or len(merchant_key) < 3:
         return {
@@ -270,11 +268,7 @@ def calculate_amount_consistency_score(transaction, session) -> Dict:
     from models import Transaction
 
     # Extract merchant name
-    desc = transaction.description
-    cleaned = re.sub(r'\d{4}\s*\w{3}\d{2}', '', desc)
-    cleaned = re.sub(r'\d{2}/\d{2}/\d{2,4}', '', cleaned)
-    cleaned = re.sub(r',.*', '', cleaned).strip()
-    merchant_key = cleaned[:30] if len(cleaned) >= 10 else cleaned
+    merchant_key = merchant_search_key(transaction.description)
 
     if not merchant_key or len(merchant_key) < 3:
         return {
@@ -7,10 +7,12 @@ import streamlit as st
 from sqlalchemy import Column, Integer, String, Boolean, JSON, func
 from sqlalchemy.orm import Session
 from difflib import SequenceMatcher
-import re
+import numpy as np
 from typing import List, Dict, Optional, Tuple
 import json
 
+from text_normalizer import normalize_merchant_name
+
 
 # ============================================================================
 # MERCHANT DATABASE MODEL (Add to models.py)
@@ -1541,15 +1543,7 @@ MERCHANT_DATA = [
 
 def normalize_string(text: str) -> str:
     """Normalize string for matching: uppercase, remove special chars"""
-    if not text:
-        return ""
-    # Remove common payment-related suffixes
-    text = re.sub(r'\s+(LTD|LIMITED|PLC|UK|STORES|STORE)$', '', text.upper())
-    # Remove special characters except spaces
-    text = re.sub(r'[^A-Z0-9\s]', '', text.upper())
-    # Collapse multiple spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return normalize_merchant_name(text)
 
 
 def fuzzy_match_score(str1: str, str2: str) -> float:
@@ -1560,102 +1554,280 @@ def fuzzy_match_score(str1: str, str2: str) -> float:
     return SequenceMatcher(None, str1, str2).ratio() * 100
 
 
-def find_merchant_match(description: str, confidence_threshold: float = 60.0) -> Optional[Dict]:
-    """
-    Find best merchant match from description using fuzzy matching
+# Alphabet produced by normalize_string (A-Z, 0-9 and space)
+_NORMALIZED_ALPHABET = {char: i for i, char in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ')}
 
-    Args:
-        description: Transaction description
-        confidence_threshold: Minimum confidence score (default 60%)
+# Slack for float rounding when comparing upper bounds with exact scores
+_BOUND_EPSILON = 1e-6
 
-    Returns:
-        Dict with merchant data and match confidence, or None if no match
-    """
-    if not description:
-        return None
 
-    normalized_desc = normalize_string(description)
-    best_match = None
-    best_score = 0.0
-
-    for merchant in MERCHANT_DATA:
-        # Check main name
-        merchant_name = normalize_string(merchant["name"])
-        score = fuzzy_match_score(normalized_desc, merchant_name)
+class MerchantIndex:
+    """
+    Prebuilt index over MERCHANT_DATA for fast merchant matching
+
+    Names and aliases are normalized once. A character n-gram inverted index
+    finds every name/alias that can be a substring of a description, and a
+    per-entry character count matrix gives an upper bound on the difflib
+    score (the SequenceMatcher.quick_ratio bound) for all entries at once.
+    Only merchants whose bound can still win are scored with
+    SequenceMatcher, so results are identical to a full scan.
+
+    Usage:
+        index = get_merchant_index()
+        match = index.find_match("TESCO STORES 2341")
+        matches = index.match_many(df['description'])
+    """
 
-        # Check if merchant name appears in description
-        if merchant_name in normalized_desc:
+    NGRAM_SIZE = 3
+
+    def __init__(self, merchants: List[Dict] = None):
+        self.merchants = list(MERCHANT_DATA if merchants is None else merchants)
+
+        # One entry per merchant name and alias, grouped by merchant in order
+        entries = []
+        owners = []
+        self._merchant_entries: List[List[str]] = []
+        for position, merchant in enumerate(self.merchants):
+            normalized = [normalize_string(merchant["name"])]
+            normalized.extend(normalize_string(alias) for alias in merchant.get("aliases", []))
+            self._merchant_entries.append(normalized)
+            entries.extend(normalized)
+            owners.extend([position] * len(normalized))
+
+        self._entries = entries
+        self._entry_owner = np.array(owners, dtype=np.int64)
+        self._entry_lengths = np.array([len(entry) for entry in entries], dtype=np.int64)
+        self._merchant_starts = np.array(
+            [0] + list(np.cumsum([len(e) for e in self._merchant_entries])[:-1]),
+            dtype=np.int64
+        ) if self.merchants else np.array([], dtype=np.int64)
+        self._boosts = np.array([m.get("confidence_boost", 0) for m in self.merchants], dtype=float)
+
+        self._char_counts = np.zeros((len(entries), len(_NORMALIZED_ALPHABET)), dtype=np.int32)
+        for row, entry in enumerate(entries):
+            self._char_counts[row] = self._count_chars(entry)
+
+        # n-gram -> entry rows containing it; short entries are checked directly
+        self._ngram_postings: Dict[str, List[int]] = {}
+        self._entry_ngram_totals = np.zeros(len(entries), dtype=np.int64)
+        self._short_entries: List[int] = []
+        for row, entry in enumerate(entries):
+            grams = self._ngrams(entry)
+            if not grams:
+                self._short_entries.append(row)
+                continue
+            self._entry_ngram_totals[row] = len(grams)
+            for gram in grams:
+                self._ngram_postings.setdefault(gram, []).append(row)
+
+    def _ngrams(self, text: str) -> set:
+        n = self.NGRAM_SIZE
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    @staticmethod
+    def _count_chars(text: str) -> np.ndarray:
+        counts = np.zeros(len(_NORMALIZED_ALPHABET), dtype=np.int32)
+        for char in text:
+            slot = _NORMALIZED_ALPHABET.get(char)
+            if slot is not None:
+                counts[slot] += 1
+        return counts
+
+    def _substring_entries(self, normalized_desc: str) -> np.ndarray:
+        """Boolean mask of entries that appear verbatim in the description"""
+        mask = np.zeros(len(self._entries), dtype=bool)
+
+        hits = [self._ngram_postings[gram] for gram in self._ngrams(normalized_desc)
+                if gram in self._ngram_postings]
+        if hits:
+            counts = np.bincount(np.concatenate(hits), minlength=len(self._entries))
+            for row in np.flatnonzero((counts == self._entry_ngram_totals) & (counts > 0)):
+                mask[row] = self._entries[row] in normalized_desc
+
+        for row in self._short_entries:
+            mask[row] = self._entries[row] in normalized_desc
+
+        return mask
+
+    def substring_matches(self, description: str) -> List[Tuple[int, str]]:
+        """
+        Every name/alias contained in the description
+
+        Returns:
+            List of (merchant position, normalized name or alias), in index order
+        """
+        normalized_desc = normalize_string(description)
+        rows = np.flatnonzero(self._substring_entries(normalized_desc))
+        return [(int(self._entry_owner[row]), self._entries[row]) for row in rows]
+
+    def _score_bounds(self, normalized_desc: str) -> np.ndarray:
+        """Upper bound of each merchant's raw score (before confidence boost)"""
+        if not self.merchants:
+            return np.array([], dtype=float)
+
+        shared = np.minimum(self._char_counts, self._count_chars(normalized_desc)).sum(axis=1)
+        total = self._entry_lengths + len(normalized_desc)
+        bounds = np.where(total > 0, 200.0 * shared / np.maximum(total, 1), 100.0)
+        bounds = np.where(self._substring_entries(normalized_desc), np.maximum(bounds, 90.0), bounds)
+
+        return np.maximum.reduceat(bounds, self._merchant_starts) + _BOUND_EPSILON
+
+    def _score(self, normalized_desc: str, position: int) -> float:
+        """Exact raw score for one merchant, as computed by a full scan"""
+        names = self._merchant_entries[position]
+
+        score = fuzzy_match_score(normalized_desc, names[0])
+        if names[0] in normalized_desc:
             score = max(score, 90.0)  # High score for substring match
 
-        # Check aliases
-        for alias in merchant.get("aliases", []):
-            alias_normalized = normalize_string(alias)
+        for alias_normalized in names[1:]:
             alias_score = fuzzy_match_score(normalized_desc, alias_normalized)
-
             if alias_normalized in normalized_desc:
                 alias_score = max(alias_score, 90.0)
-
             score = max(score, alias_score)
 
-        # Add confidence boost if score meets threshold
-        if score >= confidence_threshold:
-            adjusted_score = min(100.0, score + merchant.get("confidence_boost", 0))
+        return score
 
-            if adjusted_score > best_score:
-                best_score = adjusted_score
-                best_match = {
-                    **merchant,
-                    "match_confidence": round(adjusted_score, 1),
-                    "original_score": round(score, 1)
-                }
+    def _result(self, position: int, score: float) -> Dict:
+        merchant = self.merchants[position]
+        adjusted_score = min(100.0, score + merchant.get("confidence_boost", 0))
+        return {
+            **merchant,
+            "match_confidence": round(adjusted_score, 1),
+            "original_score": round(score, 1)
+        }
 
-    return best_match if best_score >= confidence_threshold else None
+    def find_match(self, description: str, confidence_threshold: float = 60.0) -> Optional[Dict]:
+        """Best merchant match for a description (see find_merchant_match)"""
+        if not description:
+            return None
 
+        normalized_desc = normalize_string(description)
+        bounds = self._score_bounds(normalized_desc)
+        adjusted_bounds = np.minimum(100.0, bounds + self._boosts)
 
-def get_merchant_suggestions(description: str, top_n: int = 3) -> List[Dict]:
+        # Highest bound first; earlier merchants win ties, as in a full scan
+        candidates = [p for p in np.argsort(-adjusted_bounds, kind='stable')
+                      if bounds[p] >= confidence_threshold]
+
+        best_position = None
+        best_score = 0.0
+        best_adjusted = 0.0
+
+        for position in candidates:
+            if best_position is not None and adjusted_bounds[position] < best_adjusted:
+                break
+
+            score = self._score(normalized_desc, position)
+            if score < confidence_threshold:
+                continue
+
+            adjusted_score = min(100.0, score + self.merchants[position].get("confidence_boost", 0))
+            if adjusted_score > best_adjusted or (
+                best_position is not None and adjusted_score == best_adjusted and position < best_position
+            ):
+                best_position, best_score, best_adjusted = position, score, adjusted_score
+
+        if best_position is None or best_adjusted < confidence_threshold:
+            return None
+        return self._result(best_position, best_score)
+
+    def suggestions(self, description: str, top_n: int = 3) -> List[Dict]:
+        """Top N merchants by confidence (see get_merchant_suggestions)"""
+        if not description:
+            return []
+
+        normalized_desc = normalize_string(description)
+
+        if top_n <= 0:
+            matches = [self._result(p, self._score(normalized_desc, p)) for p in range(len(self.merchants))]
+            matches.sort(key=lambda x: x["match_confidence"], reverse=True)
+            return matches[:top_n]
+
+        adjusted_bounds = np.minimum(100.0, self._score_bounds(normalized_desc) + self._boosts)
+
+        scored = []
+        for position in np.argsort(-adjusted_bounds, kind='stable'):
+            if len(scored) >= top_n:
+                nth_best = sorted((m["match_confidence"] for _, m in scored), reverse=True)[top_n - 1]
+                if round(adjusted_bounds[position], 1) < nth_best:
+                    break
+            scored.append((position, self._result(position, self._score(normalized_desc, position))))
+
+        # Same order as a stable sort over every merchant
+        scored.sort(key=lambda item: (-item[1]["match_confidence"], item[0]))
+        return [match for _, match in scored[:top_n]]
+
+    def match_many(self, descriptions, confidence_threshold: float = 60.0) -> List[Optional[Dict]]:
+        """
+        Match a whole import at once
+
+        Each distinct description is matched once.
+
+        Returns:
+            List of find_match results, aligned with descriptions
+        """
+        cache = {}
+        results = []
+        for description in descriptions:
+            if description not in cache:
+                cache[description] = self.find_match(description, confidence_threshold)
+            match = cache[description]
+            results.append(dict(match) if match else None)
+        return results
+
+
+_merchant_index: Optional[MerchantIndex] = None
+
+
+def get_merchant_index() -> MerchantIndex:
+    """Shared MerchantIndex over MERCHANT_DATA, built on first use"""
+    global _merchant_index
+    if _merchant_index is None:
+        _merchant_index = MerchantIndex()
+    return _merchant_index
+
+
+def find_merchant_match(description: str, confidence_threshold: float = 60.0) -> Optional[Dict]:
     """
-    Get top N merchant suggestions for a description
+    Find best merchant match from description using fuzzy matching
 
     Args:
         description: Transaction description
-        top_n: Number of suggestions to return
+        confidence_threshold: Minimum confidence score (default 60%)
 
     Returns:
-        List of merchant matches sorted by confidence
+        Dict with merchant data and match confidence, or None if no match
     """
-    if not description:
-        return []
-
-    normalized_desc = normalize_string(description)
-    matches = []
+    return get_merchant_index().find_match(description, confidence_threshold)
 
-    for merchant in MERCHANT_DATA:
-        merchant_name = normalize_string(merchant["name"])
-        score = fuzzy_match_score(normalized_desc, merchant_name)
 
-        if merchant_name in normalized_desc:
-            score = max(score, 90.0)
+def get_merchant_suggestions(description: str, top_n: int = 3) -> List[Dict]:
+    """
+    Get top N merchant suggestions for a description
 
-        for alias in merchant.get("aliases", []):
-            alias_normalized = normalize_string(alias)
-            alias_score = fuzzy_match_score(normalized_desc, alias_normalized)
+    Args:
+        description: Transaction description
+        top_n: Number of suggestions to return
 
-            if alias_normalized in normalized_desc:
-                alias_score = max(alias_score, 90.0)
+    Returns:
+        List of merchant matches sorted by confidence
+    """
+    return get_merchant_index().suggestions(description, top_n)
 
-            score = max(score, alias_score)
 
-        adjusted_score = min(100.0, score + merchant.get("confidence_boost", 0))
+def match_many(descriptions, confidence_threshold: float = 60.0) -> List[Optional[Dict]]:
+    """
+    Find merchant matches for many descriptions in one call
 
-        matches.append({
-            **merchant,
-            "match_confidence": round(adjusted_score, 1),
-            "original_score": round(score, 1)
-        })
+    Args:
+        descriptions: Iterable of transaction descriptions (e.g. an import's column)
+        confidence_threshold: Minimum confidence score (default 60%)
 
-    # Sort by confidence and return top N
-    matches.sort(key=lambda x: x["match_confidence"], reverse=True)
-    return matches[:top_n]
+    Returns:
+        List of match dicts (or None), aligned with descriptions
+    """
+    return get_merchant_index().match_many(descriptions, confidence_threshold)
 
 
 # ============================================================================
@@ -1695,6 +1867,9 @@ def init_merchant_database(session: Session, model_class) -> int:
             count += 1
 
     session.commit()
+
+    from merchant_lookup import invalidate_merchant_cache
+    invalidate_merchant_cache()
     return count
 
 
@@ -1739,6 +1914,9 @@ def add_custom_merchant(
     session.add(merchant)
     session.commit()
 
+    from merchant_lookup import invalidate_merchant_cache
+    invalidate_merchant_cache()
+
     return merchant
 
 
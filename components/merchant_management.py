@@ -22,7 +22,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_, func, and_
 
 from models import Merchant, Transaction, EXPENSE_CATEGORIES, INCOME_TYPES
-from components.export_manager import render_export_panel
+from merchant_lookup import invalidate_merchant_cache
 
 
 # ============================================================================
@@ -180,6 +180,7 @@ def add_custom_merchant(
 
     session.add(merchant)
     session.commit()
+    invalidate_merchant_cache()
 
     return merchant
 
@@ -241,6 +242,7 @@ def update_merchant(
         merchant.confidence_boost = min(30, max(0, confidence_boost))
 
     session.commit()
+    invalidate_merchant_cache()
 
     return merchant
 
@@ -263,6 +265,7 @@ def delete_merchant(session: Session, merchant_id: int) -> bool:
 
     session.delete(merchant)
     session.commit()
+    invalidate_merchant_cache()
 
     return True
 
@@ -1173,6 +1176,9 @@ def render_import_export_ui(session: Session) -> None:
 
             merchants_df = pd.DataFrame(rows)
 
+            # Imported here so the export stack loads only when exporting
+            from components.export_manager import render_export_panel
+
             # Show Aurora-themed export panel
             with st.expander("Export Merchants Database", expanded=True):
                 render_export_panel(
@@ -7,14 +7,16 @@ Features:
 - Smart field extraction with confidence scoring
 - UK-specific receipt patterns
 - Image preprocessing for better accuracy
-- Batch processing support
+- Batch processing support (in parallel worker processes)
 - Manual correction interface
 """
 
+import io
 import re
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple, Callable, Any
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Callable, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
@@ -54,6 +56,30 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default worker processes for batch OCR (one receipt per core)
+OCR_WORKERS = os.cpu_count() or 1
+
+# A receipt image: file path, raw file bytes, or an already opened PIL Image
+ImageSource = Union[str, Path, bytes, Any]
+
+
+def open_image(image: ImageSource) -> "Image.Image":
+    """PIL Image for a file path, raw file bytes or an Image"""
+    if isinstance(image, (bytes, bytearray)):
+        return Image.open(io.BytesIO(image))
+    if isinstance(image, (str, Path)):
+        return Image.open(image)
+    return image
+
+
+def describe_image(image: ImageSource) -> str:
+    """Short label for log messages"""
+    if isinstance(image, (bytes, bytearray)):
+        return f"<{len(image)} bytes>"
+    if isinstance(image, (str, Path)):
+        return str(image)
+    return f"<{type(image).__name__}>"
+
 
 @dataclass
 class ReceiptData:
@@ -147,7 +173,7 @@ class OCREngine:
     """Base class for OCR engines"""
 
     @staticmethod
-    def extract_text_tesseract(image_path: str) -> str:
+    def extract_text_tesseract(image: ImageSource) -> str:
         """Extract text using Tesseract OCR"""
         if not TESSERACT_AVAILABLE:
             raise ImportError("Tesseract not available. Install: pip install pytesseract")
@@ -155,7 +181,7 @@ class OCREngine:
             raise ImportError("Pillow not available. Install: pip install Pillow")
 
         try:
-            image = Image.open(image_path)
+            image = open_image(image)
             # Use config optimized for receipts
             config = '--psm 6 --oem 3'  # Assume uniform block of text
             text = pytesseract.image_to_string(image, config=config)
@@ -166,14 +192,19 @@ class OCREngine:
             return ""
 
     @staticmethod
-    def extract_text_easyocr(image_path: str) -> str:
+    def extract_text_easyocr(image: ImageSource) -> str:
         """Extract text using EasyOCR"""
         if not EASYOCR_AVAILABLE:
             raise ImportError("EasyOCR not available. Install: pip install easyocr")
 
         try:
             reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-            results = reader.readtext(image_path)
+            if isinstance(image, Path):
+                image = str(image)
+            elif PIL_AVAILABLE and isinstance(image, Image.Image):
+                import numpy as np
+                image = np.array(image)
+            results = reader.readtext(image)
             # Combine text with newlines to preserve structure
             text = '\n'.join([result[1] for result in results])
             logger.info(f"EasyOCR extracted {len(results)} text blocks")
@@ -183,15 +214,22 @@ class OCREngine:
             return ""
 
     @staticmethod
-    def extract_text_google_vision(image_path: str) -> str:
+    def extract_text_google_vision(image: ImageSource) -> str:
         """Extract text using Google Cloud Vision"""
         if not GOOGLE_VISION_AVAILABLE:
             raise ImportError("Google Cloud Vision not available. Install: pip install google-cloud-vision")
 
         try:
             client = vision.ImageAnnotatorClient()
-            with open(image_path, 'rb') as f:
-                content = f.read()
+            if isinstance(image, (bytes, bytearray)):
+                content = bytes(image)
+            elif isinstance(image, (str, Path)):
+                with open(image, 'rb') as f:
+                    content = f.read()
+            else:
+                buffer = io.BytesIO()
+                image.save(buffer, format='PNG')
+                content = buffer.getvalue()
 
             image = vision.Image(content=content)
             response = client.text_detection(image=image)
@@ -215,12 +253,12 @@ class ImagePreprocessor:
     """Image preprocessing for better OCR results"""
 
     @staticmethod
-    def preprocess_image(image_path: str, output_path: Optional[str] = None) -> Image.Image:
+    def preprocess_image(image_path: ImageSource, output_path: Optional[str] = None) -> "Image.Image":
         """
         Enhance image for better OCR results
 
         Args:
-            image_path: Path to original image
+            image_path: Path to original image (or its raw bytes)
             output_path: Optional path to save preprocessed image
 
         Returns:
@@ -230,7 +268,7 @@ class ImagePreprocessor:
             raise ImportError("Pillow not available. Install: pip install Pillow")
 
         try:
-            image = Image.open(image_path)
+            image = open_image(image_path)
             logger.info(f"Original image size: {image.size}, mode: {image.mode}")
 
             # Convert to RGB if needed
@@ -274,7 +312,7 @@ class ImagePreprocessor:
         except Exception as e:
             logger.error(f"Image preprocessing failed: {e}")
             # Return original image if preprocessing fails
-            return Image.open(image_path)
+            return open_image(image_path)
 
 
 class ReceiptParser:
@@ -479,55 +517,43 @@ class ReceiptOCR:
 
         logger.info(f"Initialized OCR with engine: {self.ocr_engine}")
 
-    def extract_text(self, image_path: str) -> str:
-        """Extract text from image using configured OCR engine"""
-        # Preprocess if enabled
+    def extract_text(self, image_path: ImageSource) -> str:
+        """Extract text from image (path or raw bytes) using configured OCR engine"""
+        # Preprocess if enabled (in memory; the engines take the PIL image directly)
+        ocr_image = image_path
         if self.preprocess and PIL_AVAILABLE:
             try:
-                # Save preprocessed image temporarily
-                preprocessed_path = str(Path(image_path).parent / f"preprocessed_{Path(image_path).name}")
-                self.preprocessor.preprocess_image(image_path, preprocessed_path)
-                ocr_image_path = preprocessed_path
+                ocr_image = self.preprocessor.preprocess_image(image_path)
             except Exception as e:
                 logger.warning(f"Preprocessing failed, using original: {e}")
-                ocr_image_path = image_path
-        else:
-            ocr_image_path = image_path
 
         # Run OCR
         try:
             if self.ocr_engine == 'tesseract':
-                text = OCREngine.extract_text_tesseract(ocr_image_path)
+                text = OCREngine.extract_text_tesseract(ocr_image)
             elif self.ocr_engine == 'easyocr':
-                text = OCREngine.extract_text_easyocr(ocr_image_path)
+                text = OCREngine.extract_text_easyocr(ocr_image)
             elif self.ocr_engine == 'google_vision':
-                text = OCREngine.extract_text_google_vision(ocr_image_path)
+                text = OCREngine.extract_text_google_vision(ocr_image)
             else:
                 raise ValueError(f"Unknown OCR engine: {self.ocr_engine}")
 
-            # Clean up preprocessed image
-            if self.preprocess and ocr_image_path != image_path:
-                try:
-                    os.remove(ocr_image_path)
-                except:
-                    pass
-
             return text
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}")
             return ""
 
-    def process_receipt(self, image_path: str) -> ReceiptData:
+    def process_receipt(self, image_path: ImageSource) -> ReceiptData:
         """
         Full receipt processing pipeline
 
         Args:
-            image_path: Path to receipt image
+            image_path: Path to receipt image (or its raw bytes)
 
         Returns:
             ReceiptData with extracted fields and confidence scores
         """
-        logger.info(f"Processing receipt: {image_path}")
+        logger.info(f"Processing receipt: {describe_image(image_path)}")
 
         # Extract text
         raw_text = self.extract_text(image_path)
@@ -564,41 +590,110 @@ class ReceiptOCR:
 
     def batch_process(
         self,
-        image_paths: List[str],
-        callback: Optional[Callable[[int, int, ReceiptData], None]] = None
+        image_paths: Sequence[ImageSource],
+        callback: Optional[Callable[[int, int, ReceiptData], None]] = None,
+        workers: int = 1,
+        should_cancel: Optional[Callable[[], bool]] = None
     ) -> List[ReceiptData]:
         """
         Process multiple receipts in batch
 
         Args:
-            image_paths: List of receipt image paths
-            callback: Optional callback(current, total, receipt_data) called after each receipt
+            image_paths: List of receipt image paths (or raw image bytes)
+            callback: Optional callback(current, total, receipt_data) called after each
+                receipt, in this process, in the order receipts finish
+            workers: Worker processes (1 processes receipts one after another here)
+            should_cancel: Optional check made after each receipt; returning True
+                stops the batch
 
         Returns:
-            List of ReceiptData objects
+            List of ReceiptData objects in input order (receipts skipped by
+            cancellation are left out)
         """
-        results = []
         total = len(image_paths)
+        results: List[Optional[ReceiptData]] = [None] * total
 
-        logger.info(f"Starting batch processing of {total} receipts")
+        logger.info(f"Starting batch processing of {total} receipts with {max(1, min(workers, total))} worker(s)")
 
-        for i, path in enumerate(image_paths, 1):
-            try:
-                data = self.process_receipt(path)
-                results.append(data)
+        batch = self.iter_batch(image_paths, workers)
+        try:
+            for i, (index, data) in enumerate(batch, 1):
+                results[index] = data
 
                 if callback:
                     callback(i, total, data)
 
                 logger.info(f"Batch progress: {i}/{total}")
-            except Exception as e:
-                logger.error(f"Failed to process {path}: {e}")
-                # Add failed result
-                results.append(ReceiptData(raw_text=f"ERROR: {str(e)}"))
 
+                if should_cancel and should_cancel():
+                    logger.info(f"Batch processing cancelled after {i}/{total} receipts")
+                    break
+        finally:
+            batch.close()
+
+        results = [data for data in results if data is not None]
         logger.info(f"Batch processing complete: {len(results)} receipts processed")
         return results
 
+    def iter_batch(self, image_paths: Sequence[ImageSource], workers: int = 1) -> Iterator[Tuple[int, ReceiptData]]:
+        """
+        Process receipts, yielding (index, ReceiptData) as each one finishes
+
+        With workers > 1 receipts are shared among a pool of worker processes
+        (each with its own ReceiptOCR) and arrive in completion order.
+        Closing the generator, e.g. by breaking out of a loop over it,
+        cancels receipts not yet started and waits for the ones in progress,
+        so no worker is left running.
+
+        Args:
+            image_paths: Receipt image paths (or raw image bytes)
+            workers: Worker processes
+
+        Yields:
+            (position in image_paths, ReceiptData); failures give a
+            ReceiptData whose raw_text starts with "ERROR:"
+        """
+        workers = min(workers, len(image_paths))
+        if workers <= 1:
+            for index, image in enumerate(image_paths):
+                yield index, self._process_safely(image)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_ocr_worker,
+            initargs=(type(self), self.ocr_engine, self.preprocess)
+        )
+        try:
+            futures = {executor.submit(_ocr_worker, image): index for index, image in enumerate(image_paths)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _process_safely(self, image: ImageSource) -> ReceiptData:
+        try:
+            return self.process_receipt(image)
+        except Exception as e:
+            logger.error(f"Failed to process {describe_image(image)}: {e}")
+            # Add failed result
+            return ReceiptData(raw_text=f"ERROR: {str(e)}")
+
+
+# Worker process state for ReceiptOCR.iter_batch
+_worker_ocr: Optional[ReceiptOCR] = None
+
+
+def _init_ocr_worker(ocr_class, ocr_engine: str, preprocess: bool) -> None:
+    global _worker_ocr
+    # One Tesseract thread per worker; the pool already uses every core
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    _worker_ocr = ocr_class(ocr_engine=ocr_engine, preprocess=preprocess)
+
+
+def _ocr_worker(image: ImageSource) -> ReceiptData:
+    return _worker_ocr._process_safely(image)
+
 
 class ManualCorrectionUI:
     """Manual correction interface for low-confidence extractions"""
@@ -770,10 +865,10 @@ def quick_ocr(image_path: str, ocr_engine: str = 'auto') -> ReceiptData:
     return processor.process_receipt(image_path)
 
 
-def batch_ocr(image_paths: List[str], ocr_engine: str = 'auto') -> List[ReceiptData]:
-    """Quick batch OCR"""
+def batch_ocr(image_paths: List[str], ocr_engine: str = 'auto', workers: int = OCR_WORKERS) -> List[ReceiptData]:
+    """Quick batch OCR (one worker process per core by default)"""
     processor = ReceiptOCR(ocr_engine=ocr_engine)
-    return processor.batch_process(image_paths)
+    return processor.batch_process(image_paths, workers=workers)
 
 
 def render_ocr_review_ui(receipt_data: ReceiptData, image_path: str = None) -> Dict[str, Any]:
@@ -3,6 +3,9 @@ Unit tests for OCR Receipt Scanner
 Tests extraction accuracy, confidence scoring, and UK-specific patterns
 """
 
+import os
+import multiprocessing
+import tempfile
 import unittest
 from datetime import date
 from components.ocr_receipt import (
@@ -433,6 +436,65 @@ class TestReceiptDataValidation(unittest.TestCase):
         self.assertFalse(receipt.is_complete(70))
 
 
+class TextReceiptOCR(ReceiptOCR):
+    """ReceiptOCR that reads receipt text from the given bytes instead of an OCR engine"""
+
+    def extract_text(self, image_path):
+        if image_path == b'UNREADABLE':
+            raise ValueError("unreadable image")
+        return image_path.decode()
+
+
+RECEIPTS = [
+    f"TESCO STORES\n{day:02d}/10/2024\nMILK 1.20\nTOTAL: £{day}.99".encode()
+    for day in range(1, 13)
+] + [b'UNREADABLE']
+
+
+class TestBatchProcessing(unittest.TestCase):
+    """Test batch OCR in worker processes"""
+
+    def setUp(self):
+        self.ocr = TextReceiptOCR(ocr_engine='tesseract')
+
+    def test_parallel_matches_sequential(self):
+        """Worker processes give the same results, in input order, with progress reported here"""
+        progress = []
+
+        def callback(current, total, data):
+            progress.append((current, total, os.getpid()))
+
+        sequential = self.ocr.batch_process(RECEIPTS)
+        parallel = self.ocr.batch_process(RECEIPTS, callback=callback, workers=3)
+
+        self.assertEqual([r.to_dict() for r in parallel], [r.to_dict() for r in sequential])
+        self.assertEqual(parallel[4].amount, 5.99)
+        self.assertTrue(parallel[-1].raw_text.startswith("ERROR:"))
+        self.assertEqual(progress, [(i, len(RECEIPTS), os.getpid()) for i in range(1, len(RECEIPTS) + 1)])
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_cancel_stops_batch(self):
+        """Cancelling leaves later receipts unprocessed and no workers running"""
+        for workers in (1, 2):
+            done = []
+            results = self.ocr.batch_process(RECEIPTS, callback=lambda c, t, d: done.append(c), workers=workers,
+                                             should_cancel=lambda: len(done) >= 3)
+            self.assertEqual(len(results), 3)
+            self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_preprocessing_writes_no_files(self):
+        """Preprocessed images stay in memory"""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'receipt.png')
+            Image.new('RGB', (400, 600), 'white').save(path)
+
+            ReceiptOCR(ocr_engine='tesseract').extract_text(path)
+
+            self.assertEqual(os.listdir(directory), ['receipt.png'])
+
+
 def run_benchmark_tests():
     """
     Run benchmark tests to measure expected accuracy
@@ -23,6 +23,8 @@ import sys
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from data_versions import table_versions
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -217,22 +219,32 @@ class VirtualScrolling:
 # ============================================================================
 
 class CacheManager:
-    """Manage Streamlit cache with TTL and invalidation"""
+    """
+    Manage Streamlit cache with TTL and invalidation
+
+    Data caches are keyed on the generations of the tables they read
+    (data_versions.table_versions), so writes made through a session
+    refresh them immediately; the TTL only bounds how long entries live.
+    """
 
     # Cache configuration
     CACHE_CONFIG = {
-        'merchants': {'ttl': 3600},  # 1 hour
-        'rules': {'ttl': 1800},      # 30 minutes
+        'merchants': {'ttl': 6 * 3600, 'tables': ('merchants',)},
+        'rules': {'ttl': 6 * 3600, 'tables': ('rules',)},
         'categories': {'ttl': 7200}, # 2 hours
         'income_types': {'ttl': 7200},  # 2 hours
-        'stats': {'ttl': 60},        # 1 minute
+        'stats': {'ttl': 6 * 3600, 'tables': ('transactions',)},
         'recent_transactions': {'ttl': 30}  # 30 seconds
     }
 
     @staticmethod
-    @st.cache_data(ttl=3600)
     def get_merchants_cached(db_path: str) -> List[Dict]:
-        """Cache merchant database (rarely changes)"""
+        """Cache merchant database (refreshed when the merchants table changes)"""
+        return CacheManager._merchants(db_path, table_versions(*CacheManager.CACHE_CONFIG['merchants']['tables']))
+
+    @staticmethod
+    @st.cache_data(ttl=6 * 3600)
+    def _merchants(db_path: str, data_version: Tuple[int, ...]) -> List[Dict]:
         try:
             conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
@@ -251,9 +263,13 @@ class CacheManager:
             return []
 
     @staticmethod
-    @st.cache_data(ttl=1800)
     def get_rules_cached(db_path: str) -> List[Dict]:
-        """Cache categorization rules (rarely changes)"""
+        """Cache categorization rules (refreshed when the rules table changes)"""
+        return CacheManager._rules(db_path, table_versions(*CacheManager.CACHE_CONFIG['rules']['tables']))
+
+    @staticmethod
+    @st.cache_data(ttl=6 * 3600)
+    def _rules(db_path: str, data_version: Tuple[int, ...]) -> List[Dict]:
         try:
             conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
@@ -312,9 +328,15 @@ class CacheManager:
         return sorted(income_types)
 
     @staticmethod
-    @st.cache_data(ttl=60)
     def get_transaction_stats_cached(db_path: str, tax_year: int) -> Dict:
-        """Cache dashboard statistics (1 minute TTL)"""
+        """Cache dashboard statistics (refreshed when transactions change)"""
+        return CacheManager._transaction_stats(
+            db_path, tax_year, table_versions(*CacheManager.CACHE_CONFIG['stats']['tables'])
+        )
+
+    @staticmethod
+    @st.cache_data(ttl=6 * 3600)
+    def _transaction_stats(db_path: str, tax_year: int, data_version: Tuple[int, ...]) -> Dict:
         try:
             conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
@@ -366,11 +388,11 @@ class CacheManager:
         # Clear specific caches
         for key in cache_keys:
             if key == 'merchants':
-                CacheManager.get_merchants_cached.clear()
+                CacheManager._merchants.clear()
             elif key == 'rules':
-                CacheManager.get_rules_cached.clear()
+                CacheManager._rules.clear()
             elif key == 'stats':
-                CacheManager.get_transaction_stats_cached.clear()
+                CacheManager._transaction_stats.clear()
             elif key == 'categories':
                 CacheManager.get_categories_cached.clear()
             elif key == 'income_types':
@@ -8,16 +8,28 @@ Features:
 - Save filter presets
 - Export filtered results
 
+Filters are applied in SQL (see transaction_queries.py) and results are
+paged by (date, id), so a page only ever loads its own rows.
+
 Usage:
-    from components.search_filter import render_search_bar, apply_filters
+    from components.search_filter import render_search_bar, keyset_page, render_page_controls
 
     # In your Streamlit page:
-    filtered_transactions = render_search_bar(session, all_transactions)
+    filters = render_search_bar(session)
+    page, page_number = keyset_page(session, filters.conditions(), 'txn_list', filters)
+    render_page_controls('txn_list', page, page_number, total)
 """
 
 import streamlit as st
 from datetime import datetime, timedelta
-from sqlalchemy import and_, or_
+
+from transaction_queries import (
+    TransactionFilter, TYPE_FILTERS, CONFIDENCE_FILTERS, PAGE_SIZE,
+    count_transactions, transaction_page
+)
+
+# Amount slider bounds; the full range means no amount filter
+AMOUNT_SLIDER_MAX = 10000
 
 
 def init_search_state():
@@ -37,19 +49,38 @@ def init_search_state():
     if 'filter_amount_min' not in st.session_state:
         st.session_state.filter_amount_min = 0
     if 'filter_amount_max' not in st.session_state:
-        st.session_state.filter_amount_max = 10000
+        st.session_state.filter_amount_max = AMOUNT_SLIDER_MAX
 
 
-def render_search_bar(session, transactions):
+def current_filter():
+    """
+    Build a TransactionFilter from the search and filter session state
+
+    Returns:
+        TransactionFilter
+    """
+    init_search_state()
+    state = st.session_state
+    return TransactionFilter(
+        search=state.search_query,
+        txn_type=state.filter_type,
+        confidence=state.filter_confidence,
+        date_start=state.filter_date_start,
+        date_end=state.filter_date_end,
+        amount_min=state.filter_amount_min if state.filter_amount_min > 0 else None,
+        amount_max=state.filter_amount_max if state.filter_amount_max < AMOUNT_SLIDER_MAX else None,
+    )
+
+
+def render_search_bar(session):
     """
     Render search bar with live filtering
 
     Args:
         session: SQLAlchemy session
-        transactions: List of Transaction objects
 
     Returns:
-        Filtered list of transactions
+        TransactionFilter for the current search and filters
     """
     init_search_state()
 
@@ -71,37 +102,27 @@ def render_search_bar(session, transactions):
             clear_all_filters()
             st.rerun()
 
-    # Apply search filter
-    filtered = transactions
-    if search_query:
-        filtered = [
-            txn for txn in filtered
-            if search_query.lower() in txn.description.lower()
-            or (txn.notes and search_query.lower() in txn.notes.lower())
-            or search_query.replace('£', '').replace(',', '') in str(txn.paid_in)
-            or search_query.replace('£', '').replace(',', '') in str(txn.paid_out)
-        ]
+    filters = current_filter()
 
     # Show results count
     if search_query or st.session_state.filter_type != 'All':
-        total_count = len(transactions)
-        filtered_count = len(filtered)
+        total_count = count_transactions(session)
+        filtered_count = count_transactions(session, filters.conditions())
         if filtered_count < total_count:
             st.info(f"🔍 Showing **{filtered_count}** of **{total_count}** transactions")
 
-    return filtered
+    return filters
 
 
-def render_advanced_filters(session, transactions):
+def render_advanced_filters(session):
     """
     Render advanced filter options in an expander
 
     Args:
         session: SQLAlchemy session
-        transactions: List of Transaction objects
 
     Returns:
-        Filtered list of transactions
+        TransactionFilter for the current search and filters
     """
     init_search_state()
 
@@ -111,10 +132,8 @@ def render_advanced_filters(session, transactions):
         with col1:
             filter_type = st.selectbox(
                 "Transaction Type",
-                ["All", "Income", "Expense", "Personal", "Unreviewed"],
-                index=["All", "Income", "Expense", "Personal", "Unreviewed"].index(
-                    st.session_state.filter_type
-                ),
+                TYPE_FILTERS,
+                index=TYPE_FILTERS.index(st.session_state.filter_type),
                 key="filter_type_select"
             )
             st.session_state.filter_type = filter_type
@@ -122,10 +141,8 @@ def render_advanced_filters(session, transactions):
         with col2:
             filter_confidence = st.selectbox(
                 "Confidence Score",
-                ["All", "High (70%+)", "Medium (40-69%)", "Low (<40%)", "No Score"],
-                index=["All", "High (70%+)", "Medium (40-69%)", "Low (<40%)", "No Score"].index(
-                    st.session_state.filter_confidence
-                ),
+                CONFIDENCE_FILTERS,
+                index=CONFIDENCE_FILTERS.index(st.session_state.filter_confidence),
                 key="filter_confidence_select"
             )
             st.session_state.filter_confidence = filter_confidence
@@ -156,7 +173,7 @@ def render_advanced_filters(session, transactions):
         amount_range = st.slider(
             "Amount (£)",
             min_value=0,
-            max_value=10000,
+            max_value=AMOUNT_SLIDER_MAX,
             value=(st.session_state.filter_amount_min, st.session_state.filter_amount_max),
             step=50,
             key="filter_amount_range_slider",
@@ -165,59 +182,80 @@ def render_advanced_filters(session, transactions):
         st.session_state.filter_amount_min = amount_range[0]
         st.session_state.filter_amount_max = amount_range[1]
 
-    # Apply filters
-    filtered = apply_filters(transactions)
+    return current_filter()
 
-    return filtered
 
+def apply_filters(query):
+    """
+    Apply all active filters to a Transaction query
 
-def apply_filters(transactions):
+    Args:
+        query: SQLAlchemy query over Transaction
+
+    Returns:
+        Filtered query
+    """
+    return query.filter(*current_filter().conditions())
+
+
+def keyset_page(session, conditions, state_key, signature, page_size=PAGE_SIZE, sort='date', descending=True):
     """
-    Apply all active filters to transaction list
+    Load the current page of a paged transaction list
+
+    The cursors of the pages visited so far are kept in
+    st.session_state[state_key] and reset whenever signature (anything
+    describing the filters and sort) changes.
 
     Args:
-        transactions: List of Transaction objects
+        session: SQLAlchemy session
+        conditions: Filter predicates
+        state_key: Session state key for this list
+        signature: Filter/sort description; a new value returns to page 1
+        page_size: Transactions per page
+        sort: 'date' or 'amount'
+        descending: Newest / largest first
 
     Returns:
-        Filtered list of transactions
+        Tuple of (TransactionPage, zero-based page number)
     """
-    filtered = transactions
-
-    # Type filter
-    if st.session_state.filter_type == "Income":
-        filtered = [t for t in filtered if t.guessed_type == 'Income']
-    elif st.session_state.filter_type == "Expense":
-        filtered = [t for t in filtered if t.guessed_type == 'Expense']
-    elif st.session_state.filter_type == "Personal":
-        filtered = [t for t in filtered if t.is_personal == True]
-    elif st.session_state.filter_type == "Unreviewed":
-        filtered = [t for t in filtered if t.reviewed == False]
-
-    # Confidence filter
-    if st.session_state.filter_confidence == "High (70%+)":
-        filtered = [t for t in filtered if t.confidence_score and t.confidence_score >= 70]
-    elif st.session_state.filter_confidence == "Medium (40-69%)":
-        filtered = [t for t in filtered if t.confidence_score and 40 <= t.confidence_score < 70]
-    elif st.session_state.filter_confidence == "Low (<40%)":
-        filtered = [t for t in filtered if t.confidence_score and t.confidence_score < 40]
-    elif st.session_state.filter_confidence == "No Score":
-        filtered = [t for t in filtered if not t.confidence_score or t.confidence_score == 0]
-
-    # Date range filter
-    if st.session_state.filter_date_start:
-        filtered = [t for t in filtered if t.date >= st.session_state.filter_date_start]
-    if st.session_state.filter_date_end:
-        filtered = [t for t in filtered if t.date <= st.session_state.filter_date_end]
-
-    # Amount range filter
-    min_amt = st.session_state.filter_amount_min
-    max_amt = st.session_state.filter_amount_max
-    filtered = [
-        t for t in filtered
-        if (min_amt <= (t.paid_in if t.paid_in > 0 else t.paid_out) <= max_amt)
-    ]
-
-    return filtered
+    signature = repr(signature)
+    state = st.session_state.get(state_key)
+    if not state or state['signature'] != signature:
+        state = {'signature': signature, 'cursors': [None]}
+        st.session_state[state_key] = state
+
+    while True:
+        page = transaction_page(session, conditions, after=state['cursors'][-1],
+                                page_size=page_size, sort=sort, descending=descending)
+        # Rows reviewed since the last rerun can empty a later page
+        if page.transactions or len(state['cursors']) == 1:
+            return page, len(state['cursors']) - 1
+        state['cursors'].pop()
+
+
+def render_page_controls(state_key, page, page_number, total, page_size=PAGE_SIZE):
+    """Previous / Next buttons for a list paged with keyset_page"""
+    total_pages = max(1, -(-total // page_size))
+    if total_pages <= 1:
+        return
+
+    state = st.session_state[state_key]
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("Previous", disabled=page_number == 0, key=f"{state_key}_prev"):
+            state['cursors'].pop()
+            st.rerun()
+    with col2:
+        st.markdown(
+            f"<div style='text-align:center; color: rgba(200,205,213,0.65); padding: 0.5rem;'>"
+            f"Page {page_number + 1} of {total_pages} &middot; "
+            f"{total} transactions</div>",
+            unsafe_allow_html=True,
+        )
+    with col3:
+        if st.button("Next", disabled=not page.has_more, key=f"{state_key}_next"):
+            state['cursors'].append(page.next_cursor)
+            st.rerun()
 
 
 def clear_all_filters():
@@ -229,7 +267,7 @@ def clear_all_filters():
     st.session_state.filter_date_start = None
     st.session_state.filter_date_end = None
     st.session_state.filter_amount_min = 0
-    st.session_state.filter_amount_max = 10000
+    st.session_state.filter_amount_max = AMOUNT_SLIDER_MAX
 
 
 def get_active_filters_summary():
@@ -258,7 +296,7 @@ def get_active_filters_summary():
             date_str += f" to {st.session_state.filter_date_end.strftime('%d/%m/%Y')}"
         filters.append(date_str)
 
-    if st.session_state.filter_amount_min > 0 or st.session_state.filter_amount_max < 10000:
+    if st.session_state.filter_amount_min > 0 or st.session_state.filter_amount_max < AMOUNT_SLIDER_MAX:
         filters.append(f"Amount: £{st.session_state.filter_amount_min}-£{st.session_state.filter_amount_max}")
 
     return " | ".join(filters) if filters else "No filters active"
@@ -274,5 +312,5 @@ def has_active_filters():
         or st.session_state.filter_date_start is not None
         or st.session_state.filter_date_end is not None
         or st.session_state.filter_amount_min > 0
-        or st.session_state.filter_amount_max < 10000
+        or st.session_state.filter_amount_max < AMOUNT_SLIDER_MAX
     )
@@ -17,9 +17,10 @@ Usage:
 """
 
 import streamlit as st
-import re
 from collections import defaultdict
 
+from text_normalizer import merchant_search_key
+
 
 def detect_similar_transactions(session, reference_txn, unreviewed_only=True):
     """
@@ -36,11 +37,7 @@ def detect_similar_transactions(session, reference_txn, unreviewed_only=True):
     from models import Transaction
 
     # Extract merchant name (clean)
-    desc = reference_txn.description
-    cleaned = re.sub(r'\d{4}\s*\w{3}\d{2}', '', desc)  # Remove dates
-    cleaned = re.sub(r'\d{2}/\d{2}/\d{2,4}', '', cleaned)
-    cleaned = re.sub(r',.*', '', cleaned).strip()
-    merchant_key = cleaned[:30] if len(cleaned) >= 10 else cleaned
+    merchant_key = merchant_search_key(reference_txn.description)
 
     # Build query
     query = session.query(Transaction).filter(
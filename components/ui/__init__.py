@@ -1,64 +1,83 @@
 """
 UI Components Library
 Reusable visual components for Tax Helper
+
+Names are imported from their submodule on first access, so importing
+one component does not load every other component and its dependencies
 """
 
-from .cards import (
-    render_action_card,
-    render_stat_card,
-    render_data_card,
-    render_hero_card
-)
+import importlib
 
-from .buttons import (
-    render_action_toolbar,
-    render_quick_category_buttons,
-    render_yes_no_dialog,
-    render_quick_action_buttons,
-    render_nav_buttons
-)
+# Submodule -> names it exports
+_EXPORTS = {
+    'cards': [
+        'render_action_card',
+        'render_stat_card',
+        'render_data_card',
+        'render_hero_card',
+    ],
+    'buttons': [
+        'render_action_toolbar',
+        'render_quick_category_buttons',
+        'render_yes_no_dialog',
+        'render_quick_action_buttons',
+        'render_nav_buttons',
+    ],
+    'styles': [
+        'inject_custom_css',
+    ],
+    'charts': [
+        'render_expense_breakdown_chart',
+        'render_income_vs_expenses_chart',
+        'render_monthly_comparison_bars',
+        'render_tax_breakdown_donut',
+        'render_category_trend_chart',
+        'render_income_sources_chart',
+        'render_yearly_comparison_chart',
+    ],
+    'interactions': [
+        'render_bulk_action_selector',
+        'render_advanced_filter_panel',
+        'render_quick_search',
+        'render_pagination',
+        'render_quick_edit_modal',
+        'render_smart_suggestions',
+    ],
+    'advanced_charts': [
+        'render_spending_heatmap',
+        'render_cash_flow_waterfall',
+        'render_expense_treemap',
+        'render_tax_projection_gauge',
+        'render_spending_radar',
+        'render_income_tax_timeline',
+        'render_expense_velocity',
+        'render_income_to_expense_sankey',
+        'render_tax_efficiency_sunburst',
+        'render_quarterly_dashboard',
+    ],
+    'mobile_styles': [
+        'inject_mobile_responsive_css',
+        'render_mobile_warning',
+        'render_mobile_nav_hint',
+        'check_mobile_viewport',
+        'render_install_pwa_prompt',
+    ],
+}
+_EXPORT_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
 
-from .styles import inject_custom_css
 
-from .charts import (
-    render_expense_breakdown_chart,
-    render_income_vs_expenses_chart,
-    render_monthly_comparison_bars,
-    render_tax_breakdown_donut,
-    render_category_trend_chart,
-    render_income_sources_chart,
-    render_yearly_comparison_chart
-)
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
 
-from .interactions import (
-    render_bulk_action_selector,
-    render_advanced_filter_panel,
-    render_quick_search,
-    render_pagination,
-    render_quick_edit_modal,
-    render_smart_suggestions
-)
 
-from .advanced_charts import (
-    render_spending_heatmap,
-    render_cash_flow_waterfall,
-    render_expense_treemap,
-    render_tax_projection_gauge,
-    render_spending_radar,
-    render_income_tax_timeline,
-    render_expense_velocity,
-    render_income_to_expense_sankey,
-    render_tax_efficiency_sunburst,
-    render_quarterly_dashboard
-)
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_MODULES))
 
-from .mobile_styles import (
-    inject_mobile_responsive_css,
-    render_mobile_warning,
-    render_mobile_nav_hint,
-    check_mobile_viewport,
-    render_install_pwa_prompt
-)
 
 __all__ = [
     # Cards
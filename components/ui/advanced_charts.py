@@ -22,11 +22,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, List, Dict, Tuple
-from sqlalchemy import and_, func, extract, or_
-from models import Transaction, Income, Expense, Mileage, Donation
-from calendar import monthrange
+from chart_data import get_chart_data, previous_period
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -111,8 +109,7 @@ def get_date_range_months(start_date: datetime, end_date: datetime) -> List[date
 def apply_theme(fig: go.Figure, title: str = "", height: int = 500) -> go.Figure:
     """Apply consistent futuristic theme to any Plotly figure"""
     fig.update_layout(
-        **LAYOUT_THEME,
-        title=title,
+        **dict(LAYOUT_THEME, title=dict(LAYOUT_THEME['title'], text=title)),
         height=height,
         hoverlabel=dict(
             bgcolor='rgba(11, 14, 20, 0.95)',
@@ -148,25 +145,13 @@ def render_spending_heatmap(session, start_date: datetime, end_date: datetime) -
         >>> render_spending_heatmap(session, datetime(2024, 1, 1), datetime(2024, 12, 31))
     """
     try:
-        # Query daily expenses
-        daily_expenses = session.query(
-            Expense.date,
-            func.sum(Expense.amount).label('total'),
-            func.count(Expense.id).label('count')
-        ).filter(
-            and_(
-                Expense.date >= start_date,
-                Expense.date <= end_date
-            )
-        ).group_by(Expense.date).all()
+        # Daily expense totals
+        df = get_chart_data(session, start_date, end_date).daily_expenses()
 
-        if not daily_expenses:
+        if df.empty:
             st.info("No expense data available for heatmap visualization.")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame(daily_expenses, columns=['date', 'amount', 'count'])
-        df['date'] = pd.to_datetime(df['date'])
         df['day'] = df['date'].dt.day
         df['month'] = df['date'].dt.strftime('%b %Y')
         df['month_num'] = df['date'].dt.year * 100 + df['date'].dt.month
@@ -184,20 +169,18 @@ def render_spending_heatmap(session, start_date: datetime, end_date: datetime) -
         month_order = df.groupby('month')['month_num'].first().sort_values()
         pivot = pivot.reindex(month_order.index)
 
-        # Create hover text with transaction count
-        hover_text = []
-        for month in pivot.index:
-            row_text = []
-            for day in pivot.columns:
-                month_data = df[(df['month'] == month) & (df['day'] == day)]
-                if not month_data.empty:
-                    amount = month_data['amount'].values[0]
-                    count = month_data['count'].values[0]
-                    text = f"<b>{month} {day}</b><br>Spent: {format_currency(amount)}<br>Transactions: {int(count)}"
-                else:
-                    text = f"<b>{month} {day}</b><br>No expenses"
-                row_text.append(text)
-            hover_text.append(row_text)
+        # Hover text with transaction count, laid out like the pivot
+        labels = '<b>' + df['month'] + ' ' + df['day'].astype(str) + '</b>'
+        df['text'] = (labels + '<br>Spent: ' + df['amount'].map(format_currency)
+                      + '<br>Transactions: ' + df['count'].astype(int).astype(str))
+        hover_text = df.pivot(index='month', columns='day', values='text').reindex(
+            index=pivot.index, columns=pivot.columns
+        )
+        no_expenses = pd.DataFrame(
+            [[f"<b>{month} {day}</b><br>No expenses" for day in pivot.columns] for month in pivot.index],
+            index=pivot.index, columns=pivot.columns
+        )
+        hover_text = hover_text.fillna(no_expenses).values.tolist()
 
         # Create heatmap
         fig = go.Figure(data=go.Heatmap(
@@ -208,8 +191,7 @@ def render_spending_heatmap(session, start_date: datetime, end_date: datetime) -
             text=hover_text,
             hovertemplate='%{text}<extra></extra>',
             colorbar=dict(
-                title='Amount (£)',
-                titleside='right',
+                title=dict(text='Amount (£)', side='right'),
                 tickprefix='£',
                 tickformat=',.0f',
                 len=0.7
@@ -280,10 +262,10 @@ def render_cash_flow_waterfall(session, start_date: datetime, end_date: datetime
         >>> render_cash_flow_waterfall(session, datetime(2024, 1, 1), datetime(2024, 12, 31), 10000.0)
     """
     try:
-        # Query monthly income and expenses
-        months = get_date_range_months(start_date, end_date)
+        # Monthly income and expenses
+        monthly = get_chart_data(session, start_date, end_date).monthly_totals()
 
-        if not months:
+        if monthly.empty:
             st.info("Date range too small for waterfall analysis.")
             return
 
@@ -298,26 +280,7 @@ def render_cash_flow_waterfall(session, start_date: datetime, end_date: datetime
             'color': METALLIC_COLORS['electric_blue']
         })
 
-        for month in months:
-            # Calculate month end
-            if month.month == 12:
-                month_end = datetime(month.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = datetime(month.year, month.month + 1, 1) - timedelta(days=1)
-
-            # Don't go beyond end_date
-            month_end = min(month_end, end_date)
-
-            # Get income for month
-            income = session.query(func.sum(Income.amount_gross)).filter(
-                and_(Income.date >= month, Income.date <= month_end)
-            ).scalar() or 0.0
-
-            # Get expenses for month
-            expenses = session.query(func.sum(Expense.amount)).filter(
-                and_(Expense.date >= month, Expense.date <= month_end)
-            ).scalar() or 0.0
-
+        for month, income, expenses in monthly[['month', 'income', 'expenses']].itertuples(index=False):
             month_label = month.strftime('%b %Y')
 
             if income > 0:
@@ -427,25 +390,13 @@ def render_expense_treemap(session, start_date: datetime, end_date: datetime) ->
         >>> render_expense_treemap(session, datetime(2024, 1, 1), datetime(2024, 12, 31))
     """
     try:
-        # Query expenses grouped by category and supplier
-        expenses = session.query(
-            Expense.category,
-            Expense.supplier,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            and_(
-                Expense.date >= start_date,
-                Expense.date <= end_date
-            )
-        ).group_by(Expense.category, Expense.supplier).all()
+        # Expenses grouped by category and supplier
+        df = get_chart_data(session, start_date, end_date).expenses_by('category', 'supplier')
 
-        if not expenses:
+        if df.empty:
             st.info("No expense data available for treemap visualization.")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame(expenses, columns=['category', 'supplier', 'amount'])
-
         # Add root level
         df['all'] = 'Total Expenses'
 
@@ -641,37 +592,20 @@ def render_spending_radar(session, start_date: datetime, end_date: datetime) ->
         >>> render_spending_radar(session, datetime(2024, 6, 1), datetime(2024, 6, 30))
     """
     try:
-        # Calculate period length
-        period_days = (end_date - start_date).days
-
-        # Previous period
-        prev_end = start_date - timedelta(days=1)
-        prev_start = prev_end - timedelta(days=period_days)
-
-        # Query current period expenses by category
-        current_expenses = session.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            and_(Expense.date >= start_date, Expense.date <= end_date)
-        ).group_by(Expense.category).all()
-
-        # Query previous period expenses by category
-        previous_expenses = session.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            and_(Expense.date >= prev_start, Expense.date <= prev_end)
-        ).group_by(Expense.category).all()
-
-        if not current_expenses and not previous_expenses:
+        # Previous period of the same length
+        prev_start, prev_end = previous_period(start_date, end_date)
+
+        # Expenses by category in both periods
+        data = get_chart_data(session, start_date, end_date)
+        df_current = data.expenses_by('category').rename(columns={'amount': 'current'})
+        df_previous = data.expenses_by('category', start=prev_start, end=prev_end).rename(
+            columns={'amount': 'previous'}
+        )
+
+        if df_current.empty and df_previous.empty:
             st.info("No expense data available for radar chart.")
             return
 
-        # Convert to DataFrames
-        df_current = pd.DataFrame(current_expenses, columns=['category', 'current'])
-        df_previous = pd.DataFrame(previous_expenses, columns=['category', 'previous'])
-
         # Merge data
         df = pd.merge(df_current, df_previous, on='category', how='outer').fillna(0)
 
@@ -802,44 +736,15 @@ def render_income_tax_timeline(session, start_date: datetime, end_date: datetime
         >>> render_income_tax_timeline(session, datetime(2024, 1, 1), datetime(2024, 12, 31))
     """
     try:
-        months = get_date_range_months(start_date, end_date)
+        # Monthly income and tax deducted (simplified - you may want to calculate from tax computation)
+        df = get_chart_data(session, start_date, end_date).monthly_totals()
 
-        if not months:
+        if df.empty:
             st.info("Date range too small for timeline analysis.")
             return
 
-        data = []
-
-        for month in months:
-            # Calculate month end
-            if month.month == 12:
-                month_end = datetime(month.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = datetime(month.year, month.month + 1, 1) - timedelta(days=1)
-
-            month_end = min(month_end, end_date)
-
-            # Get income for month
-            income = session.query(func.sum(Income.amount_gross)).filter(
-                and_(Income.date >= month, Income.date <= month_end)
-            ).scalar() or 0.0
-
-            # Get tax deducted (simplified - you may want to calculate from tax computation)
-            tax = session.query(func.sum(Income.tax_deducted)).filter(
-                and_(Income.date >= month, Income.date <= month_end)
-            ).scalar() or 0.0
-
-            # Calculate effective rate
-            tax_rate = (tax / income * 100) if income > 0 else 0
-
-            data.append({
-                'month': month,
-                'income': income,
-                'tax': tax,
-                'tax_rate': tax_rate
-            })
-
-        df = pd.DataFrame(data)
+        # Effective rate per month
+        df['tax_rate'] = (df['tax'] / df['income'] * 100).where(df['income'] > 0, 0.0)
 
         # Create figure with secondary y-axis
         fig = make_subplots(
@@ -984,39 +889,13 @@ def render_expense_velocity(session, start_date: datetime, end_date: datetime,
             period_label = 'Month'
             date_format = '%b %Y'
 
-        # Generate periods
-        periods = pd.date_range(start=start_date, end=end_date, freq=freq)
+        # Expenses per period
+        df = get_chart_data(session, start_date, end_date).period_expenses(granularity)
 
-        if len(periods) < 3:
+        if len(df) < 3:
             st.info("Date range too small for velocity analysis (need at least 3 periods).")
             return
 
-        data = []
-
-        for period_start in periods:
-            # Calculate period end
-            if granularity == 'weekly':
-                period_end = period_start + timedelta(days=6)
-            else:
-                if period_start.month == 12:
-                    period_end = datetime(period_start.year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    period_end = datetime(period_start.year, period_start.month + 1, 1) - timedelta(days=1)
-
-            period_end = min(period_end, end_date)
-
-            # Get expenses for period
-            expenses = session.query(func.sum(Expense.amount)).filter(
-                and_(Expense.date >= period_start, Expense.date <= period_end)
-            ).scalar() or 0.0
-
-            data.append({
-                'period': period_start,
-                'expenses': expenses
-            })
-
-        df = pd.DataFrame(data)
-
         # Calculate velocity (rate of change)
         df['velocity'] = df['expenses'].diff()
         df['acceleration'] = df['velocity'].diff()
@@ -1045,12 +924,9 @@ def render_expense_velocity(session, start_date: datetime, end_date: datetime,
             row=1, col=1
         )
 
-        # Add trend line
-        from sklearn.linear_model import LinearRegression
-        X = np.arange(len(df)).reshape(-1, 1)
-        y = df['expenses'].values
-        model = LinearRegression().fit(X, y)
-        trend = model.predict(X)
+        # Add trend line (least-squares fit over the period index)
+        trend_line = np.poly1d(np.polyfit(np.arange(len(df)), df['expenses'].values, 1))
+        trend = trend_line(np.arange(len(df)))
 
         fig.add_trace(
             go.Scatter(
@@ -1142,8 +1018,7 @@ def render_expense_velocity(session, start_date: datetime, end_date: datetime,
         # Predict end-of-year based on trend
         periods_remaining = 52 if granularity == 'weekly' else 12
         current_period = len(df)
-        future_X = np.arange(current_period, periods_remaining).reshape(-1, 1)
-        future_trend = model.predict(future_X)
+        future_trend = trend_line(np.arange(current_period, periods_remaining))
         predicted_total = df['expenses'].sum() + future_trend.sum()
 
         col1, col2, col3, col4 = st.columns(4)
@@ -1184,21 +1059,10 @@ def render_income_to_expense_sankey(session, start_date: datetime, end_date: dat
         >>> render_income_to_expense_sankey(session, datetime(2024, 1, 1), datetime(2024, 12, 31))
     """
     try:
-        # Query income by type
-        income_data = session.query(
-            Income.income_type,
-            func.sum(Income.amount_gross).label('total')
-        ).filter(
-            and_(Income.date >= start_date, Income.date <= end_date)
-        ).group_by(Income.income_type).all()
-
-        # Query expenses by category
-        expense_data = session.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            and_(Expense.date >= start_date, Expense.date <= end_date)
-        ).group_by(Expense.category).all()
+        # Income by type and expenses by category
+        data = get_chart_data(session, start_date, end_date)
+        income_data = list(data.income_by_type()[['income_type', 'amount']].itertuples(index=False))
+        expense_data = list(data.expenses_by('category').itertuples(index=False))
 
         if not income_data or not expense_data:
             st.info("Insufficient data for Sankey diagram (need both income and expenses).")
@@ -1315,22 +1179,10 @@ def render_tax_efficiency_sunburst(session, start_date: datetime, end_date: date
         >>> render_tax_efficiency_sunburst(session, datetime(2024, 1, 1), datetime(2024, 12, 31))
     """
     try:
-        # Get income data
-        income_data = session.query(
-            Income.income_type,
-            func.sum(Income.amount_gross).label('amount')
-        ).filter(
-            and_(Income.date >= start_date, Income.date <= end_date)
-        ).group_by(Income.income_type).all()
-
-        # Get expense data (category + supplier)
-        expense_data = session.query(
-            Expense.category,
-            Expense.supplier,
-            func.sum(Expense.amount).label('amount')
-        ).filter(
-            and_(Expense.date >= start_date, Expense.date <= end_date)
-        ).group_by(Expense.category, Expense.supplier).all()
+        # Income by type and expenses by category + supplier
+        data = get_chart_data(session, start_date, end_date)
+        income_data = list(data.income_by_type()[['income_type', 'amount']].itertuples(index=False))
+        expense_data = list(data.expenses_by('category', 'supplier').itertuples(index=False))
 
         if not income_data and not expense_data:
             st.info("No data available for sunburst visualization.")
@@ -1456,40 +1308,13 @@ def render_quarterly_dashboard(session, year: int) -> None:
     """
     try:
         # UK tax year: April 6 to April 5
-        quarters = [
-            ("Q1", datetime(year, 4, 6), datetime(year, 7, 5)),
-            ("Q2", datetime(year, 7, 6), datetime(year, 10, 5)),
-            ("Q3", datetime(year, 10, 6), datetime(year + 1, 1, 5)),
-            ("Q4", datetime(year + 1, 1, 6), datetime(year + 1, 4, 5))
-        ]
-
-        quarterly_data = []
-
-        for q_name, q_start, q_end in quarters:
-            # Get income
-            income = session.query(func.sum(Income.amount_gross)).filter(
-                and_(Income.date >= q_start, Income.date <= q_end)
-            ).scalar() or 0.0
-
-            # Get expenses
-            expenses = session.query(func.sum(Expense.amount)).filter(
-                and_(Expense.date >= q_start, Expense.date <= q_end)
-            ).scalar() or 0.0
-
-            # Calculate profit and estimated tax (simplified at 20%)
-            profit = income - expenses
-            estimated_tax = max(0, profit * 0.20) if profit > 12570 else 0  # Simplified
-
-            quarterly_data.append({
-                'quarter': q_name,
-                'income': income,
-                'expenses': expenses,
-                'profit': profit,
-                'tax': estimated_tax,
-                'net': profit - estimated_tax
-            })
+        data = get_chart_data(session, datetime(year, 4, 6), datetime(year + 1, 4, 5))
+        df = data.quarterly_totals(year)
 
-        df = pd.DataFrame(quarterly_data)
+        # Calculate profit and estimated tax (simplified at 20%)
+        df['profit'] = df['income'] - df['expenses']
+        df['tax'] = np.where(df['profit'] > 12570, df['profit'] * 0.20, 0.0)  # Simplified
+        df['net'] = df['profit'] - df['tax']
 
         # Create 2x2 subplot grid
         fig = make_subplots(
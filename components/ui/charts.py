@@ -12,6 +12,7 @@ from typing import Optional, List
 from sqlalchemy import and_, func, extract
 from models import Transaction, Income, Expense, Mileage
 from utils import format_currency
+from chart_data import get_chart_data
 
 
 # Color scheme matching UI theme
@@ -49,24 +50,15 @@ def render_expense_breakdown_chart(session, start_date: datetime, end_date: date
         None (displays chart directly using st.plotly_chart)
     """
     try:
-        # Query expenses grouped by category
-        expense_data = session.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            and_(
-                Expense.date >= start_date,
-                Expense.date <= end_date
-            )
-        ).group_by(Expense.category).all()
+        # Expenses grouped by category
+        df = get_chart_data(session, start_date, end_date).expenses_by('category')
 
         # Handle empty data
-        if not expense_data or len(expense_data) == 0:
+        if df.empty:
             st.info("No expense data available for the selected date range.")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame(expense_data, columns=['Category', 'Amount'])
+        df.columns = ['Category', 'Amount']
         df = df.sort_values('Amount', ascending=False)
 
         # Calculate percentages
@@ -143,46 +135,15 @@ def render_income_vs_expenses_chart(session, start_date: datetime, end_date: dat
         None (displays chart directly using st.plotly_chart)
     """
     try:
-        # Generate monthly date range
-        months = pd.date_range(start=start_date, end=end_date, freq='MS')
+        # Monthly totals
+        monthly = get_chart_data(session, start_date, end_date).monthly_totals()
 
-        if len(months) == 0:
+        if monthly.empty:
             st.info("Date range too small for monthly comparison.")
             return
 
-        income_data = []
-        expense_data = []
-
-        # Query data for each month
-        for month_start in months:
-            # Calculate month end
-            if month_start.month == 12:
-                month_end = datetime(month_start.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = datetime(month_start.year, month_start.month + 1, 1) - timedelta(days=1)
-
-            # Get income for month
-            income_total = session.query(func.sum(Income.amount_gross)).filter(
-                and_(
-                    Income.date >= month_start,
-                    Income.date <= month_end
-                )
-            ).scalar() or 0.0
-
-            # Get expenses for month
-            expense_total = session.query(func.sum(Expense.amount)).filter(
-                and_(
-                    Expense.date >= month_start,
-                    Expense.date <= month_end
-                )
-            ).scalar() or 0.0
-
-            income_data.append({'Month': month_start, 'Amount': income_total})
-            expense_data.append({'Month': month_start, 'Amount': expense_total})
-
-        # Convert to DataFrames
-        df_income = pd.DataFrame(income_data)
-        df_expense = pd.DataFrame(expense_data)
+        df_income = monthly[['month', 'income']].set_axis(['Month', 'Amount'], axis=1)
+        df_expense = monthly[['month', 'expenses']].set_axis(['Month', 'Amount'], axis=1)
 
         # Create figure with secondary y-axis
         fig = go.Figure()
@@ -293,50 +254,19 @@ def render_monthly_comparison_bars(session, start_date: datetime, end_date: date
         None (displays chart directly using st.plotly_chart)
     """
     try:
-        # Generate monthly date range
-        months = pd.date_range(start=start_date, end=end_date, freq='MS')
+        # Monthly totals
+        monthly = get_chart_data(session, start_date, end_date).monthly_totals()
 
-        if len(months) == 0:
+        if monthly.empty:
             st.info("Date range too small for monthly comparison.")
             return
 
-        data = []
-
-        # Query data for each month
-        for month_start in months:
-            # Calculate month end
-            if month_start.month == 12:
-                month_end = datetime(month_start.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = datetime(month_start.year, month_start.month + 1, 1) - timedelta(days=1)
-
-            # Get income for month
-            income_total = session.query(func.sum(Income.amount_gross)).filter(
-                and_(
-                    Income.date >= month_start,
-                    Income.date <= month_end
-                )
-            ).scalar() or 0.0
-
-            # Get expenses for month
-            expense_total = session.query(func.sum(Expense.amount)).filter(
-                and_(
-                    Expense.date >= month_start,
-                    Expense.date <= month_end
-                )
-            ).scalar() or 0.0
-
-            profit = income_total - expense_total
-
-            data.append({
-                'Month': month_start.strftime('%b %Y'),
-                'Income': income_total,
-                'Expenses': expense_total,
-                'Profit': profit
-            })
-
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+        df = pd.DataFrame({
+            'Month': monthly['month'].dt.strftime('%b %Y'),
+            'Income': monthly['income'],
+            'Expenses': monthly['expenses'],
+            'Profit': monthly['income'] - monthly['expenses']
+        })
 
         # Create grouped bar chart
         fig = go.Figure()
@@ -736,24 +666,15 @@ def render_income_sources_chart(session, start_date: datetime, end_date: datetim
         None (displays chart directly using st.plotly_chart)
     """
     try:
-        # Query income grouped by type
-        income_data = session.query(
-            Income.income_type,
-            func.sum(Income.amount_gross).label('total')
-        ).filter(
-            and_(
-                Income.date >= start_date,
-                Income.date <= end_date
-            )
-        ).group_by(Income.income_type).all()
+        # Income grouped by type
+        df = get_chart_data(session, start_date, end_date).income_by_type()
 
         # Handle empty data
-        if not income_data or len(income_data) == 0:
+        if df.empty:
             st.info("No income data available for the selected date range.")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame(income_data, columns=['Income Type', 'Amount'])
+        df = df[['income_type', 'amount']].set_axis(['Income Type', 'Amount'], axis=1)
         df = df.sort_values('Amount', ascending=False)
 
         # Calculate percentages
@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from models import Transaction, Income, Expense, Mileage, Donation
 from utils import format_currency, get_tax_year_dates
+from monthly_rollup import monthly_totals, month_label
 from components.ui.theme import OBSIDIAN, plotly_obsidian_layout
 
 
@@ -194,30 +195,14 @@ def render_restructured_dashboard(session, settings):
         </div>
         """, unsafe_allow_html=True)
 
-        monthly_data = []
-        for month in range(1, 13):
-            month_start = datetime(2024 if month >= 4 else 2025, month, 1)
-            if month == 12:
-                month_end = datetime(2025, 1, 1)
-            else:
-                month_end = datetime(2024 if month >= 4 else 2025, month + 1, 1)
-
-            month_income = session.query(func.sum(Income.amount_gross)).filter(
-                and_(Income.date >= month_start, Income.date < month_end)
-            ).scalar() or 0
-
-            month_expenses = session.query(func.sum(Expense.amount)).filter(
-                and_(Expense.date >= month_start, Expense.date < month_end)
-            ).scalar() or 0
-
-            monthly_data.append({
-                'Month': month_start.strftime('%b %Y'),
-                'Income': month_income,
-                'Expenses': month_expenses,
-                'Profit': month_income - month_expenses
-            })
-
-        df_monthly = pd.DataFrame(monthly_data)
+        # Twelve precomputed rows per ledger from the monthly rollup
+        df_monthly = pd.merge(
+            monthly_totals(session, 'income', tax_year)[['month', 'amount']].rename(columns={'amount': 'Income'}),
+            monthly_totals(session, 'expense', tax_year)[['month', 'amount']].rename(columns={'amount': 'Expenses'}),
+            on='month', how='outer'
+        ).fillna(0).sort_values('month')
+        df_monthly['Month'] = df_monthly['month'].map(month_label)
+        df_monthly['Profit'] = df_monthly['Income'] - df_monthly['Expenses']
 
         fig = go.Figure()
         fig.add_trace(go.Bar(
@@ -0,0 +1,135 @@
+"""
+Data version registry for Tax Helper
+Per-table generation counters that move whenever a session writes to a
+table, so cached results can be keyed on the data they were built from
+instead of expiring on a timer, and sessions kept between page loads
+expire only the objects whose tables changed
+"""
+
+import threading
+from itertools import chain
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+
+
+_generations = {}
+_lock = threading.Lock()
+
+# session.info key for tables written since the last commit/rollback
+_PENDING_KEY = 'data_versions_pending'
+
+# session.info key for the generations a session's objects were last checked against
+_SEEN_KEY = 'data_versions_seen'
+
+
+def bump_tables(tables: Iterable[str]) -> None:
+    """Advance the generation of each table"""
+    with _lock:
+        for table in tables:
+            _generations[table] = _generations.get(table, 0) + 1
+
+
+def table_versions(*tables: str) -> Tuple[int, ...]:
+    """
+    Current generations of the given tables
+
+    Pass the result as an argument of a cached function so its entries
+    are replaced as soon as any of the tables changes:
+
+        @st.cache_data(ttl=6 * 3600)
+        def _load_rules(_session, data_version): ...
+
+        _load_rules(session, table_versions('rules'))
+    """
+    with _lock:
+        return tuple(_generations.get(table, 0) for table in tables)
+
+
+def version_snapshot() -> Dict[str, int]:
+    """Generations of every table written so far"""
+    with _lock:
+        return dict(_generations)
+
+
+def has_pending_writes(session) -> bool:
+    """True if the session wrote (flushed or executed) anything it has not committed"""
+    return bool(session.info.get(_PENDING_KEY))
+
+
+def expire_changed(session, dependents: Optional[Dict[str, Iterable[str]]] = None) -> Set[str]:
+    """
+    Expire the session's objects from tables written since its last check
+
+    Objects of every other table keep their loaded state, so a session kept
+    between page loads only reloads what actually changed. The first check
+    of a session counts every table written since the process started.
+
+    Args:
+        session: SQLAlchemy session
+        dependents: Table -> tables that triggers rewrite along with it
+            (e.g. the ledgers -> monthly_rollup)
+
+    Returns:
+        Names of the changed tables (empty when nothing changed)
+    """
+    seen = session.info.get(_SEEN_KEY, {})
+    current = version_snapshot()
+    session.info[_SEEN_KEY] = current
+
+    changed = {table for table, generation in current.items() if seen.get(table, 0) != generation}
+    for table in list(changed):
+        changed.update((dependents or {}).get(table, ()))
+    if not changed:
+        return changed
+
+    for obj in list(session.identity_map.values()):
+        if inspect(obj).mapper.local_table.name in changed:
+            session.expire(obj)
+    return changed
+
+
+def _record_writes(session, tables) -> None:
+    tables = set(tables)
+    if not tables:
+        return
+    session.info.setdefault(_PENDING_KEY, set()).update(tables)
+    bump_tables(tables)
+
+
+def _after_flush(session, flush_context):
+    """ORM unit-of-work writes (add, change, delete)"""
+    _record_writes(session, (
+        inspect(obj).mapper.local_table.name
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ))
+
+
+def _on_execute(orm_execute_state):
+    """Bulk INSERT/UPDATE/DELETE statements run through the session"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        name = getattr(table, 'name', None)
+        if name:
+            _record_writes(orm_execute_state.session, (name,))
+
+
+def _after_transaction(session):
+    """
+    Bump written tables again once the transaction ends
+
+    The first bump happens at write time so the writing session sees its own
+    changes; this one stops other sessions from caching rows they read
+    before the commit (or rollback) under the new generation.
+    """
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        bump_tables(pending)
+
+
+def track_data_versions(session_factory) -> None:
+    """Register the version hooks on a sessionmaker (or Session class)"""
+    event.listen(session_factory, 'after_flush', _after_flush)
+    event.listen(session_factory, 'do_orm_execute', _on_execute)
+    event.listen(session_factory, 'after_commit', _after_transaction)
+    event.listen(session_factory, 'after_rollback', _after_transaction)
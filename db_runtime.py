@@ -0,0 +1,204 @@
+"""
+Process-wide database runtime for Tax Helper
+One engine, connection pool and session factory per database file, shared by
+every browser session and rerun of the Streamlit app, so the engine is built,
+PRAGMA-configured and checked against the schema once per process instead of
+on every rerun
+
+Each browser session keeps one ORM session in st.session_state. Between
+reruns it holds no connection: end_rerun() ends its transaction without
+expiring what it loaded. begin_rerun() then expires only the objects whose
+tables were written since (see data_versions.expire_changed), so a review
+list re-renders from the identity map instead of reloading every row.
+Writes made outside this process (scripts, another app instance) are
+noticed through PRAGMA data_version and expire everything.
+"""
+
+import sqlite3
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, MutableMapping, Optional
+
+import streamlit as st
+from sqlalchemy import text
+
+from models import init_db, seed_default_data
+from monthly_rollup import ROLLUP_LEDGERS
+from data_versions import expire_changed, has_pending_writes, version_snapshot
+
+
+# Key of the ORM session in st.session_state
+SESSION_KEY = 'db_session'
+
+# session.info key for the external-write count a session last saw
+_EXTERNAL_KEY = 'db_runtime_external_writes'
+
+# Tables rewritten by triggers when a ledger table changes
+TRIGGER_DEPENDENTS = {spec['table']: ['monthly_rollup'] for spec in ROLLUP_LEDGERS.values()}
+
+
+@dataclass
+class DatabaseHealth:
+    """Result of a database health check"""
+    ok: bool
+    latency_ms: float
+    journal_mode: Optional[str] = None
+    error: Optional[str] = None
+    pool: Dict = field(default_factory=dict)
+
+
+class DatabaseRuntime:
+    """
+    Engine, pool and session factory for one database file
+
+    Usage:
+        db = get_database(DB_PATH)
+        session = db.begin_rerun(st.session_state)
+        ...render the page...
+        db.end_rerun(st.session_state)
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.engine, self.Session = init_db(db_path)
+        self.started_at = time.time()
+        self.reruns = 0
+        self.refreshes_skipped = 0
+        self._sessions = weakref.WeakSet()
+
+        # Watches for commits by other connections; see external_writes()
+        self._watch_lock = threading.Lock()
+        self._watcher = None
+        if db_path != ':memory:':
+            self._watcher = sqlite3.connect(db_path, check_same_thread=False)
+        self._data_version = self._read_data_version()
+        self._generation_total = sum(version_snapshot().values())
+        self._external_writes = 0
+
+        # Settings and rules are seeded once per process, not once per browser session
+        with self.Session() as session:
+            seed_default_data(session)
+
+    def _read_data_version(self) -> Optional[int]:
+        if self._watcher is None:
+            return None
+        return self._watcher.execute('PRAGMA data_version').fetchone()[0]
+
+    def external_writes(self) -> int:
+        """
+        Number of times a write from outside this process has been noticed
+
+        PRAGMA data_version on the watcher connection moves whenever another
+        connection commits. If it moved while no session of this process
+        wrote anything, the write came from elsewhere. A write made in the
+        same interval as one from this process is taken to be ours, and is
+        picked up with the next external write or process restart.
+        """
+        with self._watch_lock:
+            data_version = self._read_data_version()
+            generation_total = sum(version_snapshot().values())
+            if data_version != self._data_version and generation_total == self._generation_total:
+                self._external_writes += 1
+            self._data_version = data_version
+            self._generation_total = generation_total
+            return self._external_writes
+
+    def begin_rerun(self, state: MutableMapping):
+        """
+        The browser session's ORM session, refreshed for this rerun
+
+        Args:
+            state: Per-browser-session storage (st.session_state), which keeps
+                the session between reruns and drops it with the browser session
+
+        Returns:
+            Session whose objects from changed tables are expired
+        """
+        self.reruns += 1
+        session = state.get(SESSION_KEY)
+        if session is None:
+            session = self.Session()
+            self._sessions.add(session)
+            state[SESSION_KEY] = session
+        else:
+            # The previous run may have stopped early (st.rerun(), st.stop(), an error)
+            self._release(session)
+
+        external = self.external_writes()
+        if session.info.get(_EXTERNAL_KEY, external) != external:
+            session.expire_all()
+        session.info[_EXTERNAL_KEY] = external
+
+        if not expire_changed(session, TRIGGER_DEPENDENTS):
+            self.refreshes_skipped += 1
+        return session
+
+    def end_rerun(self, state: MutableMapping) -> None:
+        """Return the browser session's connection to the pool, keeping its objects loaded"""
+        session = state.get(SESSION_KEY)
+        if session is not None:
+            self._release(session)
+
+    def _release(self, session) -> None:
+        if session.new or session.dirty or session.deleted or has_pending_writes(session):
+            # Changes a run left uncommitted are discarded, not committed by the next one
+            session.rollback()
+        elif session.in_transaction():
+            # End the read-only transaction without expiring what it loaded
+            expire_on_commit = session.expire_on_commit
+            session.expire_on_commit = False
+            try:
+                session.commit()
+            finally:
+                session.expire_on_commit = expire_on_commit
+
+    def pool_stats(self) -> Dict:
+        """
+        Connection pool counters
+
+        Returns:
+            Dictionary with the pool class and status, plus size, checked-in,
+            checked-out and overflow counts where the pool keeps them
+        """
+        pool = self.engine.pool
+        stats = {'pool': type(pool).__name__, 'status': pool.status()}
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            counter = getattr(pool, name, None)
+            if callable(counter):
+                stats[name] = counter()
+        stats['open_sessions'] = len(self._sessions)
+        stats['reruns'] = self.reruns
+        stats['refreshes_skipped'] = self.refreshes_skipped
+        stats['external_writes'] = self._external_writes
+        stats['uptime_seconds'] = round(time.time() - self.started_at)
+        return stats
+
+    def health(self) -> DatabaseHealth:
+        """Round-trip a query on a pooled connection and report pool stats"""
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text('SELECT 1')).scalar()
+                journal_mode = connection.execute(text('PRAGMA journal_mode')).scalar()
+        except Exception as e:
+            return DatabaseHealth(ok=False, latency_ms=(time.perf_counter() - started) * 1000,
+                                  error=str(e), pool=self.pool_stats())
+        return DatabaseHealth(ok=True, latency_ms=(time.perf_counter() - started) * 1000,
+                              journal_mode=journal_mode, pool=self.pool_stats())
+
+    def dispose(self) -> None:
+        """Close every session, the watcher and every pooled connection"""
+        for session in list(self._sessions):
+            session.close()
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        self.engine.dispose()
+
+
+@st.cache_resource(show_spinner=False)
+def get_database(db_path: str) -> DatabaseRuntime:
+    """The process-wide DatabaseRuntime for a database file, created on first use"""
+    return DatabaseRuntime(db_path)
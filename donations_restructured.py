@@ -6,11 +6,12 @@ Complete UI overhaul for Gift Aid donations tracking
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from sqlalchemy import func, extract, and_
+from sqlalchemy import func, and_
 import plotly.graph_objects as go
 import plotly.express as px
 from models import Donation
 from utils import format_currency, get_tax_year_dates
+from monthly_rollup import monthly_totals, month_label
 from components.ui.interactions import show_toast, confirm_delete, validate_field, show_validation
 
 def render_restructured_donations_screen(session, settings):
@@ -366,25 +367,13 @@ def render_restructured_donations_screen(session, settings):
             # Monthly donations chart
             st.markdown("#### 📈 Monthly Donation Trend")
             
-            monthly_donations = session.query(
-                extract('month', Donation.date).label('month'),
-                extract('year', Donation.date).label('year'),
-                func.sum(Donation.amount_paid).label('total'),
-                func.count(Donation.id).label('count')
-            ).filter(
-                and_(Donation.date >= start_date, Donation.date <= end_date)
-            ).group_by('year', 'month').order_by('year', 'month').all()
+            monthly_donations = monthly_totals(session, 'donation', tax_year)
+            monthly_donations = monthly_donations[monthly_donations['entry_count'] > 0]
             
-            if monthly_donations:
-                months = []
-                amounts = []
-                counts = []
-                
-                for record in monthly_donations:
-                    month_name = datetime(int(record.year), int(record.month), 1).strftime('%b %Y')
-                    months.append(month_name)
-                    amounts.append(float(record.total))
-                    counts.append(record.count)
+            if not monthly_donations.empty:
+                months = monthly_donations['month'].map(month_label).tolist()
+                amounts = monthly_donations['amount'].tolist()
+                counts = monthly_donations['entry_count'].tolist()
                 
                 fig = go.Figure()
                 
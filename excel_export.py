@@ -0,0 +1,183 @@
+"""
+Streaming Excel export for Tax Helper
+Writes workbooks through openpyxl write-only worksheets so rows go straight
+from a query cursor to the file instead of being held as ORM objects and
+worksheet cells
+
+Write-only worksheets need column widths before their first row, so sheets
+sized to their contents spool rows to a temporary file while the widths
+are measured, then replay them into the worksheet. Sheets with fixed
+widths are streamed directly.
+"""
+
+import pickle
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+
+# Rows fetched per database round trip, and rows pickled per spool write
+EXPORT_BATCH_SIZE = 1000
+
+# Auto-sized columns get the longest value plus padding, capped
+COLUMN_PADDING = 2
+MAX_COLUMN_WIDTH = 50
+
+DEFAULT_HEADER_COLOR = "366092"
+
+
+def stream_query(query, batch_size: int = EXPORT_BATCH_SIZE):
+    """Iterate a query's rows a batch at a time (column queries avoid building ORM objects)"""
+    return query.yield_per(batch_size)
+
+
+class StreamingWorkbook:
+    """
+    Write-only workbook built one sheet at a time
+
+    Usage:
+        book = StreamingWorkbook()
+        book.add_sheet("Income", stream_query(query), headers=["Date", "Source", "Amount"],
+                       number_formats={3: '£#,##0.00'})
+        book.save(path_or_bytes_io)
+
+    create_sheet, write_top and write_rows build a sheet in parts, e.g. to
+    give different rows different number formats.
+    """
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+
+    def add_sheet(
+        self,
+        title: str,
+        rows: Iterable[Sequence],
+        headers: Optional[List[str]] = None,
+        heading: Optional[str] = None,
+        widths: Optional[List[float]] = None,
+        number_formats: Optional[Dict[int, str]] = None,
+        header_color: str = DEFAULT_HEADER_COLOR
+    ) -> int:
+        """
+        Append a worksheet
+
+        Args:
+            title: Sheet name
+            rows: Row values in order (any iterable, e.g. a streamed query)
+            headers: Styled header row
+            heading: Bold title written above the headers, followed by a blank row
+            widths: Fixed column widths; when omitted columns are sized to
+                their longest value
+            number_formats: 1-based column number -> number format for data rows
+            header_color: Header fill colour
+
+        Returns:
+            Number of data rows written
+        """
+        number_formats = number_formats or {}
+
+        if widths is not None:
+            worksheet = self.create_sheet(title, widths)
+            self.write_top(worksheet, heading, headers, header_color)
+            return self.write_rows(worksheet, rows, number_formats)
+
+        measured = [len(str(value)) for value in headers or []]
+        with tempfile.TemporaryFile() as spool:
+            count = 0
+            batch = []
+            for row in rows:
+                row = tuple(row)
+                for index, value in enumerate(row):
+                    if value is None:
+                        continue
+                    length = len(str(value))
+                    if index >= len(measured):
+                        measured.extend([0] * (index + 1 - len(measured)))
+                    if length > measured[index]:
+                        measured[index] = length
+                batch.append(row)
+                if len(batch) >= EXPORT_BATCH_SIZE:
+                    pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+                count += len(batch)
+
+            worksheet = self.create_sheet(
+                title, [min(length + COLUMN_PADDING, MAX_COLUMN_WIDTH) for length in measured]
+            )
+            self.write_top(worksheet, heading, headers, header_color)
+
+            spool.seek(0)
+            self.write_rows(worksheet, _replay(spool, count), number_formats)
+
+        return count
+
+    def save(self, target) -> None:
+        """Write the workbook to a file path or binary file object (e.g. BytesIO)"""
+        self.workbook.save(target)
+
+    def create_sheet(self, title: str, widths: Optional[List[float]] = None):
+        """Append an empty write-only worksheet with fixed column widths"""
+        worksheet = self.workbook.create_sheet(title)
+        for index, width in enumerate(widths or [], 1):
+            worksheet.column_dimensions[get_column_letter(index)].width = width
+        return worksheet
+
+    def write_top(self, worksheet, heading: Optional[str] = None, headers: Optional[List[str]] = None,
+                  header_color: str = DEFAULT_HEADER_COLOR) -> None:
+        """Write the optional heading and styled header row (before any data rows)"""
+        if heading:
+            cell = WriteOnlyCell(worksheet, value=heading)
+            cell.font = Font(size=14, bold=True)
+            worksheet.append([cell])
+            worksheet.append([])
+
+        if headers:
+            font = Font(bold=True, color="FFFFFF")
+            fill = PatternFill(start_color=header_color, end_color=header_color, fill_type="solid")
+            alignment = Alignment(horizontal="center", vertical="center")
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(worksheet, value=header)
+                cell.font = font
+                cell.fill = fill
+                cell.alignment = alignment
+                header_cells.append(cell)
+            worksheet.append(header_cells)
+
+    @staticmethod
+    def write_rows(worksheet, rows: Iterable[Sequence], number_formats: Optional[Dict[int, str]] = None) -> int:
+        """Append rows, applying 1-based column number -> number format; returns the row count"""
+        count = 0
+        if not number_formats:
+            for row in rows:
+                worksheet.append(tuple(row))
+                count += 1
+            return count
+
+        formats = sorted((column - 1, number_format) for column, number_format in number_formats.items())
+        for row in rows:
+            row = list(row)
+            for index, number_format in formats:
+                if index < len(row) and row[index] is not None:
+                    cell = WriteOnlyCell(worksheet, value=row[index])
+                    cell.number_format = number_format
+                    row[index] = cell
+            worksheet.append(row)
+            count += 1
+        return count
+
+
+def _replay(spool, count: int):
+    """Rows spooled by add_sheet, in order"""
+    remaining = count
+    while remaining > 0:
+        batch = pickle.load(spool)
+        remaining -= len(batch)
+        yield from batch
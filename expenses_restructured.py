@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from models import Expense, EXPENSE_CATEGORIES
 from utils import format_currency
+from monthly_rollup import monthly_totals, month_label
 from collections import defaultdict, Counter
 from components.ui.interactions import show_toast, confirm_delete, validate_field, show_validation
 
@@ -879,23 +880,10 @@ def render_restructured_expense_screen(session, settings):
             st.markdown("<br>", unsafe_allow_html=True)
             st.markdown("#### Monthly Expense Trend")
 
-            monthly_data = {}
-            for record in all_expenses:
-                month = record.date.strftime('%Y-%m')
-                month_display = record.date.strftime('%b %Y')
-                if month not in monthly_data:
-                    monthly_data[month] = {
-                        'display': month_display,
-                        'total': 0,
-                        'count': 0
-                    }
-                monthly_data[month]['total'] += float(record.amount)
-                monthly_data[month]['count'] += 1
-
-            months = sorted(monthly_data.keys())
-            months_display = [monthly_data[m]['display'] for m in months]
-            expense_trend = [monthly_data[m]['total'] for m in months]
-            count_trend = [monthly_data[m]['count'] for m in months]
+            monthly_data = monthly_totals(session, 'expense')
+            months_display = monthly_data['month'].map(month_label).tolist()
+            expense_trend = monthly_data['amount'].tolist()
+            count_trend = monthly_data['entry_count'].tolist()
 
             fig_trend = go.Figure()
 
@@ -0,0 +1,93 @@
+"""
+Transaction fingerprints for Tax Helper
+Stable hash of date, normalized description and amount used to spot
+transactions that have already been imported
+"""
+
+import hashlib
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from text_normalizer import normalize_description, normalize_descriptions
+
+
+def amount_in_pence(paid_in: float, paid_out: float) -> int:
+    """Signed amount in integer pence (money in positive, money out negative)"""
+    return int(round((paid_in or 0.0) * 100)) - int(round((paid_out or 0.0) * 100))
+
+
+def _hash_key(date_text: str, normalized: str, pence: int, occurrence: int) -> str:
+    return hashlib.sha1(f"{date_text}|{normalized}|{pence}|{occurrence}".encode('utf-8')).hexdigest()
+
+
+def transaction_fingerprint(txn_date, description: str, paid_in: float, paid_out: float,
+                            occurrence: int = 0) -> str:
+    """
+    Fingerprint for one transaction
+
+    Args:
+        txn_date: Transaction date
+        description: Raw description (normalized here)
+        paid_in: Money in
+        paid_out: Money out
+        occurrence: 0 for the first transaction with this date, description
+            and amount; 1 for the second identical one, and so on. This lets
+            genuinely repeated purchases (two coffees on one day) coexist
+            under the unique index.
+    """
+    return _hash_key(
+        txn_date.strftime('%Y-%m-%d'),
+        normalize_description(description),
+        amount_in_pence(paid_in, paid_out),
+        occurrence
+    )
+
+
+def fingerprint_frame(df: pd.DataFrame) -> pd.Series:
+    """
+    Fingerprints for every row of a parsed statement
+
+    Identical rows are numbered in file order, matching transaction_fingerprint's
+    occurrence argument.
+
+    Args:
+        df: DataFrame with date, description, paid_in and paid_out columns
+
+    Returns:
+        Series of fingerprints with the DataFrame's index
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+
+    dates = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+    normalized = normalize_descriptions(df['description'])
+    paid_in = np.rint(df['paid_in'].astype(float).fillna(0.0).to_numpy() * 100)
+    paid_out = np.rint(df['paid_out'].astype(float).fillna(0.0).to_numpy() * 100)
+    pence = (paid_in - paid_out).astype(np.int64)
+
+    keys = pd.DataFrame({'date': dates.to_numpy(), 'normalized': normalized.to_numpy(), 'pence': pence})
+    occurrence = keys.groupby(['date', 'normalized', 'pence'], sort=False).cumcount().to_numpy()
+
+    return pd.Series(
+        [_hash_key(*row) for row in zip(keys['date'], keys['normalized'], keys['pence'].tolist(), occurrence.tolist())],
+        index=df.index,
+        dtype=object
+    )
+
+
+class FingerprintCounter:
+    """
+    Assigns occurrence numbers while walking existing transactions in order
+    (used when backfilling fingerprints)
+    """
+
+    def __init__(self):
+        self._seen: Dict[Tuple[str, str, int], int] = {}
+
+    def fingerprint(self, txn_date, description: str, paid_in: float, paid_out: float) -> str:
+        key = (txn_date.strftime('%Y-%m-%d'), normalize_description(description), amount_in_pence(paid_in, paid_out))
+        occurrence = self._seen.get(key, 0)
+        self._seen[key] = occurrence + 1
+        return _hash_key(*key, occurrence)
@@ -4,12 +4,12 @@ Complete UI overhaul while maintaining all CSV import functionality
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from sqlalchemy import func
 import plotly.graph_objects as go
 from models import Transaction, Rule
 from utils import parse_csv, format_currency
+from transaction_import import bulk_import_transactions
 from components.ui.interactions import show_toast
 
 def render_restructured_import_screen(session, settings):
@@ -609,40 +609,11 @@ def render_restructured_import_screen(session, settings):
                             progress_bar = st.progress(0)
                             status_text = st.empty()
                             
-                            imported_count = 0
-                            total = len(df)
+                            status_text.text(f"Importing {len(df)} transactions...")
+                            imported_ids = bulk_import_transactions(session, df, account_name=selected_account)
+                            imported_count = len(imported_ids)
+                            progress_bar.progress(1.0)
                             
-                            for idx, row in df.iterrows():
-                                # Update progress
-                                progress = (idx + 1) / total
-                                progress_bar.progress(progress)
-                                status_text.text(f"Importing transaction {idx + 1} of {total}...")
-                                
-                                # Create transaction
-                                transaction = Transaction(
-                                    date=row['date'],
-                                    type=row.get('type', ''),
-                                    description=row['description'],
-                                    paid_out=row['paid_out'],
-                                    paid_in=row['paid_in'],
-                                    balance=row.get('balance', 0.0),
-                                    guessed_type=row['guessed_type'],
-                                    guessed_category=row['guessed_category'],
-                                    is_personal=row['is_personal'],
-                                    reviewed=row['reviewed'],
-                                    notes=row['notes'],
-                                    confidence_score=row.get('confidence_score', 0),
-                                    merchant_confidence=row.get('merchant_confidence', 0),
-                                    pattern_confidence=row.get('pattern_confidence', 0),
-                                    pattern_type=row.get('pattern_type', None),
-                                    pattern_metadata=row.get('pattern_metadata', None),
-                                    requires_review=row.get('requires_review', False),
-                                    account_name=selected_account
-                                )
-                                session.add(transaction)
-                                imported_count += 1
-                            
-                            session.commit()
                             st.session_state.import_step = 4
                             
                             # Clear progress indicators
@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from models import Income, INCOME_TYPES
 from utils import format_currency
+from monthly_rollup import monthly_totals, month_label
 from components.ui.interactions import show_toast, confirm_delete, validate_field, show_validation
 
 def render_restructured_income_screen(session, settings):
@@ -925,25 +926,10 @@ def render_restructured_income_screen(session, settings):
             st.markdown("<br>", unsafe_allow_html=True)
             st.markdown("#### Monthly Income Trend")
 
-            monthly_data = {}
-            for record in all_income:
-                month = record.date.strftime('%Y-%m')
-                month_display = record.date.strftime('%b %Y')
-                if month not in monthly_data:
-                    monthly_data[month] = {
-                        'display': month_display,
-                        'gross': 0,
-                        'net': 0,
-                        'count': 0
-                    }
-                monthly_data[month]['gross'] += float(record.amount_gross)
-                monthly_data[month]['net'] += float(record.amount_gross - record.tax_deducted)
-                monthly_data[month]['count'] += 1
-
-            months = sorted(monthly_data.keys())
-            months_display = [monthly_data[m]['display'] for m in months]
-            gross_trend = [monthly_data[m]['gross'] for m in months]
-            net_trend = [monthly_data[m]['net'] for m in months]
+            monthly_data = monthly_totals(session, 'income')
+            months_display = monthly_data['month'].map(month_label).tolist()
+            gross_trend = monthly_data['amount'].tolist()
+            net_trend = (monthly_data['amount'] - monthly_data['tax_deducted']).tolist()
 
             fig_trend = go.Figure()
 
@@ -4,9 +4,11 @@ Extracts duplicate code from app.py and bulk_operations.py
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 import logging
 
+from sqlalchemy import insert
+
 from models import Transaction, Income, Expense
 
 # Configure logging
@@ -35,6 +37,30 @@ def safe_commit(session, error_message="Database commit failed"):
         return False, error_msg
 
 
+def _income_row(txn: Transaction, category: str) -> dict:
+    """Income ledger column values for a transaction"""
+    return {
+        'date': txn.date,
+        'source': txn.description,
+        'description': txn.notes or '',
+        'amount_gross': txn.paid_in,
+        'tax_deducted': 0.0,
+        'income_type': category or 'Other',
+    }
+
+
+def _expense_row(txn: Transaction, category: str) -> dict:
+    """Expense ledger column values for a transaction"""
+    return {
+        'date': txn.date,
+        'supplier': txn.description,
+        'description': txn.notes or '',
+        'category': category or 'Other business expenses',
+        'amount': txn.paid_out,
+        'receipt_link': '',
+    }
+
+
 def post_transaction_to_ledger(
     txn: Transaction,
     category: str,
@@ -99,14 +125,7 @@ def _post_to_income_ledger(
             return True, None  # Already exists, skip
 
     # Create new income record
-    income_record = Income(
-        date=txn.date,
-        source=txn.description,
-        description=txn.notes or '',
-        amount_gross=txn.paid_in,
-        tax_deducted=0.0,
-        income_type=category or 'Other'
-    )
+    income_record = Income(**_income_row(txn, category))
     session.add(income_record)
     logger.info(f"Posted income transaction {txn.id} to ledger")
     return True, None
@@ -142,19 +161,104 @@ def _post_to_expense_ledger(
             return True, None  # Already exists, skip
 
     # Create new expense record
-    expense_record = Expense(
-        date=txn.date,
-        supplier=txn.description,
-        description=txn.notes or '',
-        category=category or 'Other business expenses',
-        amount=txn.paid_out,
-        receipt_link=''
-    )
+    expense_record = Expense(**_expense_row(txn, category))
     session.add(expense_record)
     logger.info(f"Posted expense transaction {txn.id} to ledger")
     return True, None
 
 
+# txn_type -> (ledger model, duplicate key columns)
+LEDGER_POSTING = {
+    'Income': (Income, ('date', 'source', 'amount_gross')),
+    'Expense': (Expense, ('date', 'supplier', 'amount')),
+}
+
+
+def _existing_ledger_keys(session, model, key_columns, rows) -> set:
+    """(date, name, amount) keys already in a ledger over the date span of rows"""
+    columns = [getattr(model, column) for column in key_columns]
+    dates = [row['date'] for row in rows]
+    existing = session.query(*columns).filter(model.date.between(min(dates), max(dates))).all()
+    return {tuple(key) for key in existing}
+
+
+def post_ledger_entries(
+    entries: Iterable[tuple[Transaction, str, str]],
+    session,
+    check_duplicates: bool = True
+) -> tuple[int, int, list[str]]:
+    """
+    Post many transactions to the Income and Expense ledgers in one pass
+
+    Duplicates are found by diffing the (date, source/supplier, amount) keys
+    already in each ledger - fetched with one query over the batch's date
+    span - and the new rows are inserted with a single executemany per
+    ledger. The caller commits.
+
+    Args:
+        entries: (transaction, category, txn_type) tuples, txn_type being
+            'Income' or 'Expense'
+        session: Database session
+        check_duplicates: Whether to skip entries already in the ledger
+
+    Returns:
+        tuple: (success_count: int, failure_count: int, errors: list[str])
+    """
+    success_count = 0
+    failure_count = 0
+    errors = []
+    pending = {txn_type: [] for txn_type in LEDGER_POSTING}
+
+    for txn, category, txn_type in entries:
+        try:
+            if txn_type == 'Income' and txn.paid_in > 0:
+                pending['Income'].append((txn, _income_row(txn, category)))
+            elif txn_type == 'Expense' and txn.paid_out > 0:
+                pending['Expense'].append((txn, _expense_row(txn, category)))
+            else:
+                failure_count += 1
+                errors.append(f"Transaction {txn.id}: Invalid transaction type or amount: {txn_type}")
+        except Exception as e:
+            failure_count += 1
+            errors.append(f"Transaction {txn.id}: Failed to post transaction {txn.id} to ledger: {str(e)}")
+
+    for txn_type, batch in pending.items():
+        if not batch:
+            continue
+        model, key_columns = LEDGER_POSTING[txn_type]
+        rows = [row for _, row in batch]
+
+        try:
+            seen = _existing_ledger_keys(session, model, key_columns, rows) if check_duplicates else set()
+            new_rows = []
+            for row in rows:
+                if check_duplicates:
+                    key = tuple(row[column] for column in key_columns)
+                    if key in seen:
+                        continue  # Already exists, skip
+                    seen.add(key)
+                new_rows.append(row)
+
+            if new_rows:
+                session.execute(insert(model), new_rows)
+        except Exception as e:
+            failure_count += len(batch)
+            errors.extend(
+                f"Transaction {txn.id}: Failed to post transaction {txn.id} to ledger: {str(e)}"
+                for txn, _ in batch
+            )
+            logger.error(f"Failed to post {len(batch)} {txn_type.lower()} transaction(s) to ledger: {str(e)}")
+            continue
+
+        success_count += len(batch)
+        logger.info(
+            f"Posted {len(new_rows)} {txn_type.lower()} transaction(s) to ledger"
+            f" ({len(batch) - len(new_rows)} already present)"
+        )
+
+    return success_count, failure_count, errors
+
+
 def bulk_post_to_ledger(
     transactions: list[Transaction],
     category: str,
@@ -175,23 +279,9 @@ def bulk_post_to_ledger(
     Returns:
         tuple: (success_count: int, failure_count: int, errors: list[str])
     """
-    success_count = 0
-    failure_count = 0
-    errors = []
-
-    for txn in transactions:
-        success, error = post_transaction_to_ledger(
-            txn, category, txn_type, session, check_duplicates
-        )
-
-        if success:
-            success_count += 1
-        else:
-            failure_count += 1
-            if error:
-                errors.append(f"Transaction {txn.id}: {error}")
-
-    return success_count, failure_count, errors
+    return post_ledger_entries(
+        ((txn, category, txn_type) for txn in transactions), session, check_duplicates
+    )
 
 
 def update_transaction_categorization(
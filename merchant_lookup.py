@@ -0,0 +1,312 @@
+"""
+Unified merchant lookup for Tax Helper
+Resolves transaction descriptions against the merchants table, falling back
+to the built-in merchant lists, with an in-process cache
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, func, update
+
+from models import Merchant
+from components.merchant_db import MerchantIndex, get_merchant_index, normalize_string
+from scripts.merchant_database import ALL_MERCHANTS, CONFIDENCE_UNKNOWN
+
+
+# Score given to a name/alias contained in the description (same as find_merchant_match)
+SUBSTRING_MATCH_SCORE = 90.0
+
+# Keywords from scripts/merchant_database.py, uppercased once, in lookup order
+_KEYWORD_MERCHANTS = [(' '.join(keyword.upper().split()), merchant) for keyword, merchant in ALL_MERCHANTS.items()]
+
+# Bumped whenever merchants are edited; services reload when it changes
+_catalogue_generation = 0
+
+
+def invalidate_merchant_cache() -> None:
+    """Mark every merchant lookup cache stale (call after editing merchants)"""
+    global _catalogue_generation
+    _catalogue_generation += 1
+
+
+def normalize_lookup_key(description: str) -> str:
+    """Cache key for a description: uppercased with whitespace collapsed"""
+    return ' '.join((description or '').upper().split())
+
+
+@dataclass(frozen=True)
+class MerchantResolution:
+    """A resolved merchant and where it came from"""
+    name: str
+    category: Optional[str]
+    default_type: Optional[str]
+    is_personal: bool
+    confidence: float
+    source: str  # 'database', 'catalogue' (MERCHANT_DATA) or 'keywords' (ALL_MERCHANTS)
+    merchant_id: Optional[int] = None
+
+    def as_confidence_tuple(self) -> Tuple[bool, str, float, str]:
+        """Same shape as merchant_database.get_categorization_confidence"""
+        return self.is_personal, self.category, self.confidence, self.name
+
+
+class MerchantLookupService:
+    """
+    Single entry point for merchant resolution
+
+    Lookup order:
+        1. Merchants table names and aliases (MERCHANT_DATA if the table is empty)
+        2. Keyword list from scripts/merchant_database.py
+
+    Results are kept in an LRU cache keyed by normalized description. The
+    cache is dropped when invalidate_merchant_cache() is called. Matches
+    against the merchants table are counted in memory and written back to
+    usage_count/last_used_date in one batched UPDATE by flush_usage().
+
+    Usage:
+        lookup = get_merchant_lookup(session)
+        resolution = lookup.resolve("TESCO STORES 2341")
+        lookup.flush_usage()
+        session.commit()
+    """
+
+    # Pending usage is flushed automatically once this many merchants are waiting
+    USAGE_FLUSH_THRESHOLD = 500
+
+    def __init__(self, session, cache_size: int = 4096):
+        self.session = session
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Optional[MerchantResolution]]" = OrderedDict()
+        self._generation = None
+        self._index: Optional[MerchantIndex] = None
+        self._source = None
+        self._pending_usage: Dict[int, List] = {}
+
+    # ------------------------------------------------------------------
+    # Catalogue
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """(Re)build the catalogue index if merchants changed since the last load"""
+        if self._index is not None and self._generation == _catalogue_generation:
+            return
+
+        self._generation = _catalogue_generation
+        self._cache.clear()
+
+        rows = self.session.query(Merchant).order_by(Merchant.id).all()
+        if rows:
+            merchants = []
+            for row in rows:
+                try:
+                    aliases = json.loads(row.aliases) if row.aliases else []
+                except (TypeError, ValueError):
+                    aliases = []
+                merchants.append({
+                    "id": row.id,
+                    "name": row.name,
+                    "aliases": aliases,
+                    "default_category": row.default_category,
+                    "default_type": row.default_type,
+                    "is_personal": bool(row.is_personal),
+                    "industry": row.industry,
+                    "confidence_boost": row.confidence_boost or 0,
+                })
+            self._index = MerchantIndex(merchants)
+            self._source = 'database'
+        else:
+            self._index = get_merchant_index()
+            self._source = 'catalogue'
+
+    def _match_catalogue(self, key: str) -> Optional[MerchantResolution]:
+        """Longest name/alias found as whole words in the description"""
+        padded = f" {normalize_string(key)} "
+
+        best = None
+        for position, entry in self._index.substring_matches(key):
+            if not entry or f" {entry} " not in padded:
+                continue
+            if best is None or len(entry) > len(best[1]):
+                best = (position, entry)
+
+        if best is None:
+            return None
+
+        merchant = self._index.merchants[best[0]]
+        return MerchantResolution(
+            name=merchant["name"],
+            category=merchant.get("default_category"),
+            default_type=merchant.get("default_type"),
+            is_personal=bool(merchant.get("is_personal", False)),
+            confidence=min(100.0, SUBSTRING_MATCH_SCORE + merchant.get("confidence_boost", 0)),
+            source=self._source,
+            merchant_id=merchant.get("id"),
+        )
+
+    @staticmethod
+    def _match_keywords(key: str) -> Optional[MerchantResolution]:
+        """First keyword from scripts/merchant_database.py contained in the description"""
+        for keyword, merchant in _KEYWORD_MERCHANTS:
+            if keyword in key:
+                return MerchantResolution(
+                    name=merchant.name,
+                    category=merchant.category,
+                    default_type=None,
+                    is_personal=merchant.is_personal,
+                    confidence=merchant.confidence,
+                    source='keywords',
+                )
+        return None
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def resolve(self, description: str, record_usage: bool = True) -> Optional[MerchantResolution]:
+        """
+        Resolve a transaction description to a merchant
+
+        Args:
+            description: Transaction description
+            record_usage: Count the match towards the merchant's usage_count
+
+        Returns:
+            MerchantResolution, or None if no merchant matches
+        """
+        self._load()
+        key = normalize_lookup_key(description)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            resolution = self._cache[key]
+        else:
+            resolution = self._match_catalogue(key) if key else None
+            if resolution is None and key:
+                resolution = self._match_keywords(key)
+
+            self._cache[key] = resolution
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        if record_usage and resolution is not None and resolution.merchant_id is not None:
+            self._record_usage(resolution.merchant_id)
+
+        return resolution
+
+    def resolve_many(self, descriptions: Iterable[str], record_usage: bool = True) -> List[Optional[MerchantResolution]]:
+        """Resolve a batch of descriptions (results aligned with input)"""
+        codes, distinct = self._resolve_distinct(descriptions, record_usage)
+        return [distinct[code] for code in codes]
+
+    def confidence_columns(self, descriptions: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        categorization_confidence for a column of descriptions
+
+        Returns:
+            (is_personal bool array, category object array, confidence float array),
+            aligned with the input
+        """
+        codes, distinct = self._resolve_distinct(descriptions, record_usage=True)
+        unknown = (True, 'Unknown', CONFIDENCE_UNKNOWN)
+        values = [resolution.as_confidence_tuple()[:3] if resolution else unknown for resolution in distinct]
+
+        is_personal = np.array([value[0] for value in values], dtype=bool)
+        category = np.array([value[1] for value in values], dtype=object)
+        confidence = np.array([value[2] for value in values], dtype=float)
+        return is_personal[codes], category[codes], confidence[codes]
+
+    def _resolve_distinct(self, descriptions: Iterable[str],
+                          record_usage: bool) -> Tuple[np.ndarray, List[Optional[MerchantResolution]]]:
+        """
+        Resolve each distinct description once
+
+        Returns:
+            (codes, resolutions) where resolutions[codes[i]] belongs to description i;
+            usage is still counted once per description
+        """
+        codes, uniques = pd.factorize(pd.Series(list(descriptions), dtype=object).fillna(''))
+        distinct = [self.resolve(description, record_usage=False) for description in uniques]
+
+        if record_usage:
+            for position, uses in enumerate(np.bincount(codes, minlength=len(distinct))):
+                resolution = distinct[position]
+                if uses and resolution is not None and resolution.merchant_id is not None:
+                    self._record_usage(resolution.merchant_id, int(uses))
+
+        return codes, distinct
+
+    def categorization_confidence(self, description: str) -> Tuple[bool, str, float, str]:
+        """
+        Drop-in replacement for merchant_database.get_categorization_confidence
+        Returns: (is_personal, category, confidence, merchant_name)
+        """
+        resolution = self.resolve(description)
+        if resolution is None:
+            return True, 'Unknown', CONFIDENCE_UNKNOWN, 'Unknown'  # Default to personal with 0 confidence
+        return resolution.as_confidence_tuple()
+
+    def clear(self) -> None:
+        """Drop cached lookups for this service only"""
+        self._cache.clear()
+        self._index = None
+
+    # ------------------------------------------------------------------
+    # Usage tracking
+    # ------------------------------------------------------------------
+
+    def _record_usage(self, merchant_id: int, uses: int = 1) -> None:
+        now = datetime.now()
+        pending = self._pending_usage.get(merchant_id)
+        if pending is None:
+            self._pending_usage[merchant_id] = [uses, now]
+        else:
+            pending[0] += uses
+            pending[1] = now
+
+        if len(self._pending_usage) >= self.USAGE_FLUSH_THRESHOLD:
+            self.flush_usage()
+
+    def flush_usage(self) -> int:
+        """
+        Write pending usage counts in one batched UPDATE
+
+        The UPDATE runs in the session's current transaction; the caller
+        commits it along with its own changes.
+
+        Returns:
+            Number of merchants updated
+        """
+        if not self._pending_usage:
+            return 0
+
+        merchants = Merchant.__table__
+        statement = (
+            update(merchants)
+            .where(merchants.c.id == bindparam('merchant_id'))
+            .values(
+                usage_count=func.coalesce(merchants.c.usage_count, 0) + bindparam('uses'),
+                last_used_date=bindparam('used_at'),
+            )
+        )
+        params = [
+            {'merchant_id': merchant_id, 'uses': uses, 'used_at': used_at}
+            for merchant_id, (uses, used_at) in self._pending_usage.items()
+        ]
+        self.session.execute(statement, params)
+        self._pending_usage.clear()
+        return len(params)
+
+
+def get_merchant_lookup(session) -> MerchantLookupService:
+    """Shared MerchantLookupService for a session (kept in session.info)"""
+    service = session.info.get('merchant_lookup')
+    if service is None:
+        service = MerchantLookupService(session)
+        session.info['merchant_lookup'] = service
+    return service
@@ -0,0 +1,57 @@
+"""
+Migration 003: Add pattern_groups table for incremental pattern analysis
+
+Stores recurring pattern groups with running statistics so that a new
+import only updates the groups its transactions belong to
+"""
+
+import sqlite3
+
+
+def upgrade(db_path: str):
+    """Add pattern_groups table"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pattern_groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pattern_group_id VARCHAR(100) NOT NULL UNIQUE,
+            pattern_type VARCHAR(50) NOT NULL,
+            description_normalized VARCHAR(500) NOT NULL,
+            occurrences INTEGER DEFAULT 0,
+            amount_mean FLOAT DEFAULT 0.0,
+            amount_m2 FLOAT DEFAULT 0.0,
+            interval_count INTEGER DEFAULT 0,
+            interval_mean FLOAT DEFAULT 0.0,
+            interval_m2 FLOAT DEFAULT 0.0,
+            first_occurrence DATE,
+            last_occurrence DATE,
+            transaction_ids TEXT,
+            updated_date DATETIME
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_pattern_groups_pattern_group_id
+        ON pattern_groups(pattern_group_id)
+    ''')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Created pattern_groups table")
+
+
+def downgrade(db_path: str):
+    """Remove pattern_groups table"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('DROP INDEX IF EXISTS ix_pattern_groups_pattern_group_id')
+    cursor.execute('DROP TABLE IF EXISTS pattern_groups')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed pattern_groups table")
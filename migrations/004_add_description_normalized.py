@@ -0,0 +1,66 @@
+"""
+Migration 004: Add description_normalized column to transactions
+
+Stores the normalized description (see text_normalizer.normalize_description)
+so pattern detection can group transactions without re-normalizing them
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from text_normalizer import normalize_description
+
+
+def upgrade(db_path: str):
+    """Add and backfill description_normalized"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('ALTER TABLE transactions ADD COLUMN description_normalized VARCHAR(500)')
+        print("  ✓ Added description_normalized column")
+    except sqlite3.OperationalError as e:
+        if 'duplicate column name' in str(e).lower():
+            print("  description_normalized column already exists")
+        else:
+            raise
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_transactions_description_normalized
+        ON transactions(description_normalized)
+    ''')
+
+    rows = cursor.execute(
+        'SELECT id, description FROM transactions WHERE description_normalized IS NULL'
+    ).fetchall()
+    cursor.executemany(
+        'UPDATE transactions SET description_normalized = ? WHERE id = ?',
+        [(normalize_description(description), txn_id) for txn_id, description in rows]
+    )
+
+    conn.commit()
+    conn.close()
+
+    print(f"  ✓ Normalized {len(rows)} existing transaction description(s)")
+
+
+def downgrade(db_path: str):
+    """Drop the index (SQLite before 3.35 cannot drop the column itself)"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('DROP INDEX IF EXISTS ix_transactions_description_normalized')
+
+    try:
+        cursor.execute('ALTER TABLE transactions DROP COLUMN description_normalized')
+    except sqlite3.OperationalError:
+        pass
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed description_normalized")
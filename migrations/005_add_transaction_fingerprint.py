@@ -0,0 +1,73 @@
+"""
+Migration 005: Add fingerprint column to transactions
+
+Stores a hash of date, normalized description and amount (see fingerprints.py)
+behind a unique index so duplicate imports are found with an index lookup
+"""
+
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fingerprints import FingerprintCounter
+
+
+def upgrade(db_path: str):
+    """Add, backfill and uniquely index fingerprint"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('ALTER TABLE transactions ADD COLUMN fingerprint VARCHAR(40)')
+        print("  ✓ Added fingerprint column")
+    except sqlite3.OperationalError as e:
+        if 'duplicate column name' in str(e).lower():
+            print("  fingerprint column already exists")
+        else:
+            raise
+
+    # Walk every transaction in id order so identical lines get the same
+    # occurrence numbers they would have received on import
+    counter = FingerprintCounter()
+    updates = []
+    rows = cursor.execute(
+        'SELECT id, date, description, paid_in, paid_out, fingerprint FROM transactions ORDER BY id'
+    ).fetchall()
+    for txn_id, txn_date, description, paid_in, paid_out, fingerprint in rows:
+        computed = counter.fingerprint(date.fromisoformat(str(txn_date)[:10]), description, paid_in, paid_out)
+        if fingerprint is None:
+            updates.append((computed, txn_id))
+
+    cursor.executemany('UPDATE transactions SET fingerprint = ? WHERE id = ?', updates)
+
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_transactions_fingerprint
+        ON transactions(fingerprint)
+    ''')
+
+    conn.commit()
+    conn.close()
+
+    print(f"  ✓ Fingerprinted {len(updates)} existing transaction(s)")
+
+
+def downgrade(db_path: str):
+    """Drop the index (SQLite before 3.35 cannot drop the column itself)"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('DROP INDEX IF EXISTS ix_transactions_fingerprint')
+
+    try:
+        cursor.execute('ALTER TABLE transactions DROP COLUMN fingerprint')
+    except sqlite3.OperationalError:
+        pass
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed fingerprint")
@@ -0,0 +1,61 @@
+"""
+Migration 006: Add monthly_rollup table and ledger triggers
+
+Per-month totals of the income, expense, mileage and donation ledgers,
+kept up to date by triggers (see monthly_rollup.py)
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from monthly_rollup import trigger_statements, drop_trigger_statements, rebuild_statements
+
+
+def upgrade(db_path: str):
+    """Add monthly_rollup, its triggers, and fill it from the ledgers"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_rollup (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tax_year VARCHAR(7) NOT NULL,
+            month VARCHAR(7) NOT NULL,
+            ledger VARCHAR(20) NOT NULL,
+            category VARCHAR(100) NOT NULL DEFAULT '',
+            amount FLOAT DEFAULT 0.0,
+            tax_deducted FLOAT DEFAULT 0.0,
+            miles FLOAT DEFAULT 0.0,
+            entry_count INTEGER DEFAULT 0,
+            CONSTRAINT uq_monthly_rollup_bucket UNIQUE (tax_year, month, ledger, category)
+        )
+    ''')
+
+    for statement in trigger_statements() + rebuild_statements():
+        cursor.execute(statement)
+
+    rows = cursor.execute('SELECT COUNT(*) FROM monthly_rollup').fetchone()[0]
+
+    conn.commit()
+    conn.close()
+
+    print(f"  ✓ Created monthly_rollup table with {rows} month bucket(s)")
+
+
+def downgrade(db_path: str):
+    """Remove monthly_rollup and its triggers"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    for statement in drop_trigger_statements():
+        cursor.execute(statement)
+    cursor.execute('DROP TABLE IF EXISTS monthly_rollup')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed monthly_rollup table")
@@ -0,0 +1,52 @@
+"""
+Migration 007: Add full-text search_index and its triggers
+
+FTS5 index over transaction descriptions, income sources, expense suppliers,
+notes and merchant names, kept up to date by triggers (see search_index.py).
+Update triggers fire only when an indexed column changes; ones created
+before that are replaced.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from search_index import (
+    CREATE_INDEX_SQL, STALE_TRIGGERS_SQL, trigger_statements, drop_statements, rebuild_statements
+)
+
+
+def upgrade(db_path: str):
+    """Add search_index, its triggers, and fill it from the source tables"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    for (name,) in cursor.execute(STALE_TRIGGERS_SQL).fetchall():
+        cursor.execute(f'DROP TRIGGER {name}')
+
+    for statement in [CREATE_INDEX_SQL] + trigger_statements() + rebuild_statements():
+        cursor.execute(statement)
+
+    rows = cursor.execute('SELECT COUNT(*) FROM search_index').fetchone()[0]
+
+    conn.commit()
+    conn.close()
+
+    print(f"  ✓ Created search_index with {rows} record(s)")
+
+
+def downgrade(db_path: str):
+    """Remove search_index and its triggers"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    for statement in drop_statements():
+        cursor.execute(statement)
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed search_index")
@@ -0,0 +1,37 @@
+"""
+Migration 008: Add a case-insensitive index on transaction descriptions
+
+Lets the SQL form of Equals and Starts with rules (see rule_evaluation.py)
+use an index instead of scanning every transaction
+"""
+
+import sqlite3
+
+
+def upgrade(db_path: str):
+    """Add ix_transactions_description_nocase"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_transactions_description_nocase
+        ON transactions(description COLLATE NOCASE)
+    ''')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Added ix_transactions_description_nocase")
+
+
+def downgrade(db_path: str):
+    """Drop ix_transactions_description_nocase"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('DROP INDEX IF EXISTS ix_transactions_description_nocase')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed ix_transactions_description_nocase")
@@ -0,0 +1,37 @@
+"""
+Migration 009: Add a (reviewed, date) index on transactions
+
+Covers counting the review queue and paging it by (date, id)
+(see transaction_queries.py)
+"""
+
+import sqlite3
+
+
+def upgrade(db_path: str):
+    """Add ix_transactions_reviewed_date"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_transactions_reviewed_date
+        ON transactions(reviewed, date)
+    ''')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Added ix_transactions_reviewed_date")
+
+
+def downgrade(db_path: str):
+    """Drop ix_transactions_reviewed_date"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('DROP INDEX IF EXISTS ix_transactions_reviewed_date')
+
+    conn.commit()
+    conn.close()
+
+    print("  ✓ Removed ix_transactions_reviewed_date")
@@ -6,11 +6,12 @@ Complete UI overhaul for mileage tracking and management
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from sqlalchemy import func, extract, and_
+from sqlalchemy import func, and_
 import plotly.graph_objects as go
 import plotly.express as px
 from models import Mileage
 from utils import format_currency, get_tax_year_dates, calculate_mileage_allowance
+from monthly_rollup import monthly_totals, month_label
 from components.ui.interactions import show_toast, confirm_delete, validate_field, show_validation
 
 def render_restructured_mileage_screen(session, settings):
@@ -322,27 +323,15 @@ def render_restructured_mileage_screen(session, settings):
         # Monthly mileage chart
         st.markdown("#### 📈 Monthly Mileage Trend")
         
-        # Get monthly data
-        monthly_mileage = session.query(
-            extract('month', Mileage.date).label('month'),
-            extract('year', Mileage.date).label('year'),
-            func.sum(Mileage.miles).label('miles'),
-            func.sum(Mileage.allowable_amount).label('amount')
-        ).filter(
-            and_(Mileage.date >= start_date, Mileage.date <= end_date)
-        ).group_by('year', 'month').order_by('year', 'month').all()
+        # Get monthly data (months with journeys, from the monthly rollup)
+        monthly_mileage = monthly_totals(session, 'mileage', tax_year)
+        monthly_mileage = monthly_mileage[monthly_mileage['entry_count'] > 0]
         
-        if monthly_mileage:
+        if not monthly_mileage.empty:
             # Create dual-axis chart
-            months = []
-            miles_data = []
-            amount_data = []
-            
-            for record in monthly_mileage:
-                month_name = datetime(int(record.year), int(record.month), 1).strftime('%b %Y')
-                months.append(month_name)
-                miles_data.append(float(record.miles))
-                amount_data.append(float(record.amount))
+            months = monthly_mileage['month'].map(month_label).tolist()
+            miles_data = monthly_mileage['miles'].tolist()
+            amount_data = monthly_mileage['amount'].tolist()
             
             fig = go.Figure()
             
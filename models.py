@@ -3,13 +3,19 @@ SQLAlchemy models for UK Self Assessment Tax Helper
 Manages transactions, income, expenses, mileage, donations, rules, and settings
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Date, DateTime, Text, JSON
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Boolean, Date, DateTime, Text, JSON, UniqueConstraint, Index, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, validates
 from datetime import datetime
 from enum import Enum
 import os
 
+from text_normalizer import normalize_description
+from data_versions import track_data_versions
+from monthly_rollup import install_rollup_triggers
+from search_index import install_search_index
+from rule_evaluation import register_regexp
+
 Base = declarative_base()
 
 
@@ -29,6 +35,10 @@ class Transaction(Base):
     __tablename__ = 'transactions'
     __table_args__ = (
         # Performance indexes for common queries
+        # Case-insensitive index serving rule predicates (Equals / Starts with)
+        Index('ix_transactions_description_nocase', text('description COLLATE NOCASE')),
+        # Covers review queue counts and (date, id) keyset paging
+        Index('ix_transactions_reviewed_date', 'reviewed', 'date'),
         {'extend_existing': True},
     )
 
@@ -36,6 +46,7 @@ class Transaction(Base):
     date = Column(Date, nullable=False, index=True)  # Indexed for date filtering
     type = Column(String(50))  # POS, DD, CR, etc.
     description = Column(String(500), nullable=False)
+    description_normalized = Column(String(500), index=True)  # Kept in sync with description for pattern matching
     paid_out = Column(Float, default=0.0)
     paid_in = Column(Float, default=0.0)
     balance = Column(Float)
@@ -56,6 +67,13 @@ class Transaction(Base):
 
     import_date = Column(Date, default=datetime.now)
     account_name = Column(String(100), default='Main Account', index=True)  # Indexed for account filtering
+    fingerprint = Column(String(40), unique=True, index=True)  # Statement line hash for duplicate detection (see fingerprints.py)
+
+    @validates('description')
+    def _normalize_on_set(self, key, description):
+        """Store the normalized description whenever the description changes"""
+        self.description_normalized = normalize_description(description)
+        return description
 
 
 class Income(Base):
@@ -197,6 +215,62 @@ class Merchant(Base):
     last_used_date = Column(DateTime)
 
 
+class PatternGroupStats(Base):
+    """
+    Persisted pattern groups for incremental pattern analysis
+    Running statistics let a new import update only the groups it touches
+    """
+    __tablename__ = 'pattern_groups'
+
+    id = Column(Integer, primary_key=True)
+    pattern_group_id = Column(String(100), unique=True, nullable=False, index=True)  # Hash of type + description
+    pattern_type = Column(String(50), nullable=False)
+    description_normalized = Column(String(500), nullable=False)
+    occurrences = Column(Integer, default=0)
+    amount_mean = Column(Float, default=0.0)
+    amount_m2 = Column(Float, default=0.0)  # Sum of squared deviations from the mean
+    interval_count = Column(Integer, default=0)
+    interval_mean = Column(Float, default=0.0)  # Days between consecutive transactions
+    interval_m2 = Column(Float, default=0.0)
+    first_occurrence = Column(Date)
+    last_occurrence = Column(Date)
+    transaction_ids = Column(Text)  # JSON array of member transaction IDs
+    updated_date = Column(DateTime, default=datetime.now)
+
+
+class MonthlyRollup(Base):
+    """
+    Monthly totals per ledger and category, maintained by triggers on the
+    ledger tables (see monthly_rollup.py)
+    """
+    __tablename__ = 'monthly_rollup'
+    __table_args__ = (
+        UniqueConstraint('tax_year', 'month', 'ledger', 'category', name='uq_monthly_rollup_bucket'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    tax_year = Column(String(7), nullable=False)  # e.g. 2024/25
+    month = Column(String(7), nullable=False)  # YYYY-MM (April is split across two tax years)
+    ledger = Column(String(20), nullable=False)  # income/expense/mileage/donation
+    category = Column(String(100), nullable=False, default='')  # Expense category, income type or Gift Aid
+    amount = Column(Float, default=0.0)  # Gross income, expense amount, mileage allowance or donation paid
+    tax_deducted = Column(Float, default=0.0)
+    miles = Column(Float, default=0.0)
+    entry_count = Column(Integer, default=0)
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _install_rollup_triggers(target, connection, **kw):
+    """Create the monthly_rollup triggers once all tables exist"""
+    install_rollup_triggers(connection)
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _install_search_index(target, connection, **kw):
+    """Create the full-text search_index and its triggers once all tables exist"""
+    install_search_index(connection)
+
+
 def init_db(db_path='tax_helper.db'):
     """
     Initialize database and create all tables with optimized SQLite settings
@@ -231,9 +305,15 @@ def init_db(db_path='tax_helper.db'):
         # Set busy timeout to 5 seconds for better concurrency
         cursor.execute("PRAGMA busy_timeout=5000")
         cursor.close()
+        # REGEXP operator used by Regex categorization rules
+        register_regexp(dbapi_conn)
 
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
+
+    # Count writes per table so caches can be keyed on data versions
+    track_data_versions(Session)
+
     return engine, Session
 
 
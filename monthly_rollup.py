@@ -0,0 +1,230 @@
+"""
+Monthly ledger rollup for Tax Helper
+Keeps per-month totals of the income, expense, mileage and donation ledgers
+in the monthly_rollup table so dashboards and trend charts read a dozen
+precomputed rows instead of scanning whole ledgers
+
+The table is maintained by SQLite triggers on the ledger tables, so every
+write is reflected (ORM flushes, bulk Query.update/delete and scripts using
+sqlite3 directly). rebuild_monthly_rollup() recomputes it from scratch.
+"""
+
+from typing import List, Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+
+# Ledger table -> column expressions for the rollup
+ROLLUP_LEDGERS = {
+    'income': {
+        'table': 'income',
+        'category': "COALESCE({row}income_type, '')",
+        'amount': 'COALESCE({row}amount_gross, 0)',
+        'tax_deducted': 'COALESCE({row}tax_deducted, 0)',
+        'miles': '0',
+    },
+    'expense': {
+        'table': 'expenses',
+        'category': "COALESCE({row}category, '')",
+        'amount': 'COALESCE({row}amount, 0)',
+        'tax_deducted': '0',
+        'miles': '0',
+    },
+    'mileage': {
+        'table': 'mileage',
+        'category': "''",
+        'amount': 'COALESCE({row}allowable_amount, 0)',
+        'tax_deducted': '0',
+        'miles': 'COALESCE({row}miles, 0)',
+    },
+    'donation': {
+        'table': 'donations',
+        'category': "CASE WHEN {row}gift_aid THEN 'Gift Aid' ELSE '' END",
+        'amount': 'COALESCE({row}amount_paid, 0)',
+        'tax_deducted': '0',
+        'miles': '0',
+    },
+}
+
+# UK tax year (6 April - 5 April) of an ISO date, e.g. '2024/25'
+_TAX_YEAR_START = (
+    "(CAST(substr({row}date, 1, 4) AS INTEGER) - (CASE WHEN substr({row}date, 6, 5) < '04-06' THEN 1 ELSE 0 END))"
+)
+TAX_YEAR_SQL = f"({_TAX_YEAR_START} || '/' || substr(CAST({_TAX_YEAR_START} + 1 AS TEXT), 3, 2))"
+MONTH_SQL = "substr({row}date, 1, 7)"
+
+_KEY_COLUMNS = ('tax_year', 'month', 'ledger', 'category')
+
+
+def _row_values(ledger: str, row: str) -> dict:
+    spec = ROLLUP_LEDGERS[ledger]
+    return {
+        'tax_year': TAX_YEAR_SQL.format(row=row),
+        'month': MONTH_SQL.format(row=row),
+        'ledger': f"'{ledger}'",
+        'category': spec['category'].format(row=row),
+        'amount': spec['amount'].format(row=row),
+        'tax_deducted': spec['tax_deducted'].format(row=row),
+        'miles': spec['miles'].format(row=row),
+    }
+
+
+def _apply_row_sql(ledger: str, row: str, sign: int) -> str:
+    """Add (sign=1) or remove (sign=-1) one ledger row from its rollup bucket"""
+    values = _row_values(ledger, row)
+    key_match = ' AND '.join(f'{column} = {values[column]}' for column in _KEY_COLUMNS)
+    return f"""
+        INSERT INTO monthly_rollup (tax_year, month, ledger, category, amount, tax_deducted, miles, entry_count)
+        VALUES ({values['tax_year']}, {values['month']}, {values['ledger']}, {values['category']},
+                {sign} * {values['amount']}, {sign} * {values['tax_deducted']}, {sign} * {values['miles']}, {sign})
+        ON CONFLICT (tax_year, month, ledger, category) DO UPDATE SET
+            amount = amount + excluded.amount,
+            tax_deducted = tax_deducted + excluded.tax_deducted,
+            miles = miles + excluded.miles,
+            entry_count = entry_count + excluded.entry_count;
+        DELETE FROM monthly_rollup WHERE entry_count <= 0 AND {key_match};"""
+
+
+def trigger_statements() -> List[str]:
+    """CREATE TRIGGER statements keeping monthly_rollup in step with the ledgers"""
+    statements = []
+    for ledger, spec in ROLLUP_LEDGERS.items():
+        table = spec['table']
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_monthly_rollup_{table}_insert AFTER INSERT ON {table}
+            BEGIN{_apply_row_sql(ledger, 'NEW.', 1)}
+            END""")
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_monthly_rollup_{table}_delete AFTER DELETE ON {table}
+            BEGIN{_apply_row_sql(ledger, 'OLD.', -1)}
+            END""")
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_monthly_rollup_{table}_update AFTER UPDATE ON {table}
+            BEGIN{_apply_row_sql(ledger, 'OLD.', -1)}{_apply_row_sql(ledger, 'NEW.', 1)}
+            END""")
+    return statements
+
+
+def drop_trigger_statements() -> List[str]:
+    """DROP TRIGGER statements for downgrades"""
+    return [
+        f'DROP TRIGGER IF EXISTS trg_monthly_rollup_{spec["table"]}_{action}'
+        for spec in ROLLUP_LEDGERS.values()
+        for action in ('insert', 'delete', 'update')
+    ]
+
+
+def rebuild_statements() -> List[str]:
+    """Statements that recompute monthly_rollup from the ledgers"""
+    statements = ['DELETE FROM monthly_rollup']
+    for ledger, spec in ROLLUP_LEDGERS.items():
+        values = _row_values(ledger, '')
+        statements.append(f"""
+            INSERT INTO monthly_rollup (tax_year, month, ledger, category, amount, tax_deducted, miles, entry_count)
+            SELECT {values['tax_year']}, {values['month']}, {values['ledger']}, {values['category']},
+                   SUM({values['amount']}), SUM({values['tax_deducted']}), SUM({values['miles']}), COUNT(*)
+            FROM {spec['table']}
+            GROUP BY 1, 2, 4""")
+    return statements
+
+
+def install_rollup_triggers(connection) -> bool:
+    """
+    Create the rollup triggers if they are missing
+
+    When they were missing the ledgers may already hold rows, so the
+    rollup is rebuilt as well.
+
+    Args:
+        connection: SQLAlchemy connection
+
+    Returns:
+        True if the triggers were created
+    """
+    existing = connection.exec_driver_sql(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_monthly_rollup_%'"
+    ).scalar()
+    if existing == len(ROLLUP_LEDGERS) * 3:
+        return False
+
+    for statement in trigger_statements() + rebuild_statements():
+        connection.exec_driver_sql(statement)
+    return True
+
+
+def rebuild_monthly_rollup(session) -> int:
+    """
+    Recompute monthly_rollup from the ledgers (the caller commits)
+
+    Returns:
+        Number of rollup rows
+    """
+    for statement in rebuild_statements():
+        session.execute(text(statement))
+    return session.execute(text('SELECT COUNT(*) FROM monthly_rollup')).scalar()
+
+
+# ===================================================================
+# READING
+# ===================================================================
+
+def tax_year_months(tax_year: str) -> List[str]:
+    """The twelve 'YYYY-MM' months of a tax year, April first"""
+    start_year = int(tax_year.split('/')[0])
+    return [f'{start_year + (month < 4)}-{month:02d}' for month in list(range(4, 13)) + list(range(1, 4))]
+
+
+def monthly_totals(
+    session,
+    ledger: str,
+    tax_year: Optional[str] = None,
+    category: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Monthly totals for one ledger
+
+    Args:
+        session: SQLAlchemy session
+        ledger: 'income', 'expense', 'mileage' or 'donation'
+        tax_year: Restrict to one tax year (e.g. '2024/25'); its twelve
+            months are always returned, zero-filled. Default: every month
+            with data.
+        category: Restrict to one expense category / income type
+
+    Returns:
+        DataFrame with month ('YYYY-MM'), amount, tax_deducted, miles and
+        entry_count columns in month order
+    """
+    from models import MonthlyRollup
+
+    query = session.query(
+        MonthlyRollup.month,
+        MonthlyRollup.amount,
+        MonthlyRollup.tax_deducted,
+        MonthlyRollup.miles,
+        MonthlyRollup.entry_count
+    ).filter(MonthlyRollup.ledger == ledger)
+    if tax_year:
+        query = query.filter(MonthlyRollup.tax_year == tax_year)
+    if category is not None:
+        query = query.filter(MonthlyRollup.category == category)
+
+    columns = ['month', 'amount', 'tax_deducted', 'miles', 'entry_count']
+    rows = pd.DataFrame(query.all(), columns=columns)
+    totals = rows.groupby('month', sort=True)[columns[1:]].sum()
+
+    if tax_year:
+        # April is split between tax years; 1-5 April of the closing year only
+        # appears when it has entries
+        months = sorted(set(tax_year_months(tax_year)) | set(totals.index))
+        totals = totals.reindex(months, fill_value=0)
+        totals.index.name = 'month'
+
+    totals['entry_count'] = totals['entry_count'].astype(int)
+    return totals.reset_index()
+
+
+def month_label(month: str) -> str:
+    """'2024-05' -> 'May 2024'"""
+    return pd.Timestamp(f'{month}-01').strftime('%b %Y')
@@ -0,0 +1,152 @@
+"""
+Page registry for Tax Helper
+Maps each navigation entry to the module and function that render it, so a
+page's module - and the plotly, openpyxl, reportlab or OCR imports behind it -
+is imported the first time the page is opened instead of when app.py starts
+
+import_profile() runs imports under `python -X importtime` in a fresh
+interpreter and reports the slowest modules, for the diagnostics panel.
+"""
+
+import ast
+import importlib
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass(frozen=True)
+class Page:
+    """One navigation entry and the function that renders it"""
+    name: str
+    module: str
+    function: str
+
+
+# Navigation order
+PAGES = [
+    Page("Dashboard", "dashboard_restructured", "render_restructured_dashboard"),
+    Page("Import Statements", "import_restructured", "render_restructured_import_screen"),
+    Page("Final Review", "review_restructured", "render_restructured_review_screen"),
+    Page("Income", "income_restructured", "render_restructured_income_screen"),
+    Page("Expenses", "expenses_restructured", "render_restructured_expense_screen"),
+    Page("Mileage", "mileage_restructured", "render_restructured_mileage_screen"),
+    Page("Donations", "donations_restructured", "render_restructured_donations_screen"),
+    Page("Rules", "rules_restructured", "render_restructured_rules_screen"),
+    Page("Summary (HMRC)", "summary_restructured", "render_restructured_summary_screen"),
+    Page("HMRC Guidance", "guidance_restructured", "render_restructured_guidance_screen"),
+    Page("Settings", "settings_restructured", "render_restructured_settings_screen"),
+    Page("Export", "export_restructured", "render_restructured_export_screen"),
+    Page("Audit Trail", "audit_trail_restructured", "render_restructured_audit_trail_screen"),
+    Page("Batch Upload", "batch_upload_restructured", "render_restructured_batch_upload_screen"),
+    Page("Reports", "reports_restructured", "render_restructured_reports_screen"),
+]
+PAGE_NAMES = [page.name for page in PAGES]
+PAGES_BY_NAME = {page.name: page for page in PAGES}
+
+# Page name -> seconds its module took to import when first opened in this process
+page_load_times: Dict[str, float] = {}
+
+
+def page_renderer(name: str) -> Callable:
+    """
+    Render function for a page, importing its module on first use
+
+    Raises:
+        KeyError: If no page has this name
+    """
+    page = PAGES_BY_NAME[name]
+    if page.module not in sys.modules:
+        started = time.perf_counter()
+        importlib.import_module(page.module)
+        page_load_times[name] = time.perf_counter() - started
+    return getattr(sys.modules[page.module], page.function)
+
+
+def render_page(name: str, session, settings) -> None:
+    """Render a page by navigation name"""
+    page_renderer(name)(session, settings)
+
+
+# ===================================================================
+# IMPORT PROFILE
+# ===================================================================
+
+class ImportTiming(NamedTuple):
+    """One line of `python -X importtime` output"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse `-X importtime` lines such as
+    'import time:       412 |       1290 |   pandas.core'
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        timings.append(ImportTiming(module, int(fields[0]), int(fields[1]),
+                                    (len(name) - len(module) - 1) // 2))
+    return timings
+
+
+def startup_modules(path: str = os.path.join(PROJECT_ROOT, 'app.py')) -> List[str]:
+    """Modules a script imports at top level, in order"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_profile(modules: Sequence[str], limit: int = 25, timeout: int = 120) -> Dict:
+    """
+    Import modules in a fresh interpreter under -X importtime
+
+    A module that fails to import (e.g. a missing optional dependency) is
+    reported in 'errors' and the others are still profiled.
+
+    Args:
+        modules: Module names, imported in order
+        limit: Number of slowest top-level imports to return
+        timeout: Seconds before the profiling interpreter is abandoned
+
+    Returns:
+        Dictionary with total_ms, module_count, slowest (ImportTiming list,
+        largest cumulative time first, depth 0 only) and errors
+    """
+    script = "\n".join(
+        f"try:\n    import {module}\nexcept Exception as e:\n"
+        f"    print({module!r} + ': ' + type(e).__name__ + ': ' + str(e))"
+        for module in modules
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=timeout,
+    )
+    timings = parse_importtime(result.stderr)
+    top_level = [timing for timing in timings if timing.depth == 0]
+    return {
+        'total_ms': sum(timing.cumulative_us for timing in top_level) / 1000,
+        'module_count': len(timings),
+        'slowest': sorted(top_level, key=lambda timing: -timing.cumulative_us)[:limit],
+        'errors': [line for line in result.stdout.splitlines() if line.strip()],
+    }
@@ -13,6 +13,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from models import Income, Expense, Mileage, Donation, Transaction
 from utils import format_currency, get_tax_year_dates
+from chart_data import get_chart_data
 from components.compliance_reports import render_report_generator_ui
 from components.ui.advanced_charts import (
     render_spending_heatmap,
@@ -232,22 +233,12 @@ def render_restructured_reports_screen(session, settings):
     # DATA COLLECTION - Query all records for metrics
     # ============================================================================
 
-    # Get counts and totals
-    income_count = session.query(func.count(Income.id)).filter(
-        and_(Income.date >= start_date, Income.date <= end_date)
-    ).scalar() or 0
-
-    total_income = session.query(func.sum(Income.amount_gross)).filter(
-        and_(Income.date >= start_date, Income.date <= end_date)
-    ).scalar() or 0.0
-
-    expense_count = session.query(func.count(Expense.id)).filter(
-        and_(Expense.date >= start_date, Expense.date <= end_date)
-    ).scalar() or 0
-
-    total_expenses = session.query(func.sum(Expense.amount)).filter(
-        and_(Expense.date >= start_date, Expense.date <= end_date)
-    ).scalar() or 0.0
+    # Get counts and totals from the chart data the analytics tab also draws from
+    chart_data = get_chart_data(session, start_date, end_date)
+    income_count = chart_data.income_count
+    total_income = chart_data.total_income
+    expense_count = chart_data.expense_count
+    total_expenses = chart_data.total_expenses
 
     mileage_count = session.query(func.count(Mileage.id)).filter(
         and_(Mileage.date >= start_date, Mileage.date <= end_date)
@@ -0,0 +1,151 @@
+"""
+Set-based review actions for Tax Helper
+Mark Reviewed, Mark Personal and Apply Category act on a selection of
+transactions - a list of ids, or the filter predicates behind "Select All" -
+with the same handful of statements however many rows it covers: one
+INSERT ... SELECT for the audit entry (one undoable entry per action), one
+UPDATE and, when posting to the ledgers, one SELECT of the rows plus one
+INSERT per ledger. Apply Category only changes transactions going the way
+its category does (money in for income types, out for expense categories).
+
+The actions do not commit; the caller commits (or rolls back) them as one
+unit.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, update
+
+from models import Transaction, INCOME_TYPES, EXPENSE_CATEGORIES
+from components.audit_trail import log_bulk_update
+from ledger_helpers import post_ledger_entries
+
+
+@dataclass(frozen=True)
+class Selection:
+    """
+    The transactions a review action applies to
+
+    Usage:
+        Selection.of_ids(st.session_state['selected_txns'])
+        Selection.matching(conditions)    # every match, without loading ids
+    """
+    ids: Optional[Tuple[int, ...]] = None
+    conditions: Tuple = ()
+
+    @classmethod
+    def of_ids(cls, ids: Iterable[int]) -> 'Selection':
+        return cls(ids=tuple(ids))
+
+    @classmethod
+    def matching(cls, conditions: Sequence) -> 'Selection':
+        return cls(conditions=tuple(conditions))
+
+    def where(self) -> List:
+        """Predicates selecting the transactions"""
+        conditions = list(self.conditions)
+        if self.ids is not None:
+            conditions.append(Transaction.id.in_(self.ids))
+        return conditions
+
+
+@dataclass
+class ReviewResult:
+    """Outcome of a review action"""
+    updated: int = 0
+    posted: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+# Transactions each type of category applies to, as the one-at-a-time review
+# and post_ledger_entries decide it
+DIRECTIONS = {
+    'Income': Transaction.paid_in > 0,
+    'Expense': Transaction.paid_out > 0,
+}
+
+
+def category_type(category: str) -> str:
+    """'Income' for an income type, 'Expense' for an expense category"""
+    types = {txn_type for txn_type, categories in (('Income', INCOME_TYPES), ('Expense', EXPENSE_CATEGORIES))
+             if category in categories}
+    if len(types) != 1:
+        raise ValueError(f"Cannot tell whether {category!r} is an income type or expense category")
+    return types.pop()
+
+
+def _apply(session, selection: Selection, values: Dict, summary: str, *conditions) -> int:
+    """Audit, then update, the selected transactions matching conditions; returns the number updated"""
+    where = selection.where() + list(conditions)
+    log_bulk_update(session, Transaction, where, values, summary)
+    result = session.execute(
+        update(Transaction).where(*where).values(**values)
+        .execution_options(synchronize_session='fetch')
+    )
+    return result.rowcount
+
+
+def mark_reviewed(session, selection: Selection) -> ReviewResult:
+    """Mark the selected transactions as reviewed"""
+    return ReviewResult(updated=_apply(
+        session, selection, {'reviewed': True}, 'Bulk review: marked as reviewed'
+    ))
+
+
+def mark_personal(session, selection: Selection) -> ReviewResult:
+    """Mark the selected transactions as personal and reviewed"""
+    return ReviewResult(updated=_apply(
+        session, selection, {'is_personal': True, 'reviewed': True}, 'Bulk review: marked as personal'
+    ))
+
+
+def apply_category(session, selection: Selection, category: str, post_to_ledgers: bool = True,
+                   txn_type: Optional[str] = None) -> ReviewResult:
+    """
+    Categorize the selected transactions and mark them reviewed
+
+    The category decides the type: an income type applies to money in and an
+    expense category to money out; selected transactions going the other way
+    are left alone and counted as skipped. Personal flags are kept, and only
+    business transactions are posted to the ledger (entries already there are
+    skipped).
+
+    Args:
+        session: SQLAlchemy session
+        selection: Transactions to categorize
+        category: Income type or expense category
+        post_to_ledgers: Whether to post to the Income/Expense ledgers
+        txn_type: 'Income' or 'Expense', for categories in both lists
+            (default: looked up with category_type)
+
+    Returns:
+        ReviewResult with the updated, posted and skipped counts and any
+        posting errors
+    """
+    txn_type = txn_type or category_type(category)
+    direction = DIRECTIONS[txn_type]
+    where = selection.where()
+
+    # Read the rows to post before the UPDATE can take them out of the selection
+    selected = session.query(func.count(Transaction.id)).filter(*where).scalar()
+    rows = []
+    if post_to_ledgers:
+        rows = session.query(
+            Transaction.id, Transaction.date, Transaction.description, Transaction.notes,
+            Transaction.paid_in, Transaction.paid_out
+        ).filter(*where, direction, Transaction.is_personal.isnot(True)).all()
+
+    result = ReviewResult(updated=_apply(
+        session, selection,
+        {'guessed_category': category, 'guessed_type': txn_type, 'reviewed': True},
+        f'Bulk review: set category to {category}', direction
+    ))
+    result.skipped = selected - result.updated
+
+    if rows:
+        result.posted, _, result.errors = post_ledger_entries(
+            ((row, category, txn_type) for row in rows), session
+        )
+    return result
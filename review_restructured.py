@@ -6,11 +6,16 @@ Complete UI overhaul for transaction review workflow
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import and_
 import plotly.graph_objects as go
 from models import Transaction, Income, Expense, INCOME_TYPES, EXPENSE_CATEGORIES
 from utils import format_currency
 from components.ui.interactions import show_toast
+from components.search_filter import keyset_page, render_page_controls
+from transaction_queries import (
+    count_transactions, transaction_amount, transaction_position, review_cursor, seek_transaction, UNREVIEWED
+)
+from review_actions import Selection, mark_reviewed, mark_personal, apply_category
 
 def render_restructured_review_screen(session, settings):
     """
@@ -406,13 +411,11 @@ def render_restructured_review_screen(session, settings):
     </style>
     """, unsafe_allow_html=True)
     
-    # Get unreviewed transactions
-    unreviewed = session.query(Transaction).filter(
-        Transaction.reviewed == False
-    ).order_by(Transaction.date.desc()).all()
+    # Count the review queue; each mode loads only the rows it shows
+    unreviewed_count = count_transactions(session, UNREVIEWED)
     
-    total_transactions = session.query(func.count(Transaction.id)).scalar() or 0
-    reviewed_count = total_transactions - len(unreviewed)
+    total_transactions = count_transactions(session)
+    reviewed_count = total_transactions - unreviewed_count
     
     # ============================================================================
     # HEADER SECTION
@@ -460,7 +463,7 @@ def render_restructured_review_screen(session, settings):
     """.format(
         f"{total_transactions:,}",
         f"{reviewed_count:,}",
-        len(unreviewed),
+        unreviewed_count,
         completion_pct
     ), unsafe_allow_html=True)
     
@@ -468,13 +471,14 @@ def render_restructured_review_screen(session, settings):
     st.progress(completion_pct / 100)
 
     # ── Approve All High Confidence (visible across all modes) ────────
-    high_conf_txns = [t for t in unreviewed if t.confidence_score >= 80]
-    if high_conf_txns:
+    high_conf_filter = UNREVIEWED + [Transaction.confidence_score >= 80]
+    high_conf_count = count_transactions(session, high_conf_filter)
+    if high_conf_count:
         hc_col1, hc_col2 = st.columns([3, 1])
         with hc_col1:
             st.markdown(f"""
             <div class="approve-hc-banner">
-                <div class="count">{len(high_conf_txns)}</div>
+                <div class="count">{high_conf_count}</div>
                 <div class="label">
                     transactions with <strong>&ge;80% AI confidence</strong> — safe to auto-approve
                 </div>
@@ -482,10 +486,11 @@ def render_restructured_review_screen(session, settings):
             """, unsafe_allow_html=True)
         with hc_col2:
             if st.button("Approve All High Confidence", type="primary", use_container_width=True, key="global_approve_hc"):
-                for txn in high_conf_txns:
-                    txn.reviewed = True
+                approved = session.query(Transaction).filter(*high_conf_filter).update(
+                    {'reviewed': True}, synchronize_session=False
+                )
                 session.commit()
-                show_toast(f"Auto-approved {len(high_conf_txns)} high-confidence transactions", "success")
+                show_toast(f"Auto-approved {approved} high-confidence transactions", "success")
                 st.rerun()
 
     # ============================================================================
@@ -515,7 +520,7 @@ def render_restructured_review_screen(session, settings):
     # MAIN REVIEW INTERFACE
     # ============================================================================
     
-    if not unreviewed:
+    if unreviewed_count == 0:
         # All done!
         st.markdown("""
         <div style="
@@ -553,20 +558,25 @@ def render_restructured_review_screen(session, settings):
         # QUICK REVIEW MODE - Card by card
         # ====================================================================
         
-        if 'current_txn_index' not in st.session_state:
-            st.session_state.current_txn_index = 0
-        
-        # Ensure index is within bounds
-        if st.session_state.current_txn_index >= len(unreviewed):
-            st.session_state.current_txn_index = 0
-        
-        current_txn = unreviewed[st.session_state.current_txn_index]
+        # Load just the transaction being reviewed: the one at the (date, id)
+        # cursor, or the next one once it has been reviewed
+        current_txn = seek_transaction(session, UNREVIEWED, st.session_state.get('review_cursor'))
+        if current_txn is None:
+            # Past the oldest - start again from the newest
+            current_txn = seek_transaction(session, UNREVIEWED)
+        st.session_state.review_cursor = review_cursor(current_txn)
+        position = transaction_position(session, UNREVIEWED, current_txn)
+
+        def step_to(step):
+            """Move the cursor to the 'next' or 'previous' queued transaction (past the oldest wraps round)"""
+            txn = seek_transaction(session, UNREVIEWED, st.session_state.review_cursor, step)
+            st.session_state.review_cursor = review_cursor(txn) if txn is not None else None
         
         # Quick stats bar
         st.markdown(f"""
         <div class="quick-actions-bar">
             <div style="flex: 1;">
-                Reviewing transaction <strong>{st.session_state.current_txn_index + 1}</strong> of <strong>{len(unreviewed)}</strong>
+                Reviewing transaction <strong>{position + 1}</strong> of <strong>{unreviewed_count}</strong>
             </div>
             <div class="quick-action-chip">⏱️ Avg time: 3 sec</div>
             <div class="quick-action-chip">🎯 {completion_pct:.0f}% done</div>
@@ -637,7 +647,6 @@ def render_restructured_review_screen(session, settings):
                 # Accept AI suggestion
                 current_txn.reviewed = True
                 session.commit()
-                st.session_state.current_txn_index += 1
                 show_toast("Accepted AI suggestion", "success")
                 st.rerun()
         
@@ -646,7 +655,6 @@ def render_restructured_review_screen(session, settings):
                 current_txn.is_personal = True
                 current_txn.reviewed = True
                 session.commit()
-                st.session_state.current_txn_index += 1
                 show_toast("Marked as Personal", "info")
                 st.rerun()
         
@@ -657,7 +665,7 @@ def render_restructured_review_screen(session, settings):
         
         with col4:
             if st.button("⏭️ Skip", use_container_width=True):
-                st.session_state.current_txn_index += 1
+                step_to('next')
                 st.rerun()
         
         # Category selector (if Business was clicked)
@@ -703,7 +711,6 @@ def render_restructured_review_screen(session, settings):
                         
                         session.commit()
                         st.session_state['show_category_selector'] = False
-                        st.session_state.current_txn_index += 1
                         show_toast(f"Categorized as {category}", "success")
                         st.rerun()
         
@@ -714,8 +721,8 @@ def render_restructured_review_screen(session, settings):
         </div>
         """.format(
             ''.join([
-                f'<div class="swipe-dot {"active" if i == st.session_state.current_txn_index else ""}"></div>'
-                for i in range(min(10, len(unreviewed)))
+                f'<div class="swipe-dot {"active" if i == position else ""}"></div>'
+                for i in range(min(10, unreviewed_count))
             ])
         ), unsafe_allow_html=True)
         
@@ -724,25 +731,29 @@ def render_restructured_review_screen(session, settings):
         col1, col2, col3 = st.columns([1, 2, 1])
         with col1:
             if st.button("⬅️ Previous", use_container_width=True,
-                        disabled=st.session_state.current_txn_index == 0):
-                st.session_state.current_txn_index -= 1
+                        disabled=position == 0):
+                step_to('previous')
                 st.rerun()
         with col2:
             # Jump to transaction
             jump_to = st.number_input(
                 "Jump to transaction",
                 min_value=1,
-                max_value=len(unreviewed),
-                value=st.session_state.current_txn_index + 1,
-                key="jump_to"
+                max_value=unreviewed_count,
+                value=position + 1,
+                key=f"jump_to_{position}"  # a fresh input per position, so stepping doesn't read as a jump
             )
-            if jump_to - 1 != st.session_state.current_txn_index:
-                st.session_state.current_txn_index = jump_to - 1
+            if jump_to - 1 != position:
+                # A jump is by position, so it is the one step that skips rows with OFFSET
+                target = session.query(Transaction).filter(*UNREVIEWED).order_by(
+                    Transaction.date.desc(), Transaction.id.desc()
+                ).offset(jump_to - 1).first()
+                st.session_state.review_cursor = review_cursor(target) if target is not None else None
                 st.rerun()
         with col3:
             if st.button("Next ➡️", use_container_width=True,
-                        disabled=st.session_state.current_txn_index >= len(unreviewed) - 1):
-                st.session_state.current_txn_index += 1
+                        disabled=position >= unreviewed_count - 1):
+                step_to('next')
                 st.rerun()
     
     elif st.session_state.review_mode == 'list':
@@ -763,48 +774,52 @@ def render_restructured_review_screen(session, settings):
         with col4:
             sort_by = st.selectbox("Sort by", ["Date (Newest)", "Date (Oldest)", "Amount (High)", "Amount (Low)"])
         
-        # Apply filters
-        filtered_txns = unreviewed.copy()
+        # Apply filters in SQL
+        amount = transaction_amount()
+        conditions = list(UNREVIEWED)
         
         if filter_type == "Income":
-            filtered_txns = [t for t in filtered_txns if t.paid_in > 0]
+            conditions.append(Transaction.paid_in > 0)
         elif filter_type == "Expense":
-            filtered_txns = [t for t in filtered_txns if t.paid_out > 0]
+            conditions.append(Transaction.paid_out > 0)
         
         if filter_confidence == "High (70%+)":
-            filtered_txns = [t for t in filtered_txns if t.confidence_score >= 70]
+            conditions.append(Transaction.confidence_score >= 70)
         elif filter_confidence == "Medium (40-69%)":
-            filtered_txns = [t for t in filtered_txns if 40 <= t.confidence_score < 70]
+            conditions.append(and_(Transaction.confidence_score >= 40, Transaction.confidence_score < 70))
         elif filter_confidence == "Low (<40%)":
-            filtered_txns = [t for t in filtered_txns if t.confidence_score < 40]
+            conditions.append(Transaction.confidence_score < 40)
         
         if filter_amount == "Under £100":
-            filtered_txns = [t for t in filtered_txns if (t.paid_in or t.paid_out) < 100]
+            conditions.append(amount < 100)
         elif filter_amount == "£100-£500":
-            filtered_txns = [t for t in filtered_txns if 100 <= (t.paid_in or t.paid_out) <= 500]
+            conditions.append(amount.between(100, 500))
         elif filter_amount == "Over £500":
-            filtered_txns = [t for t in filtered_txns if (t.paid_in or t.paid_out) > 500]
+            conditions.append(amount > 500)
         
         # Sort
-        if sort_by == "Date (Newest)":
-            filtered_txns.sort(key=lambda x: x.date, reverse=True)
-        elif sort_by == "Date (Oldest)":
-            filtered_txns.sort(key=lambda x: x.date)
-        elif sort_by == "Amount (High)":
-            filtered_txns.sort(key=lambda x: x.paid_in or x.paid_out, reverse=True)
-        elif sort_by == "Amount (Low)":
-            filtered_txns.sort(key=lambda x: x.paid_in or x.paid_out)
+        sort_key, descending = {
+            "Date (Newest)": ('date', True),
+            "Date (Oldest)": ('date', False),
+            "Amount (High)": ('amount', True),
+            "Amount (Low)": ('amount', False),
+        }[sort_by]
         
-        st.info(f"Showing {len(filtered_txns)} of {len(unreviewed)} unreviewed transactions")
+        filtered_count = count_transactions(session, conditions)
+        st.info(f"Showing {filtered_count} of {unreviewed_count} unreviewed transactions")
         
-        # Bulk actions
-        if st.checkbox("Select All"):
-            st.session_state['selected_txns'] = [t.id for t in filtered_txns]
+        # Bulk actions: "Select All" acts on the filter itself, so no ids are loaded
+        if 'selected_txns' not in st.session_state:
+            st.session_state['selected_txns'] = []
+        select_all = st.checkbox("Select All")
+        if select_all:
+            selection = Selection.matching(conditions)
+            selected_count = filtered_count
         else:
-            if 'selected_txns' not in st.session_state:
-                st.session_state['selected_txns'] = []
+            selection = Selection.of_ids(st.session_state['selected_txns'])
+            selected_count = len(st.session_state['selected_txns'])
         
-        if st.session_state.get('selected_txns'):
+        if selected_count:
             st.markdown(f"""
             <div style="
                 background: linear-gradient(135deg, rgba(79, 143, 234, 0.15) 0%, rgba(79, 143, 234, 0.1) 100%);
@@ -813,62 +828,56 @@ def render_restructured_review_screen(session, settings):
                 margin: 1rem 0;
                 color: #c8cdd5;
             ">
-                <strong>{len(st.session_state['selected_txns'])} transactions selected</strong>
+                <strong>{selected_count} transactions selected</strong>
             </div>
             """, unsafe_allow_html=True)
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 if st.button("✅ Mark Reviewed", use_container_width=True):
-                    for txn_id in st.session_state['selected_txns']:
-                        txn = session.query(Transaction).get(txn_id)
-                        if txn:
-                            txn.reviewed = True
+                    result = mark_reviewed(session, selection)
                     session.commit()
-                    show_toast(f"Marked {len(st.session_state['selected_txns'])} as reviewed", "success")
+                    show_toast(f"Marked {result.updated} as reviewed", "success")
                     st.session_state['selected_txns'] = []
                     st.rerun()
             with col2:
                 if st.button("🏠 Mark Personal", use_container_width=True):
-                    for txn_id in st.session_state['selected_txns']:
-                        txn = session.query(Transaction).get(txn_id)
-                        if txn:
-                            txn.is_personal = True
-                            txn.reviewed = True
+                    result = mark_personal(session, selection)
                     session.commit()
-                    show_toast(f"Marked {len(st.session_state['selected_txns'])} as personal", "info")
+                    show_toast(f"Marked {result.updated} as personal", "info")
                     st.session_state['selected_txns'] = []
                     st.rerun()
             with col3:
-                category = st.selectbox("Set Category", ["Select..."] + EXPENSE_CATEGORIES + INCOME_TYPES)
+                bulk_type = st.radio("Type", ["Expense", "Income"], horizontal=True, key="bulk_category_type")
+                categories = INCOME_TYPES if bulk_type == "Income" else EXPENSE_CATEGORIES
+                category = st.selectbox("Set Category", ["Select..."] + categories, key="bulk_category")
             with col4:
                 if st.button("Apply Category", use_container_width=True, disabled=category == "Select..."):
-                    for txn_id in st.session_state['selected_txns']:
-                        txn = session.query(Transaction).get(txn_id)
-                        if txn:
-                            txn.guessed_category = category
-                            txn.reviewed = True
+                    result = apply_category(session, selection, category, txn_type=bulk_type)
                     session.commit()
-                    show_toast(f"Applied {category} to {len(st.session_state['selected_txns'])} transactions", "success")
+                    show_toast(f"Applied {category} to {result.updated} transactions", "success")
+                    if result.skipped:
+                        direction = "money out" if bulk_type == "Income" else "money in"
+                        show_toast(f"Skipped {result.skipped} {direction} transactions", "warning")
+                    if result.errors:
+                        show_toast(f"{len(result.errors)} could not be posted to the ledgers", "warning")
                     st.session_state['selected_txns'] = []
                     st.rerun()
         
-        # Transaction cards (staggered entrance)
-        page_size = 20
+        # Transaction cards (staggered entrance), one keyset page at a time
         page_key = "review_list_page"
-        if page_key not in st.session_state:
-            st.session_state[page_key] = 0
-        total_pages = max(1, (len(filtered_txns) + page_size - 1) // page_size)
-        page_start = st.session_state[page_key] * page_size
-        page_slice = filtered_txns[page_start:page_start + page_size]
+        page, page_number = keyset_page(
+            session, conditions, page_key, (filter_type, filter_confidence, filter_amount, sort_by),
+            sort=sort_key, descending=descending
+        )
 
-        for idx, txn in enumerate(page_slice):
+        for idx, txn in enumerate(page.transactions):
             amount = txn.paid_in if txn.paid_in > 0 else txn.paid_out
             is_income = txn.paid_in > 0
             color = "#36c7a0" if is_income else "#e07a5f"
             sign = "+" if is_income else "-"
             card_type = "income-card" if is_income else "expense-card"
-            is_selected = txn.id in st.session_state.get('selected_txns', [])
+            is_selected = select_all or txn.id in st.session_state['selected_txns']
             sel_class = " selected" if is_selected else ""
             stagger = min(idx + 1, 8)
 
@@ -893,11 +902,14 @@ def render_restructured_review_screen(session, settings):
                     value=is_selected,
                     key=f"check_{txn.id}",
                     label_visibility="collapsed",
+                    disabled=select_all,
                 )
-                if selected and txn.id not in st.session_state.get('selected_txns', []):
-                    st.session_state['selected_txns'].append(txn.id)
-                elif not selected and txn.id in st.session_state.get('selected_txns', []):
-                    st.session_state['selected_txns'].remove(txn.id)
+                # Individual picks are kept aside while Select All covers every match
+                if not select_all:
+                    if selected and txn.id not in st.session_state['selected_txns']:
+                        st.session_state['selected_txns'].append(txn.id)
+                    elif not selected and txn.id in st.session_state['selected_txns']:
+                        st.session_state['selected_txns'].remove(txn.id)
 
             with card_col:
                 st.markdown(f"""
@@ -916,27 +928,11 @@ def render_restructured_review_screen(session, settings):
             with btn_col:
                 if st.button("Review", key=f"review_{txn.id}"):
                     st.session_state.review_mode = 'quick'
-                    st.session_state.current_txn_index = unreviewed.index(txn)
+                    st.session_state.review_cursor = review_cursor(txn)
                     st.rerun()
 
         # Pagination
-        if total_pages > 1:
-            pag_col1, pag_col2, pag_col3 = st.columns([1, 2, 1])
-            with pag_col1:
-                if st.button("Previous", disabled=st.session_state[page_key] == 0, key="review_prev"):
-                    st.session_state[page_key] -= 1
-                    st.rerun()
-            with pag_col2:
-                st.markdown(
-                    f"<div style='text-align:center; color: rgba(200,205,213,0.65); padding: 0.5rem;'>"
-                    f"Page {st.session_state[page_key] + 1} of {total_pages} &middot; "
-                    f"{len(filtered_txns)} transactions</div>",
-                    unsafe_allow_html=True,
-                )
-            with pag_col3:
-                if st.button("Next", disabled=st.session_state[page_key] >= total_pages - 1, key="review_next"):
-                    st.session_state[page_key] += 1
-                    st.rerun()
+        render_page_controls(page_key, page, page_number, filtered_count)
     
     elif st.session_state.review_mode == 'ai':
         # ====================================================================
@@ -951,11 +947,14 @@ def render_restructured_review_screen(session, settings):
         
         groups = defaultdict(list)
         
-        for txn in unreviewed:
+        # Group ids by description without loading whole rows
+        for txn_id, description in session.query(Transaction.id, Transaction.description).filter(
+            *UNREVIEWED
+        ).order_by(Transaction.date.desc(), Transaction.id.desc()):
             # Group by similar descriptions
-            key_words = txn.description.upper().split()[:3]  # First 3 words
+            key_words = description.upper().split()[:3]  # First 3 words
             key = ' '.join(key_words)
-            groups[key].append(txn)
+            groups[key].append(txn_id)
         
         # Sort groups by size (largest first)
         sorted_groups = sorted(groups.items(), key=lambda x: len(x[1]), reverse=True)
@@ -963,10 +962,15 @@ def render_restructured_review_screen(session, settings):
         # Show top groups
         st.markdown("#### 📊 Transaction Groups")
         
-        for group_name, transactions in sorted_groups[:5]:
-            if len(transactions) < 2:
+        for group_name, group_ids in sorted_groups[:5]:
+            if len(group_ids) < 2:
                 continue
             
+            # Load only the groups on screen
+            transactions = session.query(Transaction).filter(Transaction.id.in_(group_ids)).order_by(
+                Transaction.date.desc(), Transaction.id.desc()
+            ).all()
+            
             with st.expander(f"**{group_name}** ({len(transactions)} transactions)", expanded=False):
                 # Show group stats
                 total_amount = sum(t.paid_in or t.paid_out for t in transactions)
@@ -996,33 +1000,34 @@ def render_restructured_review_screen(session, settings):
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     if st.button(f"✅ Accept for all", key=f"accept_group_{group_name}"):
-                        for txn in transactions:
-                            txn.reviewed = True
+                        mark_reviewed(session, Selection.of_ids(group_ids))
                         session.commit()
                         show_toast(f"Marked {len(transactions)} as reviewed", "success")
                         st.rerun()
 
                 with col2:
                     if st.button(f"🏠 All Personal", key=f"personal_group_{group_name}"):
-                        for txn in transactions:
-                            txn.is_personal = True
-                            txn.reviewed = True
+                        mark_personal(session, Selection.of_ids(group_ids))
                         session.commit()
                         show_toast(f"Marked {len(transactions)} as personal", "info")
                         st.rerun()
                 
                 with col3:
+                    group_type = st.radio(
+                        "Type", ["Expense", "Income"], horizontal=True, key=f"cat_type_{group_name}"
+                    )
                     category = st.selectbox(
                         "Apply category to all",
-                        ["Select..."] + EXPENSE_CATEGORIES + INCOME_TYPES,
+                        ["Select..."] + (INCOME_TYPES if group_type == "Income" else EXPENSE_CATEGORIES),
                         key=f"cat_select_{group_name}"
                     )
                     if st.button("Apply", key=f"apply_cat_{group_name}", disabled=category == "Select..."):
-                        for txn in transactions:
-                            txn.guessed_category = category
-                            txn.reviewed = True
+                        result = apply_category(session, Selection.of_ids(group_ids), category, txn_type=group_type)
                         session.commit()
-                        show_toast(f"Applied {category} to {len(transactions)} transactions", "success")
+                        show_toast(f"Applied {category} to {result.updated} transactions", "success")
+                        if result.skipped:
+                            direction = "money out" if group_type == "Income" else "money in"
+                            show_toast(f"Skipped {result.skipped} {direction} transactions", "warning")
                         st.rerun()
                 
                 # Show individual transactions
@@ -1041,8 +1046,7 @@ def render_restructured_review_screen(session, settings):
         st.markdown("#### 💡 Smart Suggestions")
         
         # High confidence transactions
-        high_conf = [t for t in unreviewed if t.confidence_score >= 80]
-        if high_conf:
+        if high_conf_count:
             st.markdown(f"""
             <div style="
                 background: linear-gradient(135deg, rgba(54, 199, 160, 0.2) 0%, rgba(54, 199, 160, 0.15) 100%);
@@ -1051,16 +1055,17 @@ def render_restructured_review_screen(session, settings):
                 margin: 1rem 0;
                 color: #c8cdd5;
             ">
-                <strong>🟢 {len(high_conf)} transactions with high confidence</strong><br>
+                <strong>🟢 {high_conf_count} transactions with high confidence</strong><br>
                 <small style="color: rgba(200, 205, 213, 0.7);">These can likely be auto-approved</small>
             </div>
             """, unsafe_allow_html=True)
             
             if st.button("✅ Auto-approve high confidence", type="primary"):
-                for txn in high_conf:
-                    txn.reviewed = True
+                approved = session.query(Transaction).filter(*high_conf_filter).update(
+                    {'reviewed': True}, synchronize_session=False
+                )
                 session.commit()
-                show_toast(f"Auto-approved {len(high_conf)} transactions", "success")
+                show_toast(f"Auto-approved {approved} transactions", "success")
                 st.rerun()
         
         # Recurring transactions
@@ -0,0 +1,213 @@
+"""
+Compiled rule-matching engine for Tax Helper
+Builds the categorization rules once and classifies descriptions in bulk
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Match modes that compare plain text (Regex rules are compiled separately)
+LITERAL_MATCH_MODES = ('Contains', 'Equals', 'Starts with', 'Ends with')
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Snapshot of an enabled Rule with its classification outcome"""
+    rank: int
+    match_mode: str
+    text_to_match: str
+    priority: int
+    guessed_type: Optional[str]
+    guessed_category: Optional[str]
+    is_personal: bool
+    rule: Any = field(compare=False, repr=False)
+
+    @property
+    def result(self) -> Tuple[Optional[str], Optional[str], bool]:
+        return self.guessed_type, self.guessed_category, self.is_personal
+
+
+def _literal_pattern(match_mode: str, text: str) -> str:
+    """Regex source for a literal rule, matched with re.match against a lowercased description"""
+    escaped = re.escape(text.lower())
+
+    if match_mode == 'Contains':
+        return f'.*?{escaped}'
+    if match_mode == 'Equals':
+        return rf'{escaped}\Z'
+    if match_mode == 'Starts with':
+        return escaped
+    return rf'.*{escaped}\Z'  # Ends with
+
+
+class RuleEngine:
+    """
+    Categorization rules compiled once for repeated matching
+
+    Enabled rules are sorted by priority (lower = higher priority) a single
+    time. Every literal rule is merged into one combined regex made of
+    anchored alternatives in priority order, so the first alternative that
+    matches is the highest-priority literal rule. Regex rules are
+    precompiled and only tried when they outrank the best literal match.
+
+    Usage:
+        engine = RuleEngine.from_session(session)
+        guessed_type, guessed_category, is_personal = engine.classify(desc, paid_in, paid_out)
+        guesses = engine.classify_series(df['description'], df['paid_in'], df['paid_out'])
+    """
+
+    def __init__(self, rules: List):
+        enabled = sorted([r for r in rules if r.enabled], key=lambda x: x.priority)
+
+        self.rules: List[CompiledRule] = []
+        for rank, rule in enumerate(enabled):
+            guessed_category = None
+            if rule.map_to == 'Income':
+                guessed_category = rule.income_type
+            elif rule.map_to == 'Expense':
+                guessed_category = rule.expense_category
+
+            self.rules.append(CompiledRule(
+                rank=rank,
+                match_mode=rule.match_mode,
+                text_to_match=rule.text_to_match,
+                priority=rule.priority,
+                guessed_type=rule.map_to,
+                guessed_category=guessed_category,
+                is_personal=rule.is_personal if hasattr(rule, 'is_personal') else False,
+                rule=rule
+            ))
+
+        # One matcher per rule, used for single-rule checks and previews
+        self._matchers = {}
+        alternatives = []
+        self._group_ranks: List[int] = []
+        self._regex_rules: List[Tuple[int, re.Pattern]] = []
+
+        for compiled in self.rules:
+            if compiled.match_mode in LITERAL_MATCH_MODES:
+                source = _literal_pattern(compiled.match_mode, compiled.text_to_match)
+                self._matchers[compiled.rank] = re.compile(source, re.DOTALL).match
+                alternatives.append(f'({source})')
+                self._group_ranks.append(compiled.rank)
+            elif compiled.match_mode == 'Regex':
+                try:
+                    pattern = re.compile(compiled.text_to_match, re.IGNORECASE)
+                except re.error:
+                    continue  # Invalid regex rules never match
+                self._matchers[compiled.rank] = pattern.search
+                self._regex_rules.append((compiled.rank, pattern))
+
+        self._literal_pattern = re.compile('|'.join(alternatives), re.DOTALL) if alternatives else None
+
+    @classmethod
+    def from_session(cls, session) -> 'RuleEngine':
+        """Build an engine from every rule in the database"""
+        from models import Rule
+        return cls(session.query(Rule).all())
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, description: str) -> Optional[CompiledRule]:
+        """Return the highest-priority rule matching the description, or None"""
+        description = description or ''
+        best_rank = len(self.rules)
+
+        if self._literal_pattern is not None:
+            m = self._literal_pattern.match(description.lower())
+            if m:
+                best_rank = self._group_ranks[m.lastindex - 1]
+
+        for rank, pattern in self._regex_rules:
+            if rank >= best_rank:
+                break
+            if pattern.search(description):
+                best_rank = rank
+                break
+
+        return self.rules[best_rank] if best_rank < len(self.rules) else None
+
+    def matching_rules(self, description: str) -> List[CompiledRule]:
+        """Return every rule matching the description, in priority order"""
+        description = description or ''
+        lowered = description.lower()
+
+        matches = []
+        for compiled in self.rules:
+            matcher = self._matchers.get(compiled.rank)
+            if matcher is None:
+                continue
+            target = description if compiled.match_mode == 'Regex' else lowered
+            if matcher(target):
+                matches.append(compiled)
+        return matches
+
+    def rule_matches(self, rule_rank: int, description: str) -> bool:
+        """Check a single compiled rule against a description"""
+        matcher = self._matchers.get(rule_rank)
+        if matcher is None:
+            return False
+        description = description or ''
+        target = description if self.rules[rule_rank].match_mode == 'Regex' else description.lower()
+        return bool(matcher(target))
+
+    def classify(self, description: str, paid_in: float, paid_out: float) -> Tuple[Optional[str], Optional[str], bool]:
+        """
+        Classify one transaction
+        Returns (guessed_type, guessed_category, is_personal), same as apply_rules
+        """
+        compiled = self.match(description)
+        if compiled is not None:
+            return compiled.result
+
+        # Default: if paid_in > 0, guess Income; if paid_out > 0, guess Expense
+        # Defaults to business (is_personal=False)
+        if paid_in > 0:
+            return 'Income', 'Self-employment', False
+        elif paid_out > 0:
+            return 'Expense', 'Other business expenses', False
+
+        return None, None, False
+
+    def classify_series(self, descriptions: pd.Series, paid_in: pd.Series, paid_out: pd.Series) -> pd.DataFrame:
+        """
+        Classify a whole column of transactions in one pass
+
+        Each distinct description is matched once; the paid in/out defaults
+        are applied column-wide to rows no rule matched.
+
+        Returns:
+            DataFrame indexed like descriptions with guessed_type,
+            guessed_category and is_personal columns
+        """
+        winners = {description: self.match(description) for description in pd.unique(descriptions)}
+        matched = [winners[description] for description in descriptions]
+        has_rule = np.array([compiled is not None for compiled in matched], dtype=bool)
+
+        money_in = np.asarray(paid_in, dtype=float) > 0
+        money_out = ~money_in & (np.asarray(paid_out, dtype=float) > 0)
+
+        guessed_type = np.full(len(matched), None, dtype=object)
+        guessed_type[money_in] = 'Income'
+        guessed_type[money_out] = 'Expense'
+
+        guessed_category = np.full(len(matched), None, dtype=object)
+        guessed_category[money_in] = 'Self-employment'
+        guessed_category[money_out] = 'Other business expenses'
+
+        is_personal = np.full(len(matched), False, dtype=object)
+
+        for position in np.flatnonzero(has_rule):
+            guessed_type[position], guessed_category[position], is_personal[position] = matched[position].result
+
+        return pd.DataFrame({
+            'guessed_type': pd.Series(guessed_type, index=descriptions.index, dtype=object),
+            'guessed_category': pd.Series(guessed_category, index=descriptions.index, dtype=object),
+            'is_personal': pd.Series(is_personal.tolist(), index=descriptions.index),
+        })
@@ -0,0 +1,220 @@
+"""
+Rule evaluation in SQL for Tax Helper
+Translates categorization rules into SQL predicates so testing a rule,
+applying it and measuring every rule's coverage run inside SQLite instead
+of loading the transactions table into Python
+
+Contains/Equals/Starts with/Ends with become case-insensitive LIKE and
+COLLATE NOCASE comparisons (Equals and Starts with are served by the
+ix_transactions_description_nocase index). Regex rules use the REGEXP
+function registered on every connection by models.init_db().
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, false, func
+
+
+# Regex rules match case-insensitively, like RuleEngine
+REGEX_FLAGS = '(?i)'
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def sqlite_regexp(pattern, value):
+    """REGEXP implementation: re.search semantics, NULL-safe, invalid patterns never match"""
+    if pattern is None or value is None:
+        return None
+    try:
+        return _compile(pattern).search(value) is not None
+    except re.error:
+        return False
+
+
+def register_regexp(dbapi_connection) -> None:
+    """Register REGEXP on a raw sqlite3 connection (SQLite only has the operator)"""
+    dbapi_connection.create_function('REGEXP', 2, sqlite_regexp, deterministic=True)
+
+
+def _like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def rule_predicate(match_mode: str, text_to_match: str, column=None):
+    """
+    SQL condition matching what RuleEngine matches for one rule
+
+    Args:
+        match_mode: Contains, Equals, Starts with, Ends with or Regex
+        text_to_match: Rule text (or regular expression)
+        column: Column to test (default: Transaction.description)
+
+    Returns:
+        SQLAlchemy boolean expression; false() for invalid regexes and
+        unknown match modes
+    """
+    if column is None:
+        from models import Transaction
+        column = Transaction.description
+
+    text_to_match = text_to_match or ''
+    escaped = _like_escape(text_to_match)
+
+    if match_mode == 'Contains':
+        return column.like(f'%{escaped}%', escape='\\')
+    if match_mode == 'Equals':
+        return column.collate('NOCASE') == text_to_match
+    if match_mode == 'Starts with':
+        return column.like(f'{escaped}%', escape='\\')
+    if match_mode == 'Ends with':
+        return column.like(f'%{escaped}', escape='\\')
+    if match_mode == 'Regex':
+        try:
+            re.compile(text_to_match, re.IGNORECASE)
+        except re.error:
+            return false()  # Invalid regex rules never match
+        return column.op('REGEXP')(REGEX_FLAGS + text_to_match)
+    return false()
+
+
+# ===================================================================
+# TESTING AND APPLYING ONE RULE
+# ===================================================================
+
+@dataclass
+class RuleMatchPage:
+    """One page of the transactions a rule matches"""
+    total: int
+    page: int
+    page_size: int
+    transactions: List = field(default_factory=list)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.total // self.page_size))
+
+    @property
+    def has_more(self) -> bool:
+        return (self.page + 1) * self.page_size < self.total
+
+
+def rule_matches(session, rule, page: int = 0, page_size: int = 10) -> RuleMatchPage:
+    """
+    Count the transactions a rule matches and load one page of them
+
+    Args:
+        session: SQLAlchemy session
+        rule: Rule (anything with match_mode and text_to_match)
+        page: Zero-based page number
+        page_size: Transactions per page, newest first
+
+    Returns:
+        RuleMatchPage
+    """
+    from models import Transaction
+
+    predicate = rule_predicate(rule.match_mode, rule.text_to_match)
+    total = session.query(func.count(Transaction.id)).filter(predicate).scalar() or 0
+    transactions = session.query(Transaction).filter(predicate).order_by(
+        Transaction.date.desc(), Transaction.id.desc()
+    ).limit(page_size).offset(page * page_size).all()
+
+    return RuleMatchPage(total=total, page=page, page_size=page_size, transactions=transactions)
+
+
+def apply_rule_to_matches(session, rule, values: Dict) -> int:
+    """
+    Set columns on every transaction a rule matches with one UPDATE (the caller commits)
+
+    Returns:
+        Number of transactions updated
+    """
+    from models import Transaction
+
+    predicate = rule_predicate(rule.match_mode, rule.text_to_match)
+    return session.query(Transaction).filter(predicate).update(values, synchronize_session=False)
+
+
+# ===================================================================
+# COVERAGE OF ALL RULES
+# ===================================================================
+
+@dataclass(frozen=True)
+class RuleStatistics:
+    """Hit counts of every enabled rule, from one scan of the transactions"""
+    total_transactions: int
+    hits: Dict[int, int]
+    wins: Dict[int, int]
+
+    @property
+    def matched_transactions(self) -> int:
+        """Transactions at least one enabled rule matches"""
+        return sum(self.wins.values())
+
+    @property
+    def coverage(self) -> float:
+        """Percentage of transactions some rule matches"""
+        if not self.total_transactions:
+            return 0.0
+        return self.matched_transactions / self.total_transactions * 100
+
+    @property
+    def shadowed(self) -> List[int]:
+        """IDs of rules that match transactions but always lose to a higher-priority rule"""
+        return [rule_id for rule_id, count in self.hits.items() if count and not self.wins.get(rule_id)]
+
+    @property
+    def unused(self) -> List[int]:
+        """IDs of rules that match no transactions"""
+        return [rule_id for rule_id, count in self.hits.items() if not count]
+
+
+def rule_statistics(session, rules: Optional[List] = None) -> RuleStatistics:
+    """
+    Hit count (any match) and win count (highest-priority match) of every
+    enabled rule in a single grouped query over the transactions
+
+    Args:
+        session: SQLAlchemy session
+        rules: Rules to measure (default: all enabled rules)
+
+    Returns:
+        RuleStatistics keyed by rule id
+    """
+    from models import Rule, Transaction
+
+    if rules is None:
+        rules = session.query(Rule).filter(Rule.enabled == True).all()
+    # Ties on priority go to the lower id, as in RuleEngine's stable sort
+    rules = sorted(rules, key=lambda r: (r.priority, r.id))
+
+    if not rules:
+        total = session.query(func.count(Transaction.id)).scalar() or 0
+        return RuleStatistics(total_transactions=total, hits={}, wins={})
+
+    predicates = [rule_predicate(rule.match_mode, rule.text_to_match) for rule in rules]
+    winner = case(*[(predicate, position) for position, predicate in enumerate(predicates)], else_=-1)
+
+    rows = session.query(
+        winner.label('winner'),
+        func.count(Transaction.id),
+        *[func.sum(case((predicate, 1), else_=0)) for predicate in predicates]
+    ).group_by('winner').all()
+
+    total = 0
+    hits = {rule.id: 0 for rule in rules}
+    wins = {rule.id: 0 for rule in rules}
+    for winning_position, count, *rule_hits in rows:
+        total += count
+        if winning_position >= 0:
+            wins[rules[winning_position].id] += count
+        for rule, rule_hit in zip(rules, rule_hits):
+            hits[rule.id] += rule_hit or 0
+
+    return RuleStatistics(total_transactions=total, hits=hits, wins=wins)
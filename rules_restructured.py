@@ -9,6 +9,9 @@ from datetime import datetime
 from sqlalchemy import func
 from models import Rule, Transaction, MATCH_MODES, INCOME_TYPES, EXPENSE_CATEGORIES
 from utils import format_currency
+from rule_engine import RuleEngine
+from rule_evaluation import rule_matches, apply_rule_to_matches
+from cache_helpers import get_rule_statistics
 from components.ui.interactions import show_toast, confirm_delete
 
 def render_restructured_rules_screen(session, settings):
@@ -345,33 +348,11 @@ def render_restructured_rules_screen(session, settings):
 
                             # Show test results for selected rule
                             if st.session_state.get('test_rule_id') == rule.id:
-                                # Find matching transactions
+                                # Count and page matches in SQL
                                 test_rule = rule
-                                import re as _re
-                                matching_txns = []
-                                all_txns = session.query(Transaction).all()
-                                for txn in all_txns:
-                                    desc = (txn.description or "").upper()
-                                    rule_text = test_rule.text_to_match.upper()
-                                    is_match = False
-                                    if test_rule.match_mode == "Contains" and rule_text in desc:
-                                        is_match = True
-                                    elif test_rule.match_mode == "Equals" and desc == rule_text:
-                                        is_match = True
-                                    elif test_rule.match_mode == "Starts with" and desc.startswith(rule_text):
-                                        is_match = True
-                                    elif test_rule.match_mode == "Ends with" and desc.endswith(rule_text):
-                                        is_match = True
-                                    elif test_rule.match_mode == "Regex":
-                                        try:
-                                            if _re.search(test_rule.text_to_match, txn.description or "", _re.IGNORECASE):
-                                                is_match = True
-                                        except Exception:
-                                            pass
-                                    if is_match:
-                                        matching_txns.append(txn)
-
-                                match_count = len(matching_txns)
+                                page_key = f"test_rule_page_{rule.id}"
+                                results = rule_matches(session, test_rule, page=st.session_state.get(page_key, 0))
+                                match_count = results.total
                                 cat = test_rule.income_type or test_rule.expense_category or "Ignore"
 
                                 if match_count > 0:
@@ -382,28 +363,40 @@ def render_restructured_rules_screen(session, settings):
                                     </div>
                                     """, unsafe_allow_html=True)
 
-                                    # Show first 10 matches
-                                    with st.expander(f"View {min(match_count, 10)} of {match_count} matches", expanded=True):
-                                        for txn in matching_txns[:10]:
-                                            st.markdown(f"- **{txn.description}** — {txn.date.strftime('%d %b %Y')} — £{float(txn.amount or 0):,.2f}")
+                                    # Show one page of matches
+                                    with st.expander(f"Page {results.page + 1} of {results.page_count} ({match_count} matches)", expanded=True):
+                                        for txn in results.transactions:
+                                            amount = float(txn.paid_in or txn.paid_out or 0)
+                                            st.markdown(f"- **{txn.description}** — {txn.date.strftime('%d %b %Y')} — £{amount:,.2f}")
+
+                                        prev_col, next_col = st.columns(2)
+                                        with prev_col:
+                                            if results.page > 0 and st.button("← Previous", key=f"test_prev_{rule.id}"):
+                                                st.session_state[page_key] = results.page - 1
+                                                st.rerun()
+                                        with next_col:
+                                            if results.has_more and st.button("Next →", key=f"test_next_{rule.id}"):
+                                                st.session_state[page_key] = results.page + 1
+                                                st.rerun()
 
                                     # Apply button
                                     if st.button(f"Apply rule to all {match_count} matches", key=f"apply_rule_{rule.id}", type="primary"):
-                                        applied = 0
-                                        for txn in matching_txns:
-                                            txn.guessed_type = test_rule.map_to
-                                            txn.guessed_category = cat
-                                            txn.confidence_score = 0.95
-                                            applied += 1
+                                        applied = apply_rule_to_matches(session, test_rule, {
+                                            'guessed_type': test_rule.map_to,
+                                            'guessed_category': cat,
+                                            'confidence_score': 0.95,
+                                        })
                                         session.commit()
                                         show_toast(f"Rule applied to {applied} transactions", "success")
                                         st.session_state.pop('test_rule_id', None)
+                                        st.session_state.pop(page_key, None)
                                         st.rerun()
                                 else:
                                     st.info(f"No existing transactions match \"{test_rule.text_to_match}\"")
 
                                 if st.button("Close test results", key=f"close_test_{rule.id}"):
                                     st.session_state.pop('test_rule_id', None)
+                                    st.session_state.pop(page_key, None)
                                     st.rerun()
 
                             st.markdown("---")
@@ -572,36 +565,9 @@ def render_restructured_rules_screen(session, settings):
         
         if test_description:
             # Find matching rules
-            all_rules = session.query(Rule).filter(Rule.enabled == True).order_by(Rule.priority).all()
-            
-            matched_rule = None
-            all_matches = []
-            
-            for rule in all_rules:
-                text_upper = test_description.upper()
-                rule_text_upper = rule.text_to_match.upper()
-                
-                is_match = False
-                if rule.match_mode == "Contains" and rule_text_upper in text_upper:
-                    is_match = True
-                elif rule.match_mode == "Starts with" and text_upper.startswith(rule_text_upper):
-                    is_match = True
-                elif rule.match_mode == "Ends with" and text_upper.endswith(rule_text_upper):
-                    is_match = True
-                elif rule.match_mode == "Equals" and text_upper == rule_text_upper:
-                    is_match = True
-                elif rule.match_mode == "Regex":
-                    import re
-                    try:
-                        if re.search(rule.text_to_match, test_description, re.IGNORECASE):
-                            is_match = True
-                    except:
-                        pass
-                
-                if is_match:
-                    all_matches.append(rule)
-                    if not matched_rule:
-                        matched_rule = rule
+            engine = RuleEngine.from_session(session)
+            all_matches = [compiled.rule for compiled in engine.matching_rules(test_description)]
+            matched_rule = all_matches[0] if all_matches else None
             
             # Display results
             if matched_rule:
@@ -708,24 +674,45 @@ def render_restructured_rules_screen(session, settings):
             
             st.plotly_chart(fig, use_container_width=True)
         
+        # Rule coverage from one pass over the transactions
+        rule_stats = get_rule_statistics(session)
+        enabled_rules = {r.id: r for r in session.query(Rule).filter(Rule.enabled == True).all()}
+
+        st.markdown("#### 🎯 Rule Coverage")
+        cov_col1, cov_col2, cov_col3 = st.columns(3)
+        with cov_col1:
+            st.metric("Coverage", f"{rule_stats.coverage:.1f}%")
+        with cov_col2:
+            st.metric("Matched Transactions", f"{rule_stats.matched_transactions:,}")
+        with cov_col3:
+            st.metric("Unmatched Transactions", f"{rule_stats.total_transactions - rule_stats.matched_transactions:,}")
+
         # Most effective rules
         st.markdown("#### 🏆 Most Used Rules")
-        
-        # This would need a way to track rule usage, for now show all rules by priority
-        top_rules = session.query(Rule).filter(Rule.enabled == True).order_by(Rule.priority).limit(10).all()
-        
+
+        top_rules = sorted(
+            (rule_id for rule_id, hits in rule_stats.hits.items() if hits and rule_id in enabled_rules),
+            key=lambda rule_id: -rule_stats.wins[rule_id]
+        )[:10]
+
         if top_rules:
-            for i, rule in enumerate(top_rules, 1):
+            for i, rule_id in enumerate(top_rules, 1):
+                rule = enabled_rules[rule_id]
                 category = rule.income_type or rule.expense_category or "Personal/Ignore"
-                col1, col2, col3 = st.columns([0.5, 3, 1])
-                
+                col1, col2, col3, col4 = st.columns([0.5, 3, 1, 1])
+
                 with col1:
                     st.markdown(f"**#{i}**")
                 with col2:
                     st.write(f"**{rule.text_to_match}** ({rule.match_mode})")
                 with col3:
                     st.write(f"→ {category}")
-        
+                with col4:
+                    st.write(f"{rule_stats.wins[rule_id]:,} / {rule_stats.hits[rule_id]:,}")
+            st.caption("Transactions each rule categorizes / transactions it matches")
+        else:
+            st.info("No enabled rule matches any transaction yet")
+
         # Suggestions for improvement
         st.markdown("#### 💡 Optimization Suggestions")
         
@@ -753,7 +740,17 @@ def render_restructured_rules_screen(session, settings):
         
         if generic_rules:
             suggestions.append(f"⚠️ **Very Short Rules**: {len(generic_rules)} rules have 3 or fewer characters. These might match too many transactions.")
-        
+
+        # Check for rules that always lose to a higher-priority rule
+        shadowed = [enabled_rules[rule_id].text_to_match for rule_id in rule_stats.shadowed if rule_id in enabled_rules]
+        if shadowed:
+            suggestions.append(f"⚠️ **Shadowed Rules**: {len(shadowed)} rules only match transactions already caught by a higher-priority rule ({', '.join(shadowed[:5])}). Raise their priority or remove them.")
+
+        # Check for rules that match nothing
+        unused = [rule_id for rule_id in rule_stats.unused if rule_id in enabled_rules]
+        if unused:
+            suggestions.append(f"ℹ️ **Unused Rules**: {len(unused)} enabled rules match no existing transactions.")
+
         if suggestions:
             for suggestion in suggestions:
                 st.info(suggestion)
@@ -231,6 +231,9 @@ ALL_MERCHANTS.update(SELF_EMPLOYMENT_INCOME)
 ALL_MERCHANTS.update(OFFICE_SUPPLIES)
 ALL_MERCHANTS.update(AMBIGUOUS_MERCHANTS)
 
+# Keywords uppercased once, in lookup order
+_UPPER_KEYWORDS = [(keyword.upper(), merchant_cat) for keyword, merchant_cat in ALL_MERCHANTS.items()]
+
 
 def lookup_merchant(description: str):
     """
@@ -240,8 +243,8 @@ def lookup_merchant(description: str):
     desc_upper = description.upper()
 
     # Check for exact or partial matches
-    for keyword, merchant_cat in ALL_MERCHANTS.items():
-        if keyword.upper() in desc_upper:
+    for keyword, merchant_cat in _UPPER_KEYWORDS:
+        if keyword in desc_upper:
             return merchant_cat
 
     return None
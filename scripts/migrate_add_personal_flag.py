@@ -7,7 +7,7 @@ import sys
 sys.path.insert(0, '/Users/anthony/Tax Helper')
 
 from models import init_db, Transaction, Rule
-from utils import apply_rules
+from rule_engine import RuleEngine
 from sqlalchemy import inspect
 
 # Initialize database
@@ -78,17 +78,16 @@ if added > 0:
 # Re-apply rules to all existing transactions
 print("\nRe-applying rules to existing transactions...")
 transactions = session.query(Transaction).all()
-rules = session.query(Rule).all()
+rule_engine = RuleEngine(session.query(Rule).all())
 
 updated_personal = 0
 updated_business = 0
 
 for trans in transactions:
-    guessed_type, guessed_category, is_personal = apply_rules(
+    guessed_type, guessed_category, is_personal = rule_engine.classify(
         trans.description,
         trans.paid_in,
-        trans.paid_out,
-        rules
+        trans.paid_out
     )
 
     # Update if classification changed
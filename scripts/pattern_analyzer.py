@@ -8,10 +8,17 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 from enum import Enum
-from collections import defaultdict
-import re
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
 import hashlib
 
+import numpy as np
+import pandas as pd
+
+from text_normalizer import description_key
+
 
 # ===================================================================
 # ENUMS AND CONSTANTS
@@ -28,6 +35,13 @@ class PatternType(Enum):
     NO_PATTERN = "no_pattern"
 
 
+# Patterns that override merchant data when their confidence is 90 or more
+DECISIVE_PATTERN_TYPES = (PatternType.GOVERNMENT_BENEFIT, PatternType.INTERNAL_TRANSFER, PatternType.ROUND_UP)
+
+# Smallest batch worth matching in worker processes
+PARALLEL_MIN_TRANSACTIONS = 5000
+
+
 # ===================================================================
 # DATA CLASSES
 # ===================================================================
@@ -71,46 +85,23 @@ class AnalysisResult:
     notes: List[str] = field(default_factory=list)
 
 
-# ===================================================================
-# UTILITY FUNCTIONS
-# ===================================================================
-
-def normalize_description(description: str) -> str:
-    """
-    Normalize transaction descriptions for pattern matching
-
-    Removes:
-    - Dates (various formats)
-    - Transaction IDs and reference numbers
-    - Multiple spaces
-    - Special characters
-
-    Example:
-        "TESCO STORE 12345 REF:ABC123 04/01/25" -> "TESCO STORE"
-    """
-    if not description:
-        return ""
-
-    text = description.upper().strip()
-
-    # Remove common reference patterns
-    text = re.sub(r'\bREF:?\s*[A-Z0-9]+', '', text)
-    text = re.sub(r'\b[A-Z]{2}\d{6}[A-Z]?\b', '', text)  # DWP reference codes
-    text = re.sub(r'\b\d{4,}\b', '', text)  # Long numbers (transaction IDs)
+# Fields the detectors read, as a picklable row for worker processes
+TransactionRecord = namedtuple(
+    'TransactionRecord', ['id', 'date', 'description', 'description_normalized', 'paid_in', 'paid_out']
+)
 
-    # Remove dates
-    text = re.sub(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', '', text)
-    text = re.sub(r'\b\d{1,2}-[A-Z]{3}-\d{2,4}\b', '', text)
 
-    # Remove card numbers
-    text = re.sub(r'\*+\d{4}', '', text)
+def transaction_record(transaction) -> TransactionRecord:
+    """TransactionRecord for a Transaction instance or any row with the same fields"""
+    return TransactionRecord(
+        transaction.id, transaction.date, transaction.description,
+        getattr(transaction, 'description_normalized', None), transaction.paid_in, transaction.paid_out
+    )
 
-    # Clean up spaces and punctuation
-    text = re.sub(r'[^A-Z0-9\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-
-    return text.strip()
 
+# ===================================================================
+# UTILITY FUNCTIONS
+# ===================================================================
 
 def calculate_interval_consistency(dates: List[datetime]) -> Tuple[int, float]:
     """
@@ -171,6 +162,133 @@ def generate_group_id(pattern_type: PatternType, description: str) -> str:
     return hashlib.md5(key.encode()).hexdigest()[:12]
 
 
+class PatternGroupIndex(list):
+    """
+    List of PatternGroups with hash lookup by (pattern type, normalized description)
+
+    Still a list, so detectors written against List[PatternGroup] keep working.
+    """
+
+    def __init__(self, groups=()):
+        super().__init__()
+        self._by_key: Dict[Tuple[PatternType, str], PatternGroup] = {}
+        self.extend(groups)
+
+    def append(self, group: PatternGroup) -> None:
+        super().append(group)
+        # First group wins, as with a linear scan
+        self._by_key.setdefault((group.pattern_type, group.description_normalized), group)
+
+    def extend(self, groups) -> None:
+        for group in groups:
+            self.append(group)
+
+    def find(self, pattern_type: PatternType, description_normalized: str) -> Optional[PatternGroup]:
+        return self._by_key.get((pattern_type, description_normalized))
+
+    def __reduce__(self):
+        # Rebuild through __init__ so the key index is restored (e.g. in worker processes)
+        return PatternGroupIndex, (list(self),)
+
+
+def find_group(pattern_groups: List[PatternGroup], pattern_type: PatternType,
+               description_normalized: str) -> Optional[PatternGroup]:
+    """First group of the given type for a normalized description"""
+    if isinstance(pattern_groups, PatternGroupIndex):
+        return pattern_groups.find(pattern_type, description_normalized)
+
+    for group in pattern_groups:
+        if group.pattern_type == pattern_type and group.description_normalized == description_normalized:
+            return group
+    return None
+
+
+# ===================================================================
+# RUNNING STATISTICS
+# ===================================================================
+
+@dataclass
+class RunningStats:
+    """Count, mean and sum of squared deviations, updated one value at a time (Welford)"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def variance_percent(self) -> float:
+        """Standard deviation as a percentage of the mean"""
+        if self.mean > 0:
+            return math.sqrt(max(self.variance, 0.0)) / self.mean * 100
+        return 0.0
+
+
+@dataclass
+class GroupAccumulator:
+    """Running statistics for one pattern group"""
+    group_id: str
+    pattern_type: PatternType
+    description_normalized: str
+    amounts: RunningStats = field(default_factory=RunningStats)
+    intervals: RunningStats = field(default_factory=RunningStats)
+    first_occurrence: Optional[datetime] = None
+    last_occurrence: Optional[datetime] = None
+    transaction_ids: List[int] = field(default_factory=list)
+
+    @property
+    def occurrences(self) -> int:
+        return self.amounts.count
+
+    def add_batch(self, transactions: List, amount_of) -> bool:
+        """
+        Fold transactions into the group
+
+        Intervals can only be updated in place when the new transactions fall
+        before or after the dates already seen. Returns False (and changes
+        nothing) if any falls strictly inside that range.
+        """
+        new_txns = sorted(transactions, key=lambda t: t.date)
+        if not new_txns:
+            return True
+
+        if self.first_occurrence is None:
+            chains = [[t.date for t in new_txns]]
+        else:
+            if any(self.first_occurrence < t.date < self.last_occurrence for t in new_txns):
+                return False
+            before = [t.date for t in new_txns if t.date <= self.first_occurrence]
+            after = [t.date for t in new_txns if t.date > self.first_occurrence]
+            chains = []
+            if before:
+                chains.append(before + [self.first_occurrence])
+            if after:
+                chains.append([self.last_occurrence] + after)
+
+        for dates in chains:
+            for i in range(1, len(dates)):
+                self.intervals.add((dates[i] - dates[i - 1]).days)
+
+        for txn in new_txns:
+            self.amounts.add(amount_of(txn))
+            self.transaction_ids.append(txn.id)
+
+        if self.first_occurrence is None or new_txns[0].date < self.first_occurrence:
+            self.first_occurrence = new_txns[0].date
+        if self.last_occurrence is None or new_txns[-1].date > self.last_occurrence:
+            self.last_occurrence = new_txns[-1].date
+
+        return True
+
+
 # ===================================================================
 # BASE PATTERN DETECTOR
 # ===================================================================
@@ -226,11 +344,70 @@ class BasePatternDetector(ABC):
         pass
 
 
+class GroupedPatternDetector(BasePatternDetector):
+    """
+    Base class for detectors that group transactions by normalized description
+
+    Groups are summarized by running statistics, so PatternAnalyzer can
+    persist them and update only the groups a new import touches.
+    """
+
+    @abstractmethod
+    def group_key(self, transaction) -> Optional[str]:
+        """Normalized description the transaction is grouped under, or None"""
+        pass
+
+    @abstractmethod
+    def group_amount(self, transaction) -> float:
+        """Amount tracked in the group's running statistics"""
+        pass
+
+    @abstractmethod
+    def qualifies(self, accumulator: GroupAccumulator) -> bool:
+        """Whether the group's statistics amount to a pattern"""
+        pass
+
+    @abstractmethod
+    def build_group(self, accumulator: GroupAccumulator) -> PatternGroup:
+        """PatternGroup for a qualifying accumulator"""
+        pass
+
+    def new_accumulator(self, key: str) -> GroupAccumulator:
+        return GroupAccumulator(
+            group_id=generate_group_id(self.pattern_type, key),
+            pattern_type=self.pattern_type,
+            description_normalized=key
+        )
+
+    def accumulate(self, transactions: List) -> Dict[str, GroupAccumulator]:
+        """Running statistics for every group in a list of transactions"""
+        by_key = defaultdict(list)
+        for txn in transactions:
+            key = self.group_key(txn)
+            if key:
+                by_key[key].append(txn)
+
+        accumulators = {}
+        for key, txn_list in by_key.items():
+            accumulator = self.new_accumulator(key)
+            accumulator.add_batch(txn_list, self.group_amount)
+            accumulators[key] = accumulator
+        return accumulators
+
+    def detect_patterns(self, transactions: List, existing_groups=None) -> List[PatternGroup]:
+        """Build groups and keep those whose statistics qualify"""
+        return [
+            self.build_group(accumulator)
+            for accumulator in self.accumulate(transactions).values()
+            if self.qualifies(accumulator)
+        ]
+
+
 # ===================================================================
 # RECURRING PAYMENT DETECTOR
 # ===================================================================
 
-class RecurringPaymentDetector(BasePatternDetector):
+class RecurringPaymentDetector(GroupedPatternDetector):
     """
     Detects regular monthly/weekly payments (bills, subscriptions, salaries)
 
@@ -251,110 +428,81 @@ class RecurringPaymentDetector(BasePatternDetector):
     def pattern_type(self) -> PatternType:
         return PatternType.RECURRING_PAYMENT
 
-    def detect_patterns(self, transactions: List, existing_groups=None) -> List[PatternGroup]:
-        """Detect recurring payment patterns"""
-        if len(transactions) < self.MIN_OCCURRENCES:
-            return []
-
-        # Group by normalized description
-        groups_by_desc = defaultdict(list)
+    def group_key(self, transaction) -> Optional[str]:
+        return description_key(transaction) or None
 
-        for txn in transactions:
-            normalized = normalize_description(txn.description)
-            if normalized:
-                groups_by_desc[normalized].append(txn)
-
-        pattern_groups = []
-
-        for normalized_desc, txn_list in groups_by_desc.items():
-            if len(txn_list) < self.MIN_OCCURRENCES:
-                continue
-
-            # Sort by date
-            txn_list.sort(key=lambda t: t.date)
+    def group_amount(self, transaction) -> float:
+        return transaction.paid_out if transaction.paid_out > 0 else transaction.paid_in
 
-            # Check for consistent amounts
-            amounts = [t.paid_out if t.paid_out > 0 else t.paid_in for t in txn_list]
-            avg_amount, variance_percent = calculate_amount_consistency(amounts)
+    def qualifies(self, accumulator: GroupAccumulator) -> bool:
+        if accumulator.occurrences < self.MIN_OCCURRENCES:
+            return False
 
-            if variance_percent > self.AMOUNT_VARIANCE_PERCENT:
-                continue  # Too much variation in amounts
+        # Check for consistent amounts
+        if accumulator.amounts.variance_percent > self.AMOUNT_VARIANCE_PERCENT:
+            return False  # Too much variation in amounts
 
-            # Check for regular intervals
-            dates = [t.date for t in txn_list]
-            avg_interval, interval_variance = calculate_interval_consistency(dates)
-
-            # Check if interval matches expected frequencies
-            is_regular = False
-            for expected_freq in self.EXPECTED_FREQUENCIES:
-                if abs(avg_interval - expected_freq) <= self.FREQUENCY_TOLERANCE_DAYS:
-                    is_regular = True
-                    break
-
-            if not is_regular:
-                continue
-
-            # Create pattern group
-            group_id = generate_group_id(self.pattern_type, normalized_desc)
-
-            pattern_groups.append(PatternGroup(
-                group_id=group_id,
-                pattern_type=self.pattern_type,
-                transaction_ids=[t.id for t in txn_list],
-                description_normalized=normalized_desc,
-                frequency_days=avg_interval,
-                average_amount=avg_amount,
-                variance_percent=variance_percent,
-                first_occurrence=txn_list[0].date,
-                last_occurrence=txn_list[-1].date,
-                occurrences=len(txn_list)
-            ))
+        # Check if interval matches expected frequencies
+        avg_interval = int(accumulator.intervals.mean) if accumulator.intervals.count else 0
+        return any(
+            abs(avg_interval - expected_freq) <= self.FREQUENCY_TOLERANCE_DAYS
+            for expected_freq in self.EXPECTED_FREQUENCIES
+        )
 
-        return pattern_groups
+    def build_group(self, accumulator: GroupAccumulator) -> PatternGroup:
+        return PatternGroup(
+            group_id=accumulator.group_id,
+            pattern_type=self.pattern_type,
+            transaction_ids=list(accumulator.transaction_ids),
+            description_normalized=accumulator.description_normalized,
+            frequency_days=int(accumulator.intervals.mean) if accumulator.intervals.count else 0,
+            average_amount=accumulator.amounts.mean,
+            variance_percent=accumulator.amounts.variance_percent,
+            first_occurrence=accumulator.first_occurrence,
+            last_occurrence=accumulator.last_occurrence,
+            occurrences=accumulator.occurrences
+        )
 
     def match_transaction(self, transaction, pattern_groups: List[PatternGroup]) -> Optional[PatternMatch]:
         """Match transaction to recurring payment groups"""
-        normalized = normalize_description(transaction.description)
-
-        for group in pattern_groups:
-            if group.pattern_type != self.pattern_type:
-                continue
+        normalized = description_key(transaction)
+        group = find_group(pattern_groups, self.pattern_type, normalized)
 
-            if group.description_normalized == normalized:
-                # Calculate confidence based on group strength
-                confidence = 70  # Base confidence
-
-                # Boost for long-running patterns
-                if group.occurrences >= 12:
-                    confidence += 15
-                elif group.occurrences >= 6:
-                    confidence += 10
-                elif group.occurrences >= 4:
-                    confidence += 5
-
-                # Boost for low variance
-                if group.variance_percent < 2.0:
-                    confidence += 10
-                elif group.variance_percent < 5.0:
-                    confidence += 5
-
-                confidence = min(confidence, 95)  # Cap at 95
-
-                return PatternMatch(
-                    pattern_type=self.pattern_type,
-                    confidence=confidence,
-                    metadata={
-                        'group_id': group.group_id,
-                        'frequency_days': group.frequency_days,
-                        'average_amount': group.average_amount,
-                        'occurrences': group.occurrences,
-                        'variance_percent': group.variance_percent
-                    },
-                    transaction_id=transaction.id,
-                    notes=f"Recurring payment: {group.occurrences}x occurrences, every ~{group.frequency_days} days"
-                )
+        if group is None:
+            return None
 
-        return None
+        # Calculate confidence based on group strength
+        confidence = 70  # Base confidence
+
+        # Boost for long-running patterns
+        if group.occurrences >= 12:
+            confidence += 15
+        elif group.occurrences >= 6:
+            confidence += 10
+        elif group.occurrences >= 4:
+            confidence += 5
+
+        # Boost for low variance
+        if group.variance_percent < 2.0:
+            confidence += 10
+        elif group.variance_percent < 5.0:
+            confidence += 5
+
+        confidence = min(confidence, 95)  # Cap at 95
+
+        return PatternMatch(
+            pattern_type=self.pattern_type,
+            confidence=confidence,
+            metadata={
+                'group_id': group.group_id,
+                'frequency_days': group.frequency_days,
+                'average_amount': group.average_amount,
+                'occurrences': group.occurrences,
+                'variance_percent': group.variance_percent
+            },
+            transaction_id=transaction.id,
+            notes=f"Recurring payment: {group.occurrences}x occurrences, every ~{group.frequency_days} days"
+        )
 
 
 # ===================================================================
@@ -597,7 +745,7 @@ class RoundUpDetector(BasePatternDetector):
 # RECURRING SMALL AMOUNT DETECTOR
 # ===================================================================
 
-class RecurringSmallAmountDetector(BasePatternDetector):
+class RecurringSmallAmountDetector(GroupedPatternDetector):
     """
     Detects frequent small personal expenses (coffee, lunch, etc.)
 
@@ -614,39 +762,29 @@ class RecurringSmallAmountDetector(BasePatternDetector):
     def pattern_type(self) -> PatternType:
         return PatternType.RECURRING_SMALL_AMOUNT
 
-    def detect_patterns(self, transactions: List, existing_groups=None) -> List[PatternGroup]:
-        """Detect recurring small purchase patterns"""
-        small_txns_by_merchant = defaultdict(list)
-
-        for txn in transactions:
-            amount = txn.paid_out if txn.paid_out > 0 else 0
-
-            if 0 < amount <= self.SMALL_AMOUNT_THRESHOLD:
-                normalized = normalize_description(txn.description)
-                if normalized:
-                    small_txns_by_merchant[normalized].append(txn)
-
-        pattern_groups = []
-
-        for normalized_desc, txn_list in small_txns_by_merchant.items():
-            if len(txn_list) < self.MIN_FREQUENCY_PER_MONTH:
-                continue
-
-            txn_list.sort(key=lambda t: t.date)
-
-            group_id = generate_group_id(self.pattern_type, normalized_desc)
+    def group_key(self, transaction) -> Optional[str]:
+        amount = transaction.paid_out if transaction.paid_out > 0 else 0
 
-            pattern_groups.append(PatternGroup(
-                group_id=group_id,
-                pattern_type=self.pattern_type,
-                transaction_ids=[t.id for t in txn_list],
-                description_normalized=normalized_desc,
-                occurrences=len(txn_list),
-                first_occurrence=txn_list[0].date,
-                last_occurrence=txn_list[-1].date
-            ))
+        if 0 < amount <= self.SMALL_AMOUNT_THRESHOLD:
+            return description_key(transaction) or None
+        return None
 
-        return pattern_groups
+    def group_amount(self, transaction) -> float:
+        return transaction.paid_out
+
+    def qualifies(self, accumulator: GroupAccumulator) -> bool:
+        return accumulator.occurrences >= self.MIN_FREQUENCY_PER_MONTH
+
+    def build_group(self, accumulator: GroupAccumulator) -> PatternGroup:
+        return PatternGroup(
+            group_id=accumulator.group_id,
+            pattern_type=self.pattern_type,
+            transaction_ids=list(accumulator.transaction_ids),
+            description_normalized=accumulator.description_normalized,
+            occurrences=accumulator.occurrences,
+            first_occurrence=accumulator.first_occurrence,
+            last_occurrence=accumulator.last_occurrence
+        )
 
     def match_transaction(self, transaction, pattern_groups: List[PatternGroup]) -> Optional[PatternMatch]:
         """Match transaction to recurring small amount pattern"""
@@ -655,30 +793,27 @@ class RecurringSmallAmountDetector(BasePatternDetector):
         if amount <= 0 or amount > self.SMALL_AMOUNT_THRESHOLD:
             return None
 
-        normalized = normalize_description(transaction.description)
+        normalized = description_key(transaction)
+        group = find_group(pattern_groups, self.pattern_type, normalized)
 
-        for group in pattern_groups:
-            if group.pattern_type != self.pattern_type:
-                continue
-
-            if group.description_normalized == normalized and group.occurrences >= self.MIN_FREQUENCY_PER_MONTH:
-                confidence = 75
+        if group is None or group.occurrences < self.MIN_FREQUENCY_PER_MONTH:
+            return None
 
-                if group.occurrences >= 10:
-                    confidence = 85
+        confidence = 75
 
-                return PatternMatch(
-                    pattern_type=self.pattern_type,
-                    confidence=confidence,
-                    metadata={
-                        'group_id': group.group_id,
-                        'occurrences': group.occurrences
-                    },
-                    transaction_id=transaction.id,
-                    notes=f"Recurring small purchase: {group.occurrences}x occurrences"
-                )
+        if group.occurrences >= 10:
+            confidence = 85
 
-        return None
+        return PatternMatch(
+            pattern_type=self.pattern_type,
+            confidence=confidence,
+            metadata={
+                'group_id': group.group_id,
+                'occurrences': group.occurrences
+            },
+            transaction_id=transaction.id,
+            notes=f"Recurring small purchase: {group.occurrences}x occurrences"
+        )
 
 
 # ===================================================================
@@ -730,8 +865,16 @@ class PatternAnalyzer:
     """
     Main orchestrator for transaction pattern analysis
     Coordinates multiple pattern detectors and combines results
+
+    analyze_all_transactions() builds every group from the transactions it
+    is given. analyze_incremental() instead keeps description-based groups
+    in the pattern_groups table and updates only the groups a new batch
+    touches, so importing one month does not re-read years of history.
     """
 
+    # Group IDs per query when loading stored groups
+    STORE_CHUNK_SIZE = 500
+
     def __init__(self, session, enable_caching: bool = True):
         """
         Args:
@@ -740,7 +883,7 @@ class PatternAnalyzer:
         """
         self.session = session
         self.enable_caching = enable_caching
-        self._pattern_cache: Dict[PatternType, List[PatternGroup]] = {}
+        self._pattern_cache = PatternGroupIndex()
 
         # Initialize pattern detectors in priority order
         self.detectors: List[BasePatternDetector] = [
@@ -752,12 +895,17 @@ class PatternAnalyzer:
             LargePurchaseDetector(),          # Lowest priority - just flags
         ]
 
-    def analyze_all_transactions(self, transactions: List) -> Dict[int, AnalysisResult]:
+    def analyze_all_transactions(self, transactions: List, workers: int = 1) -> Dict[int, AnalysisResult]:
         """
         Analyze all transactions to detect patterns
 
+        Groups are built from the whole list; matching transactions to them
+        is independent per transaction, so with workers > 1 large lists are
+        matched in chunks by a process pool.
+
         Args:
             transactions: List of Transaction model instances
+            workers: Processes used for matching
 
         Returns:
             Dict mapping transaction_id -> AnalysisResult
@@ -766,7 +914,7 @@ class PatternAnalyzer:
             return {}
 
         # Run detectors to build pattern groups
-        all_pattern_groups = []
+        all_pattern_groups = PatternGroupIndex()
 
         for detector in self.detectors:
             try:
@@ -775,22 +923,197 @@ class PatternAnalyzer:
             except Exception as e:
                 print(f"Warning: {detector.__class__.__name__} failed: {str(e)}")
 
+        return self._match_all(transactions, all_pattern_groups, workers)
+
+    def analyze_incremental(self, transactions: List) -> Dict[int, AnalysisResult]:
+        """
+        Analyze a new batch of (saved) transactions against stored pattern groups
+
+        Description-based groups are loaded from the pattern_groups table
+        for the batch's descriptions only, updated with the batch, and
+        written back (the caller commits). The store is seeded from the
+        full transaction history the first time it is used.
+
+        Args:
+            transactions: List of Transaction model instances
+
+        Returns:
+            Dict mapping transaction_id -> AnalysisResult
+        """
+        if not transactions:
+            return {}
+
+        from models import PatternGroupStats
+
+        if self.session.query(PatternGroupStats.id).first() is None:
+            self.rebuild_pattern_store()
+
+        all_pattern_groups = PatternGroupIndex()
+
+        for detector in self.detectors:
+            try:
+                if isinstance(detector, GroupedPatternDetector):
+                    groups = self._update_stored_groups(detector, transactions)
+                else:
+                    groups = detector.detect_patterns(transactions)
+                all_pattern_groups.extend(groups)
+            except Exception as e:
+                print(f"Warning: {detector.__class__.__name__} failed: {str(e)}")
+
+        self.session.flush()
+        return self._match_all(transactions, all_pattern_groups)
+
+    def rebuild_pattern_store(self, transactions: Optional[List] = None) -> int:
+        """
+        Recreate the pattern_groups table from scratch
+
+        Args:
+            transactions: Transactions to build from (default: all transactions)
+
+        Returns:
+            Number of groups stored
+        """
+        from models import PatternGroupStats, Transaction
+
+        if transactions is None:
+            transactions = self.session.query(Transaction).all()
+
+        self.session.query(PatternGroupStats).delete(synchronize_session=False)
+
+        stored = 0
+        for detector in self.detectors:
+            if not isinstance(detector, GroupedPatternDetector):
+                continue
+            for accumulator in detector.accumulate(transactions).values():
+                self._store_accumulator(accumulator, None)
+                stored += 1
+
+        self.session.flush()
+        return stored
+
+    def _update_stored_groups(self, detector: GroupedPatternDetector, transactions: List) -> List[PatternGroup]:
+        """Fold a batch into the stored groups it touches; return those that qualify"""
+        from models import PatternGroupStats
+
+        batch = defaultdict(list)
+        for txn in transactions:
+            key = detector.group_key(txn)
+            if key:
+                batch[key].append(txn)
+
+        keys_by_group_id = {generate_group_id(detector.pattern_type, key): key for key in batch}
+        group_ids = list(keys_by_group_id)
+
+        records = {}
+        for start in range(0, len(group_ids), self.STORE_CHUNK_SIZE):
+            chunk = group_ids[start:start + self.STORE_CHUNK_SIZE]
+            for record in self.session.query(PatternGroupStats).filter(
+                PatternGroupStats.pattern_group_id.in_(chunk)
+            ):
+                records[record.pattern_group_id] = record
+
+        groups = []
+        for group_id, key in keys_by_group_id.items():
+            record = records.get(group_id)
+            accumulator = self._accumulator_from_record(detector, key, record)
+
+            members = set(accumulator.transaction_ids)
+            new_txns = [t for t in batch[key] if t.id not in members]
+
+            if new_txns:
+                if not accumulator.add_batch(new_txns, detector.group_amount):
+                    # Dates inside the known range: rebuild this group from its members
+                    accumulator = self._rebuild_accumulator(detector, key, accumulator.transaction_ids, new_txns)
+                self._store_accumulator(accumulator, record)
+
+            if detector.qualifies(accumulator):
+                groups.append(detector.build_group(accumulator))
+
+        return groups
+
+    def _rebuild_accumulator(self, detector: GroupedPatternDetector, key: str,
+                             member_ids: List[int], new_txns: List) -> GroupAccumulator:
+        """Recompute one group from its stored members plus new transactions"""
+        from models import Transaction
+
+        members = []
+        for start in range(0, len(member_ids), self.STORE_CHUNK_SIZE):
+            chunk = member_ids[start:start + self.STORE_CHUNK_SIZE]
+            members.extend(self.session.query(Transaction).filter(Transaction.id.in_(chunk)).all())
+
+        # Members whose description was edited since no longer belong here
+        members = [t for t in members if detector.group_key(t) == key]
+
+        accumulator = detector.new_accumulator(key)
+        accumulator.add_batch(members + new_txns, detector.group_amount)
+        return accumulator
+
+    @staticmethod
+    def _accumulator_from_record(detector: GroupedPatternDetector, key: str, record) -> GroupAccumulator:
+        accumulator = detector.new_accumulator(key)
+        if record is None:
+            return accumulator
+
+        accumulator.amounts = RunningStats(record.occurrences or 0, record.amount_mean or 0.0, record.amount_m2 or 0.0)
+        accumulator.intervals = RunningStats(record.interval_count or 0, record.interval_mean or 0.0,
+                                             record.interval_m2 or 0.0)
+        accumulator.first_occurrence = record.first_occurrence
+        accumulator.last_occurrence = record.last_occurrence
+        accumulator.transaction_ids = json.loads(record.transaction_ids) if record.transaction_ids else []
+        return accumulator
+
+    def _store_accumulator(self, accumulator: GroupAccumulator, record) -> None:
+        from models import PatternGroupStats
+
+        if record is None:
+            record = PatternGroupStats(pattern_group_id=accumulator.group_id)
+            self.session.add(record)
+
+        record.pattern_type = accumulator.pattern_type.value
+        record.description_normalized = accumulator.description_normalized
+        record.occurrences = accumulator.amounts.count
+        record.amount_mean = accumulator.amounts.mean
+        record.amount_m2 = accumulator.amounts.m2
+        record.interval_count = accumulator.intervals.count
+        record.interval_mean = accumulator.intervals.mean
+        record.interval_m2 = accumulator.intervals.m2
+        record.first_occurrence = accumulator.first_occurrence
+        record.last_occurrence = accumulator.last_occurrence
+        record.transaction_ids = json.dumps(accumulator.transaction_ids)
+        record.updated_date = datetime.now()
+
+    def _match_all(self, transactions: List, pattern_groups: PatternGroupIndex,
+                   workers: int = 1) -> Dict[int, AnalysisResult]:
+        """Match each transaction against the groups"""
         # Cache groups
         if self.enable_caching:
-            for group in all_pattern_groups:
-                if group.pattern_type not in self._pattern_cache:
-                    self._pattern_cache[group.pattern_type] = []
-                self._pattern_cache[group.pattern_type].append(group)
+            self._pattern_cache = pattern_groups
+
+        if workers > 1 and len(transactions) >= PARALLEL_MIN_TRANSACTIONS:
+            return self._match_parallel(transactions, pattern_groups, workers)
 
-        # Match each transaction against groups
         results = {}
 
         for transaction in transactions:
-            matches = self._match_transaction_to_patterns(transaction, all_pattern_groups)
+            matches = self._match_transaction_to_patterns(transaction, pattern_groups)
             results[transaction.id] = self._create_analysis_result(transaction, matches)
 
         return results
 
+    def _match_parallel(self, transactions: List, pattern_groups: PatternGroupIndex,
+                        workers: int) -> Dict[int, AnalysisResult]:
+        """Match chunks of transactions in worker processes (groups are sent once per worker)"""
+        records = [transaction_record(txn) for txn in transactions]
+        chunk_size = math.ceil(len(records) / (workers * 4))
+        chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_match_worker,
+                                 initargs=(pattern_groups,)) as executor:
+            for chunk_results in executor.map(_match_chunk, chunks):
+                results.update(chunk_results)
+        return results
+
     def _match_transaction_to_patterns(
         self,
         transaction,
@@ -867,23 +1190,45 @@ class PatternAnalyzer:
         )
 
 
+# Worker process state for PatternAnalyzer._match_parallel
+_worker_analyzer: Optional[PatternAnalyzer] = None
+_worker_groups: Optional[PatternGroupIndex] = None
+
+
+def _init_match_worker(pattern_groups: PatternGroupIndex) -> None:
+    global _worker_analyzer, _worker_groups
+    _worker_analyzer = PatternAnalyzer(None, enable_caching=False)
+    _worker_groups = pattern_groups
+
+
+def _match_chunk(records: List[TransactionRecord]) -> Dict[int, AnalysisResult]:
+    return _worker_analyzer._match_all(records, _worker_groups)
+
+
 # ===================================================================
 # PUBLIC API FUNCTIONS
 # ===================================================================
 
-def analyze_transactions(session, transactions: List) -> Dict[int, AnalysisResult]:
+def analyze_transactions(session, transactions: List, incremental: bool = False,
+                         workers: int = 1) -> Dict[int, AnalysisResult]:
     """
     Main entry point for pattern analysis
 
     Args:
         session: SQLAlchemy session
         transactions: List of Transaction model instances
+        incremental: Update stored pattern groups with this batch instead of
+            building groups from the given transactions alone
+        workers: Processes used to match a full analysis (incremental
+            batches are matched in-process)
 
     Returns:
         Dictionary mapping transaction_id to AnalysisResult
     """
     analyzer = PatternAnalyzer(session)
-    return analyzer.analyze_all_transactions(transactions)
+    if incremental:
+        return analyzer.analyze_incremental(transactions)
+    return analyzer.analyze_all_transactions(transactions, workers)
 
 
 def merge_confidence_scores(
@@ -942,3 +1287,67 @@ def merge_confidence_scores(
     is_personal = pattern_personal if pattern_confidence >= merchant_confidence else merchant_personal
 
     return max_conf, is_personal if is_personal is not None else True
+
+
+def merge_confidence_arrays(
+    pattern_confidence,
+    merchant_confidence,
+    pattern_type=None,
+    pattern_personal=None,
+    merchant_personal=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    merge_confidence_scores for whole columns at once
+
+    Each argument is an array (or list) with one entry per transaction;
+    pattern_type, pattern_personal and merchant_personal may hold None.
+    Element i of the result is merge_confidence_scores applied to element i
+    of the inputs.
+
+    Returns:
+        (combined_confidence float array, is_personal object array)
+    """
+    pattern_conf = np.asarray(pattern_confidence, dtype=float)
+    merchant_conf = np.asarray(merchant_confidence, dtype=float)
+    count = len(pattern_conf)
+
+    def flags(values):
+        series = pd.Series([None] * count if values is None else list(values), dtype=object)
+        return series.to_numpy(dtype=object), series.notna().to_numpy()
+
+    pattern_personal, pattern_known = flags(pattern_personal)
+    merchant_personal, merchant_known = flags(merchant_personal)
+    pattern_or_true = np.where(pattern_known, pattern_personal, True)
+    merchant_or_true = np.where(merchant_known, merchant_personal, True)
+
+    types = pd.Series([None] * count if pattern_type is None else list(pattern_type), dtype=object)
+    decisive = types.isin(DECISIVE_PATTERN_TYPES).to_numpy() & (pattern_conf >= 90)
+
+    both_agree = pattern_known & merchant_known & (pattern_personal == merchant_personal)
+    both_strong = both_agree & (pattern_conf > 70) & (merchant_conf > 70)
+    pattern_strong = pattern_conf > 80
+    merchant_strong = merchant_conf > 80
+    both_moderate = (pattern_conf > 50) & (merchant_conf > 50)
+
+    # Same order of precedence as merge_confidence_scores
+    conditions = [decisive, both_strong, pattern_strong, merchant_strong, both_moderate]
+    combined = np.select(conditions, [
+        pattern_conf,
+        np.minimum(95, np.maximum(pattern_conf, merchant_conf) + 5),
+        pattern_conf,
+        merchant_conf,
+        np.minimum(np.trunc((pattern_conf + merchant_conf) / 2 * 1.1), 95),
+    ], default=np.maximum(pattern_conf, merchant_conf))
+
+    # Default: flag from the stronger source (pattern on ties), None counting as personal
+    default_personal = np.where(pattern_conf >= merchant_conf, pattern_personal, merchant_personal)
+    default_personal = np.where(pd.notna(default_personal), default_personal, True)
+    is_personal = np.select(conditions, [
+        pattern_or_true,
+        pattern_personal,
+        pattern_or_true,
+        merchant_or_true,
+        np.where(pattern_known, pattern_personal, merchant_personal),
+    ], default=default_personal)
+
+    return combined, is_personal
@@ -7,6 +7,7 @@ import sys
 sys.path.insert(0, '/Users/anthony/Tax Helper')
 
 from models import init_db, Transaction, Income, Expense
+from ledger_helpers import post_ledger_entries
 from collections import Counter
 
 print("=" * 80)
@@ -91,36 +92,19 @@ print()
 print("📝 Posting transactions...")
 print("-" * 80)
 
-income_posted = 0
-expense_posted = 0
-
-# Post income transactions
-for txn in business_income:
-    income_record = Income(
-        date=txn.date,
-        source=txn.description,
-        description=txn.notes or '',
-        amount_gross=txn.paid_in,
-        tax_deducted=0.0,
-        income_type=txn.guessed_category or 'Other'
-    )
-    session.add(income_record)
-    txn.reviewed = True
-    income_posted += 1
-
-# Post expense transactions
-for txn in business_expenses:
-    expense_record = Expense(
-        date=txn.date,
-        supplier=txn.description,
-        description=txn.notes or '',
-        category=txn.guessed_category or 'Other business expenses',
-        amount=txn.paid_out,
-        receipt_link=''
-    )
-    session.add(expense_record)
+# Post both ledgers with one duplicate-check query and one insert each
+income_posted, income_failed, income_errors = post_ledger_entries(
+    ((txn, txn.guessed_category, 'Income') for txn in business_income), session
+)
+expense_posted, expense_failed, expense_errors = post_ledger_entries(
+    ((txn, txn.guessed_category, 'Expense') for txn in business_expenses), session
+)
+
+for txn in business_income + business_expenses:
     txn.reviewed = True
-    expense_posted += 1
+
+for error in income_errors + expense_errors:
+    print(f"⚠️  {error}")
 
 # Commit all changes
 session.commit()
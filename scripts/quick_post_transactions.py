@@ -7,6 +7,7 @@ import sys
 sys.path.insert(0, '/Users/anthony/Tax Helper')
 
 from models import init_db, Transaction, Income, Expense
+from ledger_helpers import post_ledger_entries
 
 # Initialize database
 engine, SessionLocal = init_db()
@@ -23,35 +24,17 @@ business_txns = session.query(Transaction).filter(
 
 print(f"Found {len(business_txns)} unreviewed business transactions")
 
-income_count = 0
-expense_count = 0
+income_count, _, _ = post_ledger_entries(
+    ((txn, txn.guessed_category, 'Income') for txn in business_txns if txn.guessed_type == 'Income'), session
+)
+expense_count, _, _ = post_ledger_entries(
+    ((txn, txn.guessed_category, 'Expense') for txn in business_txns if txn.guessed_type == 'Expense'), session
+)
 
+# Only transactions that were posted (or already in a ledger) are marked reviewed
 for txn in business_txns:
-    if txn.guessed_type == 'Income' and txn.paid_in > 0:
-        income_record = Income(
-            date=txn.date,
-            source=txn.description,
-            description=txn.notes or '',
-            amount_gross=txn.paid_in,
-            tax_deducted=0.0,
-            income_type=txn.guessed_category or 'Other'
-        )
-        session.add(income_record)
+    if (txn.guessed_type == 'Income' and txn.paid_in > 0) or (txn.guessed_type == 'Expense' and txn.paid_out > 0):
         txn.reviewed = True
-        income_count += 1
-
-    elif txn.guessed_type == 'Expense' and txn.paid_out > 0:
-        expense_record = Expense(
-            date=txn.date,
-            supplier=txn.description,
-            description=txn.notes or '',
-            category=txn.guessed_category or 'Other business expenses',
-            amount=txn.paid_out,
-            receipt_link=''
-        )
-        session.add(expense_record)
-        txn.reviewed = True
-        expense_count += 1
 
 session.commit()
 
@@ -2,143 +2,156 @@
 """
 Re-categorize all existing transactions using the new smart categorization system
 Combines merchant database and pattern analysis for improved accuracy
+
+Transactions are read with one column query and written back with one
+batched UPDATE; pattern matching is spread over every CPU core.
 """
 
+import os
 import sys
 sys.path.insert(0, '/Users/anthony/Tax Helper')
 
+from sqlalchemy import case, func
+
 from models import init_db, Transaction
-from utils import apply_smart_categorization
-
-print("=" * 70)
-print("SMART RE-CATEGORIZATION - Merchant Database + Pattern Analysis")
-print("=" * 70)
-print()
-
-# Initialize database
-engine, SessionLocal = init_db()
-session = SessionLocal()
-
-# Get all transactions
-all_txns = session.query(Transaction).order_by(Transaction.date).all()
-print(f"Found {len(all_txns)} transactions to analyze\n")
-
-if len(all_txns) == 0:
-    print("No transactions to process.")
-    session.close()
-    sys.exit(0)
-
-# Show before state
-print("BEFORE Smart Categorization:")
-print("-" * 70)
-personal_before = sum(1 for t in all_txns if t.is_personal)
-business_before = len(all_txns) - personal_before
-high_conf_before = sum(1 for t in all_txns if t.confidence_score >= 70)
-
-print(f"  Personal: {personal_before} ({personal_before/len(all_txns)*100:.1f}%)")
-print(f"  Business: {business_before} ({business_before/len(all_txns)*100:.1f}%)")
-print(f"  High confidence (≥70): {high_conf_before} ({high_conf_before/len(all_txns)*100:.1f}%)")
-print()
-
-# Apply smart categorization
-print("Running smart categorization...")
-print("This may take a minute for large datasets...")
-print()
-apply_smart_categorization(session, all_txns)
-print()
-
-# Show after state
-print("AFTER Smart Categorization:")
-print("-" * 70)
-personal_after = sum(1 for t in all_txns if t.is_personal)
-business_after = len(all_txns) - personal_after
-high_conf_after = sum(1 for t in all_txns if t.confidence_score >= 70)
-medium_conf = sum(1 for t in all_txns if 40 <= t.confidence_score < 70)
-low_conf = sum(1 for t in all_txns if t.confidence_score < 40)
-needs_review = sum(1 for t in all_txns if t.requires_review)
-
-print(f"  Personal: {personal_after} ({personal_after/len(all_txns)*100:.1f}%)")
-print(f"  Business: {business_after} ({business_after/len(all_txns)*100:.1f}%)")
-print()
-print(f"  Confidence Breakdown:")
-print(f"    High (≥70): {high_conf_after} ({high_conf_after/len(all_txns)*100:.1f}%)")
-print(f"    Medium (40-69): {medium_conf} ({medium_conf/len(all_txns)*100:.1f}%)")
-print(f"    Low (<40): {low_conf} ({low_conf/len(all_txns)*100:.1f}%)")
-print()
-print(f"  Requires Manual Review: {needs_review} ({needs_review/len(all_txns)*100:.1f}%)")
-print()
-
-# Show pattern breakdown
-print("Pattern Detection:")
-print("-" * 70)
-from collections import Counter
-pattern_counts = Counter(t.pattern_type for t in all_txns if t.pattern_type)
-if pattern_counts:
-    for pattern_type, count in pattern_counts.most_common():
-        print(f"  {pattern_type}: {count} transactions")
-else:
-    print("  No patterns detected")
-print()
-
-# Show top categories
-print("Top Categories (Business Only):")
-print("-" * 70)
-business_cats = Counter(t.guessed_category for t in all_txns if not t.is_personal and t.guessed_category)
-for category, count in business_cats.most_common(10):
-    total_amount = sum(t.paid_out if t.paid_out > 0 else t.paid_in
-                       for t in all_txns
-                       if not t.is_personal and t.guessed_category == category)
-    print(f"  {category}: {count} transactions, £{total_amount:,.2f}")
-print()
-
-# Show some high-confidence personal transactions as examples
-print("Sample High-Confidence Personal Transactions:")
-print("-" * 70)
-high_conf_personal = [t for t in all_txns if t.is_personal and t.confidence_score >= 90][:10]
-for txn in high_conf_personal:
-    amount = txn.paid_out if txn.paid_out > 0 else txn.paid_in
-    flow = "OUT" if txn.paid_out > 0 else "IN"
-    print(f"  [{txn.confidence_score}%] £{amount:.2f} {flow} - {txn.description[:50]}")
-    if txn.pattern_type:
-        print(f"    Pattern: {txn.pattern_type}")
-print()
-
-# Show some business transactions as examples
-print("Sample High-Confidence Business Transactions:")
-print("-" * 70)
-high_conf_business = [t for t in all_txns if not t.is_personal and t.confidence_score >= 70][:10]
-if high_conf_business:
-    for txn in high_conf_business:
+from utils import apply_smart_categorization, load_categorization_frame
+
+# Processes used for pattern matching
+WORKERS = os.cpu_count() or 1
+
+
+def count(session, *conditions) -> int:
+    return session.query(func.count(Transaction.id)).filter(*conditions).scalar() or 0
+
+
+def show_samples(session, conditions, detail):
+    """Print up to 10 matching transactions, most confident first"""
+    samples = (session.query(Transaction).filter(*conditions)
+               .order_by(Transaction.confidence_score.desc(), Transaction.id).limit(10).all())
+    for txn in samples:
         amount = txn.paid_out if txn.paid_out > 0 else txn.paid_in
         flow = "OUT" if txn.paid_out > 0 else "IN"
         print(f"  [{txn.confidence_score}%] £{amount:.2f} {flow} - {txn.description[:50]}")
-        if txn.guessed_category:
-            print(f"    Category: {txn.guessed_category}")
-else:
-    print("  No high-confidence business transactions detected")
-print()
-
-# Show transactions needing review
-if needs_review > 0:
-    print("Transactions Flagged for Manual Review:")
-    print("-" * 70)
-    review_txns = [t for t in all_txns if t.requires_review][:10]
-    for txn in review_txns:
-        amount = max(txn.paid_out, txn.paid_in)
-        print(f"  [Conf: {txn.confidence_score}%] £{amount:.2f} - {txn.description[:50]}")
-    if len(review_txns) < needs_review:
-        print(f"  ... and {needs_review - len(review_txns)} more")
+        if detail(txn):
+            print(f"    {detail(txn)}")
+    return samples
+
+
+def main():
+    print("=" * 70)
+    print("SMART RE-CATEGORIZATION - Merchant Database + Pattern Analysis")
+    print("=" * 70)
     print()
 
-print("=" * 70)
-print("✓ Re-categorization Complete!")
-print("=" * 70)
-print()
-print("Next Steps:")
-print("  1. Review transactions in the Streamlit app Inbox page")
-print("  2. Check transactions marked 'requires_review' for accuracy")
-print("  3. Use filters to review low-confidence categorizations")
-print("  4. Adjust any incorrect categorizations manually")
-print("  5. Post business transactions to ledgers when satisfied")
-
-session.close()
+    # Initialize database
+    engine, SessionLocal = init_db()
+    session = SessionLocal()
+
+    try:
+        total = count(session)
+        print(f"Found {total} transactions to analyze\n")
+
+        if total == 0:
+            print("No transactions to process.")
+            return
+
+        # Show before state
+        print("BEFORE Smart Categorization:")
+        print("-" * 70)
+        personal_before = count(session, Transaction.is_personal == True)
+        business_before = total - personal_before
+        high_conf_before = count(session, Transaction.confidence_score >= 70)
+
+        print(f"  Personal: {personal_before} ({personal_before/total*100:.1f}%)")
+        print(f"  Business: {business_before} ({business_before/total*100:.1f}%)")
+        print(f"  High confidence (≥70): {high_conf_before} ({high_conf_before/total*100:.1f}%)")
+        print()
+
+        # Apply smart categorization
+        print(f"Running smart categorization on {WORKERS} core(s)...")
+        print()
+        summary = apply_smart_categorization(session, load_categorization_frame(session), workers=WORKERS)
+        if summary is None:
+            return
+
+        # Show after state
+        print("AFTER Smart Categorization:")
+        print("-" * 70)
+        print(f"  Personal: {summary.personal} ({summary.percent(summary.personal):.1f}%)")
+        print(f"  Business: {summary.business} ({summary.percent(summary.business):.1f}%)")
+        print()
+        print(f"  Confidence Breakdown:")
+        print(f"    High (≥70): {summary.high_confidence} ({summary.percent(summary.high_confidence):.1f}%)")
+        print(f"    Medium (40-69): {summary.medium_confidence} ({summary.percent(summary.medium_confidence):.1f}%)")
+        print(f"    Low (<40): {summary.low_confidence} ({summary.percent(summary.low_confidence):.1f}%)")
+        print()
+        print(f"  Requires Manual Review: {summary.requires_review} ({summary.percent(summary.requires_review):.1f}%)")
+        print()
+
+        # Show pattern breakdown
+        print("Pattern Detection:")
+        print("-" * 70)
+        if summary.pattern_counts:
+            for pattern_type, pattern_count in sorted(summary.pattern_counts.items(), key=lambda item: -item[1]):
+                print(f"  {pattern_type}: {pattern_count} transactions")
+        else:
+            print("  No patterns detected")
+        print()
+
+        # Show top categories
+        print("Top Categories (Business Only):")
+        print("-" * 70)
+        amount = case((Transaction.paid_out > 0, Transaction.paid_out), else_=Transaction.paid_in)
+        business_cats = (
+            session.query(Transaction.guessed_category, func.count(Transaction.id), func.sum(amount))
+            .filter(Transaction.is_personal == False, Transaction.guessed_category != None,
+                    Transaction.guessed_category != '')
+            .group_by(Transaction.guessed_category)
+            .order_by(func.count(Transaction.id).desc())
+            .limit(10)
+        )
+        for category, category_count, total_amount in business_cats:
+            print(f"  {category}: {category_count} transactions, £{total_amount or 0:,.2f}")
+        print()
+
+        # Show some high-confidence personal transactions as examples
+        print("Sample High-Confidence Personal Transactions:")
+        print("-" * 70)
+        show_samples(session, [Transaction.is_personal == True, Transaction.confidence_score >= 90],
+                     lambda txn: txn.pattern_type and f"Pattern: {txn.pattern_type}")
+        print()
+
+        # Show some business transactions as examples
+        print("Sample High-Confidence Business Transactions:")
+        print("-" * 70)
+        if not show_samples(session, [Transaction.is_personal == False, Transaction.confidence_score >= 70],
+                            lambda txn: txn.guessed_category and f"Category: {txn.guessed_category}"):
+            print("  No high-confidence business transactions detected")
+        print()
+
+        # Show transactions needing review
+        if summary.requires_review > 0:
+            print("Transactions Flagged for Manual Review:")
+            print("-" * 70)
+            review_txns = show_samples(session, [Transaction.requires_review == True], lambda txn: None)
+            if len(review_txns) < summary.requires_review:
+                print(f"  ... and {summary.requires_review - len(review_txns)} more")
+            print()
+
+        print("=" * 70)
+        print("✓ Re-categorization Complete!")
+        print("=" * 70)
+        print()
+        print("Next Steps:")
+        print("  1. Review transactions in the Streamlit app Inbox page")
+        print("  2. Check transactions marked 'requires_review' for accuracy")
+        print("  3. Use filters to review low-confidence categorizations")
+        print("  4. Adjust any incorrect categorizations manually")
+        print("  5. Post business transactions to ledgers when satisfied")
+    finally:
+        session.close()
+
+
+# Worker processes re-import this module, so the work only runs when executed directly
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Full-text search index for Tax Helper
+One SQLite FTS5 table (search_index) over transactions, income and expenses,
+so searching descriptions, suppliers, sources, notes and merchant names is an
+index lookup instead of a leading-wildcard LIKE scan of each table
+
+Like the monthly rollup, the index is maintained by triggers on the source
+tables, so every write path keeps it current. rebuild_search_index()
+repopulates it from scratch.
+
+Each record is one index row with rowid = id * 3 + the record type's code,
+which lets triggers replace it by rowid and hits map back to records without
+extra columns.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from sqlalchemy import Integer, text
+
+
+# Record type -> source table, index column expressions and the source
+# columns they read (updates of other columns leave the index alone)
+SEARCH_SOURCES = {
+    'Transaction': {
+        'code': 0,
+        'table': 'transactions',
+        'name': "COALESCE({row}description, '')",
+        'merchant': "COALESCE({row}description_normalized, '')",
+        'notes': "COALESCE({row}notes, '')",
+        'columns': ('description', 'description_normalized', 'notes'),
+    },
+    'Income': {
+        'code': 1,
+        'table': 'income',
+        'name': "COALESCE({row}source, '')",
+        'merchant': "COALESCE({row}description, '')",
+        'notes': "COALESCE({row}notes, '')",
+        'columns': ('source', 'description', 'notes'),
+    },
+    'Expense': {
+        'code': 2,
+        'table': 'expenses',
+        'name': "COALESCE({row}supplier, '')",
+        'merchant': "COALESCE({row}description, '')",
+        'notes': "COALESCE({row}notes, '')",
+        'columns': ('supplier', 'description', 'notes'),
+    },
+}
+_RECORD_TYPES = {spec['code']: record_type for record_type, spec in SEARCH_SOURCES.items()}
+_TYPE_COUNT = len(SEARCH_SOURCES)
+
+# Update triggers from before they were limited to the indexed columns
+STALE_TRIGGERS_SQL = (
+    "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+    "AND name LIKE 'trg_search_index_%_update' AND sql NOT LIKE '%UPDATE OF%'"
+)
+
+# bm25 weights for (name, merchant, notes): descriptions and suppliers count most
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+CREATE_INDEX_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        name, merchant, notes,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )"""
+
+
+class SearchHit(NamedTuple):
+    """One ranked search result"""
+    record_type: str
+    record_id: int
+    rank: float
+
+
+def _insert_sql(record_type: str, row: str) -> str:
+    spec = SEARCH_SOURCES[record_type]
+    return (
+        f"INSERT INTO search_index (rowid, name, merchant, notes) VALUES ("
+        f"{row}id * {_TYPE_COUNT} + {spec['code']}, {spec['name'].format(row=row)}, "
+        f"{spec['merchant'].format(row=row)}, {spec['notes'].format(row=row)});"
+    )
+
+
+def _delete_sql(record_type: str, row: str) -> str:
+    spec = SEARCH_SOURCES[record_type]
+    return f"DELETE FROM search_index WHERE rowid = {row}id * {_TYPE_COUNT} + {spec['code']};"
+
+
+def trigger_statements() -> List[str]:
+    """CREATE TRIGGER statements keeping search_index in step with its source tables"""
+    statements = []
+    for record_type, spec in SEARCH_SOURCES.items():
+        table = spec['table']
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_index_{table}_insert AFTER INSERT ON {table}
+            BEGIN {_insert_sql(record_type, 'NEW.')} END""")
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_index_{table}_delete AFTER DELETE ON {table}
+            BEGIN {_delete_sql(record_type, 'OLD.')} END""")
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_index_{table}_update
+            AFTER UPDATE OF {', '.join(spec['columns'])} ON {table}
+            BEGIN {_delete_sql(record_type, 'OLD.')} {_insert_sql(record_type, 'NEW.')} END""")
+    return statements
+
+
+def drop_statements() -> List[str]:
+    """DROP statements for downgrades"""
+    return [
+        f'DROP TRIGGER IF EXISTS trg_search_index_{spec["table"]}_{action}'
+        for spec in SEARCH_SOURCES.values()
+        for action in ('insert', 'delete', 'update')
+    ] + ['DROP TABLE IF EXISTS search_index']
+
+
+def rebuild_statements() -> List[str]:
+    """Statements that repopulate search_index from the source tables"""
+    statements = ['DELETE FROM search_index']
+    for record_type, spec in SEARCH_SOURCES.items():
+        statements.append(f"""
+            INSERT INTO search_index (rowid, name, merchant, notes)
+            SELECT id * {_TYPE_COUNT} + {spec['code']}, {spec['name'].format(row='')},
+                   {spec['merchant'].format(row='')}, {spec['notes'].format(row='')}
+            FROM {spec['table']}""")
+    return statements
+
+
+def install_search_index(connection) -> bool:
+    """
+    Create search_index and its triggers if any are missing
+
+    When they were missing the source tables may already hold rows, so the
+    index is rebuilt as well. Update triggers firing on every column (see
+    STALE_TRIGGERS_SQL) are replaced.
+
+    Args:
+        connection: SQLAlchemy connection
+
+    Returns:
+        True if the index was (re)created
+    """
+    for name in connection.exec_driver_sql(STALE_TRIGGERS_SQL).scalars().all():
+        connection.exec_driver_sql(f'DROP TRIGGER {name}')
+
+    existing = connection.exec_driver_sql(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'search_index' "
+        "OR (type = 'trigger' AND name LIKE 'trg_search_index_%')"
+    ).scalar()
+    if existing == len(SEARCH_SOURCES) * 3 + 1:
+        return False
+
+    for statement in [CREATE_INDEX_SQL] + trigger_statements() + rebuild_statements():
+        connection.exec_driver_sql(statement)
+    return True
+
+
+def rebuild_search_index(session) -> int:
+    """
+    Repopulate search_index from the source tables (the caller commits)
+
+    Returns:
+        Number of indexed records
+    """
+    for statement in rebuild_statements():
+        session.execute(text(statement))
+    return session.execute(text('SELECT COUNT(*) FROM search_index')).scalar()
+
+
+# ===================================================================
+# SEARCHING
+# ===================================================================
+
+def fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression
+
+    Every word must match, as a prefix, so 'tes sto' finds 'TESCO STORES'.
+    Words are quoted, so punctuation and FTS operators typed by the user
+    are taken literally.
+
+    Returns:
+        MATCH expression, or '' when the text has no searchable words
+    """
+    words = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_records(
+    session,
+    query: str,
+    record_types: Optional[List[str]] = None,
+    limit: Optional[int] = 20
+) -> List[SearchHit]:
+    """
+    Ranked full-text search across transactions, income and expenses
+
+    Args:
+        session: SQLAlchemy session
+        query: Free text typed by the user
+        record_types: Restrict to 'Transaction', 'Income' and/or 'Expense'
+        limit: Maximum number of hits (None for all)
+
+    Returns:
+        SearchHit list, best match first
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+
+    sql = f"SELECT rowid, bm25(search_index, {', '.join(map(str, RANK_WEIGHTS))}) AS rank " \
+          "FROM search_index WHERE search_index MATCH :match"
+    params = {'match': match}
+    if record_types is not None:
+        codes = sorted(SEARCH_SOURCES[record_type]['code'] for record_type in record_types)
+        if not codes:
+            return []
+        sql += f" AND rowid % {_TYPE_COUNT} IN ({', '.join(map(str, codes))})"
+    sql += " ORDER BY rank, rowid DESC"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params['limit'] = limit
+
+    return [
+        SearchHit(_RECORD_TYPES[rowid % _TYPE_COUNT], rowid // _TYPE_COUNT, rank)
+        for rowid, rank in session.execute(text(sql), params)
+    ]
+
+
+def search_ids(session, query: str, record_type: str) -> Set[int]:
+    """IDs of every record of one type matching the query"""
+    return {hit.record_id for hit in search_records(session, query, [record_type], limit=None)}
+
+
+def search_id_select(query: str, record_type: str):
+    """
+    SELECT of the ids of one record type matching the query, for use in SQL
+    filters such as Transaction.id.in_(...)
+
+    Returns:
+        Textual SELECT with an id column, or None when the text has no searchable words
+    """
+    match = fts_query(query)
+    if not match:
+        return None
+
+    code = SEARCH_SOURCES[record_type]['code']
+    return text(
+        f"SELECT rowid / {_TYPE_COUNT} AS id FROM search_index "
+        f"WHERE search_index MATCH :match AND rowid % {_TYPE_COUNT} = {code}"
+    ).bindparams(match=match).columns(id=Integer)
+
+
+def load_hits(session, hits: List[SearchHit]) -> List:
+    """
+    Load the records behind search hits, one query per record type
+
+    Returns:
+        Model instances in hit order (records deleted meanwhile are skipped)
+    """
+    import models
+
+    ids_by_type: Dict[str, List[int]] = {}
+    for hit in hits:
+        ids_by_type.setdefault(hit.record_type, []).append(hit.record_id)
+
+    records = {}
+    for record_type, ids in ids_by_type.items():
+        model = getattr(models, record_type)
+        for record in session.query(model).filter(model.id.in_(ids)).all():
+            records[(record_type, record.id)] = record
+
+    return [records[key] for key in ((hit.record_type, hit.record_id) for hit in hits) if key in records]
@@ -9,6 +9,7 @@ from datetime import datetime
 from utils import format_currency
 import shutil
 from components.ui.interactions import show_toast, confirm_delete
+from db_runtime import get_database
 from models import (
     EXPENSE_CATEGORIES, INCOME_TYPES,
     Transaction, Income, Expense, Mileage, Donation, Rule, AuditLog, Merchant,
@@ -1004,6 +1005,18 @@ def render_restructured_settings_screen(session, settings):
                 else:
                     st.error("Database file not found!")
 
+                health = get_database(DB_PATH).health()
+                pool = health.pool
+                if health.ok:
+                    st.caption(
+                        f"Connection OK in {health.latency_ms:.1f} ms ({health.journal_mode} journal) · "
+                        f"{pool.get('checkedout', 0)} of {pool.get('size', 0)} pooled connections in use · "
+                        f"{pool['open_sessions']} open session(s) · {pool['reruns']:,} page loads since start, "
+                        f"{pool['refreshes_skipped']:,} with no data to refresh"
+                    )
+                else:
+                    st.error(f"Database connection failed: {health.error}")
+
                 st.markdown('</div>', unsafe_allow_html=True)
 
             with col2:
@@ -7,11 +7,11 @@ Provides comprehensive tax calculation and HMRC submission readiness
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date
-from sqlalchemy import func, and_
 import plotly.graph_objects as go
 import plotly.express as px
-from models import Transaction, Income, Expense, Mileage, Donation, INCOME_TYPES, EXPENSE_CATEGORIES
+from models import INCOME_TYPES, EXPENSE_CATEGORIES
 from utils import format_currency, get_tax_year_dates
+from tax_snapshot import get_tax_year_snapshot
 
 def _calc_tax(total_taxable, employment_tax, dividends, donations, se_profit):
     """Calculate income tax + NI given total taxable income. Returns dict of results."""
@@ -82,6 +82,12 @@ def _calc_tax(total_taxable, employment_tax, dividends, donations, se_profit):
         "taxable_income": taxable_after_pa,
         "band": band,
         "personal_allowance": PERSONAL_ALLOWANCE,
+        "grossed_donations": grossed_donations,
+        "adjusted_basic": adjusted_basic,
+        "tax_non_dividend": tax_nd,
+        "tax_dividends": tax_div,
+        "ni_class_2": ni2,
+        "ni_class_4": ni4,
     }
 
 
@@ -397,6 +403,7 @@ def render_restructured_summary_screen(session, settings):
     # Get tax year from settings
     tax_year = settings.get('tax_year', '2024/25')
     start_date, end_date = get_tax_year_dates(tax_year)
+    snapshot = get_tax_year_snapshot(session, tax_year)
 
     # Header Section with animation
     st.markdown(f"""
@@ -436,9 +443,7 @@ def render_restructured_summary_screen(session, settings):
         warnings = []
 
         # Check 1: Unreviewed transactions
-        unreviewed_count = session.query(func.count(Transaction.id)).filter(
-            Transaction.reviewed == False
-        ).scalar() or 0
+        unreviewed_count = snapshot.unreviewed_count
 
         if unreviewed_count > 0:
             warnings.append({
@@ -449,52 +454,28 @@ def render_restructured_summary_screen(session, settings):
             })
 
         # Check 2: Missing months
-        all_txns_dates = session.query(Transaction.date).filter(
-            and_(Transaction.date >= start_date, Transaction.date <= end_date)
-        ).all()
-
-        if all_txns_dates:
-            months_with_data = set()
-            for (txn_date,) in all_txns_dates:
-                months_with_data.add((txn_date.year, txn_date.month))
-
-            # Generate all months in tax year
-            current = start_date
-            all_months = set()
-            while current <= end_date:
-                all_months.add((current.year, current.month))
-                if current.month == 12:
-                    current = current.replace(year=current.year + 1, month=1)
-                else:
-                    current = current.replace(month=current.month + 1)
-
-            missing_months = all_months - months_with_data
-            if missing_months:
-                missing_month_names = []
-                for year, month in sorted(missing_months):
-                    month_name = date(year, month, 1).strftime('%B %Y')
-                    missing_month_names.append(month_name)
-
-                if len(missing_month_names) <= 3:
-                    month_list = ', '.join(missing_month_names)
-                else:
-                    month_list = ', '.join(missing_month_names[:3]) + f' and {len(missing_month_names) - 3} more'
+        missing_months = snapshot.missing_months
+        if missing_months:
+            missing_month_names = []
+            for year, month in missing_months:
+                month_name = date(year, month, 1).strftime('%B %Y')
+                missing_month_names.append(month_name)
+
+            if len(missing_month_names) <= 3:
+                month_list = ', '.join(missing_month_names)
+            else:
+                month_list = ', '.join(missing_month_names[:3]) + f' and {len(missing_month_names) - 3} more'
 
-                warnings.append({
-                    'type': 'warning',
-                    'title': 'Missing Months Detected',
-                    'message': f'No transactions found for: {month_list}',
-                    'action': 'Import bank statements for missing months'
-                })
+            warnings.append({
+                'type': 'warning',
+                'title': 'Missing Months Detected',
+                'message': f'No transactions found for: {month_list}',
+                'action': 'Import bank statements for missing months'
+            })
 
         # Check 3: No mileage logged
-        mileage_count = session.query(func.count(Mileage.id)).filter(
-            and_(Mileage.date >= start_date, Mileage.date <= end_date)
-        ).scalar() or 0
-
-        self_emp_income = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Self-employment', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
+        mileage_count = snapshot.mileage_count
+        self_emp_income = snapshot.self_employment_total
 
         if mileage_count == 0 and self_emp_income > 0:
             warnings.append({
@@ -505,16 +486,9 @@ def render_restructured_summary_screen(session, settings):
             })
 
         # Check 4: Unusual expense ratios
-        expense_breakdown_check = session.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            and_(Expense.date >= start_date, Expense.date <= end_date)
-        ).group_by(Expense.category).all()
-
-        if expense_breakdown_check:
-            total_expenses_check = sum(total for _, total in expense_breakdown_check)
-            for category, amount in expense_breakdown_check:
+        if snapshot.expense_by_category:
+            total_expenses_check = snapshot.expenses_total
+            for category, amount in snapshot.expense_by_category.items():
                 if total_expenses_check > 0:
                     percentage = (amount / total_expenses_check) * 100
                     if percentage > 70:
@@ -527,15 +501,7 @@ def render_restructured_summary_screen(session, settings):
 
         # Check 5: Profit margin check
         if self_emp_income > 0:
-            total_expenses_for_margin = session.query(func.sum(Expense.amount)).filter(
-                and_(Expense.date >= start_date, Expense.date <= end_date)
-            ).scalar() or 0.0
-
-            mileage_expenses = session.query(func.sum(Mileage.allowable_amount)).filter(
-                and_(Mileage.date >= start_date, Mileage.date <= end_date)
-            ).scalar() or 0.0
-
-            total_all_expenses = total_expenses_for_margin + mileage_expenses
+            total_all_expenses = snapshot.total_allowable
 
             if total_all_expenses > 0:
                 profit_margin = ((self_emp_income - total_all_expenses) / self_emp_income) * 100
@@ -556,13 +522,8 @@ def render_restructured_summary_screen(session, settings):
                     })
 
         # Check 6: Personal transaction ratio
-        total_txns = session.query(func.count(Transaction.id)).filter(
-            Transaction.reviewed == True
-        ).scalar() or 0
-
-        personal_txns = session.query(func.count(Transaction.id)).filter(
-            and_(Transaction.reviewed == True, Transaction.is_personal == True)
-        ).scalar() or 0
+        total_txns = snapshot.reviewed_count
+        personal_txns = snapshot.reviewed_personal_count
 
         if total_txns > 20:
             personal_percentage = (personal_txns / total_txns) * 100
@@ -669,7 +630,7 @@ def render_restructured_summary_screen(session, settings):
             checklist = [
                 ("All transactions reviewed", unreviewed_count == 0),
                 ("Complete bank statements imported", len([w for w in warnings if 'Missing Months' in w['title']]) == 0),
-                ("Expenses properly categorized", len(expense_breakdown_check) > 0 if self_emp_income > 0 else True),
+                ("Expenses properly categorized", len(snapshot.expense_by_category) > 0 if self_emp_income > 0 else True),
                 ("Mileage logged (if applicable)", mileage_count > 0 if self_emp_income > 0 else True),
                 ("No unusual patterns detected", len([w for w in warnings if w['type'] in ['error', 'warning']]) == 0),
                 ("Ready for HMRC submission", readiness_score >= 90),
@@ -715,36 +676,14 @@ def render_restructured_summary_screen(session, settings):
         st.markdown("### Income Breakdown by Type")
 
         # Calculate all income types
-        employment_total = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Employment', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        employment_tax = session.query(func.sum(Income.tax_deducted)).filter(
-            and_(Income.income_type == 'Employment', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        self_employment_total = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Self-employment', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        interest_total = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Interest', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        dividends_total = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Dividends', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        property_total = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Property', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        other_total = session.query(func.sum(Income.amount_gross)).filter(
-            and_(Income.income_type == 'Other', Income.date >= start_date, Income.date <= end_date)
-        ).scalar() or 0.0
-
-        total_income = (employment_total + self_employment_total + interest_total +
-                       dividends_total + property_total + other_total)
+        employment_total = snapshot.employment_total
+        employment_tax = snapshot.employment_tax
+        self_employment_total = snapshot.self_employment_total
+        interest_total = snapshot.interest_total
+        dividends_total = snapshot.dividends_total
+        property_total = snapshot.property_total
+        other_total = snapshot.other_total
+        total_income = snapshot.total_income
 
         # Top-level income KPIs
         col1, col2, col3, col4 = st.columns(4)
@@ -794,9 +733,7 @@ def render_restructured_summary_screen(session, settings):
 
         with col4:
             # Count income sources
-            income_sources = session.query(func.count(func.distinct(Income.source))).filter(
-                and_(Income.date >= start_date, Income.date <= end_date)
-            ).scalar() or 0
+            income_sources = snapshot.income_sources
 
             st.markdown(f"""
             <div class="status-card">
@@ -975,19 +912,10 @@ def render_restructured_summary_screen(session, settings):
         st.markdown("### Allowable Expenses & Deductions")
 
         # Calculate expenses
-        expenses_total = session.query(func.sum(Expense.amount)).filter(
-            and_(Expense.date >= start_date, Expense.date <= end_date)
-        ).scalar() or 0.0
-
-        mileage_total = session.query(func.sum(Mileage.allowable_amount)).filter(
-            and_(Mileage.date >= start_date, Mileage.date <= end_date)
-        ).scalar() or 0.0
-
-        donations_total = session.query(func.sum(Donation.amount_paid)).filter(
-            and_(Donation.gift_aid == True, Donation.date >= start_date, Donation.date <= end_date)
-        ).scalar() or 0.0
-
-        total_allowable = expenses_total + mileage_total
+        expenses_total = snapshot.expenses_total
+        mileage_total = snapshot.mileage_total
+        donations_total = snapshot.donations_total
+        total_allowable = snapshot.total_allowable
 
         # Top-level expense KPIs
         col1, col2, col3, col4 = st.columns(4)
@@ -1062,12 +990,7 @@ def render_restructured_summary_screen(session, settings):
                 st.markdown("#### Expenses by Category")
 
                 # Get expense breakdown
-                expense_breakdown = session.query(
-                    Expense.category,
-                    func.sum(Expense.amount).label('total')
-                ).filter(
-                    and_(Expense.date >= start_date, Expense.date <= end_date)
-                ).group_by(Expense.category).all()
+                expense_breakdown = list(snapshot.expense_by_category.items())
 
                 if expense_breakdown:
                     # Create pie chart
@@ -1122,9 +1045,7 @@ def render_restructured_summary_screen(session, settings):
                     st.markdown("<br>", unsafe_allow_html=True)
 
                     # Get mileage details
-                    total_miles = session.query(func.sum(Mileage.miles)).filter(
-                        and_(Mileage.date >= start_date, Mileage.date <= end_date)
-                    ).scalar() or 0
+                    total_miles = snapshot.total_miles
 
                     st.markdown(f"""
                     <div class="info-card">
@@ -1146,13 +1067,7 @@ def render_restructured_summary_screen(session, settings):
                     percentage = (amount / expenses_total * 100) if expenses_total > 0 else 0
 
                     # Get count for this category
-                    count = session.query(func.count(Expense.id)).filter(
-                        and_(
-                            Expense.category == category,
-                            Expense.date >= start_date,
-                            Expense.date <= end_date
-                        )
-                    ).scalar() or 0
+                    count = snapshot.expense_counts.get(category, 0)
 
                     st.markdown(f"""
                     <div class="tax-calc-card">
@@ -1226,100 +1141,34 @@ def render_restructured_summary_screen(session, settings):
         # Expenses (already calculated in tab 3)
 
         # Self-employment profit
-        net_profit = self_employment_total - total_allowable
+        net_profit = snapshot.net_profit
 
         # Total taxable income
-        total_taxable = employment_total + net_profit + interest_total + dividends_total + property_total
-
-        # Personal Allowance (2024/25: £12,570)
-        PERSONAL_ALLOWANCE = 12570
+        total_taxable = snapshot.total_taxable
 
-        # Adjust for Gift Aid
-        grossed_donations = donations_total * 1.25 if donations_total > 0 else 0
+        tax_result = _calc_tax(total_taxable, employment_tax, dividends_total, donations_total, net_profit)
 
-        # Tax bands (2024/25)
-        BASIC_RATE_THRESHOLD = 37700  # £50,270 - £12,570
+        # Personal Allowance and tax bands (2024/25)
+        PERSONAL_ALLOWANCE = tax_result['personal_allowance']
         HIGHER_RATE_THRESHOLD = 125140
+        DIVIDEND_ALLOWANCE = 500
 
-        # Adjust basic rate band for Gift Aid
-        adjusted_basic_threshold = BASIC_RATE_THRESHOLD + grossed_donations
-
-        # Calculate taxable amount after personal allowance
-        taxable_after_allowance = max(0, total_taxable - PERSONAL_ALLOWANCE)
-
-        # Calculate tax on non-dividend income first
-        non_dividend_income = taxable_after_allowance - dividends_total
-        non_dividend_income = max(0, non_dividend_income)
-
-        # Tax on non-dividend income
-        tax_on_non_dividend = 0
-        if non_dividend_income > 0:
-            if non_dividend_income <= adjusted_basic_threshold:
-                # All in basic rate (20%)
-                tax_on_non_dividend = non_dividend_income * 0.20
-            elif non_dividend_income <= HIGHER_RATE_THRESHOLD:
-                # Basic + higher rate (40%)
-                tax_on_non_dividend = (adjusted_basic_threshold * 0.20) + ((non_dividend_income - adjusted_basic_threshold) * 0.40)
-            else:
-                # Basic + higher + additional (45%)
-                tax_on_non_dividend = (
-                    (adjusted_basic_threshold * 0.20) +
-                    ((HIGHER_RATE_THRESHOLD - adjusted_basic_threshold) * 0.40) +
-                    ((non_dividend_income - HIGHER_RATE_THRESHOLD) * 0.45)
-                )
-
-        # Tax on dividends (if any)
-        DIVIDEND_ALLOWANCE = 500  # 2024/25
-        tax_on_dividends = 0
-
-        if dividends_total > DIVIDEND_ALLOWANCE:
-            taxable_dividends = dividends_total - DIVIDEND_ALLOWANCE
+        # Basic rate band extended by Gift Aid
+        grossed_donations = tax_result['grossed_donations']
+        adjusted_basic_threshold = tax_result['adjusted_basic']
 
-            # Determine which tax band dividends fall into
-            income_before_dividends = non_dividend_income
-
-            # Basic rate dividends (8.75%)
-            if income_before_dividends < adjusted_basic_threshold:
-                basic_rate_dividends = min(taxable_dividends, adjusted_basic_threshold - income_before_dividends)
-                tax_on_dividends += basic_rate_dividends * 0.0875
-                taxable_dividends -= basic_rate_dividends
-                income_before_dividends += basic_rate_dividends
-
-            # Higher rate dividends (33.75%)
-            if taxable_dividends > 0 and income_before_dividends < HIGHER_RATE_THRESHOLD:
-                higher_rate_dividends = min(taxable_dividends, HIGHER_RATE_THRESHOLD - income_before_dividends)
-                tax_on_dividends += higher_rate_dividends * 0.3375
-                taxable_dividends -= higher_rate_dividends
-                income_before_dividends += higher_rate_dividends
-
-            # Additional rate dividends (39.35%)
-            if taxable_dividends > 0:
-                tax_on_dividends += taxable_dividends * 0.3935
-
-        # Total income tax
-        total_income_tax = tax_on_non_dividend + tax_on_dividends
-
-        # Less tax already paid
-        tax_still_to_pay = total_income_tax - employment_tax
+        taxable_after_allowance = tax_result['taxable_income']
+        tax_on_non_dividend = tax_result['tax_non_dividend']
+        tax_on_dividends = tax_result['tax_dividends']
+        total_income_tax = tax_result['income_tax']
+        tax_still_to_pay = tax_result['tax_to_pay']
 
         # National Insurance (Class 2 and Class 4)
-        ni_class_2 = 0
-        ni_class_4 = 0
-
-        if net_profit > 6725:  # Class 2 threshold 2024/25
-            ni_class_2 = 3.45 * 52  # £3.45 per week
-
-        if net_profit > 12570:  # Class 4 lower profits limit
-            class_4_profit = min(net_profit, 50270) - 12570
-            ni_class_4 = class_4_profit * 0.09  # 9% on profits between £12,570 and £50,270
-
-            if net_profit > 50270:
-                ni_class_4 += (net_profit - 50270) * 0.02  # 2% on profits above £50,270
-
-        total_ni = ni_class_2 + ni_class_4
+        ni_class_2 = tax_result['ni_class_2']
+        ni_class_4 = tax_result['ni_class_4']
+        total_ni = tax_result['ni']
 
-        # Total tax liability
-        total_tax_liability = tax_still_to_pay + total_ni
+        total_tax_liability = tax_result['total_liability']
 
         # ======================================================================
         # DISPLAY TAX CALCULATION
@@ -0,0 +1,251 @@
+"""
+Tax year snapshot for Tax Helper
+Every figure the HMRC summary needs for one tax year (SA100 / SA103S boxes,
+readiness check counts) computed in a handful of grouped queries
+
+The summary page, its tax calculation and the Excel summary sheet all read
+the same TaxYearSnapshot, so they cannot disagree. Snapshots are memoized
+per database and tax year and rebuilt when any of the tables they read
+changes (see data_versions.py).
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Tuple
+
+from sqlalchemy import and_, case, func
+
+from data_versions import table_versions
+
+
+# Tables a snapshot is built from
+SNAPSHOT_TABLES = ('income', 'expenses', 'mileage', 'donations', 'transactions')
+
+# engine -> {tax_year: (data_version, snapshot)}
+_snapshots = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TaxYearSnapshot:
+    """Aggregated ledger figures for one tax year"""
+    tax_year: str
+    start_date: date
+    end_date: date
+    income_by_type: Dict[str, float] = field(default_factory=dict)
+    tax_by_type: Dict[str, float] = field(default_factory=dict)
+    income_sources: int = 0
+    expense_by_category: Dict[str, float] = field(default_factory=dict)
+    expense_counts: Dict[str, int] = field(default_factory=dict)
+    mileage_count: int = 0
+    total_miles: float = 0.0
+    mileage_total: float = 0.0
+    donations_total: float = 0.0
+    transaction_months: frozenset = frozenset()
+    unreviewed_count: int = 0
+    reviewed_count: int = 0
+    reviewed_personal_count: int = 0
+
+    # --- Income (SA100 / SA103S) ---
+
+    @property
+    def employment_total(self) -> float:
+        return self.income_by_type.get('Employment', 0.0)
+
+    @property
+    def employment_tax(self) -> float:
+        return self.tax_by_type.get('Employment', 0.0)
+
+    @property
+    def self_employment_total(self) -> float:
+        return self.income_by_type.get('Self-employment', 0.0)
+
+    @property
+    def interest_total(self) -> float:
+        return self.income_by_type.get('Interest', 0.0)
+
+    @property
+    def dividends_total(self) -> float:
+        return self.income_by_type.get('Dividends', 0.0)
+
+    @property
+    def property_total(self) -> float:
+        return self.income_by_type.get('Property', 0.0)
+
+    @property
+    def other_total(self) -> float:
+        return self.income_by_type.get('Other', 0.0)
+
+    @property
+    def total_income(self) -> float:
+        return (self.employment_total + self.self_employment_total + self.interest_total +
+                self.dividends_total + self.property_total + self.other_total)
+
+    # --- Expenses and profit ---
+
+    @property
+    def expenses_total(self) -> float:
+        return sum(self.expense_by_category.values())
+
+    @property
+    def total_allowable(self) -> float:
+        return self.expenses_total + self.mileage_total
+
+    @property
+    def net_profit(self) -> float:
+        return self.self_employment_total - self.total_allowable
+
+    @property
+    def total_taxable(self) -> float:
+        return (self.employment_total + self.net_profit + self.interest_total +
+                self.dividends_total + self.property_total)
+
+    # --- Readiness ---
+
+    @property
+    def missing_months(self) -> List[Tuple[int, int]]:
+        """(year, month) pairs of the tax year with no transactions, empty when none were imported"""
+        if not self.transaction_months:
+            return []
+        months = []
+        current = self.start_date
+        while current <= self.end_date:
+            if (current.year, current.month) not in self.transaction_months:
+                months.append((current.year, current.month))
+            current = current.replace(year=current.year + current.month // 12, month=current.month % 12 + 1)
+        return months
+
+    def hmrc_boxes(self) -> List[Tuple[str, List[Tuple[str, float]]]]:
+        """Return figures grouped by section, as (section, [(box label, value), ...])"""
+        return [
+            ("EMPLOYMENT (if applicable)", [
+                ("Box 1 - Pay from employment", self.employment_total),
+                ("Box 2 - UK tax deducted", self.employment_tax),
+            ]),
+            ("SELF-EMPLOYMENT (SA103S - Short Form)", [
+                ("Box 15 - Turnover", self.self_employment_total),
+                ("Box 31 - Total allowable expenses", self.total_allowable),
+                ("Box 32 - Net profit", self.net_profit),
+            ]),
+            ("SAVINGS INTEREST", [
+                ("Box 1 - Interest (gross)", self.interest_total),
+            ]),
+            ("DIVIDENDS", [
+                ("Box 1 - Dividends (gross)", self.dividends_total),
+            ]),
+            ("GIFT AID", [
+                ("Donations paid", self.donations_total),
+            ]),
+        ]
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def build_tax_year_snapshot(session, tax_year: str) -> TaxYearSnapshot:
+    """
+    Compute a snapshot from the ledgers, bypassing the memo
+
+    Args:
+        session: SQLAlchemy session
+        tax_year: Tax year string, e.g. '2024/25'
+
+    Returns:
+        TaxYearSnapshot
+    """
+    from models import Transaction, Income, Expense, Mileage, Donation
+    from utils import get_tax_year_dates
+
+    start_date, end_date = (d.date() for d in get_tax_year_dates(tax_year))
+
+    income_rows = session.query(
+        Income.income_type,
+        func.sum(Income.amount_gross),
+        func.sum(Income.tax_deducted)
+    ).filter(
+        and_(Income.date >= start_date, Income.date <= end_date)
+    ).group_by(Income.income_type).all()
+
+    income_sources = session.query(func.count(func.distinct(Income.source))).filter(
+        and_(Income.date >= start_date, Income.date <= end_date)
+    ).scalar() or 0
+
+    expense_rows = session.query(
+        Expense.category,
+        func.sum(Expense.amount),
+        func.count(Expense.id)
+    ).filter(
+        and_(Expense.date >= start_date, Expense.date <= end_date)
+    ).group_by(Expense.category).all()
+
+    mileage_count, total_miles, mileage_total = session.query(
+        func.count(Mileage.id),
+        func.sum(Mileage.miles),
+        func.sum(Mileage.allowable_amount)
+    ).filter(
+        and_(Mileage.date >= start_date, Mileage.date <= end_date)
+    ).one()
+
+    donations_total = session.query(func.sum(Donation.amount_paid)).filter(
+        and_(Donation.gift_aid == True, Donation.date >= start_date, Donation.date <= end_date)
+    ).scalar() or 0.0
+
+    month_rows = session.query(func.strftime('%Y-%m', Transaction.date)).filter(
+        and_(Transaction.date >= start_date, Transaction.date <= end_date)
+    ).distinct().all()
+
+    # Review progress covers every transaction, not just this tax year
+    unreviewed_count, reviewed_count, reviewed_personal_count = session.query(
+        _count_where(Transaction.reviewed == False),
+        _count_where(Transaction.reviewed == True),
+        _count_where(and_(Transaction.reviewed == True, Transaction.is_personal == True))
+    ).one()
+
+    return TaxYearSnapshot(
+        tax_year=tax_year,
+        start_date=start_date,
+        end_date=end_date,
+        income_by_type={income_type: gross or 0.0 for income_type, gross, _ in income_rows},
+        tax_by_type={income_type: tax or 0.0 for income_type, _, tax in income_rows},
+        income_sources=income_sources,
+        expense_by_category={category: total or 0.0 for category, total, _ in expense_rows},
+        expense_counts={category: count for category, _, count in expense_rows},
+        mileage_count=mileage_count or 0,
+        total_miles=total_miles or 0.0,
+        mileage_total=mileage_total or 0.0,
+        donations_total=donations_total,
+        transaction_months=frozenset(
+            (int(month[:4]), int(month[5:7])) for (month,) in month_rows if month
+        ),
+        unreviewed_count=unreviewed_count,
+        reviewed_count=reviewed_count,
+        reviewed_personal_count=reviewed_personal_count,
+    )
+
+
+def get_tax_year_snapshot(session, tax_year: str) -> TaxYearSnapshot:
+    """
+    Snapshot for a tax year, reused until one of SNAPSHOT_TABLES changes
+
+    Args:
+        session: SQLAlchemy session
+        tax_year: Tax year string, e.g. '2024/25'
+
+    Returns:
+        TaxYearSnapshot
+    """
+    engine = session.get_bind()
+    data_version = table_versions(*SNAPSHOT_TABLES)
+
+    with _lock:
+        cached = _snapshots.get(engine, {}).get(tax_year)
+    if cached and cached[0] == data_version:
+        return cached[1]
+
+    snapshot = build_tax_year_snapshot(session, tax_year)
+    with _lock:
+        _snapshots.setdefault(engine, {})[tax_year] = (data_version, snapshot)
+    return snapshot
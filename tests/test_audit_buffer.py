@@ -0,0 +1,120 @@
+"""
+Test Script for the buffered audit log writer
+Audit entries ride on the caller's transaction: one commit for a bulk
+review, visible to readers straight away, gone on rollback, and trimmed
+periodically rather than on every write
+"""
+
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from models import init_db, Transaction, AuditLog
+from components.audit_trail import (
+    log_action, get_audit_trail, undo_last_action, get_undo_stack_size,
+    MAX_UNDO_STACK, AUDIT_TRIM_INTERVAL
+)
+
+
+def setup_session():
+    """In-memory database with some transactions"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    for i in range(500):
+        session.add(Transaction(date=date(2024, 5, 1), description=f'TXN {i}', paid_out=10.0, reviewed=False))
+    session.commit()
+    return session
+
+
+def test_bulk_review_commits_once():
+    """500 audited updates cost one commit and a handful of statements"""
+    session = setup_session()
+    try:
+        commits = []
+        event.listen(session, 'after_commit', lambda s: commits.append(1))
+        statements = []
+        event.listen(session.get_bind(), 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        for txn in session.query(Transaction).all():
+            txn.reviewed = True
+            assert log_action(session, 'BULK_UPDATE', 'Transaction', txn.id,
+                              {'reviewed': False}, {'reviewed': True}, 'Bulk review')
+        session.commit()
+
+        audit_inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT INTO AUDIT_LOG')]
+        assert len(commits) == 1
+        assert len(audit_inserts) == 1, len(audit_inserts)
+        assert session.query(AuditLog).count() == MAX_UNDO_STACK + 1
+        print(f"✓ 500 audited updates written with {len(commits)} commit and {len(statements)} statements")
+    finally:
+        session.close()
+
+
+def test_entries_visible_before_commit():
+    """Readers and undo see buffered entries; rollback discards them"""
+    session = setup_session()
+    try:
+        txn = session.query(Transaction).first()
+        txn.guessed_category = 'Travel'
+        log_action(session, 'UPDATE', 'Transaction', txn.id,
+                   {'guessed_category': None}, {'guessed_category': 'Travel'}, 'Set category')
+
+        logs, total = get_audit_trail(session)
+        assert total == 1 and logs[0].changes_summary == 'Set category'
+
+        success, message = undo_last_action(session)
+        assert success, message
+        assert session.get(Transaction, txn.id).guessed_category is None
+
+        log_action(session, 'UPDATE', 'Transaction', txn.id, {'reviewed': False}, {'reviewed': True}, 'Discarded')
+        session.rollback()
+        session.commit()
+        assert get_undo_stack_size(session) == 0
+        print("✓ Buffered entries are readable and undoable at once, and dropped on rollback")
+    finally:
+        session.close()
+
+
+def test_trimming_is_amortized():
+    """The table stays bounded while trimming runs once per interval"""
+    session = setup_session()
+    try:
+        sizes = []
+        for txn in session.query(Transaction).limit(3 * AUDIT_TRIM_INTERVAL).all():
+            log_action(session, 'UPDATE', 'Transaction', txn.id, {'reviewed': False}, {'reviewed': True}, 'Review')
+            session.commit()
+            sizes.append(session.query(AuditLog).count())
+
+        assert max(sizes) <= MAX_UNDO_STACK + AUDIT_TRIM_INTERVAL
+        assert len(set(sizes)) > 2
+        print(f"✓ Audit log stays within {max(sizes)} rows with amortized trimming")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all audit buffer tests"""
+    print("\n" + "=" * 60)
+    print("BUFFERED AUDIT LOG - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_bulk_review_commits_once()
+        test_entries_visible_before_commit()
+        test_trimming_is_amortized()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
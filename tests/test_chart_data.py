@@ -0,0 +1,204 @@
+"""
+Test Script for the shared chart data provider
+ChartData shapes must match the per-month / per-quarter queries the charts
+used to run, be reused until a ledger changes, and let every advanced chart
+render from the provider's two queries
+"""
+
+import sys
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from sqlalchemy import event, func, and_
+
+from models import init_db, Income, Expense
+from chart_data import get_chart_data, build_chart_data, previous_period, CHART_CACHE_SIZE, _chart_data
+
+START, END = datetime(2024, 4, 6), datetime(2025, 4, 5)
+
+
+def build_database(db_path=':memory:'):
+    """Income and expenses over the 2024/25 tax year and the year before"""
+    engine, Session = init_db(db_path)
+    session = Session()
+    rng = random.Random(25)
+    first = date(2023, 4, 1)
+    for i in range(300):
+        session.add(Income(date=first + timedelta(days=rng.randrange(740)), source=f'Payer {i % 5}',
+                           amount_gross=rng.uniform(50, 3000), tax_deducted=rng.choice([0.0, 20.0, 150.0]),
+                           income_type=rng.choice(['Employment', 'Self-employment', 'Interest'])))
+    for i in range(900):
+        session.add(Expense(date=first + timedelta(days=rng.randrange(740)), supplier=f'Supplier {i % 40}',
+                            amount=rng.uniform(1, 400),
+                            category=rng.choice(['Travel', 'Office costs', 'Phone & internet', 'Other business expenses'])))
+    session.commit()
+    return engine, session
+
+
+class StatementCounter:
+    """Counts SQL statements sent to the database"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def query_sum(session, column, start, end):
+    """One per-period query as the charts ran it, with date bounds"""
+    model = column.class_
+    return session.query(func.sum(column)).filter(
+        and_(model.date >= start.date(), model.date <= end.date())
+    ).scalar() or 0.0
+
+
+def test_shapes_match_queries():
+    """Monthly, quarterly and grouped totals equal the queries they replace"""
+    engine, session = build_database()
+    try:
+        data = build_chart_data(session, START, END)
+
+        monthly = data.monthly_totals()
+        assert len(monthly) == 13  # April 2024 (from the 6th) to April 2025 (to the 5th)
+        for month, income, tax, expenses in monthly.itertuples(index=False):
+            month_start = max(month.to_pydatetime(), START)
+            month_end = min((month + pd.offsets.MonthEnd(0)).to_pydatetime(), END)
+            assert abs(income - query_sum(session, Income.amount_gross, month_start, month_end)) < 1e-6
+            assert abs(tax - query_sum(session, Income.tax_deducted, month_start, month_end)) < 1e-6
+            assert abs(expenses - query_sum(session, Expense.amount, month_start, month_end)) < 1e-6
+
+        quarters = data.quarterly_totals(2024)
+        bounds = [(datetime(2024, 4, 6), datetime(2024, 7, 5)), (datetime(2024, 7, 6), datetime(2024, 10, 5)),
+                  (datetime(2024, 10, 6), datetime(2025, 1, 5)), (datetime(2025, 1, 6), datetime(2025, 4, 5))]
+        for (quarter, income, expenses), (q_start, q_end) in zip(quarters.itertuples(index=False), bounds):
+            assert abs(income - query_sum(session, Income.amount_gross, q_start, q_end)) < 1e-6, quarter
+            assert abs(expenses - query_sum(session, Expense.amount, q_start, q_end)) < 1e-6, quarter
+
+        weekly = data.period_expenses('weekly')
+        for period, expenses in weekly.itertuples(index=False):
+            period_end = min(period.to_pydatetime() + timedelta(days=6), END)
+            assert abs(expenses - query_sum(session, Expense.amount, period.to_pydatetime(), period_end)) < 1e-6
+
+        # The previous period comes from the same fetch
+        prev_start, prev_end = previous_period(START.date(), END.date())
+        previous = data.expenses_by('category', start=prev_start, end=prev_end)
+        expected = dict(session.query(Expense.category, func.sum(Expense.amount)).filter(
+            Expense.date >= prev_start, Expense.date <= prev_end
+        ).group_by(Expense.category).all())
+        assert set(previous['category']) == set(expected)
+        for category, amount in previous.itertuples(index=False):
+            assert abs(amount - expected[category]) < 1e-6, category
+
+        daily = data.daily_expenses()
+        assert daily['count'].sum() == data.expense_count == session.query(func.count(Expense.id)).filter(
+            Expense.date >= START.date(), Expense.date <= END.date()).scalar()
+        print(f"✓ {len(monthly)} months, 4 quarters and {len(weekly)} weeks match the per-period queries")
+    finally:
+        session.close()
+
+
+def test_memo_refreshes_after_write():
+    """Reused until an income or expense write, then rebuilt"""
+    engine, session = build_database()
+    try:
+        counter = StatementCounter(engine)
+        first = get_chart_data(session, START, END)
+        assert get_chart_data(session, START.date(), END.date()) is first
+        assert counter.count == 2
+
+        session.add(Expense(date=date(2024, 5, 1), supplier='New', amount=100.0, category='Travel'))
+        session.commit()
+        refreshed = get_chart_data(session, START, END)
+        assert refreshed is not first
+        assert abs(refreshed.total_expenses - first.total_expenses - 100.0) < 1e-6
+
+        # Only the most recently used ranges are kept, and only while current
+        for months in range(CHART_CACHE_SIZE + 2):
+            get_chart_data(session, START, END - timedelta(days=30 * months))
+        assert len(_chart_data[engine]) == CHART_CACHE_SIZE
+        assert (START.date(), END.date()) not in _chart_data[engine]
+        session.add(Expense(date=date(2024, 6, 1), supplier='New', amount=5.0, category='Travel'))
+        session.commit()
+        get_chart_data(session, START, END)
+        assert list(_chart_data[engine]) == [(START.date(), END.date())]
+        print("✓ Chart data is reused until the ledgers change, for the last few ranges")
+    finally:
+        session.close()
+
+
+def render_analytics(session):
+    """Every advanced chart over one tax year, as the Reports page draws them"""
+    from datetime import datetime
+    import streamlit as st
+    from components.ui.advanced_charts import (
+        render_spending_heatmap, render_cash_flow_waterfall, render_expense_treemap,
+        render_tax_projection_gauge, render_spending_radar, render_income_tax_timeline,
+        render_expense_velocity, render_income_to_expense_sankey, render_tax_efficiency_sunburst,
+        render_quarterly_dashboard
+    )
+
+    start, end = datetime(2024, 4, 6), datetime(2025, 4, 5)
+    render_spending_heatmap(session, start, end)
+    render_cash_flow_waterfall(session, start, end, 0.0)
+    render_expense_treemap(session, start, end)
+    render_tax_projection_gauge(5000, 150, 800, 35000)
+    render_spending_radar(session, start, end)
+    render_income_tax_timeline(session, start, end)
+    render_expense_velocity(session, start, end, 'monthly')
+    render_income_to_expense_sankey(session, start, end)
+    render_tax_efficiency_sunburst(session, start, end)
+    render_quarterly_dashboard(session, 2024)
+    st.write('done')
+
+
+def test_charts_render_from_two_queries():
+    """All ten charts render without errors from the provider's two queries"""
+    from streamlit.testing.v1 import AppTest
+
+    # The app script runs on its own thread, so the database must be a file
+    with tempfile.TemporaryDirectory() as directory:
+        engine, session = build_database(os.path.join(directory, 'charts.db'))
+        try:
+            counter = StatementCounter(engine)
+            app = AppTest.from_function(render_analytics, args=(session,), default_timeout=60)
+            app.run()
+
+            assert not app.exception, app.exception
+            assert not app.error, [e.value for e in app.error]
+            assert app.markdown[-1].value == 'done'
+            assert counter.count == 2, counter.count
+            print(f"✓ Ten charts rendered from {counter.count} queries")
+        finally:
+            session.close()
+            engine.dispose()
+
+
+def run_all_tests():
+    """Run all chart data tests"""
+    print("\n" + "=" * 60)
+    print("CHART DATA - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_shapes_match_queries()
+        test_memo_refreshes_after_write()
+        test_charts_render_from_two_queries()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
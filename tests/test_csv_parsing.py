@@ -0,0 +1,133 @@
+"""
+Test Script for CSV Import Parsing
+Verifies the vectorized parse_csv path produces the same DataFrame and
+error list as the original per-row path
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from models import init_db, seed_default_data, Rule, Transaction
+from utils import parse_csv, parse_uk_dates, parse_currency_column, parse_uk_date, parse_currency
+
+
+def setup_session():
+    """Create an in-memory database with the default rules"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    seed_default_data(session)
+    return session
+
+
+def _column_mappings(use_value_column):
+    return {
+        'column_date': 'Date',
+        'column_type': 'Type',
+        'column_description': 'Description',
+        'column_value': 'Value' if use_value_column else '',
+        'column_paid_in': 'Paid in',
+        'column_paid_out': 'Paid out',
+        'column_balance': 'Balance',
+    }
+
+
+def test_parse_uk_dates_matches_parse_uk_date():
+    """Column-wide date parsing agrees with parse_uk_date value by value"""
+    values = pd.Series([
+        '01/02/2024', '1/2/24', '01-02-2024', '01.02.2024', '04-Apr-25',
+        '04-April-25', '2024-03-04', '31/02/2024', '01/02/2024 10:00',
+        '  05/06/2020 ', '', None, 'not a date', '01/01/2999',
+    ])
+
+    expected = values.apply(parse_uk_date)
+    result = parse_uk_dates(values)
+
+    pd.testing.assert_series_equal(result, expected)
+    print("✓ parse_uk_dates matches parse_uk_date")
+
+
+def test_parse_currency_column_matches_parse_currency():
+    """Column-wide currency cleaning agrees with parse_currency value by value"""
+    values = pd.Series(['£1,234.50', '-12.99', '$5', '', None, 'abc', '5e2', ' 7 ', '2000000000'])
+
+    expected = values.apply(parse_currency)
+    result = parse_currency_column(values)
+
+    pd.testing.assert_series_equal(result, expected)
+    print("✓ parse_currency_column matches parse_currency")
+
+
+def test_vectorized_parse_csv_matches_row_by_row():
+    """Both parse_csv modes return identical output for value and paid in/out files"""
+    session = setup_session()
+    session.add_all([
+        Rule(match_mode='Starts with', text_to_match='AMAZON', map_to='Ignore', is_personal=True,
+             priority=10, enabled=True),
+        Rule(match_mode='Ends with', text_to_match='ACME LTD', map_to='Income', income_type='Other',
+             is_personal=False, priority=10, enabled=True),
+    ])
+    session.commit()
+    rules = session.query(Rule).all()
+
+    value_csv = (
+        "Date,Type,Description,Value,Balance\n"
+        "01/05/2024,POS,TESCO STORE 1234,-12.50,100.00\n"
+        "01/05/2024,POS,AMAZON MARKETPLACE,-20.00,80.00\n"
+        "01/05/2024,BAC,PAYMENT FROM ACME LTD,500.00,580.00\n"
+        "02/05/2024,BAC,CLIENT PAYMENT ACME,\"£1,200.00\",1300.00\n"
+        "bad date,POS,UNKNOWN SHOP,-3.00,1297.00\n"
+        "03/05/2024,DD,NETFLIX.COM,-9.99,\n"
+        "04/05/2024,POS,,abc,1287.01\n"
+    ).encode()
+
+    split_csv = (
+        "Date,Type,Description,Paid in,Paid out,Balance\n"
+        "01-May-24,POS,UBER TRIP,,8.40,100.00\n"
+        "02-May-24,BAC,SALARY ACME,\"2,500.00\",,2600.00\n"
+        "2024-05-03,POS,RANDOM SHOP,,£15.00,2585.00\n"
+    ).encode()
+
+    try:
+        for content, use_value_column in ((value_csv, True), (split_csv, False)):
+            expected_df, expected_errors = parse_csv(
+                content, _column_mappings(use_value_column), session, rules, Transaction,
+                vectorized=False
+            )
+            df, errors = parse_csv(
+                content, _column_mappings(use_value_column), session, rules, Transaction
+            )
+
+            assert errors == expected_errors, f"Error lists differ: {errors} != {expected_errors}"
+            pd.testing.assert_frame_equal(df, expected_df)
+
+        print("✓ Vectorized parse_csv matches the per-row path")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all CSV parsing tests"""
+    print("\n" + "=" * 60)
+    print("CSV IMPORT PARSING - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_parse_uk_dates_matches_parse_uk_date()
+        test_parse_currency_column_matches_parse_currency()
+        test_vectorized_parse_csv_matches_row_by_row()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+"""
+Test Script for SQL-side dashboard statistics
+Compares get_dashboard_statistics against the original per-object counts
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_
+
+from models import init_db, Transaction, Expense
+from cache_helpers import get_dashboard_statistics
+
+
+def build_database():
+    """Random transactions and expenses across two accounts"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(10)
+    start = date(2024, 1, 1)
+
+    for i in range(400):
+        session.add(Transaction(
+            date=start + timedelta(days=rng.randrange(500)),
+            description=f'TXN {i}',
+            paid_out=rng.uniform(1, 200),
+            reviewed=rng.choice([True, False]),
+            confidence_score=rng.randrange(0, 101),
+            requires_review=rng.choice([True, False, False]),
+            account_name=rng.choice(['Main Account', 'Business'])
+        ))
+    for i in range(120):
+        session.add(Expense(
+            date=start + timedelta(days=rng.randrange(500)),
+            supplier=f'Supplier {i}',
+            category=rng.choice(['Other business expenses', 'Travel', 'Office costs']),
+            amount=rng.choice([20.0, 99.99, 100.0, 450.0]),
+            receipt_link=rng.choice(['', None, 'receipts/r.pdf'])
+        ))
+    session.commit()
+    return session
+
+
+def reference_statistics(session, start_date, end_date, account_filter=None):
+    """Original implementation: load every transaction and count in Python"""
+    query = session.query(Transaction).filter(Transaction.date >= start_date, Transaction.date <= end_date)
+    if account_filter and account_filter != 'All Accounts':
+        query = query.filter(Transaction.account_name == account_filter)
+    transactions = query.all()
+
+    expenses = session.query(Expense).filter(Expense.date >= start_date, Expense.date <= end_date)
+    return {
+        'total_transactions': len(transactions),
+        'unreviewed_count': sum(1 for t in transactions if not t.reviewed),
+        'high_confidence': sum(1 for t in transactions if t.confidence_score >= 70),
+        'needs_manual_review': sum(1 for t in transactions if t.requires_review or t.confidence_score < 40),
+        'generic_expenses': expenses.filter(Expense.category == 'Other business expenses').count(),
+        'large_expenses_count': expenses.filter(
+            Expense.amount >= 100.0, or_(Expense.receipt_link == '', Expense.receipt_link == None)
+        ).count(),
+    }
+
+
+def test_statistics_match_reference():
+    """SQL aggregates equal the Python counts for each filter"""
+    session = build_database()
+    try:
+        cases = [
+            (date(2024, 4, 6), date(2025, 4, 5), None),
+            (date(2024, 4, 6), date(2025, 4, 5), 'Business'),
+            (date(2024, 1, 1), date(2025, 12, 31), 'All Accounts'),
+            (date(2030, 1, 1), date(2030, 12, 31), None),
+        ]
+        for start_date, end_date, account in cases:
+            expected = reference_statistics(session, start_date, end_date, account)
+            assert get_dashboard_statistics(session, start_date, end_date, account) == expected, (start_date, account)
+
+        print("✓ SQL dashboard statistics match the per-object counts")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all dashboard statistics tests"""
+    print("\n" + "=" * 60)
+    print("DASHBOARD STATISTICS - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_statistics_match_reference()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,105 @@
+"""
+Test Script for the data version registry
+Checks that writes through a session advance table generations and that
+cached helpers refresh as soon as their tables change
+"""
+
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+
+from models import init_db, Transaction, Rule, Expense
+from data_versions import table_versions
+from cache_helpers import load_rules, get_dashboard_statistics
+
+
+def setup_session():
+    """Create an empty in-memory database"""
+    engine, Session = init_db(':memory:')
+    return Session()
+
+
+def test_generations_follow_writes():
+    """ORM flushes, bulk updates and Core statements all bump their tables"""
+    session = setup_session()
+    try:
+        before = table_versions('transactions', 'rules')
+
+        session.add(Transaction(date=date(2024, 5, 1), description='TESCO', paid_out=10.0))
+        session.flush()
+        after_flush = table_versions('transactions', 'rules')
+        assert after_flush[0] > before[0] and after_flush[1] == before[1]
+
+        session.commit()
+        after_commit = table_versions('transactions')
+        assert after_commit[0] > after_flush[0]
+
+        session.query(Transaction).filter(Transaction.id > 0).update({'reviewed': True})
+        assert table_versions('transactions')[0] > after_commit[0]
+
+        current = table_versions('transactions')
+        session.execute(update(Transaction.__table__).values(reviewed=False))
+        assert table_versions('transactions')[0] > current[0]
+
+        # Reads leave generations alone
+        session.commit()
+        current = table_versions('transactions', 'rules')
+        session.query(Transaction).all()
+        session.commit()
+        assert table_versions('transactions', 'rules') == current
+        print("✓ Table generations follow flushes, bulk updates and Core statements")
+    finally:
+        session.close()
+
+
+def test_cached_helpers_refresh():
+    """Cached rules and dashboard statistics change right after a write"""
+    session = setup_session()
+    try:
+        start, end = date(2024, 4, 6), date(2025, 4, 5)
+
+        assert load_rules(session) == []
+        assert load_rules(session) == []
+        session.add(Rule(match_mode='Contains', text_to_match='NETFLIX', map_to='Expense', priority=1))
+        session.commit()
+        assert [r['text_to_match'] for r in load_rules(session)] == ['NETFLIX']
+
+        stats = get_dashboard_statistics(session, start, end)
+        assert stats['total_transactions'] == 0
+        session.add(Transaction(date=date(2024, 6, 1), description='CLIENT', paid_in=500.0))
+        session.add(Expense(date=date(2024, 6, 2), supplier='Shop', category='Other business expenses', amount=150.0))
+        session.commit()
+
+        stats = get_dashboard_statistics(session, start, end)
+        assert stats['total_transactions'] == 1
+        assert stats['generic_expenses'] == 1
+        print("✓ Cached helpers refresh when their tables change")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all data version tests"""
+    print("\n" + "=" * 60)
+    print("DATA VERSION REGISTRY - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_generations_follow_writes()
+        test_cached_helpers_refresh()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
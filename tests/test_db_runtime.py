@@ -0,0 +1,181 @@
+"""
+Test Script for the process-wide database runtime
+get_database must build one engine per database file, and each rerun must
+get a fresh session that goes back to the pool when the rerun ends
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Setting, Transaction
+from db_runtime import DatabaseRuntime, get_database
+
+
+def temp_db_path(directory):
+    return os.path.join(directory, 'runtime.db')
+
+
+def test_one_runtime_per_database():
+    """Repeated calls share the engine; the database is seeded once"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = get_database(temp_db_path(directory))
+        try:
+            assert get_database(temp_db_path(directory)) is db
+            with db.Session() as session:
+                settings = session.query(Setting).count()
+                assert settings > 0
+            DatabaseRuntime(temp_db_path(directory)).dispose()
+            with db.Session() as session:
+                assert session.query(Setting).count() == settings
+            print("✓ One engine per database file, seeded once")
+        finally:
+            db.dispose()
+            get_database.clear()
+
+
+def test_sessions_per_rerun():
+    """Each browser session keeps its session between reruns and releases its connection"""
+    tab1, tab2 = {}, {}
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseRuntime(temp_db_path(directory))
+        try:
+            first = db.begin_rerun(tab1)
+            first.add(Transaction(date=date(2024, 5, 1), description='TESCO', paid_in=0.0, paid_out=5.0))
+            first.commit()
+            assert first.query(Transaction).count() == 1
+            assert db.pool_stats()['checkedout'] == 1
+
+            # Another browser session rendering at the same time has its own session
+            other = db.begin_rerun(tab2)
+            assert other is not first and tab2['db_session'] is other
+            other.query(Transaction).count()
+            assert db.pool_stats()['checkedout'] == 2
+            db.end_rerun(tab2)
+
+            # The next rerun of the first tab releases what its last run left open
+            assert db.begin_rerun(tab1) is first
+            assert db.pool_stats()['checkedout'] == 0
+            assert first.query(Transaction).one().description == 'TESCO'
+            db.end_rerun(tab1)
+
+            stats = db.pool_stats()
+            assert stats['checkedout'] == 0
+            assert stats['reruns'] == 3 and stats['open_sessions'] == 2
+            print(f"✓ Sessions live per browser session and return their connections ({stats['status']})")
+        finally:
+            db.dispose()
+
+
+def test_targeted_refresh():
+    """A rerun expires only objects whose tables were written, and nothing when none were"""
+    viewer, editor = {}, {}
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseRuntime(temp_db_path(directory))
+        try:
+            session = db.begin_rerun(editor)
+            session.add_all([Transaction(date=date(2024, 5, day), description=f'SHOP {day}', paid_in=0.0,
+                                         paid_out=float(day)) for day in range(1, 21)])
+            session.commit()
+            db.end_rerun(editor)
+
+            session = db.begin_rerun(viewer)
+            transactions = session.query(Transaction).order_by(Transaction.id).all()
+            tax_year = session.query(Setting).filter(Setting.key == 'tax_year').one()
+            db.end_rerun(viewer)
+
+            # A widget interaction: nothing written, nothing reloaded
+            skipped = db.pool_stats()['refreshes_skipped']
+            session = db.begin_rerun(viewer)
+            assert db.pool_stats()['refreshes_skipped'] == skipped + 1
+            assert all('description' in t.__dict__ for t in transactions)
+            db.end_rerun(viewer)
+
+            # Another tab reviews a transaction: only transactions are expired
+            other = db.begin_rerun(editor)
+            other.query(Transaction).filter(Transaction.id == transactions[0].id).one().reviewed = True
+            other.commit()
+            db.end_rerun(editor)
+
+            session = db.begin_rerun(viewer)
+            assert 'description' not in transactions[0].__dict__
+            assert 'value' in tax_year.__dict__
+            assert transactions[0].reviewed is True
+            db.end_rerun(viewer)
+
+            # A run that stopped part-way through an edit does not leak it into the next
+            transactions[1].description = 'HALF DONE'
+            session = db.begin_rerun(viewer)
+            assert transactions[1].description == 'SHOP 2'
+            db.end_rerun(viewer)
+            print("✓ Reruns refresh only the tables that changed")
+        finally:
+            db.dispose()
+
+
+def test_external_writes():
+    """A commit from another process expires everything the session holds"""
+    tab = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseRuntime(temp_db_path(directory))
+        try:
+            session = db.begin_rerun(tab)
+            setting = session.query(Setting).filter(Setting.key == 'tax_year').one()
+            db.end_rerun(tab)
+
+            script = sqlite3.connect(temp_db_path(directory))
+            script.execute("UPDATE settings SET value = '2025/26' WHERE key = 'tax_year'")
+            script.commit()
+            script.close()
+
+            session = db.begin_rerun(tab)
+            assert setting.value == '2025/26'
+            assert db.pool_stats()['external_writes'] == 1
+            db.end_rerun(tab)
+            print("✓ Writes from other processes are noticed")
+        finally:
+            db.dispose()
+
+
+def test_health():
+    """Health check round-trips a query and reports the WAL journal"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseRuntime(temp_db_path(directory))
+        try:
+            health = db.health()
+            assert health.ok and health.error is None
+            assert health.journal_mode == 'wal'
+            assert health.pool['checkedout'] == 0
+            print(f"✓ Health check OK in {health.latency_ms:.2f} ms")
+        finally:
+            db.dispose()
+
+
+def run_all_tests():
+    """Run all database runtime tests"""
+    print("\n" + "=" * 60)
+    print("DATABASE RUNTIME - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_one_runtime_per_database()
+        test_sessions_per_rerun()
+        test_targeted_refresh()
+        test_external_writes()
+        test_health()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
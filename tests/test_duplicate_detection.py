@@ -0,0 +1,122 @@
+"""
+Test Script for fingerprint-based duplicate detection
+Re-importing a statement must flag every line already in the database while
+genuinely repeated same-day transactions are still imported
+"""
+
+import sys
+import os
+import importlib
+import sqlite3
+import tempfile
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from models import init_db, Transaction
+from fingerprints import fingerprint_frame, transaction_fingerprint
+from utils import detect_duplicates
+
+
+def make_statement():
+    """Statement with two identical coffees on the same day"""
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-05', '2024-01-05', '2024-01-05', '2024-01-06']),
+        'description': ['COSTA COFFEE 1234', 'COSTA COFFEE 5678', 'TESCO STORE', 'CLIENT PAYMENT REF:AB12'],
+        'paid_in': [0.0, 0.0, 0.0, 1500.0],
+        'paid_out': [3.2, 3.2, 42.17, 0.0],
+    })
+
+
+def test_fingerprints():
+    """Vectorized fingerprints agree with the scalar helper and number repeats"""
+    df = make_statement()
+    fingerprints = fingerprint_frame(df)
+
+    assert fingerprints.iloc[0] == transaction_fingerprint(date(2024, 1, 5), 'COSTA COFFEE', 0.0, 3.2, 0)
+    assert fingerprints.iloc[1] == transaction_fingerprint(date(2024, 1, 5), 'COSTA COFFEE 9999', 0.0, 3.2, 1)
+    assert fingerprints.nunique() == len(df)
+    print("✓ Fingerprints normalize descriptions and number same-day repeats")
+
+
+def test_reimport_is_detected():
+    """Every line of an already imported statement is a duplicate"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        df = make_statement()
+        assert detect_duplicates(df, session, Transaction) == []
+        assert 'fingerprint' not in df.columns  # the caller's frame is left alone
+
+        df['fingerprint'] = fingerprint_frame(df)
+        for _, row in df.iloc[:3].iterrows():
+            session.add(Transaction(date=row['date'].date(), description=row['description'],
+                                    paid_in=row['paid_in'], paid_out=row['paid_out'],
+                                    fingerprint=row['fingerprint']))
+        session.commit()
+
+        again = make_statement()
+        assert detect_duplicates(again, session, Transaction) == [0, 1, 2]
+        assert detect_duplicates(df, session, Transaction) == [0, 1, 2]  # precomputed fingerprints
+
+        # A third identical coffee on the same day is new
+        extra = pd.concat([again, again.iloc[[0]]], ignore_index=True)
+        assert detect_duplicates(extra, session, Transaction) == [0, 1, 2]
+        assert list(extra.columns) == list(again.columns)
+        print("✓ Re-imported lines are detected and new repeats are kept")
+    finally:
+        session.close()
+
+
+def test_migration_backfill():
+    """Migration 005 fingerprints existing rows the same way imports do"""
+    migration = importlib.import_module('migrations.005_add_transaction_fingerprint')
+    path = tempfile.mktemp(suffix='.db')
+    try:
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE transactions (id INTEGER PRIMARY KEY, date DATE, description VARCHAR(500), '
+                     'paid_in FLOAT, paid_out FLOAT)')
+        df = make_statement()
+        conn.executemany(
+            'INSERT INTO transactions (date, description, paid_in, paid_out) VALUES (?, ?, ?, ?)',
+            [(d.strftime('%Y-%m-%d'), desc, pin, pout)
+             for d, desc, pin, pout in zip(df['date'], df['description'], df['paid_in'], df['paid_out'])]
+        )
+        conn.commit()
+        conn.close()
+
+        migration.upgrade(path)
+
+        conn = sqlite3.connect(path)
+        stored = [fp for (fp,) in conn.execute('SELECT fingerprint FROM transactions ORDER BY id')]
+        conn.close()
+        assert stored == fingerprint_frame(df).tolist()
+        print("✓ Migration backfills matching fingerprints")
+    finally:
+        os.remove(path)
+
+
+def run_all_tests():
+    """Run all duplicate detection tests"""
+    print("\n" + "=" * 60)
+    print("DUPLICATE DETECTION - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_fingerprints()
+        test_reimport_is_detected()
+        test_migration_backfill()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
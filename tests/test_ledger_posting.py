@@ -0,0 +1,133 @@
+"""
+Test Script for set-based ledger posting
+bulk_post_to_ledger must leave the ledgers exactly as posting each
+transaction with post_transaction_to_ledger did, with a fixed number of
+statements however many transactions are posted
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from models import init_db, Transaction, Income, Expense
+from ledger_helpers import post_transaction_to_ledger, bulk_post_to_ledger, post_ledger_entries
+
+
+def build_database(seed=13):
+    """Transactions with repeats, zero amounts and some entries already posted"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(seed)
+    start = date(2024, 4, 6)
+
+    for i in range(300):
+        day = start + timedelta(days=rng.randrange(365))
+        description = rng.choice(['CLIENT A', 'CLIENT B', 'TESCO', 'SHELL', 'ADOBE'])
+        amount = rng.choice([0.0, 12.5, 40.0, 99.99, float(rng.randrange(1, 500))])
+        session.add(Transaction(date=day, description=description, notes=rng.choice([None, 'note']),
+                                paid_in=amount if i % 2 else 0.0, paid_out=0.0 if i % 2 else amount))
+    session.commit()
+
+    # Some transactions are already in the ledgers
+    for txn in session.query(Transaction).filter(Transaction.id % 7 == 0).all():
+        if txn.paid_in > 0:
+            session.add(Income(date=txn.date, source=txn.description, amount_gross=txn.paid_in, income_type='Other'))
+        elif txn.paid_out > 0:
+            session.add(Expense(date=txn.date, supplier=txn.description, amount=txn.paid_out, category='Travel'))
+    session.commit()
+    return session
+
+
+def ledger_contents(session):
+    """Ledger rows as comparable sorted lists"""
+    income = sorted((r.date, r.source, r.amount_gross, r.income_type, r.description)
+                    for r in session.query(Income).all())
+    expenses = sorted((r.date, r.supplier, r.amount, r.category, r.description)
+                      for r in session.query(Expense).all())
+    return income, expenses
+
+
+def post_one_by_one(transactions, category, txn_type, session):
+    """Original bulk_post_to_ledger loop"""
+    success_count, failure_count, errors = 0, 0, []
+    for txn in transactions:
+        success, error = post_transaction_to_ledger(txn, category, txn_type, session)
+        if success:
+            success_count += 1
+        else:
+            failure_count += 1
+            errors.append(f"Transaction {txn.id}: {error}")
+    return success_count, failure_count, errors
+
+
+def test_matches_per_transaction_posting():
+    """Counts, errors and ledger rows equal the per-transaction path"""
+    results = []
+    for poster in (post_one_by_one, bulk_post_to_ledger):
+        session = build_database()
+        try:
+            transactions = session.query(Transaction).order_by(Transaction.id).all()
+            counts = [
+                poster(transactions, 'Self-employment', 'Income', session),
+                poster(transactions, None, 'Expense', session),
+            ]
+            session.commit()
+            results.append((counts, ledger_contents(session)))
+        finally:
+            session.close()
+
+    assert results[0] == results[1]
+    (income_counts, expense_counts), _ = results[1]
+    assert income_counts[0] > 0 and income_counts[1] > 0
+    print(f"✓ Set-based posting matches per-transaction posting ({income_counts[0]} income successes)")
+
+
+def test_statement_count_is_fixed():
+    """Posting issues one duplicate query and one insert per ledger"""
+    session = build_database()
+    try:
+        transactions = session.query(Transaction).all()
+        statements = []
+        engine = session.get_bind()
+        event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        post_ledger_entries(
+            [(txn, None, 'Income' if txn.paid_in > 0 else 'Expense') for txn in transactions], session
+        )
+
+        selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+        inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT INTO INCOME')
+                   or s.lstrip().upper().startswith('INSERT INTO EXPENSES')]
+        assert len(selects) == 2, len(selects)
+        assert len(inserts) <= 2, len(inserts)
+        print(f"✓ {len(transactions)} transactions posted with {len(statements)} statements")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all ledger posting tests"""
+    print("\n" + "=" * 60)
+    print("LEDGER POSTING - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_matches_per_transaction_posting()
+        test_statement_count_is_fixed()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
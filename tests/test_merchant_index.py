@@ -0,0 +1,147 @@
+"""
+Test Script for the indexed merchant matcher
+Checks that MerchantIndex returns the same matches and suggestions as a
+full scan over MERCHANT_DATA
+"""
+
+import sys
+import os
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.merchant_db import (
+    MERCHANT_DATA, normalize_string, fuzzy_match_score,
+    find_merchant_match, get_merchant_suggestions, match_many
+)
+
+
+def _reference_scores(description):
+    """The original full scan: (merchant, raw score, adjusted score) per merchant"""
+    normalized_desc = normalize_string(description)
+    scored = []
+
+    for merchant in MERCHANT_DATA:
+        merchant_name = normalize_string(merchant["name"])
+        score = fuzzy_match_score(normalized_desc, merchant_name)
+        if merchant_name in normalized_desc:
+            score = max(score, 90.0)
+
+        for alias in merchant.get("aliases", []):
+            alias_normalized = normalize_string(alias)
+            alias_score = fuzzy_match_score(normalized_desc, alias_normalized)
+            if alias_normalized in normalized_desc:
+                alias_score = max(alias_score, 90.0)
+            score = max(score, alias_score)
+
+        scored.append((merchant, score, min(100.0, score + merchant.get("confidence_boost", 0))))
+
+    return scored
+
+
+def reference_find_match(description, confidence_threshold=60.0):
+    if not description:
+        return None
+
+    best_match = None
+    best_score = 0.0
+    for merchant, score, adjusted_score in _reference_scores(description):
+        if score >= confidence_threshold and adjusted_score > best_score:
+            best_score = adjusted_score
+            best_match = {**merchant, "match_confidence": round(adjusted_score, 1),
+                          "original_score": round(score, 1)}
+
+    return best_match if best_score >= confidence_threshold else None
+
+
+def reference_suggestions(description, top_n=3):
+    if not description:
+        return []
+
+    matches = [{**merchant, "match_confidence": round(adjusted_score, 1), "original_score": round(score, 1)}
+               for merchant, score, adjusted_score in _reference_scores(description)]
+    matches.sort(key=lambda x: x["match_confidence"], reverse=True)
+    return matches[:top_n]
+
+
+def sample_descriptions():
+    """Real-looking bank descriptions plus noisy variants of merchant names"""
+    descriptions = [
+        'TESCO STORES 2341', 'CARD PAYMENT TO AMAZON.CO.UK', 'SAINSBURYS S/MKTS', 'BP CONNECT 44',
+        'DIRECT DEBIT EE LIMITED', 'H&M HENNES', 'B&Q WAREHOUSE', 'UBER *TRIP', 'NETFLIX.COM',
+        'PAYPAL *EBAY', 'SHELL 1234 LONDON', 'RANDOM LOCAL CAFE', 'FASTER PAYMENT JOHN SMITH',
+        '', '   ', '***', 'Straße Café', 'O2 UK', 'BT GROUP PLC', 'X',
+    ]
+
+    random.seed(3)
+    names = [m["name"] for m in MERCHANT_DATA]
+    for _ in range(40):
+        name = random.choice(names)
+        noise = random.choice(['CARD PAYMENT TO ', 'DD ', '', 'POS ', 'CONTACTLESS '])
+        suffix = random.choice(['', ' LTD', ' 1234', ' LONDON GB', ' ON 12 MAR'])
+        text = noise + name.upper() + suffix
+        if random.random() < 0.3 and len(text) > 4:
+            cut = random.randrange(len(text))
+            text = text[:cut] + text[cut + 1:]
+        descriptions.append(text)
+
+    return descriptions
+
+
+def test_find_match_matches_full_scan():
+    """find_merchant_match agrees with the full scan at several thresholds"""
+    for description in sample_descriptions():
+        for threshold in (0.0, 60.0, 85.0):
+            expected = reference_find_match(description, threshold)
+            actual = find_merchant_match(description, threshold)
+            assert actual == expected, f"{description!r} @ {threshold}: {actual} != {expected}"
+
+    print("✓ find_merchant_match matches the full scan")
+
+
+def test_suggestions_match_full_scan():
+    """get_merchant_suggestions returns the same merchants in the same order"""
+    for description in sample_descriptions():
+        for top_n in (1, 3, 0, -2):
+            expected = reference_suggestions(description, top_n)
+            actual = get_merchant_suggestions(description, top_n)
+            assert actual == expected, f"{description!r} top {top_n}"
+
+    print("✓ get_merchant_suggestions matches the full scan")
+
+
+def test_match_many():
+    """match_many returns one result per description, duplicates included"""
+    descriptions = ['TESCO STORES 2341', 'UNKNOWN', 'TESCO STORES 2341', None]
+
+    results = match_many(descriptions)
+
+    assert len(results) == 4
+    assert results[0] == find_merchant_match('TESCO STORES 2341')
+    assert results[0] == results[2] and results[0] is not results[2]
+    assert results[3] is None
+    print("✓ match_many aligns results with descriptions")
+
+
+def run_all_tests():
+    """Run all merchant index tests"""
+    print("\n" + "=" * 60)
+    print("MERCHANT INDEX - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_find_match_matches_full_scan()
+        test_suggestions_match_full_scan()
+        test_match_many()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+"""
+Test Script for the unified merchant lookup
+Covers lookup order, cache invalidation and batched usage tracking
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import init_db, Merchant
+from merchant_lookup import get_merchant_lookup
+from components.merchant_db import init_merchant_database
+from components.merchant_management import add_custom_merchant, update_merchant
+
+
+def setup_session():
+    """Create an empty in-memory database"""
+    engine, Session = init_db(':memory:')
+    return Session()
+
+
+def test_lookup_order():
+    """Merchants table first, static lists as fallback"""
+    session = setup_session()
+    try:
+        lookup = get_merchant_lookup(session)
+
+        # Empty merchants table: MERCHANT_DATA is used
+        resolution = lookup.resolve('CARD PAYMENT TO TESCO STORES 2341')
+        assert resolution.source == 'catalogue' and resolution.name == 'TESCO'
+        assert resolution.merchant_id is None
+
+        # Keyword list catches what the catalogue does not
+        resolution = lookup.resolve('DWP UC PAYMENT')
+        assert resolution.source == 'keywords' and resolution.category == 'Government Benefits'
+
+        # Short names only match whole words
+        resolution = lookup.resolve('BANK FEES')
+        assert resolution is None or resolution.name != 'EE'
+
+        init_merchant_database(session, Merchant)
+        resolution = lookup.resolve('CARD PAYMENT TO TESCO STORES 2341')
+        assert resolution.source == 'database' and resolution.merchant_id is not None
+
+        assert lookup.categorization_confidence('') == (True, 'Unknown', 0, 'Unknown')
+        print("✓ Lookup checks the merchants table, then the static lists")
+    finally:
+        session.close()
+
+
+def test_cache_invalidated_on_edit():
+    """Editing a merchant through merchant_management refreshes the cache"""
+    session = setup_session()
+    try:
+        merchant = add_custom_merchant(session, 'ACME WIDGETS', ['ACMEW'], 'Office costs', 'Expense',
+                                       False, 'Retail', 10)
+        lookup = get_merchant_lookup(session)
+
+        assert lookup.resolve('ACMEW ORDER 55').category == 'Office costs'
+
+        update_merchant(session, merchant.id, default_category='Travel')
+        assert lookup.resolve('ACMEW ORDER 55').category == 'Travel'
+        print("✓ Merchant edits invalidate cached lookups")
+    finally:
+        session.close()
+
+
+def test_usage_written_in_one_batch():
+    """Usage counts build up in memory and are written by flush_usage"""
+    session = setup_session()
+    try:
+        merchant = add_custom_merchant(session, 'ACME WIDGETS', [], 'Office costs', 'Expense',
+                                       False, 'Retail', 10)
+        lookup = get_merchant_lookup(session)
+
+        for _ in range(3):
+            lookup.resolve('ACME WIDGETS LONDON')
+        lookup.resolve('ACME WIDGETS LONDON', record_usage=False)
+
+        session.refresh(merchant)
+        assert merchant.usage_count == 0
+
+        assert lookup.flush_usage() == 1
+        session.commit()
+        session.refresh(merchant)
+        assert merchant.usage_count == 3
+        assert merchant.last_used_date is not None
+        print("✓ Usage counts are flushed in one batch")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all merchant lookup tests"""
+    print("\n" + "=" * 60)
+    print("MERCHANT LOOKUP - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_lookup_order()
+        test_cache_invalidated_on_edit()
+        test_usage_written_in_one_batch()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,123 @@
+"""
+Test Script for the monthly ledger rollup
+Random inserts, edits and deletes on the ledgers must leave monthly_rollup
+equal to a rebuild from scratch and to per-month sums over the ledgers
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from models import init_db, Income, Expense, Mileage, Donation, MonthlyRollup
+from monthly_rollup import monthly_totals, rebuild_monthly_rollup, tax_year_months
+
+
+def rollup_snapshot(session):
+    """Rollup rows as a comparable dict"""
+    return {
+        (r.tax_year, r.month, r.ledger, r.category): (round(r.amount, 6), round(r.tax_deducted, 6),
+                                                      round(r.miles, 6), r.entry_count)
+        for r in session.query(MonthlyRollup).all()
+    }
+
+
+def random_writes(session, rng, rounds=300):
+    """Insert, edit and delete ledger rows through the ORM, bulk updates and SQL"""
+    start = date(2023, 3, 1)
+    for _ in range(rounds):
+        day = start + timedelta(days=rng.randrange(800))
+        action = rng.random()
+        if action < 0.55:
+            session.add(rng.choice([
+                Income(date=day, source='Client', amount_gross=rng.uniform(10, 900),
+                       tax_deducted=rng.choice([0.0, 20.0]), income_type=rng.choice(['Self-employment', 'Other'])),
+                Expense(date=day, supplier='Shop', amount=rng.uniform(1, 300),
+                        category=rng.choice(['Travel', 'Office costs'])),
+                Mileage(date=day, purpose='Visit', miles=rng.uniform(1, 80), allowable_amount=rng.uniform(1, 36)),
+                Donation(date=day, charity='Charity', amount_paid=rng.uniform(5, 50), gift_aid=rng.random() < 0.5),
+            ]))
+        elif action < 0.75:
+            record = session.query(Expense).order_by(Expense.id.desc()).first()
+            if record:
+                record.amount = rng.uniform(1, 300)
+                record.date = day
+                record.category = rng.choice(['Travel', 'Office costs'])
+        elif action < 0.85:
+            record = session.query(Income).first()
+            if record:
+                session.delete(record)
+        elif action < 0.92:
+            session.query(Mileage).filter(Mileage.miles > 70).update({'allowable_amount': 31.5})
+        else:
+            session.execute(text('UPDATE donations SET gift_aid = NOT gift_aid WHERE id % 3 = 0'))
+        session.commit()
+
+
+def test_rollup_matches_rebuild():
+    """Trigger-maintained rollup equals a rebuild from the ledgers"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        random_writes(session, random.Random(3))
+        maintained = rollup_snapshot(session)
+
+        rebuild_monthly_rollup(session)
+        session.commit()
+
+        assert maintained == rollup_snapshot(session)
+        print(f"✓ Incrementally maintained rollup matches a rebuild ({len(maintained)} buckets)")
+    finally:
+        session.close()
+
+
+def test_monthly_totals():
+    """monthly_totals agrees with summing the ledger in Python"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        random_writes(session, random.Random(8))
+
+        expected = {}
+        for record in session.query(Expense).all():
+            month = record.date.strftime('%Y-%m')
+            expected[month] = expected.get(month, 0) + record.amount
+        totals = monthly_totals(session, 'expense')
+        assert list(totals['month']) == sorted(expected)
+        assert all(abs(a - expected[m]) < 1e-6 for m, a in zip(totals['month'], totals['amount']))
+
+        year_totals = monthly_totals(session, 'income', '2024/25')
+        assert list(year_totals['month'][:12]) == tax_year_months('2024/25')
+        in_year = [r for r in session.query(Income).all() if date(2024, 4, 6) <= r.date <= date(2025, 4, 5)]
+        assert abs(year_totals['amount'].sum() - sum(r.amount_gross for r in in_year)) < 1e-6
+        assert year_totals['entry_count'].sum() == len(in_year)
+        print("✓ Monthly totals match per-month sums over the ledgers")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all monthly rollup tests"""
+    print("\n" + "=" * 60)
+    print("MONTHLY ROLLUP - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_rollup_matches_rebuild()
+        test_monthly_totals()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
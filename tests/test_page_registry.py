@@ -0,0 +1,100 @@
+"""
+Test Script for the lazy page registry
+Every navigation entry must point at a real render function, app.py must not
+import page modules or the heavy components at startup, and -X importtime
+output must parse into timings
+"""
+
+import sys
+import os
+import ast
+import subprocess
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from page_registry import PAGES, PAGE_NAMES, parse_importtime, startup_modules, import_profile
+
+# Modules whose dependencies (plotly figures, openpyxl, reportlab, OCR) only some pages need
+HEAVY_MODULES = [
+    'components.ocr_receipt', 'components.batch_receipt_upload', 'components.compliance_reports',
+    'components.export_manager', 'components.ui.charts', 'components.ui.advanced_charts',
+]
+
+
+def test_pages_resolve():
+    """Each page's module defines its render function (checked without importing it)"""
+    assert len(set(PAGE_NAMES)) == len(PAGES)
+    for page in PAGES:
+        with open(os.path.join(PROJECT_ROOT, f'{page.module}.py'), encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        functions = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+        assert page.function in functions, page
+    print(f"✓ All {len(PAGES)} pages resolve to render functions")
+
+
+def test_startup_imports_no_pages():
+    """app.py imports no page module and no heavy component at top level"""
+    modules = startup_modules()
+    assert 'page_registry' in modules
+    for page in PAGES:
+        assert page.module not in modules, page.module
+    for module in HEAVY_MODULES:
+        assert module not in modules, module
+    print(f"✓ app.py imports {len(modules)} modules at startup, none of them pages")
+
+
+def test_component_packages_lazy():
+    """Importing one component does not pull in the others"""
+    code = ("import sys; import components.ui.theme, components.audit_trail, components.merchant_management; "
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-500:]
+    assert result.stdout.strip() == '[]', result.stdout
+
+    import components.ui
+    assert callable(components.ui.render_stat_card)
+    assert 'render_stat_card' in dir(components.ui)
+    print("✓ Component packages load submodules on first use")
+
+
+def test_parse_importtime():
+    """Header skipped, nesting depth read from indentation"""
+    output = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       412 |       1290 |   pandas.core
+import time:       663 |       1953 | pandas
+"""
+    timings = parse_importtime(output)
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ('_io', 120, 120, 2), ('pandas.core', 412, 1290, 1), ('pandas', 663, 1953, 0)]
+
+    profile = import_profile(['json', 'no_such_module_here'])
+    assert any(t.module == 'json' for t in profile['slowest'])
+    assert profile['errors'] and profile['errors'][0].startswith('no_such_module_here')
+    print(f"✓ Import profile parsed ({profile['module_count']} modules, {profile['total_ms']:.1f} ms)")
+
+
+def run_all_tests():
+    """Run all page registry tests"""
+    print("\n" + "=" * 60)
+    print("PAGE REGISTRY - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_pages_resolve()
+        test_startup_imports_no_pages()
+        test_component_packages_lazy()
+        test_parse_importtime()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
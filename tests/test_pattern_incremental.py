@@ -0,0 +1,164 @@
+"""
+Test Script for incremental pattern analysis
+Checks that updating stored pattern groups batch by batch gives the same
+results as analysing the whole history at once
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+
+# Add project root and scripts to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
+
+from models import init_db, Transaction, PatternGroupStats
+from pattern_analyzer import PatternAnalyzer, PatternGroupIndex, find_group, PatternType
+
+
+def setup_session():
+    """Create an empty in-memory database"""
+    engine, Session = init_db(':memory:')
+    return Session()
+
+
+def add_history(session, months, first_month=0):
+    """Monthly subscription, weekly coffee and one-off purchases over N months"""
+    transactions = []
+    start = date(2024, 1, 5)
+
+    for month in range(first_month, first_month + months):
+        transactions.append(Transaction(date=start + timedelta(days=30 * month), description=f'NETFLIX.COM {1000 + month}',
+                                        paid_out=10.99, paid_in=0.0))
+        for week in range(4):
+            transactions.append(Transaction(date=start + timedelta(days=30 * month + 7 * week), description='COSTA COFFEE',
+                                            paid_out=3.2 + 0.1 * week, paid_in=0.0))
+        transactions.append(Transaction(date=start + timedelta(days=30 * month + 3), description=f'SHOP NUMBER {month}',
+                                        paid_out=25.0, paid_in=0.0))
+
+    session.add_all(transactions)
+    session.flush()
+    return transactions
+
+
+def summarize(results, transactions):
+    """Primary pattern, confidence and group size per transaction"""
+    summary = []
+    for txn in transactions:
+        result = results[txn.id]
+        primary = result.primary_pattern
+        summary.append((
+            primary.pattern_type if primary else None,
+            result.pattern_confidence,
+            primary.metadata.get('occurrences') if primary else None,
+        ))
+    return summary
+
+
+def test_incremental_matches_full_analysis():
+    """Stored groups updated with the last month match a full re-analysis"""
+    session = setup_session()
+    try:
+        history = add_history(session, 5)
+        analyzer = PatternAnalyzer(session)
+        analyzer.rebuild_pattern_store(history)
+
+        new_month = add_history(session, 1, first_month=5)
+        incremental = analyzer.analyze_incremental(new_month)
+
+        full = PatternAnalyzer(session).analyze_all_transactions(history + new_month)
+
+        assert summarize(incremental, new_month) == summarize(full, new_month)
+        print("✓ Incremental analysis matches a full re-analysis")
+    finally:
+        session.close()
+
+
+def test_batches_are_not_counted_twice():
+    """Analysing the same batch again leaves the stored statistics unchanged"""
+    session = setup_session()
+    try:
+        history = add_history(session, 3)
+        analyzer = PatternAnalyzer(session)
+
+        analyzer.analyze_incremental(history)  # Seeds the store from the database
+        before = {(g.pattern_group_id, g.occurrences) for g in session.query(PatternGroupStats)}
+
+        analyzer.analyze_incremental(history[-6:])
+        after = {(g.pattern_group_id, g.occurrences) for g in session.query(PatternGroupStats)}
+
+        assert before == after
+        print("✓ Re-analysed transactions are not double counted")
+    finally:
+        session.close()
+
+
+def test_out_of_order_batch_rebuilds_group():
+    """A transaction dated inside a group's range triggers an exact rebuild"""
+    session = setup_session()
+    try:
+        coffees = [Transaction(date=date(2024, 1, 1) + timedelta(days=14 * i), description='COSTA COFFEE',
+                               paid_out=3.0, paid_in=0.0) for i in (0, 2, 3, 4)]
+        session.add_all(coffees)
+        session.flush()
+
+        analyzer = PatternAnalyzer(session)
+        analyzer.rebuild_pattern_store(coffees)
+
+        late = Transaction(date=date(2024, 1, 15), description='COSTA COFFEE', paid_out=3.0, paid_in=0.0)
+        session.add(late)
+        session.flush()
+        results = analyzer.analyze_incremental([late])
+
+        metadata = results[late.id].primary_pattern.metadata
+        assert results[late.id].primary_pattern.pattern_type == PatternType.RECURRING_PAYMENT
+        assert metadata['occurrences'] == 5 and metadata['frequency_days'] == 14
+
+        stored = session.query(PatternGroupStats).filter_by(
+            pattern_group_id=metadata['group_id']).one()
+        assert stored.interval_count == 4 and stored.interval_m2 == 0.0
+        print("✓ Out-of-order transactions rebuild the group exactly")
+    finally:
+        session.close()
+
+
+def test_group_index_matches_linear_scan():
+    """PatternGroupIndex.find returns the same group as a list scan"""
+    session = setup_session()
+    try:
+        history = add_history(session, 4)
+        groups = PatternAnalyzer(session).detectors[3].detect_patterns(history)
+        index = PatternGroupIndex(groups)
+
+        for group in groups:
+            assert find_group(index, group.pattern_type, group.description_normalized) is \
+                find_group(list(groups), group.pattern_type, group.description_normalized)
+        assert find_group(index, PatternType.RECURRING_PAYMENT, 'MISSING') is None
+        print("✓ Group index lookup matches a linear scan")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all incremental pattern analysis tests"""
+    print("\n" + "=" * 60)
+    print("INCREMENTAL PATTERN ANALYSIS - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_incremental_matches_full_analysis()
+        test_batches_are_not_counted_twice()
+        test_out_of_order_batch_rebuilds_group()
+        test_group_index_matches_linear_scan()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,220 @@
+"""
+Test Script for set-based review actions
+Bulk Mark Reviewed / Mark Personal / Apply Category must change the same
+rows as the old per-id loops, in a fixed number of statements, with
+undoable audit entries and ledger postings
+"""
+
+import sys
+import os
+import json
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from models import init_db, Transaction, Income, Expense, AuditLog
+from transaction_queries import UNREVIEWED, TransactionFilter
+from review_actions import Selection, mark_reviewed, mark_personal, apply_category
+from components.audit_trail import MAX_UNDO_STACK, undo_last_action
+
+
+def build_database(count=3000):
+    """Unreviewed money in and out, some already reviewed"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(24)
+    for i in range(count):
+        paid_in = rng.choice([0.0, 0.0, 0.0, 250.0])
+        session.add(Transaction(
+            date=date(2024, 4, 6) + timedelta(days=rng.randrange(300)),
+            description=rng.choice(['TESCO STORES', 'CLIENT PAYMENT', 'SHELL FUEL', 'ADOBE']) + f' {i % 50}',
+            paid_in=paid_in, paid_out=0.0 if paid_in else rng.choice([4.99, 12.5, 80.0]),
+            notes=rng.choice([None, 'card']), reviewed=rng.random() < 0.2, is_personal=False,
+        ))
+    session.commit()
+    return engine, session
+
+
+class StatementCounter:
+    """Counts SQL statements sent to the database"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def snapshot(session):
+    return {t.id: (t.reviewed, t.is_personal, t.guessed_category, t.guessed_type)
+            for t in session.query(Transaction)}
+
+
+def test_select_all_matches_loop():
+    """Acting on every match updates exactly the rows the per-id loop did"""
+    engine, session = build_database()
+    expected_engine, expected_session = build_database()
+    try:
+        conditions = UNREVIEWED + TransactionFilter(amount_max=50.0).conditions()
+
+        # The old path: load every id, then update each transaction
+        ids = [txn_id for (txn_id,) in expected_session.query(Transaction.id).filter(*conditions)]
+        for txn_id in ids:
+            txn = expected_session.get(Transaction, txn_id)
+            txn.is_personal = True
+            txn.reviewed = True
+        expected_session.commit()
+
+        counter = StatementCounter(engine)
+        result = mark_personal(session, Selection.matching(conditions))
+        session.commit()
+
+        assert result.updated == len(ids) > 1000
+        assert snapshot(session) == snapshot(expected_session)
+        assert counter.count <= 6, counter.count
+        print(f"✓ Marked {result.updated} matches personal in {counter.count} statements")
+    finally:
+        session.close()
+        expected_session.close()
+
+
+def test_audit_entries_undo():
+    """A bulk action is one audit entry that undo restores in full"""
+    engine, session = build_database(200)
+    try:
+        ids = [txn_id for (txn_id,) in session.query(Transaction.id).filter(*UNREVIEWED).limit(30)]
+        result = mark_reviewed(session, Selection.of_ids(ids))
+        session.commit()
+        assert result.updated == 30
+
+        entries = session.query(AuditLog).all()
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry.action_type == 'BULK_UPDATE' and entry.record_id == min(ids)
+        old_values, new_values = json.loads(entry.old_values), json.loads(entry.new_values)
+        assert set(old_values) == {str(txn_id) for txn_id in ids}
+        assert all(values == {'reviewed': False} for values in old_values.values())
+        assert all(values == {'reviewed': True} for values in new_values.values())
+
+        success, message = undo_last_action(session)
+        assert success, message
+        assert session.query(Transaction).filter(Transaction.id.in_(ids), Transaction.reviewed == True).count() == 0
+        assert session.query(AuditLog).count() == 0
+
+        # Nothing matching writes no entry
+        mark_reviewed(session, Selection.of_ids([]))
+        session.commit()
+        assert session.query(AuditLog).count() == 0
+        print("✓ A bulk action is one audit entry and undo restores every record")
+    finally:
+        session.close()
+
+
+def test_undo_large_selection():
+    """Selections over MAX_UNDO_STACK rows survive the trim and undo completely"""
+    engine, session = build_database(600)
+    try:
+        before = snapshot(session)
+        conditions = list(UNREVIEWED)
+        selection_size = session.query(Transaction).filter(*conditions).count()
+        assert selection_size > MAX_UNDO_STACK
+
+        result = apply_category(session, Selection.matching(conditions), 'Travel', post_to_ledgers=False)
+        session.commit()
+        assert result.updated > MAX_UNDO_STACK and result.skipped > 0
+        mark_personal(session, Selection.matching([Transaction.description.like('TESCO%')]))
+        session.commit()
+        assert session.query(AuditLog).count() == 2
+
+        # Undo the personal marking, then the categorization
+        for _ in range(2):
+            success, message = undo_last_action(session)
+            assert success, message
+        session.expire_all()
+        assert snapshot(session) == before
+        assert session.query(AuditLog).count() == 0
+        print(f"✓ Undid a bulk categorization of {selection_size} transactions in one step")
+    finally:
+        session.close()
+
+
+def test_apply_category_posts_ledgers():
+    """Categories apply to the matching direction only, and business rows are posted once"""
+    engine, session = build_database(400)
+    try:
+        conditions = UNREVIEWED + [Transaction.description.like('CLIENT%') | Transaction.description.like('ADOBE%')]
+        selection = Selection.matching(conditions)
+        rows = session.query(Transaction.id, Transaction.paid_in).filter(*conditions).all()
+        money_in = {txn_id for txn_id, paid_in in rows if paid_in > 0}
+        money_out = {txn_id for txn_id, paid_in in rows if not paid_in > 0}
+        personal = set(sorted(money_out)[:5]) | set(sorted(money_in)[:5])
+        session.query(Transaction).filter(Transaction.id.in_(personal)).update({'is_personal': True})
+        session.commit()
+
+        counter = StatementCounter(engine)
+        result = apply_category(session, selection, 'Stock/Materials')
+        session.commit()
+        statements = counter.count
+
+        business_out = len(money_out - personal)
+        assert result.updated == len(money_out) and result.skipped == len(money_in), result
+        assert result.posted == business_out and not result.errors, result
+        assert statements <= 10, statements
+        assert session.query(Income).count() == 0 and session.query(Expense).count() == business_out
+        categorized = session.query(Transaction).filter(Transaction.guessed_category == 'Stock/Materials').all()
+        assert {t.id for t in categorized} == money_out
+        assert all(t.reviewed and t.guessed_type == 'Expense' for t in categorized)
+        assert {t.id for t in categorized if t.is_personal} == personal & money_out
+
+        # Money in is still unreviewed; an income type picks it up
+        result = apply_category(session, Selection.matching(conditions), 'Self-employment')
+        session.commit()
+        assert result.updated == len(money_in) and result.skipped == 0
+        assert session.query(Income).count() == result.posted == len(money_in - personal)
+        assert {i.income_type for i in session.query(Income)} == {'Self-employment'}
+
+        # Categories in both lists need the type spelled out
+        try:
+            apply_category(session, selection, 'Interest')
+            assert False, "'Interest' is both an income type and an expense category"
+        except ValueError:
+            pass
+
+        # Repeating it posts nothing new
+        ledger_rows = session.query(Income).count() + session.query(Expense).count()
+        result = apply_category(session, Selection.of_ids(money_in), 'Interest', txn_type='Income')
+        session.commit()
+        assert result.updated == len(money_in) and not result.errors
+        assert session.query(Income).count() + session.query(Expense).count() == ledger_rows
+        print(f"✓ Categorized {len(rows)} transactions by direction and posted them in {statements} statements")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all review action tests"""
+    print("\n" + "=" * 60)
+    print("BULK REVIEW ACTIONS - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_select_all_matches_loop()
+        test_audit_entries_undo()
+        test_undo_large_selection()
+        test_apply_category_posts_ledgers()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
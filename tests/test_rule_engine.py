@@ -0,0 +1,160 @@
+"""
+Test Script for the compiled RuleEngine
+Checks that the engine picks the same rule as the original per-rule loop
+"""
+
+import sys
+import os
+import re
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from models import Rule
+from rule_engine import RuleEngine
+
+
+def reference_apply_rules(description, paid_in, paid_out, rules):
+    """The original apply_rules loop, kept here as the reference behaviour"""
+    sorted_rules = sorted([r for r in rules if r.enabled], key=lambda x: x.priority)
+
+    for rule in sorted_rules:
+        match = False
+
+        if rule.match_mode == 'Contains':
+            match = rule.text_to_match.lower() in description.lower()
+        elif rule.match_mode == 'Equals':
+            match = rule.text_to_match.lower() == description.lower()
+        elif rule.match_mode == 'Starts with':
+            match = description.lower().startswith(rule.text_to_match.lower())
+        elif rule.match_mode == 'Ends with':
+            match = description.lower().endswith(rule.text_to_match.lower())
+        elif rule.match_mode == 'Regex':
+            try:
+                match = bool(re.search(rule.text_to_match, description, re.IGNORECASE))
+            except re.error:
+                continue
+
+        if match:
+            guessed_category = None
+            if rule.map_to == 'Income':
+                guessed_category = rule.income_type
+            elif rule.map_to == 'Expense':
+                guessed_category = rule.expense_category
+            return rule.map_to, guessed_category, rule.is_personal
+
+    if paid_in > 0:
+        return 'Income', 'Self-employment', False
+    elif paid_out > 0:
+        return 'Expense', 'Other business expenses', False
+    return None, None, False
+
+
+def build_rules():
+    """A rule set with overlapping keywords, ties, regexes and disabled rules"""
+    return [
+        Rule(match_mode='Contains', text_to_match='TESCO', map_to='Ignore', is_personal=True, priority=25, enabled=True),
+        Rule(match_mode='Contains', text_to_match='TESCO PETROL', map_to='Expense', expense_category='Travel',
+             is_personal=False, priority=25, enabled=True),
+        Rule(match_mode='Contains', text_to_match='EE', map_to='Expense', expense_category='Phone',
+             is_personal=False, priority=20, enabled=True),
+        Rule(match_mode='Equals', text_to_match='client payment', map_to='Income', income_type='Self-employment',
+             is_personal=False, priority=5, enabled=True),
+        Rule(match_mode='Regex', text_to_match=r'^UBER\s+\*?TRIP', map_to='Expense', expense_category='Travel',
+             is_personal=False, priority=1, enabled=True),
+        Rule(match_mode='Regex', text_to_match=r'([unclosed', map_to='Ignore', is_personal=True, priority=0,
+             enabled=True),
+        Rule(match_mode='Contains', text_to_match='a.b*c', map_to='Ignore', is_personal=True, priority=15,
+             enabled=True),
+        Rule(match_mode='Contains', text_to_match='NETFLIX', map_to='Ignore', is_personal=True, priority=1,
+             enabled=False),
+        Rule(match_mode='Contains', text_to_match='INTEREST', map_to='Income', income_type='Interest',
+             is_personal=False, priority=30, enabled=True),
+        Rule(match_mode='Starts with', text_to_match='AMAZON', map_to='Expense', expense_category='Office costs',
+             is_personal=False, priority=10, enabled=True),
+        Rule(match_mode='Starts with', text_to_match='AMAZON PRIME', map_to='Ignore', is_personal=True,
+             priority=10, enabled=True),
+        Rule(match_mode='Ends with', text_to_match='.CO.UK', map_to='Expense', expense_category='Office costs',
+             is_personal=False, priority=12, enabled=True),
+        Rule(match_mode='Ends with', text_to_match='LTD', map_to='Income', income_type='Self-employment',
+             is_personal=False, priority=40, enabled=True),
+    ]
+
+
+def test_engine_matches_reference():
+    """RuleEngine.classify agrees with the original loop on varied descriptions"""
+    rules = build_rules()
+    engine = RuleEngine(rules)
+
+    descriptions = [
+        'TESCO STORES 1234', 'TESCO PETROL 99', 'FEES AND CHARGES', 'CLIENT PAYMENT', 'client payment ltd',
+        'UBER *TRIP HELP.UBER.COM', 'uber trip', 'PAY UBER TRIP', 'A.B*C SHOP', 'abxbc', 'NETFLIX.COM',
+        'BANK INTEREST', '', 'Straße Café', 'random shop', 'AMAZON MARKETPLACE', 'amazon prime video',
+        'PAY AMAZON', 'SHOP.CO.UK', 'shop.co.uk refund', 'client payment ltd', 'LTD', 'AMAZON.CO.UK',
+    ]
+
+    for description in descriptions:
+        for paid_in, paid_out in ((0.0, 10.0), (10.0, 0.0), (0.0, 0.0)):
+            expected = reference_apply_rules(description, paid_in, paid_out, rules)
+            assert engine.classify(description, paid_in, paid_out) == expected, description
+
+    print("✓ RuleEngine.classify matches the reference loop")
+
+
+def test_classify_series_matches_classify():
+    """classify_series gives the same answers as classify, row by row"""
+    rules = build_rules()
+    engine = RuleEngine(rules)
+
+    random.seed(7)
+    words = ['TESCO', 'PETROL', 'EE', 'UBER', 'TRIP', 'CLIENT', 'PAYMENT', 'SHOP', 'INTEREST', 'A.B*C',
+             'AMAZON', 'PRIME', 'LTD', 'SHOP.CO.UK']
+    descriptions = pd.Series([' '.join(random.sample(words, 3)) for _ in range(500)])
+    paid_in = pd.Series([random.choice([0.0, 12.5]) for _ in range(500)])
+    paid_out = pd.Series([random.choice([0.0, 3.2]) for _ in range(500)])
+
+    result = engine.classify_series(descriptions, paid_in, paid_out)
+
+    for i in range(len(descriptions)):
+        expected = engine.classify(descriptions[i], paid_in[i], paid_out[i])
+        actual = (result['guessed_type'][i], result['guessed_category'][i], result['is_personal'][i])
+        assert actual == expected, descriptions[i]
+
+    print("✓ classify_series matches classify")
+
+
+def test_matching_rules_in_priority_order():
+    """matching_rules lists every match, winner first"""
+    engine = RuleEngine(build_rules())
+
+    matches = engine.matching_rules('TESCO PETROL FEES')
+
+    assert [m.text_to_match for m in matches] == ['EE', 'TESCO', 'TESCO PETROL']
+    assert engine.match('TESCO PETROL FEES') is matches[0]
+    print("✓ matching_rules returns matches in priority order")
+
+
+def run_all_tests():
+    """Run all rule engine tests"""
+    print("\n" + "=" * 60)
+    print("RULE ENGINE - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_engine_matches_reference()
+        test_classify_series_matches_classify()
+        test_matching_rules_in_priority_order()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
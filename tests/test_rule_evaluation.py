@@ -0,0 +1,142 @@
+"""
+Test Script for SQL rule evaluation
+The SQL predicates must match exactly what RuleEngine matches, and the
+one-pass rule statistics must agree with classifying every transaction
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import init_db, Transaction, Rule
+from rule_engine import RuleEngine
+from rule_evaluation import rule_matches, rule_statistics, apply_rule_to_matches
+
+DESCRIPTIONS = [
+    'TESCO STORES 1234', 'tesco', 'AMAZON MKTPLACE', 'Amazon Prime', 'SHELL 50% OFF', 'SHELL_UK',
+    'ADOBE CREATIVE', 'CLIENT A INVOICE', 'client a', 'PAYPAL *EBAY', 'back\\slash', 'RENT MAY',
+]
+
+RULES = [
+    ('Contains', 'tesco', 5), ('Equals', 'tesco', 1), ('Starts with', 'amazon', 3),
+    ('Ends with', 'prime', 3), ('Contains', '50%', 2), ('Contains', 'l_u', 2),
+    ('Regex', r'^client\s+a', 4), ('Regex', r'[unclosed', 1), ('Contains', '*ebay', 6),
+    ('Contains', 'back\\', 6), ('Contains', 'store', 7), ('Equals', 'nothing', 8),
+]
+
+
+def build_database():
+    """Random transactions and a rule for each match mode, including LIKE wildcards"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(16)
+
+    for i in range(400):
+        session.add(Transaction(date=date(2024, 4, 6) + timedelta(days=rng.randrange(365)),
+                                description=rng.choice(DESCRIPTIONS), paid_out=float(i)))
+    for match_mode, text_to_match, priority in RULES:
+        session.add(Rule(match_mode=match_mode, text_to_match=text_to_match, map_to='Expense',
+                         expense_category='Travel', priority=priority, enabled=True))
+    session.add(Rule(match_mode='Contains', text_to_match='rent', map_to='Ignore', priority=1, enabled=False))
+    session.commit()
+    return session
+
+
+def test_predicates_match_rule_engine():
+    """Each rule's SQL matches equal RuleEngine's matches"""
+    session = build_database()
+    try:
+        transactions = session.query(Transaction).all()
+        for rule in session.query(Rule).filter(Rule.enabled == True).all():
+            engine = RuleEngine([rule])
+            expected = sorted(((t.date, t.id) for t in transactions if engine.match(t.description)), reverse=True)
+
+            results = rule_matches(session, rule, page=0, page_size=1000)
+            assert results.total == len(expected), (rule.text_to_match, results.total, len(expected))
+            assert [(t.date, t.id) for t in results.transactions] == expected, rule.text_to_match
+
+            second = rule_matches(session, rule, page=1, page_size=7)
+            assert [(t.date, t.id) for t in second.transactions] == expected[7:14]
+            assert second.has_more == (len(expected) > 14)
+
+        print("✓ SQL predicates match RuleEngine for every match mode")
+    finally:
+        session.close()
+
+
+def test_statistics_match_classification():
+    """Hits, wins, coverage and shadowed rules agree with RuleEngine winners"""
+    session = build_database()
+    try:
+        rules = session.query(Rule).order_by(Rule.id).all()
+        engine = RuleEngine(rules)
+        transactions = session.query(Transaction).all()
+
+        expected_hits = {r.id: 0 for r in rules if r.enabled}
+        expected_wins = dict(expected_hits)
+        for txn in transactions:
+            for rule in rules:
+                if rule.enabled and RuleEngine([rule]).match(txn.description):
+                    expected_hits[rule.id] += 1
+            winner = engine.match(txn.description)
+            if winner:
+                expected_wins[winner.rule.id] += 1
+
+        stats = rule_statistics(session)
+        assert stats.total_transactions == len(transactions)
+        assert stats.hits == expected_hits
+        assert stats.wins == expected_wins
+        assert 0 < stats.coverage < 100
+
+        shadowed = {r.text_to_match for r in rules if r.id in stats.shadowed}
+        assert shadowed == {'store', 'prime'}, shadowed  # prime ties with amazon and loses on id
+        assert {r.text_to_match for r in rules if r.id in stats.unused} == {'[unclosed', 'nothing'}
+
+        empty = rule_statistics(session, rules=[])
+        assert empty.total_transactions == len(transactions) and empty.coverage == 0.0
+        print(f"✓ Rule statistics match classification ({stats.coverage:.1f}% coverage)")
+    finally:
+        session.close()
+
+
+def test_apply_updates_matches():
+    """Applying a rule updates exactly its matches with one UPDATE"""
+    session = build_database()
+    try:
+        rule = session.query(Rule).filter(Rule.text_to_match == 'amazon').one()
+        expected = rule_matches(session, rule).total
+
+        applied = apply_rule_to_matches(session, rule, {'guessed_type': 'Expense', 'guessed_category': 'Office costs'})
+        session.commit()
+        assert applied == expected
+        assert session.query(Transaction).filter(Transaction.guessed_category == 'Office costs').count() == expected
+        print(f"✓ Rule applied to {applied} matching transactions")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all rule evaluation tests"""
+    print("\n" + "=" * 60)
+    print("RULE EVALUATION - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_predicates_match_rule_engine()
+        test_statistics_match_classification()
+        test_apply_updates_matches()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
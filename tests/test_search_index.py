@@ -0,0 +1,182 @@
+"""
+Test Script for the full-text search index
+Checks the trigger-maintained index agrees with a rebuild and with a
+word-prefix scan of the source tables, and that hits are ranked
+"""
+
+import sys
+import os
+import random
+import re
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from models import init_db, Transaction, Income, Expense
+from search_index import (
+    search_records, search_ids, rebuild_search_index, load_hits, fts_query, install_search_index, SEARCH_SOURCES
+)
+
+WORDS = ['TESCO', 'STORES', 'AMAZON', 'MARKETPLACE', 'SHELL', 'CLIENT', 'INVOICE', 'ADOBE', 'RENT', 'Café']
+
+
+def random_text(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def build_database():
+    """Random records, then edits and deletes through the ORM and raw SQL"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(15)
+    day = date(2024, 4, 6)
+
+    for i in range(200):
+        session.add(Transaction(date=day + timedelta(days=i), description=random_text(rng, 3), paid_out=1.0,
+                                notes=rng.choice([None, random_text(rng, 2)])))
+        session.add(Income(date=day, source=random_text(rng, 2), amount_gross=10.0, income_type='Other',
+                           description=rng.choice([None, random_text(rng, 2)])))
+        session.add(Expense(date=day, supplier=random_text(rng, 1), amount=5.0, category='Travel',
+                            notes=rng.choice([None, random_text(rng, 2)])))
+    session.commit()
+
+    for txn in session.query(Transaction).filter(Transaction.id % 5 == 0).all():
+        txn.description = random_text(rng, 2)
+        txn.notes = None
+    for expense in session.query(Expense).filter(Expense.id % 7 == 0).all():
+        session.delete(expense)
+    session.query(Income).filter(Income.id % 3 == 0).update({'source': 'ADOBE RENT'})
+    session.execute(text("UPDATE expenses SET notes = 'Café tesco' WHERE id % 4 = 1"))
+    session.commit()
+    return session
+
+
+def scan_matches(session, query):
+    """Records where every query word starts some word of the searchable text"""
+    words = [w.lower() for w in re.findall(r'\w+', query)]
+
+    def matches(*fields):
+        tokens = re.findall(r'\w+', ' '.join(f or '' for f in fields).lower().replace('é', 'e'))
+        return all(any(token.startswith(word) for token in tokens) for word in words)
+
+    found = set()
+    for t in session.query(Transaction).all():
+        if matches(t.description, t.description_normalized, t.notes):
+            found.add(('Transaction', t.id))
+    for i in session.query(Income).all():
+        if matches(i.source, i.description, i.notes):
+            found.add(('Income', i.id))
+    for e in session.query(Expense).all():
+        if matches(e.supplier, e.description, e.notes):
+            found.add(('Expense', e.id))
+    return found
+
+
+def test_index_matches_scan():
+    """Triggers keep the index equal to a scan, and to a rebuild"""
+    session = build_database()
+    try:
+        queries = ['tes', 'amazon market', 'ADOBE rent', 'cafe', 'sh', "client's invoice"]
+        before = {q: search_records(session, q, limit=None) for q in queries}
+
+        for q in queries:
+            assert {(h.record_type, h.record_id) for h in before[q]} == scan_matches(session, q), q
+
+        rebuild_search_index(session)
+        session.commit()
+        for q in queries:
+            assert search_records(session, q, limit=None) == before[q], q
+
+        print(f"✓ Index results match a table scan for {len(queries)} queries")
+    finally:
+        session.close()
+
+
+def test_ranking_and_filters():
+    """Names outrank notes; type filters, limits and odd input behave"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        session.add(Expense(date=date(2024, 5, 1), supplier='Office supplies', amount=1.0, category='Travel',
+                            notes='printer paper'))
+        session.add(Expense(date=date(2024, 5, 1), supplier='Printer World', amount=1.0, category='Travel'))
+        session.add(Transaction(date=date(2024, 5, 1), description='PRINTER WORLD LTD', paid_out=1.0))
+        session.commit()
+
+        hits = search_records(session, 'printer', ['Expense'])
+        assert [h.record_id for h in hits] == [2, 1]
+        assert {h.record_type for h in search_records(session, 'printer')} == {'Expense', 'Transaction'}
+        assert len(search_records(session, 'printer', limit=1)) == 1
+        assert search_ids(session, 'printer world', 'Transaction') == {1}
+        assert [r.supplier for r in load_hits(session, hits)] == ['Printer World', 'Office supplies']
+
+        assert fts_query('"; DROP TABLE x --') == '"DROP"* "TABLE"* "x"*'
+        assert search_records(session, '  *** ') == []
+        assert len(search_records(session, 'printer* (world')) == 2
+        print("✓ Hits are ranked, filtered and safe for arbitrary input")
+    finally:
+        session.close()
+
+
+def trigger_writes(session, statement):
+    """Rows written by a statement, counting those written by triggers"""
+    before = session.execute(text('SELECT total_changes()')).scalar()
+    direct = session.execute(text(statement)).rowcount
+    return session.execute(text('SELECT total_changes()')).scalar() - before - direct
+
+
+def test_update_triggers_indexed_columns_only():
+    """Updates of unindexed columns leave the index alone; old triggers are replaced"""
+    session = build_database()
+    try:
+        # transactions has no other triggers, so any trigger write is the index's
+        assert trigger_writes(session, 'UPDATE transactions SET reviewed = 1, is_personal = 1') == 0
+        assert trigger_writes(session, "UPDATE transactions SET notes = 'CLIENT' WHERE id <= 10") > 0
+        assert {('Transaction', i) for i in range(1, 11)} <= {
+            (h.record_type, h.record_id) for h in search_records(session, 'client', limit=None)}
+
+        # A database from before the triggers named their columns
+        session.execute(text('DROP TRIGGER trg_search_index_expenses_update'))
+        session.execute(text("""
+            CREATE TRIGGER trg_search_index_expenses_update AFTER UPDATE ON expenses
+            BEGIN SELECT 1; END"""))
+        assert install_search_index(session.connection())
+        for spec in SEARCH_SOURCES.values():
+            sql = session.execute(text("SELECT sql FROM sqlite_master WHERE name = :name"),
+                                  {'name': f"trg_search_index_{spec['table']}_update"}).scalar()
+            assert f"AFTER UPDATE OF {', '.join(spec['columns'])} ON {spec['table']}" in sql, sql
+        assert not install_search_index(session.connection())
+        session.execute(text("UPDATE expenses SET amount = 0, notes = 'CLIENT' WHERE id % 2 = 0"))
+        for q in ['tes', 'cafe', 'client']:
+            assert {(h.record_type, h.record_id) for h in search_records(session, q, limit=None)} == \
+                scan_matches(session, q), q
+
+        print("✓ Update triggers fire only for indexed columns")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all search index tests"""
+    print("\n" + "=" * 60)
+    print("FULL-TEXT SEARCH INDEX - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_index_matches_scan()
+        test_ranking_and_filters()
+        test_update_triggers_indexed_columns_only()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,212 @@
+"""
+Test Script for columnar smart categorization
+apply_smart_categorization must write what the original per-transaction
+loop wrote, and merge_confidence_arrays must agree with
+merge_confidence_scores element by element
+"""
+
+import sys
+import os
+import random
+import itertools
+import importlib
+from datetime import date, timedelta
+
+# Add project root and scripts to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
+
+from models import init_db, Transaction, Merchant
+from merchant_lookup import MerchantLookupService
+import pattern_analyzer
+from pattern_analyzer import PatternType, analyze_transactions, merge_confidence_scores, merge_confidence_arrays
+import utils
+
+if not utils.SMART_CATEGORIZATION_AVAILABLE:
+    # utils was imported (e.g. by another test) before scripts/ was on the path
+    importlib.reload(utils)
+from utils import apply_smart_categorization, load_categorization_frame, SMART_CATEGORIZATION_COLUMNS
+
+
+def build_database():
+    """Two years of subscriptions, benefits, transfers, card spending and client payments"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(19)
+    session.add(Merchant(name='ACME CONSULTING', default_category='Consulting', default_type='Income',
+                         is_personal=False, usage_count=0))
+
+    start = date(2023, 1, 3)
+    for month in range(24):
+        day = start + timedelta(days=30 * month)
+        session.add(Transaction(date=day, description='NETFLIX.COM', paid_out=10.99, paid_in=0.0))
+        session.add(Transaction(date=day + timedelta(days=2), description='HMRC CHILD BENEFIT',
+                                paid_in=96.6, paid_out=0.0))
+        session.add(Transaction(date=day + timedelta(days=5), description='ACME CONSULTING LTD',
+                                paid_in=rng.choice([1200.0, 1450.0]), paid_out=0.0,
+                                guessed_type='Income', guessed_category='Self-employment'))
+    for i in range(400):
+        paid_out = rng.choice([2.5, 3.2, 14.99, 60.0, 1250.0])
+        session.add(Transaction(
+            date=start + timedelta(days=rng.randrange(720)),
+            description=rng.choice(['TESCO STORES', 'PRET A MANGER', 'SHELL FUEL', 'TRANSFER TO SAVINGS',
+                                    'AMAZON MKTPLACE', f'CORNER SHOP {i % 40}', 'TFL TRAVEL CHARGE']),
+            paid_out=paid_out, paid_in=0.0, guessed_type='Expense',
+            guessed_category='Other business expenses', is_personal=False,
+        ))
+    session.commit()
+    return session
+
+
+def per_row_categorization(session, transactions):
+    """The original apply_smart_categorization loop"""
+    lookup = MerchantLookupService(session)
+    pattern_results = analyze_transactions(session, transactions)
+
+    for txn in transactions:
+        is_personal_merchant, category_merchant, confidence_merchant, merchant_name = \
+            lookup.categorization_confidence(txn.description)
+        pattern_result = pattern_results.get(txn.id)
+
+        final_type = txn.guessed_type
+        final_category = txn.guessed_category
+        final_is_personal = txn.is_personal
+        final_confidence = 0
+        requires_review = False
+
+        if pattern_result and pattern_result.pattern_confidence > 0:
+            pattern_conf = pattern_result.pattern_confidence
+            combined_conf, combined_personal = merge_confidence_scores(
+                pattern_confidence=pattern_conf,
+                merchant_confidence=confidence_merchant,
+                pattern_type=pattern_result.primary_pattern.pattern_type if pattern_result.primary_pattern else None,
+                pattern_personal=pattern_result.is_personal,
+                merchant_personal=is_personal_merchant
+            )
+            final_confidence = combined_conf
+            final_is_personal = combined_personal
+
+            if pattern_conf >= 70 and pattern_result.suggested_type:
+                final_type = pattern_result.suggested_type
+                if pattern_result.suggested_category:
+                    final_category = pattern_result.suggested_category
+            elif confidence_merchant >= 70:
+                if txn.paid_in > 0:
+                    final_type = "Income"
+                elif txn.paid_out > 0:
+                    final_type = "Expense"
+                final_category = category_merchant
+
+            if pattern_result.primary_pattern:
+                txn.pattern_type = pattern_result.primary_pattern.pattern_type.value
+                txn.pattern_group_id = pattern_result.primary_pattern.metadata.get('group_id', '')
+                txn.pattern_metadata = pattern_result.primary_pattern.metadata
+
+            requires_review = pattern_result.requires_review
+
+        elif confidence_merchant > 0:
+            final_confidence = confidence_merchant
+            final_is_personal = is_personal_merchant
+            if confidence_merchant >= 70:
+                if txn.paid_in > 0:
+                    final_type = "Income"
+                elif txn.paid_out > 0:
+                    final_type = "Expense"
+                final_category = category_merchant
+
+        txn.guessed_type = final_type
+        txn.guessed_category = final_category
+        txn.is_personal = final_is_personal
+        txn.confidence_score = final_confidence
+        txn.merchant_confidence = confidence_merchant
+        txn.pattern_confidence = pattern_result.pattern_confidence if pattern_result else 0
+        txn.requires_review = requires_review
+
+    lookup.flush_usage()
+    session.commit()
+
+
+def stored_rows(session):
+    """Categorization columns per transaction id, as read back from the database"""
+    columns = [Transaction.id] + [getattr(Transaction, name) for name in SMART_CATEGORIZATION_COLUMNS]
+    return {row[0]: tuple(row[1:]) for row in session.query(*columns).order_by(Transaction.id)}
+
+
+def test_merge_arrays_match_scalar():
+    """Every combination of inputs merges as merge_confidence_scores does"""
+    confidences = [0, 30, 50, 51, 69, 70, 71, 80, 81, 89, 90, 95]
+    types = [None] + list(PatternType)
+    flags = [None, True, False]
+    cases = list(itertools.product(confidences, confidences, types, flags, flags))
+
+    combined, personal = merge_confidence_arrays(*zip(*cases))
+    for i, (pattern_conf, merchant_conf, pattern_type, pattern_personal, merchant_personal) in enumerate(cases):
+        expected = merge_confidence_scores(pattern_conf, merchant_conf, pattern_type,
+                                           pattern_personal, merchant_personal)
+        assert (combined[i], personal[i]) == expected, cases[i]
+    print(f"✓ merge_confidence_arrays matches merge_confidence_scores on {len(cases)} cases")
+
+
+def test_matches_per_row_path():
+    """Columnar categorization writes the same values and usage counts as the original loop"""
+    expected_session = build_database()
+    session = build_database()
+    try:
+        per_row_categorization(expected_session, expected_session.query(Transaction).order_by(Transaction.date).all())
+
+        summary = apply_smart_categorization(session, load_categorization_frame(session))
+
+        expected = stored_rows(expected_session)
+        assert stored_rows(session) == expected
+        assert session.query(Merchant.usage_count).scalar() == expected_session.query(Merchant.usage_count).scalar() == 24
+
+        values = list(expected.values())
+        assert summary.total == len(values)
+        assert summary.high_confidence == sum(1 for v in values if v[3] >= 70)
+        assert summary.personal == sum(1 for v in values if v[2])
+        assert summary.requires_review == sum(1 for v in values if v[9])
+        assert sum(summary.pattern_counts.values()) == sum(1 for v in values if v[6])
+        print(f"✓ {summary.total} transactions categorized as the per-row loop did")
+    finally:
+        expected_session.close()
+        session.close()
+
+
+def test_parallel_matching():
+    """Matching in worker processes gives the same results as in-process"""
+    original = pattern_analyzer.PARALLEL_MIN_TRANSACTIONS
+    pattern_analyzer.PARALLEL_MIN_TRANSACTIONS = 1
+    session = build_database()
+    try:
+        transactions = session.query(Transaction).order_by(Transaction.date).all()
+        serial = analyze_transactions(session, transactions)
+        parallel = analyze_transactions(session, transactions, workers=2)
+        assert parallel == serial
+        print(f"✓ Parallel pattern matching agrees on {len(parallel)} transactions")
+    finally:
+        pattern_analyzer.PARALLEL_MIN_TRANSACTIONS = original
+        session.close()
+
+
+def run_all_tests():
+    """Run all smart categorization tests"""
+    print("\n" + "=" * 60)
+    print("COLUMNAR SMART CATEGORIZATION - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_merge_arrays_match_scalar()
+        test_matches_per_row_path()
+        test_parallel_matching()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,147 @@
+"""
+Test Script for the tax year snapshot
+Compares TaxYearSnapshot against the per-figure queries the summary page
+used to run, and checks the memo refreshes after writes
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, and_
+
+from models import init_db, Transaction, Income, Expense, Mileage, Donation
+from tax_snapshot import get_tax_year_snapshot, build_tax_year_snapshot
+from utils import get_tax_year_dates
+
+
+def build_database():
+    """Random ledger rows either side of the 2024/25 tax year boundaries"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(12)
+    start = date(2024, 3, 1)
+    days = [date(2024, 4, 5), date(2024, 4, 6), date(2025, 4, 5), date(2025, 4, 6)]
+
+    def pick_day():
+        return rng.choice(days) if rng.random() < 0.1 else start + timedelta(days=rng.randrange(460))
+
+    for i in range(150):
+        session.add(Income(date=pick_day(), source=f'Payer {i % 7}', amount_gross=rng.uniform(10, 2000),
+                           tax_deducted=rng.choice([0.0, 40.0]),
+                           income_type=rng.choice(['Employment', 'Self-employment', 'Interest',
+                                                   'Dividends', 'Property', 'Other'])))
+    for i in range(150):
+        session.add(Expense(date=pick_day(), supplier=f'Supplier {i}', amount=rng.uniform(1, 400),
+                            category=rng.choice(['Travel', 'Office costs', 'Other business expenses'])))
+    for i in range(40):
+        session.add(Mileage(date=pick_day(), purpose='Visit', miles=rng.uniform(1, 80),
+                            allowable_amount=rng.uniform(1, 36)))
+    for i in range(30):
+        session.add(Donation(date=pick_day(), charity='Charity', amount_paid=rng.uniform(5, 50),
+                             gift_aid=rng.random() < 0.6))
+    for i in range(200):
+        # Leave July 2024 without transactions
+        day = pick_day()
+        if (day.year, day.month) == (2024, 7):
+            continue
+        session.add(Transaction(date=day, description=f'TXN {i}', paid_out=10.0,
+                                reviewed=rng.random() < 0.7, is_personal=rng.random() < 0.5))
+    session.commit()
+    return session
+
+
+def test_snapshot_matches_queries():
+    """Snapshot figures equal one query per figure"""
+    session = build_database()
+    try:
+        # Plain dates: datetime bounds would drop entries dated 6 April
+        start_date, end_date = (d.date() for d in get_tax_year_dates('2024/25'))
+        snapshot = get_tax_year_snapshot(session, '2024/25')
+
+        def income_sum(column, income_type):
+            return session.query(func.sum(column)).filter(
+                and_(Income.income_type == income_type, Income.date >= start_date, Income.date <= end_date)
+            ).scalar() or 0.0
+
+        def in_year(model):
+            return and_(model.date >= start_date, model.date <= end_date)
+
+        assert abs(snapshot.employment_total - income_sum(Income.amount_gross, 'Employment')) < 1e-6
+        assert abs(snapshot.employment_tax - income_sum(Income.tax_deducted, 'Employment')) < 1e-6
+        assert abs(snapshot.self_employment_total - income_sum(Income.amount_gross, 'Self-employment')) < 1e-6
+        assert abs(snapshot.dividends_total - income_sum(Income.amount_gross, 'Dividends')) < 1e-6
+        assert abs(snapshot.property_total - income_sum(Income.amount_gross, 'Property')) < 1e-6
+        assert snapshot.income_sources == session.query(func.count(func.distinct(Income.source))).filter(
+            in_year(Income)).scalar()
+
+        expenses_total = session.query(func.sum(Expense.amount)).filter(in_year(Expense)).scalar()
+        mileage_total = session.query(func.sum(Mileage.allowable_amount)).filter(in_year(Mileage)).scalar()
+        donations_total = session.query(func.sum(Donation.amount_paid)).filter(
+            Donation.gift_aid == True, in_year(Donation)).scalar()
+        assert abs(snapshot.expenses_total - expenses_total) < 1e-6
+        assert abs(snapshot.mileage_total - mileage_total) < 1e-6
+        assert abs(snapshot.donations_total - donations_total) < 1e-6
+        assert snapshot.mileage_count == session.query(Mileage).filter(in_year(Mileage)).count()
+        assert abs(snapshot.net_profit - (snapshot.self_employment_total - expenses_total - mileage_total)) < 1e-6
+
+        for category, count in snapshot.expense_counts.items():
+            assert count == session.query(Expense).filter(Expense.category == category, in_year(Expense)).count()
+
+        assert snapshot.unreviewed_count == session.query(Transaction).filter(Transaction.reviewed == False).count()
+        assert snapshot.reviewed_personal_count == session.query(Transaction).filter(
+            Transaction.reviewed == True, Transaction.is_personal == True).count()
+        assert snapshot.missing_months == [(2024, 7)]
+        print("✓ Snapshot figures match the per-figure queries")
+    finally:
+        session.close()
+
+
+def test_snapshot_memo():
+    """The memo is reused until a ledger changes"""
+    session = build_database()
+    try:
+        first = get_tax_year_snapshot(session, '2024/25')
+        assert get_tax_year_snapshot(session, '2024/25') is first
+
+        session.add(Expense(date=date(2024, 9, 1), supplier='Shop', amount=100.0, category='Travel'))
+        session.commit()
+        refreshed = get_tax_year_snapshot(session, '2024/25')
+        assert refreshed is not first
+        assert abs(refreshed.expenses_total - first.expenses_total - 100.0) < 1e-6
+        assert refreshed == build_tax_year_snapshot(session, '2024/25')
+
+        # A different database never shares entries
+        engine, Session = init_db(':memory:')
+        other = Session()
+        assert get_tax_year_snapshot(other, '2024/25').expenses_total == 0
+        other.close()
+        print("✓ Snapshot memo refreshes after writes")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all tax snapshot tests"""
+    print("\n" + "=" * 60)
+    print("TAX YEAR SNAPSHOT - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_snapshot_matches_queries()
+        test_snapshot_memo()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,127 @@
+"""
+Test Script for the shared description normalizer
+Checks the precompiled, memoized normalizers against the original
+inline implementations
+"""
+
+import sys
+import os
+import re
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from models import init_db, Transaction
+from text_normalizer import (
+    normalize_description, normalize_descriptions, normalize_merchant_name,
+    merchant_search_key, description_key
+)
+
+
+DESCRIPTIONS = [
+    'TESCO STORE 12345 REF:ABC123 04/01/25', 'DWP UC AB123456C', 'CARD ****1234 AMAZON.CO.UK',
+    'NETFLIX.COM 01-JAN-2024', 'Costa Coffee, London', 'PAYPAL *EBAY 0123 JAN24 ACME LTD',
+    'tesco stores', '   ', '', 'Straße Café', 'H&M', 'ASDA SUPERSTORE 1/2/2024', 'REF 99 PAYMENT',
+]
+
+
+def reference_normalize_description(description):
+    """Original scripts/pattern_analyzer.normalize_description"""
+    if not description:
+        return ""
+    text = description.upper().strip()
+    text = re.sub(r'\bREF:?\s*[A-Z0-9]+', '', text)
+    text = re.sub(r'\b[A-Z]{2}\d{6}[A-Z]?\b', '', text)
+    text = re.sub(r'\b\d{4,}\b', '', text)
+    text = re.sub(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', '', text)
+    text = re.sub(r'\b\d{1,2}-[A-Z]{3}-\d{2,4}\b', '', text)
+    text = re.sub(r'\*+\d{4}', '', text)
+    text = re.sub(r'[^A-Z0-9\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def reference_normalize_string(text):
+    """Original components/merchant_db.normalize_string"""
+    if not text:
+        return ""
+    text = re.sub(r'\s+(LTD|LIMITED|PLC|UK|STORES|STORE)$', '', text.upper())
+    text = re.sub(r'[^A-Z0-9\s]', '', text.upper())
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def reference_merchant_key(desc):
+    """Original cleaning in smart_learning.detect_similar_transactions"""
+    cleaned = re.sub(r'\d{4}\s*\w{3}\d{2}', '', desc)
+    cleaned = re.sub(r'\d{2}/\d{2}/\d{2,4}', '', cleaned)
+    cleaned = re.sub(r',.*', '', cleaned).strip()
+    return cleaned[:30] if len(cleaned) >= 10 else cleaned
+
+
+def test_normalizers_match_originals():
+    """Each shared normalizer matches the code it replaced"""
+    for description in DESCRIPTIONS:
+        assert normalize_description(description) == reference_normalize_description(description), description
+        assert normalize_merchant_name(description) == reference_normalize_string(description), description
+        assert merchant_search_key(description) == reference_merchant_key(description), description
+
+    print("✓ Shared normalizers match the original implementations")
+
+
+def test_series_variant():
+    """normalize_descriptions agrees with normalize_description row by row"""
+    values = pd.Series(DESCRIPTIONS + DESCRIPTIONS[:3] + [None], index=range(100, 100 + len(DESCRIPTIONS) + 4))
+
+    result = normalize_descriptions(values)
+
+    assert list(result.index) == list(values.index)
+    assert list(result) == [normalize_description(v) if isinstance(v, str) else "" for v in values]
+    print("✓ normalize_descriptions matches normalize_description")
+
+
+def test_transaction_stores_normalized_description():
+    """Transaction.description_normalized follows description"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        txn = Transaction(date=pd.Timestamp('2024-01-01').date(), description='NETFLIX.COM 1234',
+                          paid_in=0.0, paid_out=9.99)
+        session.add(txn)
+        session.commit()
+
+        assert txn.description_normalized == 'NETFLIX COM'
+        assert description_key(txn) == 'NETFLIX COM'
+
+        txn.description = 'SPOTIFY P0123 REF:XYZ'
+        session.commit()
+        stored = session.query(Transaction.description_normalized).filter_by(id=txn.id).scalar()
+        assert stored == normalize_description('SPOTIFY P0123 REF:XYZ')
+        print("✓ Transactions keep their normalized description in sync")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all normalizer tests"""
+    print("\n" + "=" * 60)
+    print("DESCRIPTION NORMALIZER - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_normalizers_match_originals()
+        test_series_variant()
+        test_transaction_stores_normalized_description()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
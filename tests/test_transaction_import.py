@@ -0,0 +1,128 @@
+"""
+Test Script for bulk statement import
+Checks the chunked INSERT path writes the same rows as building Transaction
+objects, skips lines already imported and categorizes on columns
+"""
+
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from models import init_db, Transaction
+from text_normalizer import normalize_description
+from transaction_import import bulk_import_transactions
+from utils import categorize_frame
+
+
+def make_statement():
+    """DataFrame shaped like parse_csv output"""
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2024-02-01', '2024-02-01', '2024-02-03', '2024-02-04', '2024-02-05']),
+        'description': ['COSTA COFFEE 1234', 'COSTA COFFEE 1234', 'ACME CLIENT REF:INV42', 'NETFLIX.COM', 'TESCO'],
+        'paid_in': [0.0, 0.0, 1200.0, 0.0, 0.0],
+        'paid_out': [3.2, 3.2, 0.0, 9.99, 25.5],
+        'balance': [100.0, 96.8, 1296.8, 1286.81, None],
+        'guessed_type': ['Expense', 'Expense', 'Income', 'Expense', 'Expense'],
+        'guessed_category': ['Other business expenses'] * 2 + ['Self-employment'] + ['Other business expenses'] * 2,
+        'is_personal': [False] * 5,
+        'reviewed': [False] * 5,
+        'notes': [''] * 5,
+    })
+
+
+def test_bulk_insert():
+    """Rows are inserted in chunks with derived columns filled in"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        ids = bulk_import_transactions(session, make_statement(), account_name='Business', chunk_size=2)
+
+        assert len(ids) == 5
+        stored = session.query(Transaction).order_by(Transaction.id).all()
+        assert [t.id for t in stored] == ids
+        assert [t.description for t in stored] == make_statement()['description'].tolist()
+        assert stored[0].date == date(2024, 2, 1)
+        assert stored[2].description_normalized == normalize_description('ACME CLIENT REF:INV42')
+        assert stored[2].paid_in == 1200.0 and stored[3].paid_out == 9.99
+        assert stored[4].balance is None
+        assert all(t.account_name == 'Business' for t in stored)
+        assert all(t.type == '' for t in stored)
+        assert all(t.import_date is not None for t in stored)
+        assert len({t.fingerprint for t in stored}) == 5
+        print("✓ Statement lines inserted in chunks with normalized descriptions and fingerprints")
+    finally:
+        session.close()
+
+
+def test_reimport_skipped():
+    """Importing a statement twice adds nothing the second time"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        first = bulk_import_transactions(session, make_statement())
+        again = bulk_import_transactions(session, make_statement())
+
+        extended = pd.concat([make_statement(), make_statement().iloc[[0]]], ignore_index=True)
+        third = bulk_import_transactions(session, extended)
+
+        assert len(first) == 5
+        assert again == []
+        assert len(third) == 1
+        assert session.query(Transaction).count() == 6
+        print("✓ Lines already imported are skipped by the fingerprint index")
+    finally:
+        session.close()
+
+
+def test_categorize_frame():
+    """Merchant matches override rule guesses; unknown merchants keep them"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    try:
+        frame = make_statement()
+        frame['id'] = range(1, len(frame) + 1)
+
+        result = categorize_frame(session, frame)
+
+        netflix = result.iloc[3]
+        assert netflix['confidence_score'] >= 70
+        assert netflix['guessed_type'] == 'Expense'
+        assert netflix['guessed_category'] != 'Other business expenses'
+        assert bool(netflix['is_personal']) is True
+
+        client = result.iloc[2]
+        assert client['confidence_score'] == 0
+        assert client['guessed_type'] == 'Income' and client['guessed_category'] == 'Self-employment'
+        assert bool(client['is_personal']) is False
+        assert list(result.index) == list(frame.index)
+        print("✓ Column-wise categorization applies merchant matches")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all bulk import tests"""
+    print("\n" + "=" * 60)
+    print("BULK STATEMENT IMPORT - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_bulk_insert()
+        test_reimport_skipped()
+        test_categorize_frame()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
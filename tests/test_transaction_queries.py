@@ -0,0 +1,178 @@
+"""
+Test Script for SQL transaction filters and keyset paging
+TransactionFilter must select what the old list comprehensions selected,
+and walking pages by cursor must visit every match once, in order
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import init_db, Transaction
+from transaction_queries import (
+    TransactionFilter, TYPE_FILTERS, CONFIDENCE_FILTERS, UNREVIEWED,
+    count_transactions, transaction_page, transaction_position, review_cursor, seek_transaction
+)
+
+
+def build_database():
+    """Random transactions with repeated dates and amounts"""
+    engine, Session = init_db(':memory:')
+    session = Session()
+    rng = random.Random(18)
+
+    for i in range(300):
+        paid_in = rng.choice([0.0, 0.0, 12.5, 250.0, 1200.0])
+        session.add(Transaction(
+            date=date(2024, 4, 6) + timedelta(days=rng.randrange(60)),
+            description=rng.choice(['TESCO STORES', 'CLIENT PAYMENT', 'SHELL FUEL', 'AMAZON']),
+            paid_in=paid_in, paid_out=0.0 if paid_in else rng.choice([4.99, 12.5, 80.0, 640.0]),
+            guessed_type=rng.choice([None, 'Income', 'Expense']),
+            confidence_score=rng.choice([None, 0, 25, 55, 85]),
+            is_personal=rng.random() < 0.3, reviewed=rng.random() < 0.4,
+        ))
+    session.commit()
+    return session
+
+
+def python_filter(transactions, f):
+    """The list-comprehension filters the SQL replaces"""
+    result = transactions
+    if f.search:
+        words = f.search.lower().split()
+        amount = f.search.replace('£', '').replace(',', '')
+        result = [t for t in result
+                  if all(any(w.startswith(word) for w in t.description.lower().split()) for word in words)
+                  or amount in str(t.paid_in) or amount in str(t.paid_out)]
+    if f.txn_type in ('Income', 'Expense'):
+        result = [t for t in result if t.guessed_type == f.txn_type]
+    elif f.txn_type == 'Personal':
+        result = [t for t in result if t.is_personal == True]
+    elif f.txn_type == 'Unreviewed':
+        result = [t for t in result if t.reviewed == False]
+    score = {
+        'High (70%+)': lambda s: s and s >= 70,
+        'Medium (40-69%)': lambda s: s and 40 <= s < 70,
+        'Low (<40%)': lambda s: s and s < 40,
+        'No Score': lambda s: not s,
+    }.get(f.confidence)
+    if score:
+        result = [t for t in result if score(t.confidence_score)]
+    if f.date_start:
+        result = [t for t in result if t.date >= f.date_start]
+    if f.amount_min is not None:
+        result = [t for t in result if (t.paid_in if t.paid_in > 0 else t.paid_out) >= f.amount_min]
+    if f.amount_max is not None:
+        result = [t for t in result if (t.paid_in if t.paid_in > 0 else t.paid_out) <= f.amount_max]
+    return {t.id for t in result}
+
+
+def test_filters_match_python():
+    """Every filter combination selects the same transactions"""
+    session = build_database()
+    try:
+        transactions = session.query(Transaction).all()
+        rng = random.Random(1)
+        for _ in range(60):
+            f = TransactionFilter(
+                search=rng.choice(['', '', 'tes', 'client pay', '12.5', '£1,200']),
+                txn_type=rng.choice(TYPE_FILTERS),
+                confidence=rng.choice(CONFIDENCE_FILTERS),
+                date_start=rng.choice([None, date(2024, 5, 1)]),
+                amount_min=rng.choice([None, 10.0]),
+                amount_max=rng.choice([None, 300.0]),
+            )
+            found = {t.id for t in session.query(Transaction).filter(*f.conditions())}
+            assert found == python_filter(transactions, f), f
+        print("✓ SQL filters match the list comprehensions")
+    finally:
+        session.close()
+
+
+def test_keyset_pages_cover_matches():
+    """Cursor paging visits every match once, in sort order, for each sort"""
+    session = build_database()
+    try:
+        conditions = UNREVIEWED + TransactionFilter(amount_max=700.0).conditions()
+        expected_count = count_transactions(session, conditions)
+        matches = session.query(Transaction).filter(*conditions).all()
+
+        def amount(t):
+            return t.paid_in if t.paid_in > 0 else t.paid_out
+
+        for sort, descending, key in [('date', True, lambda t: (t.date, t.id)), ('date', False, lambda t: (t.date, t.id)),
+                                      ('amount', True, lambda t: (amount(t), t.id)),
+                                      ('amount', False, lambda t: (amount(t), t.id))]:
+            seen, cursor = [], None
+            while True:
+                page = transaction_page(session, conditions, after=cursor, page_size=13, sort=sort,
+                                        descending=descending)
+                assert len(page.transactions) <= 13
+                seen.extend(page.transactions)
+                if not page.has_more:
+                    break
+                cursor = page.next_cursor
+            assert len(seen) == expected_count
+            assert [t.id for t in seen] == [t.id for t in sorted(matches, key=key, reverse=descending)], sort
+
+        newest_first = sorted(matches, key=lambda t: (t.date, t.id), reverse=True)
+        assert transaction_position(session, conditions, newest_first[17]) == 17
+        print(f"✓ Keyset pages cover all {expected_count} matches for every sort")
+    finally:
+        session.close()
+
+
+def test_seek_walks_review_queue():
+    """Cursor seeks step through the queue newest first, and past reviewed rows"""
+    session = build_database()
+    try:
+        queue = sorted(session.query(Transaction).filter(*UNREVIEWED), key=lambda t: (t.date, t.id), reverse=True)
+        assert seek_transaction(session, UNREVIEWED) is queue[0]
+
+        seen, txn = [], seek_transaction(session, UNREVIEWED)
+        while txn is not None:
+            seen.append(txn)
+            txn = seek_transaction(session, UNREVIEWED, review_cursor(txn), 'next')
+        assert [t.id for t in seen] == [t.id for t in queue]
+
+        cursor = review_cursor(queue[40])
+        assert seek_transaction(session, UNREVIEWED, cursor) is queue[40]
+        assert seek_transaction(session, UNREVIEWED, cursor, 'previous') is queue[39]
+        assert seek_transaction(session, UNREVIEWED, review_cursor(queue[0]), 'previous') is None
+        assert seek_transaction(session, UNREVIEWED, review_cursor(queue[-1]), 'next') is None
+
+        # Reviewing the current transaction moves the same cursor on to the next
+        queue[40].reviewed = True
+        session.commit()
+        assert seek_transaction(session, UNREVIEWED, cursor) is queue[41]
+        assert transaction_position(session, UNREVIEWED, queue[41]) == 40
+        print(f"✓ Cursor seeks walk all {len(queue)} queued transactions")
+    finally:
+        session.close()
+
+
+def run_all_tests():
+    """Run all transaction query tests"""
+    print("\n" + "=" * 60)
+    print("TRANSACTION FILTERS & PAGING - TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_filters_match_python()
+        test_keyset_pages_cover_matches()
+        test_seek_walks_review_queue()
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+    print("\n✅ ALL TESTS PASSED")
+    return True
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
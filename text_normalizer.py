@@ -0,0 +1,147 @@
+"""
+Shared transaction description normalization for Tax Helper
+Precompiled patterns and memoized results used by the pattern detectors,
+merchant matching and similar-transaction search
+"""
+
+import re
+from functools import lru_cache
+
+
+# Upper bound on memoized descriptions per normalizer
+NORMALIZE_CACHE_SIZE = 65536
+
+
+# ===================================================================
+# PATTERN DESCRIPTIONS (pattern analysis, stored on Transaction)
+# ===================================================================
+
+_DESCRIPTION_PATTERNS = [
+    re.compile(r'\bREF:?\s*[A-Z0-9]+'),  # Reference numbers
+    re.compile(r'\b[A-Z]{2}\d{6}[A-Z]?\b'),  # DWP reference codes
+    re.compile(r'\b\d{4,}\b'),  # Long numbers (transaction IDs)
+    re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'),  # Dates
+    re.compile(r'\b\d{1,2}-[A-Z]{3}-\d{2,4}\b'),
+    re.compile(r'\*+\d{4}'),  # Card numbers
+]
+_PUNCTUATION = re.compile(r'[^A-Z0-9\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_description(description: str) -> str:
+    text = description.upper().strip()
+
+    for pattern in _DESCRIPTION_PATTERNS:
+        text = pattern.sub('', text)
+
+    # Clean up spaces and punctuation
+    text = _PUNCTUATION.sub(' ', text)
+    text = _WHITESPACE.sub(' ', text)
+
+    return text.strip()
+
+
+def normalize_description(description: str) -> str:
+    """
+    Normalize transaction descriptions for pattern matching
+
+    Removes:
+    - Dates (various formats)
+    - Transaction IDs and reference numbers
+    - Multiple spaces
+    - Special characters
+
+    Example:
+        "TESCO STORE 12345 REF:ABC123 04/01/25" -> "TESCO STORE"
+    """
+    if not description:
+        return ""
+    return _normalize_description(description)
+
+
+def normalize_descriptions(values):
+    """
+    Normalize a whole column of descriptions
+
+    Each distinct value is normalized once.
+
+    Args:
+        values: pandas Series (or list) of descriptions
+
+    Returns:
+        Series of normalized descriptions with the same index
+    """
+    import pandas as pd
+
+    values = pd.Series(values, dtype=object) if not isinstance(values, pd.Series) else values
+    normalized = {value: normalize_description(value) if isinstance(value, str) else ""
+                  for value in pd.unique(values)}
+    return values.map(normalized).astype(object)
+
+
+def description_key(transaction) -> str:
+    """Normalized description for a Transaction, using the stored column when set"""
+    stored = getattr(transaction, 'description_normalized', None)
+    if stored is not None:
+        return stored
+    return normalize_description(transaction.description)
+
+
+# ===================================================================
+# MERCHANT NAMES (merchant_db fuzzy matching)
+# ===================================================================
+
+_MERCHANT_SUFFIX = re.compile(r'\s+(LTD|LIMITED|PLC|UK|STORES|STORE)$')
+_NON_ALPHANUMERIC = re.compile(r'[^A-Z0-9\s]')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_merchant_name(text: str) -> str:
+    # Remove common payment-related suffixes
+    text = _MERCHANT_SUFFIX.sub('', text.upper())
+    # Remove special characters except spaces
+    text = _NON_ALPHANUMERIC.sub('', text.upper())
+    # Collapse multiple spaces
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def normalize_merchant_name(text: str) -> str:
+    """Normalize string for merchant matching: uppercase, remove special chars"""
+    if not text:
+        return ""
+    return _normalize_merchant_name(text)
+
+
+# ===================================================================
+# SIMILAR-TRANSACTION SEARCH KEYS
+# ===================================================================
+
+_STATEMENT_DATE = re.compile(r'\d{4}\s*\w{3}\d{2}')
+_SLASH_DATE = re.compile(r'\d{2}/\d{2}/\d{2,4}')
+_AFTER_COMMA = re.compile(r',.*')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _merchant_search_key(description: str) -> str:
+    cleaned = _STATEMENT_DATE.sub('', description)  # Remove dates
+    cleaned = _SLASH_DATE.sub('', cleaned)
+    cleaned = _AFTER_COMMA.sub('', cleaned).strip()
+    return cleaned[:30] if len(cleaned) >= 10 else cleaned
+
+
+def merchant_search_key(description: str) -> str:
+    """
+    Merchant part of a description for LIKE searches
+    Strips dates and anything after a comma, keeping the first 30 characters
+    """
+    if not description:
+        return ""
+    return _merchant_search_key(description)
+
+
+def clear_normalize_caches() -> None:
+    """Drop all memoized normalizations"""
+    _normalize_description.cache_clear()
+    _normalize_merchant_name.cache_clear()
+    _merchant_search_key.cache_clear()
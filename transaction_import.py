@@ -0,0 +1,137 @@
+"""
+Bulk import of parsed bank statements for Tax Helper
+Writes the DataFrame returned by parse_csv with chunked multi-row INSERTs
+and categorizes the new rows as columns, instead of building one ORM
+object per statement line
+"""
+
+from typing import List, Optional
+
+import pandas as pd
+from sqlalchemy.dialects.sqlite import insert
+
+from models import Transaction
+from fingerprints import fingerprint_frame
+from merchant_lookup import get_merchant_lookup
+from text_normalizer import normalize_descriptions
+from utils import SMART_CATEGORIZATION_AVAILABLE, categorize_frame, write_categorization
+
+
+# Rows per INSERT statement (about 20 bound parameters per row, well under
+# SQLite's limit of 32766 per statement)
+IMPORT_CHUNK_SIZE = 500
+
+# parse_csv columns copied onto new transactions when present
+IMPORT_COLUMNS = [
+    'date', 'type', 'description', 'paid_out', 'paid_in', 'balance', 'guessed_type', 'guessed_category',
+    'is_personal', 'reviewed', 'notes', 'confidence_score', 'merchant_confidence', 'pattern_confidence',
+    'pattern_type', 'pattern_metadata', 'requires_review'
+]
+
+# Values for columns a statement does not have
+IMPORT_DEFAULTS = {'type': '', 'balance': 0.0}
+
+
+def _statement_rows(df: pd.DataFrame, account_name: str) -> pd.DataFrame:
+    """Column values for the transactions table, one row per statement line"""
+    columns = [name for name in IMPORT_COLUMNS if name in df.columns]
+    rows = df[columns].astype(object)
+    rows = rows.where(df[columns].notna(), None)
+
+    rows['date'] = pd.to_datetime(df['date']).dt.date.astype(object)
+    for name in ('paid_in', 'paid_out'):
+        rows[name] = df[name].astype(float).fillna(0.0).astype(object)
+
+    for name, default in IMPORT_DEFAULTS.items():
+        if name not in rows.columns:
+            rows[name] = default
+
+    rows['description_normalized'] = normalize_descriptions(df['description'])
+    rows['account_name'] = account_name
+
+    fingerprints = df['fingerprint'] if 'fingerprint' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    if fingerprints.isna().any():
+        fingerprints = fingerprints.fillna(fingerprint_frame(df))
+    rows['fingerprint'] = fingerprints.astype(object)
+
+    return rows
+
+
+def bulk_import_transactions(
+    session,
+    df: pd.DataFrame,
+    account_name: str = 'Main Account',
+    categorize: bool = True,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> List[int]:
+    """
+    Insert parsed statement lines and categorize them in one transaction
+
+    Lines whose fingerprint is already stored are skipped by the unique
+    index (INSERT ... ON CONFLICT DO NOTHING), so importing the same
+    statement twice never creates duplicates.
+
+    Args:
+        session: SQLAlchemy session (committed on success)
+        df: DataFrame from parse_csv
+        account_name: Account the statement belongs to
+        categorize: Run smart categorization on the new rows
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        Ids of the new transactions, in statement order
+    """
+    if df is None or df.empty:
+        return []
+
+    rows = _statement_rows(df, account_name)
+    table = Transaction.__table__
+    statement = insert(table).on_conflict_do_nothing(index_elements=['fingerprint'])
+    statement = statement.returning(table.c.id, table.c.fingerprint)
+
+    ids_by_fingerprint = {}
+    records = rows.to_dict('records')
+    for start in range(0, len(records), chunk_size):
+        result = session.execute(statement.values(records[start:start + chunk_size]))
+        ids_by_fingerprint.update((fingerprint, txn_id) for txn_id, fingerprint in result)
+
+    rows['id'] = rows['fingerprint'].map(ids_by_fingerprint)
+    rows = rows[rows['id'].notna()]
+    rows['id'] = rows['id'].astype(int)
+
+    if categorize:
+        categorize_imported(session, rows)
+
+    session.commit()
+    return rows['id'].tolist()
+
+
+def categorize_imported(session, rows: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Smart categorization for newly inserted rows, written with one batched UPDATE
+
+    Pattern analysis updates the stored pattern groups incrementally; the
+    analyzers read plain row tuples rather than Transaction instances.
+    The caller commits.
+
+    Args:
+        session: SQLAlchemy session
+        rows: New rows with id, date, description, description_normalized,
+            paid_in, paid_out and the rule-based guesses
+
+    Returns:
+        The categorization columns written, or None when smart
+        categorization is unavailable
+    """
+    if not SMART_CATEGORIZATION_AVAILABLE or rows.empty:
+        return None
+
+    from pattern_analyzer import analyze_transactions
+
+    records = list(rows[['id', 'date', 'description', 'description_normalized', 'paid_in', 'paid_out']]
+                   .itertuples(index=False, name='ImportedTransaction'))
+    pattern_results = analyze_transactions(session, records, incremental=True)
+    categorized = categorize_frame(session, rows, pattern_results)
+    write_categorization(session, rows['id'].tolist(), categorized)
+    get_merchant_lookup(session).flush_usage()
+    return categorized
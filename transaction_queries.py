@@ -0,0 +1,222 @@
+"""
+Transaction filtering and paging for Tax Helper
+Turns filter choices into SQL predicates and pages results with keyset
+(seek) pagination, so review and search screens load one page of rows
+instead of the whole transactions table
+
+Pages are ordered by (sort key, id) and each page starts after the last
+row of the previous one, so reading page 50 costs the same as page 1
+(OFFSET would walk and discard every earlier row). Counts use
+ix_transactions_reviewed_date, which covers the reviewed and date filters.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import String, and_, case, cast, func, literal, or_, tuple_
+
+from models import Transaction
+from search_index import search_id_select
+
+
+PAGE_SIZE = 20
+
+# The review queue
+UNREVIEWED = [Transaction.reviewed == False]
+
+TYPE_FILTERS = ["All", "Income", "Expense", "Personal", "Unreviewed"]
+CONFIDENCE_FILTERS = ["All", "High (70%+)", "Medium (40-69%)", "Low (<40%)", "No Score"]
+
+
+def transaction_amount():
+    """Money in when there is any, otherwise money out"""
+    return case(
+        (Transaction.paid_in > 0, Transaction.paid_in),
+        else_=func.coalesce(Transaction.paid_out, 0.0)
+    )
+
+
+SORT_KEYS = {
+    'date': lambda: Transaction.date,
+    'amount': transaction_amount,
+}
+
+
+@dataclass(frozen=True)
+class TransactionFilter:
+    """
+    Search and filter choices for the transactions table
+
+    Usage:
+        filters = TransactionFilter(search='tesco', confidence='High (70%+)')
+        page = transaction_page(session, filters.conditions())
+    """
+    search: str = ''
+    txn_type: str = 'All'
+    confidence: str = 'All'
+    date_start: Optional[date] = None
+    date_end: Optional[date] = None
+    amount_min: Optional[float] = None
+    amount_max: Optional[float] = None
+
+    def conditions(self) -> List:
+        """SQLAlchemy predicates for every active filter (an empty list matches everything)"""
+        conditions = []
+
+        # Search: words via the full-text index, amounts by digits
+        if self.search:
+            amount_text = self.search.replace('£', '').replace(',', '')
+            matches = [
+                cast(Transaction.paid_in, String).contains(amount_text, autoescape=True),
+                cast(Transaction.paid_out, String).contains(amount_text, autoescape=True),
+            ]
+            id_select = search_id_select(self.search, 'Transaction')
+            if id_select is not None:
+                matches.append(Transaction.id.in_(id_select))
+            conditions.append(or_(*matches))
+
+        # Type filter
+        if self.txn_type == "Income":
+            conditions.append(Transaction.guessed_type == 'Income')
+        elif self.txn_type == "Expense":
+            conditions.append(Transaction.guessed_type == 'Expense')
+        elif self.txn_type == "Personal":
+            conditions.append(Transaction.is_personal == True)
+        elif self.txn_type == "Unreviewed":
+            conditions.append(Transaction.reviewed == False)
+
+        # Confidence filter (scores of 0 or NULL count as no score)
+        score = Transaction.confidence_score
+        if self.confidence == "High (70%+)":
+            conditions.append(score >= 70)
+        elif self.confidence == "Medium (40-69%)":
+            conditions.append(and_(score >= 40, score < 70))
+        elif self.confidence == "Low (<40%)":
+            conditions.append(and_(score != 0, score < 40))
+        elif self.confidence == "No Score":
+            conditions.append(or_(score == None, score == 0))
+
+        # Date range filter
+        if self.date_start:
+            conditions.append(Transaction.date >= self.date_start)
+        if self.date_end:
+            conditions.append(Transaction.date <= self.date_end)
+
+        # Amount range filter
+        if self.amount_min is not None:
+            conditions.append(transaction_amount() >= self.amount_min)
+        if self.amount_max is not None:
+            conditions.append(transaction_amount() <= self.amount_max)
+
+        return conditions
+
+
+@dataclass
+class TransactionPage:
+    """One page of transactions plus the cursor for the next page"""
+    transactions: List = field(default_factory=list)
+    next_cursor: Optional[Tuple] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def count_transactions(session, conditions: Sequence = ()) -> int:
+    """Number of transactions matching the conditions"""
+    return session.query(func.count(Transaction.id)).filter(*conditions).scalar() or 0
+
+
+def transaction_page(
+    session,
+    conditions: Sequence = (),
+    after: Optional[Tuple] = None,
+    page_size: int = PAGE_SIZE,
+    sort: str = 'date',
+    descending: bool = True
+) -> TransactionPage:
+    """
+    Load one page of matching transactions with keyset pagination
+
+    Args:
+        session: SQLAlchemy session
+        conditions: Predicates, e.g. TransactionFilter.conditions()
+        after: Cursor returned with the previous page (None for the first page)
+        page_size: Transactions per page
+        sort: 'date' or 'amount'; ties are broken by id
+        descending: Largest / newest first
+
+    Returns:
+        TransactionPage whose next_cursor is None on the last page
+    """
+    sort_key = SORT_KEYS[sort]()
+    keyset = tuple_(sort_key, Transaction.id)
+
+    query = session.query(Transaction, sort_key.label('sort_key')).filter(*conditions)
+    if after is not None:
+        last_key, last_id = after
+        boundary = tuple_(literal(last_key, sort_key.type), literal(last_id))
+        query = query.filter(keyset < boundary if descending else keyset > boundary)
+
+    if descending:
+        query = query.order_by(sort_key.desc(), Transaction.id.desc())
+    else:
+        query = query.order_by(sort_key.asc(), Transaction.id.asc())
+
+    # One extra row tells whether another page follows
+    rows = query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1].sort_key, rows[-1][0].id)
+
+    return TransactionPage(transactions=[row[0] for row in rows], next_cursor=next_cursor)
+
+
+def review_cursor(txn) -> Tuple:
+    """(date, id) cursor for seek_transaction"""
+    return (txn.date, txn.id)
+
+
+def seek_transaction(session, conditions: Sequence = (), cursor: Optional[Tuple] = None, step: str = 'at'):
+    """
+    The matching transaction at, after or before a (date, id) cursor, newest first
+
+    Each call is one seek on (date, id), however far down the matches the
+    cursor is.
+
+    Args:
+        session: SQLAlchemy session
+        conditions: Predicates, e.g. UNREVIEWED
+        cursor: review_cursor of a transaction (None for the newest match)
+        step: 'at' for the transaction at the cursor or, if it no longer
+            matches (e.g. it was just reviewed), the one after it; 'next' for
+            the one after it; 'previous' for the one before it
+
+    Returns:
+        Transaction, or None when there is none
+    """
+    query = session.query(Transaction).filter(*conditions)
+    newest_first = (Transaction.date.desc(), Transaction.id.desc())
+    if cursor is None:
+        return query.order_by(*newest_first).first()
+
+    keyset = tuple_(Transaction.date, Transaction.id)
+    boundary = tuple_(literal(cursor[0], Transaction.date.type), literal(cursor[1]))
+    if step == 'previous':
+        return query.filter(keyset > boundary).order_by(Transaction.date.asc(), Transaction.id.asc()).first()
+    return query.filter(keyset <= boundary if step == 'at' else keyset < boundary).order_by(*newest_first).first()
+
+
+def transaction_position(session, conditions: Sequence, txn) -> int:
+    """Zero-based position of a transaction among the matches, newest first"""
+    newer = tuple_(Transaction.date, Transaction.id) > tuple_(
+        literal(txn.date, Transaction.date.type), literal(txn.id)
+    )
+    return count_transactions(session, list(conditions) + [newer])
+
+
+def transaction_ids(session, conditions: Sequence = ()) -> List[int]:
+    """IDs of every matching transaction (e.g. for select-all), without loading rows"""
+    return [txn_id for (txn_id,) in session.query(Transaction.id).filter(*conditions)]
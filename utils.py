@@ -3,22 +3,44 @@ Utility functions for UK Self Assessment Tax Helper
 Handles CSV parsing, date parsing, duplicate detection, Excel export, and rules application
 """
 
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime, timedelta
 from dateutil import parser as date_parser
 from typing import List, Dict, Tuple, Optional
 import io
+from dataclasses import dataclass, field
+
+from sqlalchemy import bindparam, case, func, update
+
+from rule_engine import RuleEngine
+from merchant_lookup import get_merchant_lookup
+from fingerprints import fingerprint_frame
 
 # Import smart categorization modules
 try:
-    from merchant_database import get_categorization_confidence
-    from pattern_analyzer import analyze_transactions, merge_confidence_scores
+    from pattern_analyzer import analyze_transactions, merge_confidence_arrays
     SMART_CATEGORIZATION_AVAILABLE = True
 except ImportError:
     SMART_CATEGORIZATION_AVAILABLE = False
 
 
+# Common UK bank statement date formats, tried in order
+UK_DATE_FORMATS = [
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%d/%m/%y',
+    '%d-%m-%y',
+    '%d-%b-%y',  # NatWest format: 04-Apr-25
+    '%d-%B-%y',  # Full month name
+]
+
+# Security: Reject amounts outside reasonable bounds (-1 billion to +1 billion)
+MAX_AMOUNT = 1_000_000_000.0
+
+
 def parse_uk_date(date_string: str) -> Optional[datetime]:
     """
     Parse UK date formats flexibly
@@ -30,18 +52,8 @@ def parse_uk_date(date_string: str) -> Optional[datetime]:
         return None
 
     # Try common UK formats first
-    uk_formats = [
-        '%d/%m/%Y',
-        '%d-%m-%Y',
-        '%d.%m.%Y',
-        '%d/%m/%y',
-        '%d-%m-%y',
-        '%d-%b-%y',  # NatWest format: 04-Apr-25
-        '%d-%B-%y',  # Full month name
-    ]
-
     parsed_date = None
-    for fmt in uk_formats:
+    for fmt in UK_DATE_FORMATS:
         try:
             parsed_date = datetime.strptime(str(date_string).strip(), fmt)
             break
@@ -93,8 +105,6 @@ def parse_currency(value: str) -> float:
         amount = float(value_str)
 
         # Security: Validate reasonable amount range
-        # Reject amounts outside reasonable bounds (-1 billion to +1 billion)
-        MAX_AMOUNT = 1_000_000_000.0
         if abs(amount) > MAX_AMOUNT:
             return 0.0
 
@@ -103,6 +113,66 @@ def parse_currency(value: str) -> float:
         return 0.0
 
 
+def parse_uk_dates(values: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_uk_date for a whole CSV column
+
+    Each UK format is tried column-wide against the rows still unparsed, so a
+    statement written in one format is parsed by a single pd.to_datetime pass.
+    Anything no format accepts falls back to parse_uk_date once per unique
+    value. Returns a datetime64 Series with NaT for invalid or out-of-range dates.
+    """
+    text = values.astype('string').str.strip()
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[us]')
+    # parse_uk_date rejects missing and empty values before stripping
+    pending = (values.astype('string').fillna('') != '').astype(bool)
+
+    for fmt in UK_DATE_FORMATS:
+        if not pending.any():
+            break
+        attempt = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+        hits = attempt.index[attempt.notna()]
+        parsed.loc[hits] = attempt[hits]
+        pending.loc[hits] = False
+
+    # Fall back to dateutil for the leftovers (ISO dates, times, typos)
+    if pending.any():
+        leftovers = text[pending].astype(object)
+        fallback = {value: parse_uk_date(value) for value in leftovers.unique()}
+        parsed.loc[pending] = pd.to_datetime(leftovers.map(fallback))
+
+    # Security: Validate date range (same bounds as parse_uk_date)
+    today = datetime.now()
+    min_date = datetime(today.year - 100, 1, 1)
+    max_date = today + timedelta(days=1)
+
+    return parsed.where((parsed >= min_date) & (parsed <= max_date))
+
+
+def parse_currency_column(values: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_currency for a whole CSV column
+    Strips currency symbols and thousands separators with column-wide string
+    ops; only values pandas cannot convert are passed to parse_currency
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        amounts = values.astype(float).fillna(0.0)
+    else:
+        present = values.notna()
+        text = values.astype('string').fillna('').str.strip()
+        text = text.str.replace(r'[£$,]', '', regex=True).str.strip().astype(object)
+        amounts = pd.to_numeric(text, errors='coerce').astype(float)
+
+        residue = amounts.isna() & present & (text != '')
+        if residue.any():
+            fallback = {value: parse_currency(value) for value in text[residue].unique()}
+            amounts.loc[residue] = text[residue].map(fallback)
+        amounts = amounts.where(present & (text != ''), 0.0)
+
+    # Security: Validate reasonable amount range
+    return amounts.where(~(amounts.abs() > MAX_AMOUNT), 0.0)
+
+
 def format_currency(value: float) -> str:
     """
     Format float as UK currency string
@@ -110,63 +180,43 @@ def format_currency(value: float) -> str:
     return f"£{value:,.2f}"
 
 
+# Fingerprints per IN (...) query, below SQLite's bound-parameter limit
+DUPLICATE_CHECK_CHUNK_SIZE = 500
+
+
 def detect_duplicates(df: pd.DataFrame, session, Transaction) -> List[int]:
     """
-    Detect duplicate transactions already in database using batch query
+    Detect duplicate transactions already in database
+    Compares statement fingerprints (see fingerprints.py) against the unique
+    fingerprint index, in chunks. Uses df's fingerprint column when present,
+    otherwise computes the fingerprints without adding the column to df
     Returns list of row indices that are duplicates
     """
-    from sqlalchemy import and_, tuple_
+    if df.empty:
+        return []
 
-    duplicates = []
+    fingerprints = df['fingerprint'] if 'fingerprint' in df.columns else fingerprint_frame(df)
 
-    if df.empty:
-        return duplicates
-
-    # Build a single batch query using filter().in_() - avoids N+1 query problem
-    # Create tuples of (date, description, paid_in, paid_out) for all rows
-    transaction_tuples = []
-    for idx, row in df.iterrows():
-        date_val = row.get('date')
-        desc_val = row.get('description', '')
-        paid_in = row.get('paid_in', 0.0)
-        paid_out = row.get('paid_out', 0.0)
-        transaction_tuples.append((date_val, desc_val, paid_in, paid_out))
-
-    # Query all potential duplicates in a single database call
-    existing_transactions = session.query(
-        Transaction.date,
-        Transaction.description,
-        Transaction.paid_in,
-        Transaction.paid_out
-    ).filter(
-        tuple_(
-            Transaction.date,
-            Transaction.description,
-            Transaction.paid_in,
-            Transaction.paid_out
-        ).in_(transaction_tuples)
-    ).all()
-
-    # Convert to set for O(1) lookup
-    existing_set = set(existing_transactions)
-
-    # Check which rows are duplicates
-    for idx, row in df.iterrows():
-        date_val = row.get('date')
-        desc_val = row.get('description', '')
-        paid_in = row.get('paid_in', 0.0)
-        paid_out = row.get('paid_out', 0.0)
-
-        if (date_val, desc_val, paid_in, paid_out) in existing_set:
-            duplicates.append(idx)
-
-    return duplicates
+    wanted = fingerprints.dropna().unique().tolist()
+    existing = set()
+    for start in range(0, len(wanted), DUPLICATE_CHECK_CHUNK_SIZE):
+        chunk = wanted[start:start + DUPLICATE_CHECK_CHUNK_SIZE]
+        existing.update(
+            fp for (fp,) in session.query(Transaction.fingerprint).filter(Transaction.fingerprint.in_(chunk))
+        )
+
+    if not existing:
+        return []
+    return df.index[fingerprints.isin(existing)].tolist()
 
 
 def apply_rules(description: str, paid_in: float, paid_out: float, rules: List) -> Tuple[Optional[str], Optional[str], bool]:
     """
     Apply categorization rules to a transaction
     Returns (guessed_type, guessed_category, is_personal)
+
+    For more than a handful of transactions build a RuleEngine once and use
+    classify/classify_series instead of calling this in a loop.
     """
     # Sort rules by priority (lower = higher priority)
     sorted_rules = sorted([r for r in rules if r.enabled], key=lambda x: x.priority)
@@ -178,6 +228,10 @@ def apply_rules(description: str, paid_in: float, paid_out: float, rules: List)
             match = rule.text_to_match.lower() in description.lower()
         elif rule.match_mode == 'Equals':
             match = rule.text_to_match.lower() == description.lower()
+        elif rule.match_mode == 'Starts with':
+            match = description.lower().startswith(rule.text_to_match.lower())
+        elif rule.match_mode == 'Ends with':
+            match = description.lower().endswith(rule.text_to_match.lower())
         elif rule.match_mode == 'Regex':
             try:
                 match = bool(re.search(rule.text_to_match, description, re.IGNORECASE))
@@ -206,121 +260,250 @@ def apply_rules(description: str, paid_in: float, paid_out: float, rules: List)
     return None, None, False
 
 
-def apply_smart_categorization(session, transactions: List) -> None:
+# Columns written by smart categorization
+SMART_CATEGORIZATION_COLUMNS = [
+    'guessed_type', 'guessed_category', 'is_personal', 'confidence_score', 'merchant_confidence',
+    'pattern_confidence', 'pattern_type', 'pattern_group_id', 'pattern_metadata', 'requires_review'
+]
+
+# Columns read by smart categorization (id through paid_out feed pattern analysis)
+CATEGORIZATION_INPUT_COLUMNS = [
+    'id', 'date', 'description', 'description_normalized', 'paid_in', 'paid_out', 'guessed_type',
+    'guessed_category', 'is_personal', 'pattern_type', 'pattern_group_id', 'pattern_metadata'
+]
+
+
+def pattern_columns(ids: List[int], pattern_results: Optional[Dict]) -> Dict[str, np.ndarray]:
+    """Fields of each transaction's AnalysisResult as arrays aligned with ids (empty where there is none)"""
+    count = len(ids)
+    results = [pattern_results.get(txn_id) for txn_id in ids] if pattern_results else [None] * count
+    primary = [result.primary_pattern if result is not None else None for result in results]
+
+    def array(values, dtype=object):
+        return np.array(list(values), dtype=dtype) if count else np.empty(0, dtype=dtype)
+
+    return {
+        'confidence': array((result.pattern_confidence if result is not None else 0 for result in results), float),
+        'suggested_type': array(result.suggested_type if result is not None else None for result in results),
+        'suggested_category': array(result.suggested_category if result is not None else None for result in results),
+        'is_personal': array(result.is_personal if result is not None else None for result in results),
+        'requires_review': array((result is not None and result.requires_review for result in results), bool),
+        'type': array(match.pattern_type if match else None for match in primary),
+        'type_value': array(match.pattern_type.value if match else None for match in primary),
+        'group_id': array(match.metadata.get('group_id', '') if match else None for match in primary),
+        'metadata': array(match.metadata if match else None for match in primary),
+    }
+
+
+def categorize_frame(session, frame: pd.DataFrame, pattern_results: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Combine merchant and pattern data for a table of transactions
+
+    Each distinct description is resolved to a merchant once, and pattern
+    and merchant confidences are merged with merge_confidence_arrays, so
+    every decision is an array operation over the whole table.
+
+    Args:
+        session: SQLAlchemy session (for merchant lookup)
+        frame: DataFrame with id, description, paid_in, paid_out, guessed_type,
+            guessed_category and is_personal columns (pattern_type,
+            pattern_group_id and pattern_metadata are kept when present)
+        pattern_results: Dict mapping transaction id -> AnalysisResult
+
+    Returns:
+        DataFrame of SMART_CATEGORIZATION_COLUMNS with the frame's index
+    """
+    count = len(frame)
+    merchant_personal, merchant_category, merchant_confidence = \
+        get_merchant_lookup(session).confidence_columns(frame['description'])
+
+    paid_in = frame['paid_in'].fillna(0.0).to_numpy(dtype=float)
+    paid_out = frame['paid_out'].fillna(0.0).to_numpy(dtype=float)
+
+    def column(name, default=None):
+        if name in frame.columns:
+            return frame[name].to_numpy(dtype=object)
+        return np.full(count, default, dtype=object)
+
+    pattern = pattern_columns(frame['id'].tolist(), pattern_results)
+    has_pattern = pattern['confidence'] > 0
+    has_primary = has_pattern & pd.notna(pattern['type'])
+
+    # Only merchant data available
+    merchant_only = ~has_pattern & (merchant_confidence > 0)
+    confident = merchant_confidence >= 70
+    merchant_type = np.where(paid_in > 0, 'Income', np.where(paid_out > 0, 'Expense', '')).astype(object)
+
+    confidence = np.where(merchant_only, merchant_confidence, 0.0)
+    is_personal = np.where(merchant_only, merchant_personal, column('is_personal', False))
+
+    # Merge with pattern data (pattern results only exist when pattern_analyzer imported)
+    if has_pattern.any():
+        combined, combined_personal = merge_confidence_arrays(
+            pattern['confidence'], merchant_confidence, pattern['type'], pattern['is_personal'], merchant_personal
+        )
+        confidence = np.where(has_pattern, combined, confidence)
+        is_personal = np.where(has_pattern, combined_personal, is_personal)
+
+    # Pattern suggestion if high confidence, otherwise merchant suggestion if available
+    use_pattern = has_pattern & (pattern['confidence'] >= 70) & pattern['suggested_type'].astype(bool)
+    use_merchant = confident & (merchant_only | (has_pattern & ~use_pattern))
+    guessed_type = np.where(use_pattern, pattern['suggested_type'],
+                            np.where(use_merchant & (merchant_type != ''), merchant_type, column('guessed_type')))
+    guessed_category = np.where(use_pattern & pattern['suggested_category'].astype(bool), pattern['suggested_category'],
+                                np.where(use_merchant, merchant_category, column('guessed_category')))
+
+    return pd.DataFrame({
+        'guessed_type': guessed_type,
+        'guessed_category': guessed_category,
+        'is_personal': is_personal,
+        'confidence_score': confidence,
+        'merchant_confidence': merchant_confidence,
+        'pattern_confidence': pattern['confidence'],
+        'pattern_type': np.where(has_primary, pattern['type_value'], column('pattern_type')),
+        'pattern_group_id': np.where(has_primary, pattern['group_id'], column('pattern_group_id')),
+        'pattern_metadata': np.where(has_primary, pattern['metadata'], column('pattern_metadata')),
+        'requires_review': (has_pattern & pattern['requires_review']).astype(object),
+    }, index=frame.index)
+
+
+def transactions_frame(transactions: List) -> pd.DataFrame:
+    """Columns used by categorize_frame, read from Transaction instances"""
+    columns = ['id', 'description', 'paid_in', 'paid_out', 'guessed_type', 'guessed_category',
+               'is_personal', 'pattern_type', 'pattern_group_id', 'pattern_metadata']
+    return pd.DataFrame(
+        {name: [getattr(txn, name) for txn in transactions] for name in columns},
+        dtype=object
+    ).astype({'paid_in': float, 'paid_out': float})
+
+
+def load_categorization_frame(session, conditions=()) -> pd.DataFrame:
+    """
+    CATEGORIZATION_INPUT_COLUMNS for matching transactions, oldest first,
+    read with one column query instead of loading Transaction instances
+    """
+    from models import Transaction
+
+    columns = [getattr(Transaction, name) for name in CATEGORIZATION_INPUT_COLUMNS]
+    rows = session.query(*columns).filter(*conditions).order_by(Transaction.date, Transaction.id).all()
+    return pd.DataFrame(
+        [tuple(row) for row in rows], columns=CATEGORIZATION_INPUT_COLUMNS, dtype=object
+    ).astype({'paid_in': float, 'paid_out': float})
+
+
+def write_categorization(session, ids: List[int], categorized: pd.DataFrame) -> int:
+    """
+    Write categorize_frame's columns back with one batched UPDATE (the caller commits)
+
+    Returns:
+        Number of transactions updated
+    """
+    from models import Transaction
+
+    if not len(ids):
+        return 0
+
+    table = Transaction.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam('txn_id'))
+        .values({name: bindparam(f'new_{name}') for name in SMART_CATEGORIZATION_COLUMNS})
+    )
+    # tolist() turns numpy scalars into Python values the driver accepts
+    columns = [categorized[name].tolist() for name in SMART_CATEGORIZATION_COLUMNS]
+    params = [
+        {'txn_id': int(txn_id), **{f'new_{name}': value for name, value in zip(SMART_CATEGORIZATION_COLUMNS, values)}}
+        for txn_id, values in zip(ids, zip(*columns))
+    ]
+    session.execute(statement, params)
+    return len(params)
+
+
+@dataclass
+class CategorizationSummary:
+    """Outcome of apply_smart_categorization"""
+    total: int = 0
+    high_confidence: int = 0    # ≥70
+    medium_confidence: int = 0  # 40-69
+    low_confidence: int = 0     # <40
+    personal: int = 0
+    business: int = 0
+    requires_review: int = 0
+    pattern_counts: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, categorized: pd.DataFrame) -> 'CategorizationSummary':
+        """Counts over categorize_frame's result"""
+        confidence = categorized['confidence_score'].to_numpy(dtype=float)
+        personal = categorized['is_personal'].to_numpy(dtype=bool)
+        patterns = categorized['pattern_type'].dropna()
+        return cls(
+            total=len(categorized),
+            high_confidence=int((confidence >= 70).sum()),
+            medium_confidence=int(((confidence >= 40) & (confidence < 70)).sum()),
+            low_confidence=int((confidence < 40).sum()),
+            personal=int(personal.sum()),
+            business=int((~personal).sum()),
+            requires_review=int(categorized['requires_review'].to_numpy(dtype=bool).sum()),
+            pattern_counts={str(k): int(v) for k, v in patterns[patterns != ''].value_counts().items()},
+        )
+
+    def percent(self, count: int) -> float:
+        """count as a percentage of all categorized transactions"""
+        return count / self.total * 100 if self.total else 0.0
+
+
+def apply_smart_categorization(
+    session,
+    transactions,
+    incremental: bool = False,
+    workers: int = 1
+) -> Optional[CategorizationSummary]:
     """
     Apply intelligent categorization using merchant database and pattern analysis
     Updates transactions with confidence scores and improved categorization
 
+    Results are written with one batched UPDATE and committed. Transaction
+    instances passed in are expired by the commit and reload on next access.
+
     Args:
         session: SQLAlchemy session
-        transactions: List of Transaction model instances (already saved to DB)
+        transactions: Transaction instances (already saved to DB), or a
+            DataFrame from load_categorization_frame()
+        incremental: Treat transactions as a new import and update the stored
+            pattern groups, rather than finding patterns within them alone
+        workers: Processes used for pattern matching on large batches
+
+    Returns:
+        CategorizationSummary, or None when smart categorization is unavailable
     """
     if not SMART_CATEGORIZATION_AVAILABLE:
         print("Warning: Smart categorization modules not available, using basic rules only")
-        return
+        return None
 
-    if not transactions:
-        return
+    if isinstance(transactions, pd.DataFrame):
+        frame = transactions
+        records = list(frame[['id', 'date', 'description', 'description_normalized', 'paid_in', 'paid_out']]
+                       .itertuples(index=False, name='CategorizationRecord'))
+    else:
+        frame = transactions_frame(transactions)
+        records = transactions
 
-    print(f"Running smart categorization on {len(transactions)} transactions...")
+    if frame.empty:
+        return CategorizationSummary()
 
     # Step 1: Run pattern analysis on all transactions
-    pattern_results = analyze_transactions(session, transactions)
-
-    # Step 2: For each transaction, combine merchant and pattern data
-    for txn in transactions:
-        # Get merchant confidence
-        is_personal_merchant, category_merchant, confidence_merchant, merchant_name = \
-            get_categorization_confidence(txn.description)
-
-        # Get pattern analysis result
-        pattern_result = pattern_results.get(txn.id)
-
-        # Start with defaults
-        final_type = txn.guessed_type
-        final_category = txn.guessed_category
-        final_is_personal = txn.is_personal
-        final_confidence = 0
-        requires_review = False
-
-        # Combine both sources of information
-        if pattern_result and pattern_result.pattern_confidence > 0:
-            # We have pattern analysis
-            pattern_conf = pattern_result.pattern_confidence
-            pattern_personal = pattern_result.is_personal
-            pattern_type = pattern_result.suggested_type
-            pattern_category = pattern_result.suggested_category
-
-            # Merge with merchant data
-            combined_conf, combined_personal = merge_confidence_scores(
-                pattern_confidence=pattern_conf,
-                merchant_confidence=confidence_merchant,
-                pattern_type=pattern_result.primary_pattern.pattern_type if pattern_result.primary_pattern else None,
-                pattern_personal=pattern_personal,
-                merchant_personal=is_personal_merchant
-            )
+    pattern_results = analyze_transactions(session, records, incremental=incremental, workers=workers)
 
-            final_confidence = combined_conf
-            final_is_personal = combined_personal
-
-            # Use pattern suggestion if high confidence
-            if pattern_conf >= 70 and pattern_type:
-                final_type = pattern_type
-                if pattern_category:
-                    final_category = pattern_category
-            # Otherwise use merchant suggestion if available
-            elif confidence_merchant >= 70:
-                if txn.paid_in > 0:
-                    final_type = "Income"
-                elif txn.paid_out > 0:
-                    final_type = "Expense"
-                final_category = category_merchant
-
-            # Store pattern metadata
-            if pattern_result.primary_pattern:
-                txn.pattern_type = pattern_result.primary_pattern.pattern_type.value
-                txn.pattern_group_id = pattern_result.primary_pattern.metadata.get('group_id', '')
-                txn.pattern_metadata = pattern_result.primary_pattern.metadata
-
-            requires_review = pattern_result.requires_review
-
-        elif confidence_merchant > 0:
-            # Only merchant data available
-            final_confidence = confidence_merchant
-            final_is_personal = is_personal_merchant
-
-            if confidence_merchant >= 70:
-                if txn.paid_in > 0:
-                    final_type = "Income"
-                elif txn.paid_out > 0:
-                    final_type = "Expense"
-                final_category = category_merchant
-
-        # Update transaction with smart categorization
-        txn.guessed_type = final_type
-        txn.guessed_category = final_category
-        txn.is_personal = final_is_personal
-        txn.confidence_score = final_confidence
-        txn.merchant_confidence = confidence_merchant
-        txn.pattern_confidence = pattern_result.pattern_confidence if pattern_result else 0
-        txn.requires_review = requires_review
-
-    # Commit all updates
-    session.commit()
-    print(f"✓ Smart categorization complete")
+    # Step 2: Combine merchant and pattern data for every transaction
+    categorized = categorize_frame(session, frame, pattern_results)
+    write_categorization(session, frame['id'].tolist(), categorized)
 
-    # Print summary
-    high_conf = sum(1 for t in transactions if t.confidence_score >= 70)
-    med_conf = sum(1 for t in transactions if 40 <= t.confidence_score < 70)
-    low_conf = sum(1 for t in transactions if t.confidence_score < 40)
-    personal = sum(1 for t in transactions if t.is_personal)
-    business = sum(1 for t in transactions if not t.is_personal)
+    # Commit all updates (including merchant usage counts)
+    get_merchant_lookup(session).flush_usage()
+    session.commit()
 
-    print(f"  High confidence (≥70): {high_conf} ({high_conf/len(transactions)*100:.1f}%)")
-    print(f"  Medium confidence (40-69): {med_conf} ({med_conf/len(transactions)*100:.1f}%)")
-    print(f"  Low confidence (<40): {low_conf} ({low_conf/len(transactions)*100:.1f}%)")
-    print(f"  Personal: {personal} ({personal/len(transactions)*100:.1f}%)")
-    print(f"  Business: {business} ({business/len(transactions)*100:.1f}%)")
+    return CategorizationSummary.from_frame(categorized)
 
 
 def parse_csv(
@@ -328,13 +511,18 @@ def parse_csv(
     column_mappings: Dict[str, str],
     session,
     rules: List,
-    Transaction
+    Transaction,
+    vectorized: bool = True
 ) -> Tuple[pd.DataFrame, List[str]]:
     """
     Parse CSV file with flexible column mapping
     Apply rules and detect duplicates
     Returns (dataframe, list of errors)
 
+    vectorized=True parses dates, amounts and descriptions with column-wide
+    pandas operations; vectorized=False keeps the original per-row path.
+    Both produce the same DataFrame and error list.
+
     Security: Validates file size, row count, and field lengths
     """
     errors = []
@@ -513,12 +701,19 @@ def parse_csv(
         # Security: Validate and sanitize description field length
         MAX_DESCRIPTION_LENGTH = 500
         if 'description' in df.columns:
-            df['description'] = df['description'].apply(
-                lambda x: str(x)[:MAX_DESCRIPTION_LENGTH] if pd.notna(x) else ''
-            )
+            if vectorized:
+                descriptions = df['description'].astype(object)
+                df['description'] = descriptions.where(descriptions.notna(), '').map(str).str[:MAX_DESCRIPTION_LENGTH]
+            else:
+                df['description'] = df['description'].apply(
+                    lambda x: str(x)[:MAX_DESCRIPTION_LENGTH] if pd.notna(x) else ''
+                )
 
         # Parse dates
-        df['date'] = df['date'].apply(parse_uk_date)
+        if vectorized:
+            df['date'] = parse_uk_dates(df['date'])
+        else:
+            df['date'] = df['date'].apply(parse_uk_date)
 
         # Remove rows with invalid dates
         invalid_dates = df['date'].isna().sum()
@@ -532,7 +727,16 @@ def parse_csv(
             return None, errors
 
         # Parse currency values and split Value column if needed
-        if use_value_column:
+        if vectorized:
+            amount_columns = ['value'] if use_value_column else ['paid_in', 'paid_out']
+            if 'balance' in df.columns:
+                amount_columns.append('balance')
+            for column in amount_columns:
+                df[column] = parse_currency_column(df[column])
+            if use_value_column:
+                df['paid_in'] = df['value'].where(df['value'] > 0, 0.0)
+                df['paid_out'] = df['value'].abs().where(df['value'] < 0, 0.0)
+        elif use_value_column:
             df['value'] = df['value'].apply(parse_currency)
             # Split into paid_in and paid_out based on sign
             df['paid_in'] = df['value'].apply(lambda x: x if x > 0 else 0.0)
@@ -541,7 +745,7 @@ def parse_csv(
             df['paid_in'] = df['paid_in'].apply(parse_currency)
             df['paid_out'] = df['paid_out'].apply(parse_currency)
 
-        if 'balance' in df.columns:
+        if 'balance' in df.columns and not vectorized:
             df['balance'] = df['balance'].apply(parse_currency)
 
         # Apply rules to guess categories and personal/business flag
@@ -549,19 +753,27 @@ def parse_csv(
         df['guessed_category'] = None
         df['is_personal'] = False
 
-        for idx, row in df.iterrows():
-            guessed_type, guessed_category, is_personal = apply_rules(
-                row['description'],
-                row['paid_in'],
-                row['paid_out'],
-                rules
-            )
-            df.at[idx, 'guessed_type'] = guessed_type
-            df.at[idx, 'guessed_category'] = guessed_category
-            df.at[idx, 'is_personal'] = is_personal
+        if vectorized:
+            guesses = RuleEngine(rules).classify_series(df['description'], df['paid_in'], df['paid_out'])
+            df['guessed_type'] = guesses['guessed_type']
+            df['guessed_category'] = guesses['guessed_category']
+            df['is_personal'] = guesses['is_personal']
+        else:
+            for idx, row in df.iterrows():
+                guessed_type, guessed_category, is_personal = apply_rules(
+                    row['description'],
+                    row['paid_in'],
+                    row['paid_out'],
+                    rules
+                )
+                df.at[idx, 'guessed_type'] = guessed_type
+                df.at[idx, 'guessed_category'] = guessed_category
+                df.at[idx, 'is_personal'] = is_personal
 
         # Detect duplicates (with error handling)
         try:
+            # Fingerprint each statement line so re-imports can be recognised
+            df['fingerprint'] = fingerprint_frame(df)
             duplicate_indices = detect_duplicates(df, session, Transaction)
             if duplicate_indices:
                 errors.append(f"Warning: {len(duplicate_indices)} duplicate transactions detected and will be skipped")
@@ -597,17 +809,18 @@ def parse_csv(
         return None, errors
 
 
-def export_to_excel(file_path: str, session, models_dict: Dict, settings: Dict[str, str]):
+def export_to_excel(file_path, session, models_dict: Dict, settings: Dict[str, str]):
     """
     Export all data to Excel workbook
     Creates sheets for each data type plus summary
+
+    Rows are streamed from column queries into write-only sheets (see
+    excel_export.py), so memory stays flat however many years are exported.
+    file_path may also be a binary file object such as BytesIO.
     """
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from openpyxl.utils.dataframe import dataframe_to_rows
+    from excel_export import StreamingWorkbook, stream_query
 
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
+    book = StreamingWorkbook()
 
     # Extract models
     Transaction = models_dict['Transaction']
@@ -616,246 +829,76 @@ def export_to_excel(file_path: str, session, models_dict: Dict, settings: Dict[s
     Mileage = models_dict['Mileage']
     Donation = models_dict['Donation']
     Rule = models_dict['Rule']
-    Setting = models_dict['Setting']
 
-    # Style definitions
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
+    def uk_date(column):
+        return func.strftime('%d/%m/%Y', column)
 
-    # 1. Profile Sheet
-    ws_profile = wb.create_sheet("Profile")
-    ws_profile.append(["Setting", "Value"])
-    for cell in ws_profile[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
+    def yes_no(condition):
+        return case((condition, 'Yes'), else_='No')
 
-    for key, value in settings.items():
-        ws_profile.append([key, value])
+    # 1. Profile Sheet
+    book.add_sheet("Profile", settings.items(), headers=["Setting", "Value"])
 
     # 2. Income Sheet
-    income_records = session.query(Income).order_by(Income.date.desc()).all()
-    ws_income = wb.create_sheet("Income")
-    ws_income.append(["Date", "Source", "Description", "Amount (Gross)", "Tax Deducted", "Income Type", "Notes"])
-
-    for cell in ws_income[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for record in income_records:
-        ws_income.append([
-            record.date.strftime('%d/%m/%Y') if record.date else '',
-            record.source,
-            record.description,
-            record.amount_gross,
-            record.tax_deducted,
-            record.income_type,
-            record.notes
-        ])
+    book.add_sheet("Income", stream_query(session.query(
+        uk_date(Income.date), Income.source, Income.description, Income.amount_gross,
+        Income.tax_deducted, Income.income_type, Income.notes
+    ).order_by(Income.date.desc())),
+        headers=["Date", "Source", "Description", "Amount (Gross)", "Tax Deducted", "Income Type", "Notes"])
 
     # 3. Expenses Sheet
-    expense_records = session.query(Expense).order_by(Expense.date.desc()).all()
-    ws_expenses = wb.create_sheet("Expenses")
-    ws_expenses.append(["Date", "Supplier", "Description", "Category", "Amount", "Receipt Link", "Notes"])
-
-    for cell in ws_expenses[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for record in expense_records:
-        ws_expenses.append([
-            record.date.strftime('%d/%m/%Y') if record.date else '',
-            record.supplier,
-            record.description,
-            record.category,
-            record.amount,
-            record.receipt_link,
-            record.notes
-        ])
+    book.add_sheet("Expenses", stream_query(session.query(
+        uk_date(Expense.date), Expense.supplier, Expense.description, Expense.category,
+        Expense.amount, Expense.receipt_link, Expense.notes
+    ).order_by(Expense.date.desc())),
+        headers=["Date", "Supplier", "Description", "Category", "Amount", "Receipt Link", "Notes"])
 
     # 4. Mileage Sheet
-    mileage_records = session.query(Mileage).order_by(Mileage.date.desc()).all()
-    ws_mileage = wb.create_sheet("Mileage")
-    ws_mileage.append(["Date", "Purpose", "From", "To", "Miles", "Rate/Mile", "Allowable Amount", "Notes"])
-
-    for cell in ws_mileage[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for record in mileage_records:
-        ws_mileage.append([
-            record.date.strftime('%d/%m/%Y') if record.date else '',
-            record.purpose,
-            record.from_location,
-            record.to_location,
-            record.miles,
-            record.rate_per_mile,
-            record.allowable_amount,
-            record.notes
-        ])
+    book.add_sheet("Mileage", stream_query(session.query(
+        uk_date(Mileage.date), Mileage.purpose, Mileage.from_location, Mileage.to_location,
+        Mileage.miles, Mileage.rate_per_mile, Mileage.allowable_amount, Mileage.notes
+    ).order_by(Mileage.date.desc())),
+        headers=["Date", "Purpose", "From", "To", "Miles", "Rate/Mile", "Allowable Amount", "Notes"])
 
     # 5. Donations Sheet
-    donation_records = session.query(Donation).order_by(Donation.date.desc()).all()
-    ws_donations = wb.create_sheet("Donations")
-    ws_donations.append(["Date", "Charity", "Amount Paid", "Gift Aid", "Notes"])
-
-    for cell in ws_donations[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for record in donation_records:
-        ws_donations.append([
-            record.date.strftime('%d/%m/%Y') if record.date else '',
-            record.charity,
-            record.amount_paid,
-            "Yes" if record.gift_aid else "No",
-            record.notes
-        ])
-
-    # 6. Summary Sheet (HMRC totals)
-    ws_summary = wb.create_sheet("Summary")
-    ws_summary.append([f"HMRC Self Assessment Summary for Tax Year {settings.get('tax_year', 'N/A')}"])
-    ws_summary.append([])
-
-    # Calculate totals
-    from sqlalchemy import func
-
-    # Employment income
-    employment_total = session.query(func.sum(Income.amount_gross)).filter(
-        Income.income_type == 'Employment'
-    ).scalar() or 0.0
-    employment_tax = session.query(func.sum(Income.tax_deducted)).filter(
-        Income.income_type == 'Employment'
-    ).scalar() or 0.0
-
-    # Self-employment income
-    self_employment_total = session.query(func.sum(Income.amount_gross)).filter(
-        Income.income_type == 'Self-employment'
-    ).scalar() or 0.0
-
-    # Interest
-    interest_total = session.query(func.sum(Income.amount_gross)).filter(
-        Income.income_type == 'Interest'
-    ).scalar() or 0.0
-
-    # Dividends
-    dividends_total = session.query(func.sum(Income.amount_gross)).filter(
-        Income.income_type == 'Dividends'
-    ).scalar() or 0.0
-
-    # Expenses
-    expenses_total = session.query(func.sum(Expense.amount)).scalar() or 0.0
-
-    # Mileage
-    mileage_total = session.query(func.sum(Mileage.allowable_amount)).scalar() or 0.0
-
-    # Total allowable expenses
-    total_allowable = expenses_total + mileage_total
-
-    # Net profit
-    net_profit = self_employment_total - total_allowable
-
-    # Donations
-    donations_total = session.query(func.sum(Donation.amount_paid)).filter(
-        Donation.gift_aid == True
-    ).scalar() or 0.0
-
-    ws_summary.append(["EMPLOYMENT (if applicable)"])
-    ws_summary.append(["Box 1 - Pay from employment", employment_total])
-    ws_summary.append(["Box 2 - UK tax deducted", employment_tax])
-    ws_summary.append([])
-
-    ws_summary.append(["SELF-EMPLOYMENT (SA103S - Short Form)"])
-    ws_summary.append(["Box 15 - Turnover", self_employment_total])
-    ws_summary.append(["Box 31 - Total allowable expenses", total_allowable])
-    ws_summary.append(["Box 32 - Net profit", net_profit])
-    ws_summary.append([])
-
-    ws_summary.append(["SAVINGS INTEREST"])
-    ws_summary.append(["Box 1 - Interest (gross)", interest_total])
-    ws_summary.append([])
-
-    ws_summary.append(["DIVIDENDS"])
-    ws_summary.append(["Box 1 - Dividends (gross)", dividends_total])
-    ws_summary.append([])
-
-    ws_summary.append(["GIFT AID"])
-    ws_summary.append(["Donations paid", donations_total])
-    ws_summary.append([])
-
-    ws_summary.append(["Breakdown of Allowable Expenses:"])
-    ws_summary.append(["Total Expenses", expenses_total])
-    ws_summary.append(["Total Mileage Allowance", mileage_total])
+    book.add_sheet("Donations", stream_query(session.query(
+        uk_date(Donation.date), Donation.charity, Donation.amount_paid,
+        yes_no(Donation.gift_aid == True), Donation.notes
+    ).order_by(Donation.date.desc())),
+        headers=["Date", "Charity", "Amount Paid", "Gift Aid", "Notes"])
+
+    # 6. Summary Sheet (HMRC totals for the selected tax year)
+    from tax_snapshot import get_tax_year_snapshot
+
+    tax_year = settings.get('tax_year', '2024/25')
+    snapshot = get_tax_year_snapshot(session, tax_year)
+
+    summary_rows = [[f"HMRC Self Assessment Summary for Tax Year {tax_year}"], []]
+    for section, boxes in snapshot.hmrc_boxes():
+        summary_rows.append([section])
+        summary_rows.extend([label, value] for label, value in boxes)
+        summary_rows.append([])
+    summary_rows.append(["Breakdown of Allowable Expenses:"])
+    summary_rows.append(["Total Expenses", snapshot.expenses_total])
+    summary_rows.append(["Total Mileage Allowance", snapshot.mileage_total])
+    book.add_sheet("Summary", summary_rows)
 
     # 7. Rules Sheet
-    rule_records = session.query(Rule).order_by(Rule.priority).all()
-    ws_rules = wb.create_sheet("Rules")
-    ws_rules.append(["Match Mode", "Text to Match", "Map To", "Income Type", "Expense Category", "Priority", "Enabled", "Notes"])
-
-    for cell in ws_rules[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for rule in rule_records:
-        ws_rules.append([
-            rule.match_mode,
-            rule.text_to_match,
-            rule.map_to,
-            rule.income_type or '',
-            rule.expense_category or '',
-            rule.priority,
-            "Yes" if rule.enabled else "No",
-            rule.notes
-        ])
+    book.add_sheet("Rules", stream_query(session.query(
+        Rule.match_mode, Rule.text_to_match, Rule.map_to, func.coalesce(Rule.income_type, ''),
+        func.coalesce(Rule.expense_category, ''), Rule.priority, yes_no(Rule.enabled == True), Rule.notes
+    ).order_by(Rule.priority)),
+        headers=["Match Mode", "Text to Match", "Map To", "Income Type", "Expense Category", "Priority", "Enabled", "Notes"])
 
     # 8. Archived Inbox Sheet (all reviewed transactions)
-    transaction_records = session.query(Transaction).filter(
-        Transaction.reviewed == True
-    ).order_by(Transaction.date.desc()).all()
-
-    ws_inbox = wb.create_sheet("Archived_Inbox")
-    ws_inbox.append(["Date", "Type", "Description", "Paid Out", "Paid In", "Balance", "Guessed Type", "Guessed Category", "Personal", "Notes"])
-
-    for cell in ws_inbox[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for record in transaction_records:
-        ws_inbox.append([
-            record.date.strftime('%d/%m/%Y') if record.date else '',
-            record.type,
-            record.description,
-            record.paid_out,
-            record.paid_in,
-            record.balance,
-            record.guessed_type,
-            record.guessed_category,
-            "Yes" if record.is_personal else "No",
-            record.notes
-        ])
-
-    # Adjust column widths for all sheets
-    for ws in wb.worksheets:
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-    wb.save(file_path)
+    book.add_sheet("Archived_Inbox", stream_query(session.query(
+        uk_date(Transaction.date), Transaction.type, Transaction.description, Transaction.paid_out,
+        Transaction.paid_in, Transaction.balance, Transaction.guessed_type, Transaction.guessed_category,
+        yes_no(Transaction.is_personal == True), Transaction.notes
+    ).filter(Transaction.reviewed == True).order_by(Transaction.date.desc())),
+        headers=["Date", "Type", "Description", "Paid Out", "Paid In", "Balance", "Guessed Type", "Guessed Category", "Personal", "Notes"])
+
+    book.save(file_path)
 
 
 def get_tax_year_dates(tax_year_str: str) -> Tuple[datetime, datetime]: